@@ -0,0 +1,105 @@
+"""Size and cold-start report of a PyInstaller build.
+
+    pyinstaller pipedesignoptimizer.spec
+    python benchmarks/bundle_report.py dist/pipedesignoptimizer --runs 5
+    python benchmarks/bundle_report.py dist/pipedesignoptimizer --baseline old/pipedesignoptimizer
+
+Sizes are listed per top-level entry of the bundle (``_internal``). Each run
+starts the exe with ``PDO_STARTUP_PROBE`` set: the application writes its
+start-up marks (first frame, catalogues ready) to a file and quits. For a
+cold start, run it after a reboot or with ``--first-start``, which also removes
+the catalogues copied next to the exe so they are installed again.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from engine.catalogue_db import DB_FILE, TABLES            # noqa: E402
+from engine.startup import PROBE_ENV                       # noqa: E402
+
+EXE_NAME = "pipedesignoptimizer"
+
+
+def _contents(dist):
+    internal = Path(dist) / "_internal"
+    return internal if internal.is_dir() else Path(dist)
+
+
+def folder_sizes(dist):
+    """(total bytes, file count, {top-level entry: bytes}) of a build folder."""
+    total, count, entries = 0, 0, {}
+    contents = _contents(dist)
+    for path in Path(dist).rglob("*"):
+        if not path.is_file():
+            continue
+        size = path.stat().st_size
+        total += size
+        count += 1
+        rel = path.relative_to(contents).parts[0] if contents in path.parents else path.name
+        entries[rel] = entries.get(rel, 0) + size
+    return total, count, entries
+
+
+def _installed(dist):
+    return [Path(dist) / name for name in [file for file, _ in TABLES.values()] + [DB_FILE]]
+
+
+def cold_start(dist, runs=5, first_start=False, timeout=120):
+    """Start-up marks (seconds) of ``runs`` launches, as a list of dicts."""
+    exe = next(p for p in (Path(dist) / f"{EXE_NAME}.exe", Path(dist) / EXE_NAME) if p.exists())
+    marks = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(runs):
+            if first_start:
+                for path in _installed(dist):
+                    for f in (path, Path(f"{path}-wal"), Path(f"{path}-shm")):
+                        f.unlink(missing_ok=True)
+            probe = os.path.join(tmp, f"run{i}.json")
+            subprocess.run([str(exe)], env=dict(os.environ, **{PROBE_ENV: probe}),
+                           timeout=timeout, check=False)
+            with open(probe, encoding="utf-8") as fh:
+                marks.append(json.load(fh))
+    return marks
+
+
+def _mb(n):
+    return f"{n / 1e6:8.1f} MB"
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("dist", help="build folder, e.g. dist/pipedesignoptimizer")
+    p.add_argument("--baseline", help="another build folder to compare sizes with")
+    p.add_argument("--runs", type=int, default=5, help="launches to time (0: sizes only)")
+    p.add_argument("--first-start", action="store_true",
+                   help="remove the installed catalogues before each launch")
+    p.add_argument("--top", type=int, default=15, help="largest entries listed")
+    args = p.parse_args(argv)
+
+    total, count, entries = folder_sizes(args.dist)
+    base = folder_sizes(args.baseline)[2] if args.baseline else {}
+    print(f"Bundle {args.dist}: {_mb(total).strip()} in {count} files")
+    for name, size in sorted(entries.items(), key=lambda e: -e[1])[:args.top]:
+        delta = f"  ({(size - base.get(name, 0)) / 1e6:+.1f} MB)" if args.baseline else ""
+        print(f"  {_mb(size)}  {name}{delta}")
+    if args.baseline:
+        base_total = sum(base.values())
+        print(f"Baseline {args.baseline}: {_mb(base_total).strip()} "
+              f"({(total - base_total) / 1e6:+.1f} MB)")
+
+    if args.runs:
+        marks = cold_start(args.dist, args.runs, args.first_start)
+        for label in marks[0]:
+            times = [m[label] for m in marks if label in m]
+            print(f"{label:>18}: median {statistics.median(times):.2f} s, "
+                  f"min {min(times):.2f} s, max {max(times):.2f} s ({len(times)} runs)")
+
+
+if __name__ == "__main__":
+    main()
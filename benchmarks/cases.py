@@ -0,0 +1,98 @@
+"""Reference cases and golden results shared by the benchmark modules."""
+import json
+import os
+import sys
+from pathlib import Path
+
+os.environ.setdefault("MPLBACKEND", "Agg")          # headless
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import pipedesignoptimizer as pdo                   # noqa: E402
+from engine.hydraulics import (                     # noqa: E402
+    critical_diameter, diameter_grid, pressure_drop_sweep, resolve_fittings,
+    velocity_critical_diameter,
+)
+from engine.thickness import F_MAP, thickness_schedule  # noqa: E402
+from engine.design import run_design                    # noqa: E402
+
+HERE = Path(__file__).resolve().parent
+CASES = json.loads((HERE / "reference_cases.json").read_text(encoding="utf-8"))
+GOLDEN_FILE = HERE / "golden.json"
+RTOL = 1e-9
+
+# (Re, D, k) points checked against the golden Colebrook values
+COLEBROOK_POINTS = [
+    (500.0, 0.05, 4.5e-5),
+    (4000.0, 0.1, 4.5e-5),
+    (1e5, 0.3, 4.5e-5),
+    (1e6, 0.5, 9.0e-5),
+    (1e8, 1.0, 2.0e-6),
+]
+
+
+def load_golden():
+    return json.loads(GOLDEN_FILE.read_text(encoding="utf-8"))
+
+
+def case_inputs(case):
+    """Fluid properties and resolved fittings of a reference case."""
+    rho, mu = pdo.fluid_properties(case["phase"], case["fluid"])
+    fittings = resolve_fittings(pdo.fittings_df, case["fittings"])
+    return rho, mu, fittings
+
+
+def sweep_materials(case, materials, rho, mu, fittings):
+    """ΔP sweep and critical diameter for every material (Pa, m)."""
+    diameters = diameter_grid()
+    out = {}
+    for mat in materials:
+        td = pressure_drop_sweep(case["flowrate"], case["length"], rho, mu, case["velocity"],
+                                 pdo.material_roughness(mat), fittings, diameters)
+        out[mat] = critical_diameter(diameters, td, case["dp_max"] * 1e5)
+    return out
+
+
+def thickness_for(case, materials, dcrit):
+    pressure_drop_results = {m: {"Critical Diameter (m)": d,
+                                 "Critical Diameter (mm)": d * 1000 if d else None}
+                             for m, d in dcrit.items()}
+    return thickness_schedule(materials, pdo.material_df, pdo.sched_df,
+                              velocity_critical_diameter(case["flowrate"], case["velocity"]),
+                              pressure_drop_results, F_MAP[case["location"]],
+                              case["design_pressure"] * 1e5, case["corrosion_allowance"])
+
+
+def run_case(case):
+    """Full design chain of one reference case, reduced to the golden fields."""
+    result = run_design(case)
+    return {
+        "compatible": result["compatible_materials"],
+        "dcrit_velocity": result["dcrit_velocity"],
+        "dcrit": {m: r["dcrit"] for m, r in result["materials"].items()},
+        "details": {m: {k: v for k, v in r["calculation"].items() if k != "details"}
+                    for m, r in result["materials"].items() if r["calculation"]},
+        "thickness": [{"Material": r["Material"],
+                       "t_required_mm": r["t_required_mm"],
+                       "OD_norm_mm": r["OD_norm_mm"],
+                       "t_norm_mm": r["t_norm_mm"],
+                       "NPS": str(r["NPS"])} for r in result["thickness"]],
+        "prices": result["prices"],
+    }
+
+
+def assert_close(actual, expected, path="result"):
+    """Recursive comparison of a result against its golden value."""
+    if isinstance(expected, dict):
+        assert set(actual) == set(expected), f"{path}: keys differ"
+        for key in expected:
+            assert_close(actual[key], expected[key], f"{path}[{key!r}]")
+    elif isinstance(expected, list):
+        assert len(actual) == len(expected), f"{path}: length differs"
+        for i, (a, e) in enumerate(zip(actual, expected)):
+            assert_close(a, e, f"{path}[{i}]")
+    elif isinstance(expected, float):
+        assert actual is not None and abs(actual - expected) <= RTOL * abs(expected), \
+            f"{path}: {actual!r} != {expected!r}"
+    else:
+        assert actual == expected, f"{path}: {actual!r} != {expected!r}"
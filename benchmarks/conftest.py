@@ -0,0 +1,18 @@
+import pytest
+
+from cases import CASES, load_golden
+
+
+@pytest.fixture(scope="session")
+def golden():
+    return load_golden()
+
+
+@pytest.fixture(params=CASES, ids=[c["name"] for c in CASES])
+def case(request):
+    return request.param
+
+
+@pytest.fixture
+def case_golden(case, golden):
+    return golden["cases"][case["name"]]
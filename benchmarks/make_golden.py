@@ -0,0 +1,22 @@
+"""Regenerate ``golden.json`` from the current engine.
+
+Only run this after a deliberate change of the numerical results, and review
+the diff of ``golden.json`` before committing it.
+"""
+import json
+
+from cases import CASES, COLEBROOK_POINTS, GOLDEN_FILE, run_case
+from engine.hydraulics import colebrook
+
+
+def main():
+    golden = {
+        "colebrook": [[Re, D, k, colebrook(Re, D, k)] for Re, D, k in COLEBROOK_POINTS],
+        "cases": {case["name"]: run_case(case) for case in CASES},
+    }
+    GOLDEN_FILE.write_text(json.dumps(golden, indent=1, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(f"Wrote {GOLDEN_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import os
+import shutil
+
+from cases import ROOT
+from engine.assets import ImageCache
+
+BG = str(ROOT / "bg_eppm.png")
+UHD = (3840, 2160)
+
+
+def test_scaled_once_per_size(tmp_path):
+    cache = ImageCache(max_sizes=2)
+    first = cache.scaled(BG, UHD)
+    assert first.size == UHD and cache.scaled(BG, UHD) is first
+    cache.scaled(BG, (1920, 1080))
+    cache.scaled(BG, (1280, 720))
+    assert cache.resizes == 3 and len(cache._scaled) == 2
+    cache.scaled(BG, UHD)                       # evicted: scaled again
+    assert cache.resizes == 4
+
+
+def test_changed_file_is_decoded_again(tmp_path):
+    path = str(tmp_path / "bg.png")
+    shutil.copy(BG, path)
+    cache = ImageCache()
+    before = cache.scaled(path, (320, 180))
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert cache.scaled(path, (320, 180)) is not before
+
+
+def test_page_switch_background(benchmark):
+    cache = ImageCache()
+    cache.scaled(BG, UHD)
+    assert benchmark(cache.scaled, BG, UHD).size == UHD
@@ -0,0 +1,44 @@
+import shutil
+import sys
+
+import pandas as pd
+
+from cases import ROOT
+from engine import catalogues
+from engine.catalogue_db import DB_FILE, TABLES, CatalogueDB
+
+WORKBOOKS = [file for file, _ in TABLES.values()]
+
+
+def _frozen_build(tmp_path, monkeypatch):
+    """A fake onedir build: exe folder with the catalogues bundled in _internal."""
+    app = tmp_path / "app"
+    internal = app / "_internal"
+    internal.mkdir(parents=True)
+    for name in WORKBOOKS + ["bg_eppm.png"]:
+        shutil.copy2(ROOT / name, internal / name)
+    with CatalogueDB(str(internal / DB_FILE)) as db:          # as the spec builds it
+        db.import_excel(str(ROOT))
+        db.conn.execute("PRAGMA journal_mode=DELETE")
+    for name in WORKBOOKS:                                    # PyInstaller may not keep mtimes
+        (internal / name).touch()
+    monkeypatch.setattr(sys, "frozen", True, raising=False)
+    monkeypatch.setattr(sys, "executable", str(app / "pipedesignoptimizer.exe"))
+    monkeypatch.setattr(sys, "_MEIPASS", str(internal), raising=False)
+    return app
+
+
+def test_first_start_uses_bundled_database(tmp_path, monkeypatch):
+    app = _frozen_build(tmp_path, monkeypatch)
+    from engine.resources import resource_path
+
+    assert resource_path("bg_eppm.png") == str(app / "_internal" / "bg_eppm.png")
+
+    def no_excel(*args, **kwargs):
+        raise AssertionError("workbook parsed on first start")
+
+    monkeypatch.setattr(pd, "read_excel", no_excel)
+    cat = catalogues.get_catalogues.__wrapped__()
+    assert cat.db is not None and len(cat.material_df) > 0
+    assert all((app / name).is_file() for name in WORKBOOKS + [DB_FILE])
+    cat.db.close()
@@ -0,0 +1,81 @@
+import os
+import shutil
+
+import pytest
+
+from cases import CASES, ROOT, run_design
+from engine import cache as cache_mod
+from engine.cache import DesignCache, case_key, catalogue_fingerprint
+from engine.catalogue_db import TABLES
+from engine.catalogues import Catalogues, get_catalogues
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with DesignCache(str(tmp_path / "cache.sqlite")) as cache:
+        yield cache
+
+
+def test_hit_equals_design(cache):
+    for case in CASES:
+        first = cache.design(case)
+        again = cache.design(dict(case, project_name="Renamed"))
+        assert first == run_design(case)
+        assert again == run_design(dict(case, project_name="Renamed"))
+    assert (cache.hits, cache.misses) == (len(CASES), len(CASES))
+
+
+def test_hit_keeps_the_resolved_velocity(cache):
+    case = {k: v for k, v in CASES[0].items() if k != "velocity"}
+    case.update(velocity_limit="api-rp-14e", c_factor=100)
+    first = cache.design(case)
+    again = cache.design(dict(case, name="Renamed"))
+    assert cache.hits == 1 and again == run_design(dict(case, name="Renamed"))
+    assert first["case"]["velocity"] == again["case"]["velocity"] < float("inf")
+
+
+def test_workbook_change_invalidates(tmp_path):
+    for file, _ in TABLES.values():
+        shutil.copy(ROOT / file, tmp_path / file)
+    cat = Catalogues(str(tmp_path))
+    before = catalogue_fingerprint(cat)
+    path = tmp_path / TABLES["fittings"][0]
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    assert catalogue_fingerprint(cat) != before
+    assert case_key(CASES[0], before) != case_key(CASES[0], catalogue_fingerprint(cat))
+
+    db_path = str(tmp_path / "cache.sqlite")
+    with DesignCache(db_path, catalogues=cat) as cache:
+        cache.put(case_key(CASES[0], cache.fingerprint), {"x": 1})
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    with DesignCache(db_path, catalogues=cat) as cache:
+        assert len(cache) == 0                         # stale entries purged on open
+
+
+def test_format_change_invalidates(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "cache.sqlite")
+    with DesignCache(db_path) as cache:
+        key = case_key(CASES[0], cache.fingerprint)
+        cache.put(key, {"x": 1})
+    monkeypatch.setattr(cache_mod, "CACHE_FORMAT", cache_mod.CACHE_FORMAT + 1)
+    assert case_key(CASES[0], cache.fingerprint) != key
+    with DesignCache(db_path) as cache:
+        assert len(cache) == 0
+
+
+def test_lru_eviction(tmp_path):
+    with DesignCache(str(tmp_path / "cache.sqlite"), max_bytes=4000) as cache:
+        payload = {"data": os.urandom(600).hex()}     # ~1 kB compressed
+        for i in range(10):
+            cache.put(f"k{i}", payload)
+            cache.get("k0")                            # k0 stays the most recent
+        assert cache.size <= 4000
+        assert cache.get("k0") is not None and cache.get("k9") is not None
+        assert cache.get("k1") is None
+
+
+def test_cached_design(benchmark, cache):
+    get_catalogues()
+    cache.design(CASES[0])
+    result = benchmark(cache.design, CASES[0])
+    assert result["recommended"] == run_design(CASES[0])["recommended"]
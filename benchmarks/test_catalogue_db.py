@@ -0,0 +1,46 @@
+import shutil
+
+import pytest
+
+from cases import CASES, ROOT, pdo
+from engine.catalogue_db import CatalogueDB, TABLES
+from engine.catalogues import Catalogues
+from engine.thickness import select_schedule
+
+
+@pytest.fixture
+def db(tmp_path):
+    for file, _ in TABLES.values():
+        shutil.copy(ROOT / file, tmp_path / file)
+    with CatalogueDB(str(tmp_path / "catalogue.sqlite")) as db:
+        db.import_excel(str(tmp_path))
+        yield db
+
+
+def test_frames_match_workbooks(db, tmp_path):
+    excel, sql = Catalogues(str(tmp_path)), Catalogues.from_database(db, str(tmp_path))
+    for name in ("liquid_df", "gas_df", "material_df", "fittings_df", "sched_df"):
+        a, b = getattr(excel, name), getattr(sql, name)
+        assert list(a.columns) == list(b.columns)
+        assert a.astype(str).values.tolist() == b.astype(str).values.tolist()
+
+
+def test_indexed_lookups(db):
+    for case in CASES:
+        assert db.compatible_materials(case["temperature"], case["pressure"]) == \
+            pdo.get_compatible_materials(case["temperature"], case["pressure"])
+        assert db.fluid_properties(case["phase"], case["fluid"]) == \
+            pdo.fluid_properties(case["phase"], case["fluid"])
+    pick = lambda row: None if row is None else (row["Outside diameter (mm)"], row["Wall thickness (mm)"])
+    for od in (10.0, 60.3, 250.0, 1000.0, 5000.0):
+        for t in (2.0, 6.0, 20.0):
+            assert pick(db.select_schedule(od, t)) == pick(select_schedule(pdo.sched_df, od, t))
+
+
+def test_add_fluid(benchmark, db):
+    names = iter(range(10 ** 6))
+    benchmark(lambda: db.add_fluid("Liquid", {"Liquid": f"Test fluid {next(names)}",
+                                              "Density (kg/mÂ³)": "870", "Viscosity (mPaÂ·s)": "12"}))
+    assert db.fluid_properties("Liquid", "test fluid 0") == (870.0, 0.012)
+    with pytest.raises(ValueError):
+        db.add_fluid("Liquid", {"Liquid": "Test Fluid 0"})
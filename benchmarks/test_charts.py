@@ -0,0 +1,98 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from cases import CASES
+from engine.catalogues import fluid_properties, get_catalogues, material_roughness
+from engine.charts import DEFAULT_MAX_ERROR, build_charts, load_charts
+from engine.hydraulics import (
+    critical_diameter_search, diameter_grid, pack_fittings, resolve_fittings,
+)
+from engine.service import CalculationService
+
+CAT = get_catalogues()
+FLUIDS = ["Refined Petroleum", "Methane"]
+MATERIAL = "ASTM A790"
+AXES = {"flowrate": (10.0, 1e4), "length": (100.0, 5e4), "dp_max": (0.1, 20.0)}
+
+
+@pytest.fixture(scope="module")
+def charts(tmp_path_factory):
+    path = tmp_path_factory.mktemp("charts") / "charts.npz"
+    return load_charts(build_charts(path, CAT, FLUIDS, per_decade=4, axes=AXES))
+
+
+def _points(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return [np.exp(rng.uniform(np.log(lo), np.log(hi), n)) for lo, hi in AXES.values()]
+
+
+def _solver(fluid, Q, L, dp, vmax, fittings=None):
+    phase = "Gas" if fluid == "Methane" else "Liquid"
+    rho, mu = fluid_properties(CAT.liquid_df, CAT.gas_df, phase, fluid)
+    return critical_diameter_search(Q, L, rho, mu, vmax, material_roughness(CAT.material_df, MATERIAL),
+                                    dp * 1e5, fittings)
+
+
+@pytest.mark.parametrize("fluid", FLUIDS)
+def test_lookup_matches_solver(charts, fluid):
+    Q, L, dp = _points()
+    dcrit, error = charts.lookup(fluid, MATERIAL, Q, L, dp, 3.0)
+    ref = _solver(fluid, Q, L, dp, 3.0)
+    assert np.isnan(dcrit).sum() == np.isnan(ref).sum()
+    # interpolated answers may round up to the neighbouring grid diameter
+    steps = np.searchsorted(diameter_grid(), dcrit) - np.searchsorted(diameter_grid(), ref)
+    assert np.all(np.abs(steps[~np.isnan(ref)]) <= 1) and np.mean(steps == 0) > 0.98
+    assert np.all((error == 0) | (error <= DEFAULT_MAX_ERROR))
+    exact, _ = charts.lookup(fluid, MATERIAL, Q, L, dp, 3.0, snap=False, max_error=-1)
+    smooth, error = charts.lookup(fluid, MATERIAL, Q, L, dp, 3.0, snap=False)
+    assert np.all(np.abs(smooth / exact - 1)[error > 0] <= 2 * error[error > 0] + 1e-4)
+
+
+def test_fallbacks(charts):
+    Q, L, dp = _points(50)
+    fittings = resolve_fittings(CAT.fittings_df, CASES[0]["fittings"])
+    dcrit, error = charts.lookup("Refined Petroleum", MATERIAL, Q, L, dp, 3.0, fittings)
+    np.testing.assert_array_equal(dcrit, _solver("Refined Petroleum", Q, L, dp, 3.0,
+                                                 pack_fittings([fittings])))
+    assert np.all(error == 0)
+    dcrit, error = charts.lookup("Refined Petroleum", MATERIAL, 100, 20, 1.0, 3.0)  # off the chart
+    assert error == 0 and dcrit == _solver("Refined Petroleum", 100, 20, 1.0, 3.0)[0]
+    dcrit, error = charts.lookup("Crude Oil", MATERIAL, 250, 5000, 5.0, 3.0)         # not tabulated
+    assert error == 0 and np.isfinite(dcrit)
+    with pytest.raises(ValueError, match="Unknown material"):
+        charts.lookup("Methane", "unobtainium", 250, 5000, 5.0)
+
+
+def test_lookup_one_and_case(charts):
+    Q, L, dp = _points(200, seed=1)
+    vector, _ = charts.lookup("Methane", MATERIAL, Q, L, dp, 20.0)
+    scalar = [charts.lookup_one("Methane", MATERIAL, q, length, d, 20.0)[0]
+              for q, length, d in zip(Q, L, dp)]
+    np.testing.assert_array_equal(scalar, vector)
+    case = dict(CASES[1], temperature=20, pressure=10)
+    result = charts.lookup_case(case)
+    assert result["materials"][MATERIAL]["dcrit"] == pytest.approx(
+        float(charts.lookup("Refined Petroleum", MATERIAL, case["flowrate"], case["length"],
+                            case["dp_max"], case["velocity"])[0]))
+
+
+def test_screen_endpoint(charts):
+    service = CalculationService(workers=0)
+    try:
+        service._charts = (charts, DEFAULT_MAX_ERROR)
+        body = dict(CASES[1], materials=[MATERIAL])
+        status, reply = asyncio.run(service.dispatch("POST", "/screen", json.dumps(body).encode()))
+        assert status == 200
+        status, exact = asyncio.run(service.dispatch("POST", "/critical-diameter",
+                                                     json.dumps(body).encode()))
+        assert abs(reply["dcrit"][MATERIAL] - exact["dcrit"][MATERIAL]) <= 0.0021
+    finally:
+        service.close()
+
+
+def test_lookup_one(benchmark, charts):
+    dcrit, error = benchmark(charts.lookup_one, "Refined Petroleum", MATERIAL, 120.0, 2000.0, 2.0, 2.5)
+    assert 0 < error <= DEFAULT_MAX_ERROR and dcrit > 0
@@ -0,0 +1,169 @@
+import json
+
+import pandas as pd
+import pytest
+
+from cases import CASES, run_design
+from engine import cli
+from engine.sweep import DesignSpace
+
+LIQUID, GAS = CASES[0], CASES[4]
+
+
+@pytest.fixture(autouse=True)
+def no_open_cache(monkeypatch):
+    # the CLI keeps one design cache per process; every main() here starts without it
+    monkeypatch.setattr(cli, "_cache", None)
+
+
+def write_case(tmp_path, case, name="case.json"):
+    path = tmp_path / name
+    path.write_text(json.dumps(case), encoding="utf-8")
+    return str(path)
+
+
+def run(argv, capsys):
+    status = cli.main([str(a) for a in argv])
+    out, err = capsys.readouterr()
+    return status, out, err
+
+
+# ------------------------------------------------------------------
+# design / batch
+# ------------------------------------------------------------------
+def test_design_prints_the_result(tmp_path, capsys):
+    status, out, _ = run(["design", write_case(tmp_path, LIQUID), "--no-cache"], capsys)
+    result, expected = json.loads(out), run_design(LIQUID)
+    assert status == 0 and result["recommended"] == expected["recommended"]
+    assert result["dcrit_velocity"] == expected["dcrit_velocity"]
+    assert "sweeps" not in result
+
+
+def test_design_output_and_cache(tmp_path, capsys):
+    case, cache = write_case(tmp_path, GAS), tmp_path / "cache.sqlite"
+    for name in ("first.json", "again.json"):
+        status, out, _ = run(["design", case, "-o", tmp_path / name, "--cache", cache], capsys)
+        assert status == 0 and out == ""
+    assert cli._cache.hits == 1
+    first, again = (json.loads((tmp_path / n).read_text(encoding="utf-8")) for n in ("first.json", "again.json"))
+    assert first == again and first["recommended"] == run_design(GAS)["recommended"]
+
+
+def test_batch_reports_bad_cases(tmp_path, capsys):
+    cases = [LIQUID, dict(LIQUID, name="bad", fluid="Unobtainium"), GAS]
+    path = tmp_path / "cases.jsonl"
+    path.write_text("".join(json.dumps(c) + "\n" for c in cases), encoding="utf-8")
+    status, out, err = run(["batch", path, "--no-cache", "--table", tmp_path / "t.csv"], capsys)
+    rows = [json.loads(line) for line in out.splitlines()]
+    assert status == 1 and "2/3 cases designed" in err
+    assert [r["name"] for r in rows] == [LIQUID["name"], "bad", GAS["name"]]
+    assert "error" in rows[1] and rows[2]["recommended"] == run_design(GAS)["recommended"]
+    assert set(pd.read_csv(tmp_path / "t.csv")["case"]) == {0, 2}
+
+    status, _, _ = run(["batch", path, "--no-cache", "-o", tmp_path / "out.jsonl"], capsys)
+    assert status == 1 and len((tmp_path / "out.jsonl").read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_parallel_batch_counts_cache_hits(tmp_path, capsys):
+    path, cache = write_case(tmp_path, [LIQUID, GAS, dict(GAS, name="again")]), tmp_path / "cache.sqlite"
+    status, out, err = run(["batch", path, "-j", 2, "--cache", cache], capsys)
+    assert status == 0 and "3/3 cases designed, " in err and "from the design cache" in err
+    assert [json.loads(line)["name"] for line in out.splitlines()] == [LIQUID["name"], GAS["name"], "again"]
+    status, _, err = run(["batch", path, "-j", 2, "--cache", cache], capsys)
+    assert status == 0 and "3 from the design cache" in err
+
+
+def test_bad_cases(tmp_path, capsys):
+    status, _, err = run(["design", write_case(tmp_path, dict(LIQUID, fluid="Unobtainium")),
+                          "--no-cache"], capsys)
+    assert status == 1 and err.startswith("error:")
+    for key in ("velocity", "flowrate", "length", "dp_max"):
+        status, _, err = run(["design", write_case(tmp_path, dict(LIQUID, **{key: -1})), "--no-cache"],
+                             capsys)
+        assert status == 1 and f"'{key}' must be positive" in err
+    status, _, err = run(["design", tmp_path / "missing.json", "--no-cache"], capsys)
+    assert status == 1 and "missing.json" in err
+    with pytest.raises(SystemExit, match="use 'batch'"):
+        cli.main(["design", write_case(tmp_path, [LIQUID, GAS]), "--no-cache"])
+    with pytest.raises(SystemExit, match="give one case"):
+        cli.main(["surge", write_case(tmp_path, [LIQUID, GAS])])
+    with pytest.raises(SystemExit):
+        cli.main(["rate"])                                  # argparse: CASE is required
+
+
+# ------------------------------------------------------------------
+# Smoke run of the other commands
+# ------------------------------------------------------------------
+def test_project_and_report(tmp_path, capsys):
+    case, project = write_case(tmp_path, LIQUID), tmp_path / "line.pdo"
+    status, _, _ = run(["design", case, "--no-cache", "-o", tmp_path / "r.json", "--project", project], capsys)
+    assert status == 0
+    status, out, _ = run(["project", project], capsys)
+    assert status == 0 and "1 segment(s)" in out
+    status, _, _ = run(["report", case, tmp_path / "report.pdf"], capsys)
+    assert status == 0 and (tmp_path / "report.pdf").read_bytes()[:4] == b"%PDF"
+
+
+def test_stream_and_bench(tmp_path, capsys):
+    table = pd.DataFrame([dict(c, fittings=json.dumps(c["fittings"])) for c in CASES])
+    table.to_csv(tmp_path / "cases.csv", index=False)
+    status, _, _ = run(["stream", tmp_path / "cases.csv", "-o", tmp_path / "out.csv", "--chunk", 2], capsys)
+    assert status == 0 and len(pd.read_csv(tmp_path / "out.csv")) == len(CASES)
+    table.loc[1, "velocity"] = -1
+    table.to_csv(tmp_path / "bad.csv", index=False)
+    status, _, err = run(["stream", tmp_path / "bad.csv", "-o", tmp_path / "bad_out.csv"], capsys)
+    out = pd.read_csv(tmp_path / "bad_out.csv")
+    assert status == 1 and f"{len(CASES) - 1}/{len(CASES)} cases designed" in err
+    assert "must be positive" in out["error"][1] and out["error"].drop(index=1).isna().all()
+    status, out, _ = run(["bench", write_case(tmp_path, [GAS]), "-n", 1], capsys)
+    assert status == 0 and GAS["name"][:24] in out
+
+
+def test_uncertainty_and_sweep(tmp_path, capsys):
+    case = write_case(tmp_path, LIQUID)
+    status, out, _ = run(["uncertainty", case, "-n", 200, "--seed", 3, "-j", 1], capsys)
+    result = json.loads(out)
+    assert status == 0 and result["samples"] == 200 and result["seed"] == 3
+    status, _, _ = run(["sweep", case, "--flowrate", "100:400:4", "--dp-max", "1,5",
+                        "-o", tmp_path / "space.npz"], capsys)
+    assert status == 0 and DesignSpace.load(tmp_path / "space.npz").shape[:3] == (4, 1, 2)
+    status, _, _ = run(["sweep", case, "-o", tmp_path / "space.csv"], capsys)
+    assert status == 0 and "dcrit" in pd.read_csv(tmp_path / "space.csv")
+
+
+def test_economic_rate_and_pareto(tmp_path, capsys):
+    case = write_case(tmp_path, LIQUID)
+    status, out, _ = run(["economic", case, "--tariff", 0.2, "--curve", tmp_path / "curve.csv"], capsys)
+    assert status == 0 and json.loads(out)["recommended"] and (tmp_path / "curve.csv").exists()
+    status, out, _ = run(["rate", case, "--table", tmp_path / "rate.csv"], capsys)
+    assert status == 0 and json.loads(out) and len(pd.read_csv(tmp_path / "rate.csv"))
+    status, out, _ = run(["pareto", case, "--objective", "cost", "--objective", "dp_bar",
+                          "--table", tmp_path / "front.csv", "--plot", tmp_path / "front.png"], capsys)
+    assert status == 0 and json.loads(out)["objectives"] == ["cost", "dp_bar"]
+    assert (tmp_path / "front.png").stat().st_size > 0
+
+
+def test_surge(tmp_path, capsys):
+    status, _, err = run(["surge", write_case(tmp_path, LIQUID), "--all", "--closure", 30,
+                          "--reaches", 50, "-o", tmp_path / "surge.json"], capsys)
+    surge = json.loads((tmp_path / "surge.json").read_text(encoding="utf-8"))
+    assert status == (0 if all(s["ok"] for s in surge.values()) else 1)
+    assert len(surge) == len(run_design(LIQUID)["thickness"]) and "pipe(s) simulated" in err
+    status, _, err = run(["surge", write_case(tmp_path, GAS)], capsys)
+    assert status == 1 and "liquid" in err
+
+
+def test_charts(tmp_path, capsys):
+    path = tmp_path / "charts.npz"
+    status, out, _ = run(["charts", "build", "--file", path, "--fluid", LIQUID["fluid"],
+                          "--per-decade", 2], capsys)
+    assert status == 0 and "1 fluid(s)" in out
+    status, out, _ = run(["charts", "lookup", write_case(tmp_path, LIQUID), "--file", path], capsys)
+    assert status == 0 and json.loads(out)
+    with pytest.raises(SystemExit, match="needs a CASE"):
+        cli.main(["charts", "lookup", "--file", str(path)])
+
+
+def test_catalogue_info(tmp_path, capsys):
+    status, out, _ = run(["catalogue", "info", "--folder", tmp_path], capsys)
+    assert status == 0 and "version" in out and all(t in out for t in ("liquid", "material"))
@@ -0,0 +1,27 @@
+from cases import assert_close, pdo, run_case, thickness_for
+from engine.pricing import calculate_pipe_prices
+
+
+def test_get_compatible_materials(benchmark, case, case_golden):
+    materials = benchmark(pdo.get_compatible_materials, case["temperature"], case["pressure"])
+    assert materials == case_golden["compatible"]
+
+
+def test_schedule_selection(benchmark, case, case_golden):
+    results = benchmark(thickness_for, case, case_golden["compatible"], case_golden["dcrit"])
+    assert_close([{"Material": r["Material"],
+                   "t_required_mm": float(r["t_required_mm"]),
+                   "OD_norm_mm": float(r["OD_norm_mm"]),
+                   "t_norm_mm": float(r["t_norm_mm"]),
+                   "NPS": str(r["NPS"])} for r in results], case_golden["thickness"], "thickness")
+
+
+def test_pipe_prices(benchmark, case, case_golden):
+    thickness = case_golden["thickness"]
+    prices = benchmark(calculate_pipe_prices, thickness, pdo.material_df, pdo.fittings_df,
+                       case["fittings"], case["length"])
+    assert_close(prices, case_golden["prices"], "prices")
+
+
+def test_full_design_chain(benchmark, case, case_golden):
+    assert_close(benchmark(run_case, case), case_golden)
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from cases import CASES
+from engine.catalogues import fluid_properties, fluid_rheology, get_catalogues, material_roughness
+from engine.economics import annuity_factor, economic_diameter
+from engine.hydraulics import pressure_drop_sweep, resolve_fittings
+from engine.pricing import MARKUP, fittings_cost, pipe_mass
+
+CASE = CASES[0]
+CAT = get_catalogues()
+
+
+def test_matches_scalar_pricing():
+    eco = economic_diameter(CASE, catalogues=CAT, lifetime=10, discount_rate=0.05)
+    rho, mu = fluid_properties(CAT.liquid_df, CAT.gas_df, CASE["phase"], CASE["fluid"])
+    fittings = resolve_fittings(CAT.fittings_df, CASE["fittings"])
+    i = 0
+    mat = eco.materials[i]
+    price = float(CAT.material_df.set_index("Material").loc[mat, "Price"])
+    for j in np.flatnonzero(eco.feasible[i])[:5]:
+        od, t = eco.schedule.loc[j, ["Outside diameter (mm)", "Wall thickness (mm)"]]
+        dp = pressure_drop_sweep(CASE["flowrate"], CASE["length"], rho, mu, CASE["velocity"],
+                                 material_roughness(CAT.material_df, mat), fittings,
+                                 np.array([(od - 2 * t) / 1000]))[0]
+        capital = (pipe_mass(od, t, CASE["length"]) * price
+                   + fittings_cost(CAT.fittings_df, CASE["fittings"])) * MARKUP
+        energy = dp * CASE["flowrate"] / 3600 / 0.75 * 8000 / 1000 * 0.12 * annuity_factor(10, 0.05)
+        assert eco.dp[i, j] == pytest.approx(dp, rel=1e-12)
+        assert eco.total[i, j] == pytest.approx(capital + energy, rel=1e-12)
+
+
+def test_non_newtonian_pressure_drop():
+    case = dict(CASE, fluid="Polymer Solution (CMC 1%)")
+    eco = economic_diameter(case, catalogues=CAT)
+    rho, mu = fluid_properties(CAT.liquid_df, CAT.gas_df, case["phase"], case["fluid"])
+    mat = eco.materials[0]
+    inner = (eco.schedule["Outside diameter (mm)"] - 2 * eco.schedule["Wall thickness (mm)"]).to_numpy()
+    j = np.flatnonzero(eco.feasible[0])[:5]
+    dp = pressure_drop_sweep(case["flowrate"], case["length"], rho, mu, case["velocity"],
+                             material_roughness(CAT.material_df, mat),
+                             resolve_fittings(CAT.fittings_df, case["fittings"]), inner[j] / 1000,
+                             rheology=fluid_rheology(CAT.liquid_df, case["fluid"]))
+    np.testing.assert_allclose(eco.dp[0, j], dp, rtol=1e-12)
+
+
+def test_dearer_energy_buys_a_bigger_pipe():
+    cheap = economic_diameter(CASE, catalogues=CAT, tariff=0.01).summary()["recommended"]
+    dear = economic_diameter(CASE, catalogues=CAT, tariff=1.0).summary()["recommended"]
+    assert dear["ID_mm"] > cheap["ID_mm"]
+    eco = economic_diameter(dict(CASE, economics={"tariff": 1.0}), catalogues=CAT)
+    assert eco.summary()["recommended"] == dear
+    curve = eco.curve(eco.materials[0])
+    assert curve["OD_norm_mm"].is_monotonic_increasing and curve["OD_norm_mm"].is_unique
+
+
+def test_bad_parameters():
+    with pytest.raises(ValueError, match="efficiency"):
+        economic_diameter(CASE, catalogues=CAT, efficiency=0)
+    with pytest.raises(ValueError, match="Unknown economic"):
+        economic_diameter(dict(CASE, economics={"interest": 0.1}), catalogues=CAT)
+
+
+def test_economic_diameter(benchmark):
+    eco = benchmark(economic_diameter, CASE, catalogues=CAT)
+    assert eco.recommended is not None
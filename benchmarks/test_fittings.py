@@ -0,0 +1,43 @@
+import pytest
+
+from cases import pdo
+from engine.fittings import FittingList, parse_fitting_table, read_fitting_csv
+from engine.hydraulics import resolve_fittings
+
+TYPES = pdo.fittings_df["Fitting Type"].tolist()
+
+
+def test_model_edits():
+    rows = FittingList([(TYPES[0], 2), ("", 0)])
+    rows.append(TYPES[1], "3")
+    rows.set(0, count="4.0")
+    with pytest.raises(ValueError):
+        rows.set(0, count="1.5")
+    with pytest.raises(ValueError):
+        rows.append(TYPES[2], -1)
+    assert rows[0] == (TYPES[0], 4) and rows.total == 7
+    rows.remove([1, 1])
+    assert rows.entries() == [(TYPES[0].strip(), 4), (TYPES[1].strip(), 3)]
+
+
+def test_excel_paste_with_header():
+    text = "Type\tCount\n" + f" {TYPES[0].strip().upper()} \t2\n{TYPES[1]}\t\nTeleporter\t1\n"
+    rows, unknown = parse_fitting_table(text, TYPES)
+    assert rows == [(TYPES[0], 2), (TYPES[1], 1)] and unknown == ["Teleporter"]
+    resolve_fittings(pdo.fittings_df, FittingList(rows).entries())    # catalogue spelling
+    with pytest.raises(ValueError, match="Line 2"):
+        parse_fitting_table(f"{TYPES[0]};2\n{TYPES[1]};many")
+
+
+def test_csv_import(tmp_path):
+    path = tmp_path / "fittings.csv"
+    path.write_text("﻿type,count\n" + "".join(f'"{t}",{i}\n' for i, t in enumerate(TYPES)),
+                    encoding="utf-8")
+    rows, unknown = read_fitting_csv(path, TYPES)
+    assert rows == [(t, i) for i, t in enumerate(TYPES)] and not unknown
+
+
+def test_parse_300_rows(benchmark):
+    text = "\n".join(f"{TYPES[i % len(TYPES)]}\t{i % 7 + 1}" for i in range(300))
+    rows, unknown = benchmark(parse_fitting_table, text, TYPES)
+    assert len(rows) == 300 and not unknown
@@ -0,0 +1,39 @@
+import numpy as np
+
+from cases import COLEBROOK_POINTS, assert_close, case_inputs, pdo, sweep_materials
+from engine.hydraulics import colebrook, detailed_calculation
+
+
+def test_pressure_drop_sweep(benchmark, case, case_golden):
+    """ΔP sweep + critical diameter over every compatible material."""
+    rho, mu, fittings = case_inputs(case)
+    materials = case_golden["compatible"]
+    benchmark.extra_info["materials"] = len(materials)
+    dcrit = benchmark(sweep_materials, case, materials, rho, mu, fittings)
+    assert_close(dcrit, case_golden["dcrit"], "dcrit")
+
+
+def test_detailed_calculation(benchmark, case, case_golden):
+    rho, mu, fittings = case_inputs(case)
+
+    def run():
+        return {mat: detailed_calculation(d, case["flowrate"], case["length"], rho, mu,
+                                          pdo.material_roughness(mat), fittings)
+                for mat, d in case_golden["dcrit"].items() if d}
+
+    details = benchmark(run)
+    assert_close({m: {k: float(v) for k, v in c.items() if k != "details"}
+                  for m, c in details.items()}, case_golden["details"], "details")
+
+
+def test_colebrook_large_array(benchmark, golden):
+    rng = np.random.default_rng(2024)
+    n = 1_000_000
+    Re = 10 ** rng.uniform(3.4, 8, n)
+    D = rng.uniform(0.008, 2.05, n)
+    f = benchmark(colebrook, Re, D, 4.5e-5)
+    assert f.shape == (n,) and np.all(np.isfinite(f))
+
+    Re_g, D_g, k_g, f_g = (np.array(col) for col in zip(*golden["colebrook"]))
+    assert_close(list(colebrook(Re_g, D_g, k_g)), list(f_g), "colebrook")
+    assert len(golden["colebrook"]) == len(COLEBROOK_POINTS)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from engine import kernels
+from engine.hydraulics import diameter_grid, pack_fittings, pressure_drop, pressure_drop_matrix
+
+ROWS = 40
+RNG = np.random.default_rng(7)
+D = diameter_grid()[None, ::10]
+Q = RNG.uniform(1, 800, (ROWS, 1))
+MU = RNG.choice([1e-3, 0.5, 5.0], (ROWS, 1))              # turbulent to laminar
+K = RNG.uniform(1e-6, 1e-4, (ROWS, 1))
+FITTINGS = [("elbow", 4, 800.0, 0.25, 4.0), ("valve", 2, 300.0, 0.1, 3.9)]
+
+
+def _numpy(*args):
+    backend = kernels._backend
+    kernels._backend = "numpy"
+    try:
+        return pressure_drop(*args)
+    finally:
+        kernels._backend = backend
+
+
+@pytest.mark.parametrize("fittings", [None, pack_fittings([FITTINGS]),
+                                      pack_fittings([FITTINGS[:i % 3] for i in range(ROWS)])])
+def test_kernel_matches_numpy(fittings):
+    args = (D, Q, 5000.0, 850.0, MU, 3.0, K, fittings)
+    ref = _numpy(*args)
+    out = kernels.fused_pressure_drop(*args, kernel=kernels._rows)    # same code, plain Python
+    np.testing.assert_array_equal(np.isnan(out), np.isnan(ref))
+    np.testing.assert_allclose(out, ref, rtol=1e-12)
+
+
+def test_no_flow():
+    Q0 = np.vstack([np.zeros((1, 1)), Q[1:]])
+    args = (D, Q0, 5000.0, 850.0, MU, 3.0, K, pack_fittings([FITTINGS]))
+    out = kernels.fused_pressure_drop(*args, kernel=kernels._rows)
+    np.testing.assert_array_equal(out[0], 0.0)
+    np.testing.assert_allclose(out, _numpy(*args), rtol=1e-12)
+
+
+def test_fallback_without_numba(monkeypatch):
+    if kernels.available():
+        pytest.skip("Numba is installed")
+    monkeypatch.setattr(kernels, "_backend", None)
+    assert kernels.backend() == "numpy"
+    with pytest.raises(ImportError, match="pip install numba"):
+        kernels.use("numba")
+    assert kernels.backend() == "numpy"
+
+
+def test_numba_matches_numpy(monkeypatch):
+    pytest.importorskip("numba")
+    args = (D, Q, 5000.0, 850.0, MU, 3.0, K, pack_fittings([FITTINGS]))
+    ref = _numpy(*args)
+    monkeypatch.setattr(kernels, "_backend", None)
+    kernels.use("numba")
+    np.testing.assert_allclose(pressure_drop(*args), ref, rtol=1e-12)
+
+
+@pytest.mark.parametrize("backend", ["numpy", "numba"])
+def test_pressure_drop_matrix(benchmark, monkeypatch, backend):
+    if backend == "numba":
+        pytest.importorskip("numba")
+    monkeypatch.setattr(kernels, "_backend", None)
+    kernels.use(backend)
+    q = np.linspace(5, 800, 2000)
+    fittings = pack_fittings([FITTINGS])
+    pressure_drop_matrix(q[:2], 5000.0, 850.0, 1e-3, 3.0, 4.5e-5, fittings)    # compile
+    out = benchmark(pressure_drop_matrix, q, 5000.0, 850.0, 1e-3, 3.0, 4.5e-5, fittings)
+    assert out.shape == (2000, 1000)
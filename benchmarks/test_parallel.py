@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from cases import pdo
+from engine.catalogues import material_roughness
+from engine.hydraulics import (
+    critical_diameter, detailed_calculation, diameter_grid, material_hydraulics,
+    pressure_drop_sweep, resolve_fittings,
+)
+
+ARGS = dict(Q=250.0, L=5000.0, rho=850.0, mu=0.01, vmax=3.0, dp_max=5e5)
+FITTINGS = resolve_fittings(pdo.fittings_df, [(t, 2) for t in pdo.fittings_df["Fitting Type"][:4]])
+ROUGHNESS = [material_roughness(pdo.material_df, m) for m in pdo.material_df["Material"]] * 2
+
+
+@pytest.mark.parametrize("workers", [1, 3, 64])
+def test_same_result_for_any_worker_count(workers):
+    d = diameter_grid()
+    out = material_hydraulics(ROUGHNESS, ARGS["Q"], ARGS["L"], ARGS["rho"], ARGS["mu"],
+                              ARGS["vmax"], FITTINGS, ARGS["dp_max"], d, max_workers=workers)
+    assert len(out) == len(ROUGHNESS)
+    for k, (td, dcrit, calc) in zip(ROUGHNESS, out):
+        ref = pressure_drop_sweep(ARGS["Q"], ARGS["L"], ARGS["rho"], ARGS["mu"], ARGS["vmax"],
+                                  k, FITTINGS, d)
+        np.testing.assert_allclose(td, ref, rtol=1e-12)
+        assert dcrit == critical_diameter(d, ref, ARGS["dp_max"])
+        if dcrit:
+            assert calc["dp_linear"] == pytest.approx(detailed_calculation(
+                dcrit, ARGS["Q"], ARGS["L"], ARGS["rho"], ARGS["mu"], k, FITTINGS)["dp_linear"])
+
+
+def test_material_hydraulics(benchmark):
+    out = benchmark(material_hydraulics, ROUGHNESS, ARGS["Q"], ARGS["L"], ARGS["rho"], ARGS["mu"],
+                    ARGS["vmax"], FITTINGS, ARGS["dp_max"])
+    assert any(dcrit for _, dcrit, _ in out)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from cases import CASES
+from engine.catalogues import get_catalogues
+from engine.economics import economic_diameter
+from engine.pareto import OBJECTIVES, non_dominated, pareto_designs
+
+CAT = get_catalogues()
+
+
+def _brute_force(F):
+    le = np.all(F[:, None] <= F[None], axis=2)
+    lt = np.any(F[:, None] < F[None], axis=2)
+    return np.flatnonzero(~(le & lt).any(axis=0))
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 5])
+def test_non_dominated_matches_brute_force(k):
+    rng = np.random.default_rng(k)
+    F = np.round(rng.random((1500, k)), 2)          # ties and duplicate rows
+    F[::50] = F[1::50]
+    np.testing.assert_array_equal(non_dominated(F, block=64), _brute_force(F))
+    assert len(non_dominated(np.zeros((0, k)))) == 0
+
+
+def test_front_of_a_case():
+    pareto = pareto_designs(CASES[2], CAT)
+    F = np.column_stack([pareto.values[o][pareto.feasible] * s for o, s in OBJECTIVES.items()])
+    front = pareto.pareto[pareto.feasible]
+    np.testing.assert_array_equal(np.flatnonzero(front), _brute_force(F))
+    assert not (pareto.pareto & ~pareto.feasible).any()
+    # same feasibility and installed cost as the economic design
+    eco = economic_diameter(CASES[2], CAT)
+    np.testing.assert_array_equal(pareto.feasible, eco.feasible)
+    np.testing.assert_allclose(pareto.values["cost"][eco.feasible], eco.capital[eco.feasible], rtol=1e-12)
+    table = pareto.table()
+    assert len(table) == len(pareto) and table["cost"].is_monotonic_increasing
+    assert pareto.best("cost")["cost"] == pareto.values["cost"][pareto.feasible].min()
+
+
+def test_objective_subset():
+    pareto = pareto_designs(CASES[0], CAT, objectives=["cost"])
+    cheapest = pareto.values["cost"][pareto.feasible].min()
+    assert (pareto.table()["cost"] == cheapest).all()
+    summary = pareto.summary()
+    assert summary["objectives"] == ["cost"] and summary["front"][0]["cost"] == cheapest
+    with pytest.raises(ValueError, match="Unknown objective"):
+        pareto_designs(CASES[0], CAT, objectives=["beauty"])
+
+
+def test_pareto_designs(benchmark):
+    pareto = benchmark(pareto_designs, CASES[1], CAT)
+    assert pareto.feasible.sum() > 10000 and 0 < len(pareto) < pareto.feasible.sum()
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from cases import CASES
+from engine.design import run_design
+from engine.project import load_project, save_project
+
+
+@pytest.fixture(scope="module")
+def project_file(tmp_path_factory):
+    designs = [run_design(case, keep_sweeps=True) for case in CASES]
+    path = tmp_path_factory.mktemp("project") / "line.pdo"
+    save_project(path, designs * 100, "line")                      # 500 segments
+    return path, designs
+
+
+def test_round_trip(project_file):
+    path, designs = project_file
+    project = load_project(path)
+    assert len(project) == 500
+    for i, design in enumerate(designs):
+        saved = project.design(i)
+        for key in ("compatible_materials", "materials", "thickness", "prices", "recommended"):
+            assert saved[key] == run_design(design["case"])[key]
+        for mat, td in design["sweeps"].items():
+            np.testing.assert_allclose(saved["sweeps"][mat], td, rtol=1e-6)
+
+
+def test_open_500_segments(benchmark, project_file):
+    path, _ = project_file
+    project = benchmark(load_project, path)
+    assert isinstance(project.curves, np.memmap)
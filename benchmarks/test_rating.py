@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from cases import CASES
+from engine.catalogues import get_catalogues
+from engine.design import run_design
+from engine.hydraulics import pack_fittings, pressure_drop
+from engine.rating import max_flowrate, rate_schedule
+
+CAT = get_catalogues()
+D = np.geomspace(0.01, 1.5, 200)
+K = 4.5e-5
+FITTINGS = pack_fittings([[("elbow", 4, 800.0, 0.25, 4.0)]])
+
+
+def test_max_flowrate_hits_the_limit():
+    Q, limit = max_flowrate(D, 100, 850, 0.01, 3.0, K, 5e5, FITTINGS)
+    dp = pressure_drop(D, Q, 100, 850, 0.01, np.inf, K, FITTINGS)[0]
+    V = Q / 3600 / (np.pi * D ** 2 / 4)
+    assert np.all((dp <= 5e5 * (1 + 1e-9)) & (V <= 3.0 * (1 + 1e-12)))
+    # either limit is active, or the flow sits at the laminar/turbulent jump
+    above = pressure_drop(D, Q * (1 + 1e-9), 100, 850, 0.01, np.inf, K, FITTINGS)[0]
+    assert np.all(np.where(limit == 0, np.isclose(V, 3.0, rtol=1e-12), above > 5e5))
+    assert set(limit) == {0, 1}
+
+
+def test_velocity_and_yield_limits():
+    Q, limit = max_flowrate(D, 10, 850, 0.01, 3.0, K, 1e9)
+    np.testing.assert_allclose(Q, 3600 * 3.0 * np.pi * D ** 2 / 4, rtol=1e-12)
+    assert np.all(limit == 0)
+    # a Bingham plastic needs 4·τ0·L/D before it moves at all
+    Q, _ = max_flowrate(D, 5000, 1200, np.nan, 3.0, K, 5e5, rheology=(1.0, 0.02, 8.0))
+    assert np.all((Q == 0) == (4 * 8.0 * 5000 / D > 5e5))
+
+
+def test_rating_agrees_with_design():
+    case = CASES[0]
+    rating = rate_schedule(case, CAT)
+    result = run_design(case, CAT)
+    table = rating.table()
+    for mat in rating.materials[:5]:
+        dcrit = result["materials"][mat]["dcrit"] * 1000
+        rows = table[table["Material"] == mat]
+        assert rows[rows["ID_mm"] >= dcrit]["carries"].all()
+        assert not rows[rows["ID_mm"] < dcrit - 3]["carries"].any()     # grid step ≈ 2 mm
+        best = rating.smallest(mat)
+        assert best["Q_max_m3h"] >= case["flowrate"] and best["ID_mm"] >= dcrit - 3
+    with pytest.raises(KeyError):
+        rating.smallest("unobtainium")
+
+
+def test_rate_without_flowrate():
+    case = {k: v for k, v in CASES[0].items() if k != "flowrate"}
+    rating = rate_schedule(case, CAT, materials=["ASTM A790"])
+    assert "carries" not in rating.table() and rating.summary()["flowrate"] is None
+
+
+def test_rate_schedule(benchmark):
+    rating = benchmark(rate_schedule, CASES[0], CAT)
+    assert np.isfinite(rating.Q_max).all()
@@ -0,0 +1,17 @@
+import shutil
+
+from cases import ROOT, pdo
+from engine.design import report_arguments, run_design
+
+
+def test_pdf_report(benchmark, case, tmp_path):
+    img_folder = tmp_path / "report_imgs"
+    img_folder.mkdir()
+    for name in ("velocity_vs_diameter.png", "pressure_drop_vs_diameter.png"):
+        shutil.copy(ROOT / "report_imgs" / name, img_folder / name)
+    pdf = tmp_path / "report.pdf"
+    kwargs = dict(report_arguments(run_design(case)), file_path=pdf, img_folder=img_folder)
+
+    benchmark.pedantic(pdo.build_pipeline_report, kwargs=kwargs, rounds=3, iterations=1)
+    assert pdf.read_bytes().startswith(b"%PDF")
+    assert pdf.stat().st_size > 10_000
@@ -0,0 +1,47 @@
+import numpy as np
+
+from cases import CASES, run_design
+from engine.project import load_project, save_project
+from engine.results import MaterialResults
+
+
+def _designs():
+    return [run_design(case) for case in CASES]
+
+
+def test_round_trip_to_dicts():
+    designs = _designs()
+    table = MaterialResults.from_designs(designs)
+    assert len(table) == sum(len(d["compatible_materials"]) for d in designs)
+    for i, design in enumerate(designs):
+        part = table.case(i)
+        assert part.recommended == design["recommended"]
+        assert part.prices() == design["prices"]
+        for ours, theirs in zip(part.thickness_results(), design["thickness"]):
+            assert ours == {k: str(v) if k in ("NPS", "API") else v for k, v in theirs.items()}
+
+
+def test_views_share_memory():
+    table = MaterialResults.from_designs(_designs())
+    assert np.shares_memory(table["total_cost"], table.records)
+    assert np.shares_memory(table.view("material", "OD_norm_mm", "t_norm_mm"), table.records)
+    assert np.shares_memory(table.case(2).records, table.records)
+    frame = table.to_frame()
+    assert len(frame) == len(table) and "total_cost" in frame
+
+
+def test_fitting_coefficients():
+    design = run_design(CASES[0])
+    table = MaterialResults.from_design(design)
+    rec = design["recommended"]
+    details = design["materials"][rec]["calculation"]["details"]
+    assert table.fittings == [(typ, n) for typ, n, _ in details]
+    np.testing.assert_array_equal(table.fitting_k[table.index(rec)], [K for *_, K in details])
+
+
+def test_project_results(tmp_path):
+    designs = _designs()
+    save_project(tmp_path / "net.pdo", designs)
+    table = load_project(tmp_path / "net.pdo").results()
+    assert [table.case(i).recommended for i in range(len(designs))] == \
+        [d["recommended"] for d in designs]
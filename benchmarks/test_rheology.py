@@ -0,0 +1,79 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cases import CASES, run_design
+from engine.catalogues import fluid_rheology, get_catalogues
+from engine.hydraulics import diameter_grid, pack_fittings, pressure_drop_matrix
+from engine.rheology import (
+    buckingham_reiner, darby_melson, dodge_metzner, pack_rheology, parse_rheology,
+)
+from engine.stream import design_chunk
+
+K = np.linspace(1e-5, 1e-4, 20)
+FITTINGS = pack_fittings([[("elbow", 4, 800.0, 0.25, 4.0)]])
+MUD, POLYMER = "Drilling Mud (water-based)", "Polymer Solution (CMC 1%)"
+
+
+def test_newtonian_triple_is_unchanged():
+    ref = pressure_drop_matrix(250, 5000, 850, 0.01, 3.0, K, FITTINGS)
+    out = pressure_drop_matrix(250, 5000, 850, 0.01, 3.0, K, FITTINGS, rheology=(1.0, 0.01, 0.0))
+    np.testing.assert_array_equal(out, ref)
+
+
+def test_laminar_power_law_is_analytic():
+    n, Kc, D, V = 0.6, 0.8, np.array([0.1, 0.2]), 0.5
+    Q = 3600 * V * np.pi * D ** 2 / 4
+    dp = [pressure_drop_matrix(q, 100, 1000, np.nan, np.inf, 0, diameters=[d], rheology=(n, Kc, 0))[0, 0]
+          for q, d in zip(Q, D)]
+    wall_stress = Kc * ((3 * n + 1) / (4 * n) * 8 * V / D) ** n
+    np.testing.assert_allclose(dp, 4 * wall_stress * 100 / D, rtol=1e-12)
+
+
+def test_turbulent_correlations_solve_their_equations():
+    Re, n = np.logspace(3.5, 7, 30), np.linspace(0.3, 1, 30)
+    x = 1 / np.sqrt(dodge_metzner(Re, n) / 4)
+    np.testing.assert_allclose(x, 4 / n ** 0.75 * np.log10(Re * x ** (n - 2)) - 0.4 / n ** 1.2,
+                               rtol=1e-12)
+    He = np.logspace(2, 8, 30)
+    f = buckingham_reiner(Re, He) / 4
+    np.testing.assert_allclose(f, 16 / Re * (1 + He / (6 * Re) - He ** 4 / (3 * f ** 3 * Re ** 7)),
+                               rtol=1e-9)
+    np.testing.assert_allclose(darby_melson(np.array([10.0, 100.0]), 0.0), 64 / np.array([10, 100]),
+                               rtol=1e-9)
+
+
+def test_catalogue_rheology():
+    cat = get_catalogues()
+    assert fluid_rheology(cat.liquid_df, MUD) == (1.0, 0.02, 8.0)
+    assert fluid_rheology(cat.liquid_df, POLYMER) == (0.6, 0.8, 0.0)
+    assert fluid_rheology(cat.liquid_df, "Crude Oil") is None
+    assert parse_rheology(np.nan) is None and parse_rheology("Newtonian", 0.5) is None
+    with pytest.raises(ValueError, match="flow index"):
+        parse_rheology("Power-law", None, 0.8)
+    with pytest.raises(ValueError, match="Unknown rheology"):
+        parse_rheology("Casson", 1, 1, 1)
+
+
+def test_batch_matches_run_design():
+    cases = [dict(CASES[0], name=f, fluid=f) for f in (MUD, POLYMER, CASES[0]["fluid"])]
+    frame = design_chunk(pd.DataFrame([dict(c, fittings=json.dumps(c["fittings"])) for c in cases])
+                         .to_dict("records"))
+    for case, row in zip(cases, frame.itertuples()):
+        result = run_design(case)
+        thick = next(t for t in result["thickness"] if t["Material"] == result["recommended"])
+        assert row.recommended == result["recommended"] and row.dcrit_m == thick["dcrit (m)"]
+    assert "rheology" in run_design(cases[0])["fluid"]
+
+
+@pytest.mark.parametrize("model", ["Newtonian", "Power-law", "Bingham", "mixed"])
+def test_pressure_drop_matrix(benchmark, model):
+    triples = {"Newtonian": None, "Power-law": (0.6, 0.8, 0.0), "Bingham": (1.0, 0.02, 8.0)}
+    if model == "mixed":
+        rheology = pack_rheology([list(triples.values())[i % 3] for i in range(len(K))], 0.01)
+    else:
+        rheology = triples[model]
+    out = benchmark(pressure_drop_matrix, 250, 5000, 1200, 0.01, 3.0, K, FITTINGS, None, rheology)
+    assert out.shape == (len(K), len(diameter_grid()))
@@ -0,0 +1,38 @@
+import asyncio
+import json
+
+import pytest
+
+from cases import CASES, assert_close
+from engine.service import CalculationService
+
+
+@pytest.fixture(scope="module")
+def service():
+    svc = CalculationService(workers=0)
+    yield svc
+    svc.close()
+
+
+def _concurrent(service, path, bodies):
+    async def go():
+        return await asyncio.gather(*(service.dispatch("POST", path, json.dumps(b).encode())
+                                      for b in bodies))
+    return asyncio.run(go())
+
+
+def test_batched_critical_diameters(benchmark, service, golden):
+    bodies = CASES * 20
+    replies = benchmark(_concurrent, service, "/critical-diameter", bodies)
+    for body, (status, reply) in zip(bodies, replies):
+        assert status == 200
+        assert_close(reply["dcrit"], golden["cases"][body["name"]]["dcrit"], body["name"])
+
+
+def test_bad_request(service):
+    [(status, reply)] = _concurrent(service, "/critical-diameter", [{"flowrate": "x"}])
+    assert status == 400 and "flowrate" in reply["error"]
+    bodies = [dict(CASES[0], velocity=-1), dict(CASES[0], dp_max=0)]
+    for path in ("/critical-diameter", "/design"):
+        for (status, reply), key in zip(_concurrent(service, path, bodies), ("velocity", "dp_max")):
+            assert status == 400 and f"'{key}' must be positive" in reply["error"]
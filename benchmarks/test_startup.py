@@ -0,0 +1,32 @@
+import json
+import subprocess
+import sys
+
+from cases import ROOT
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import pipedesignoptimizer as app
+imported = time.perf_counter() - t0
+heavy = [m for m in ("pandas", "matplotlib", "reportlab") if m in sys.modules]
+cat = app.startup.load_catalogues().result()
+print(json.dumps({"import": imported, "heavy": heavy, "materials": len(app.material_df)}))
+"""
+
+
+def _probe():
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, capture_output=True, text=True,
+                         check=True, env={"MPLBACKEND": "Agg", "PATH": ""})
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_gui_import_is_light():
+    probe = _probe()
+    assert probe["heavy"] == []                 # loaded by the loader thread or on first use
+    assert probe["materials"] > 0               # frames published once the future is done
+
+
+def test_gui_import_time(benchmark):
+    probe = benchmark.pedantic(_probe, rounds=1, iterations=1)
+    assert probe["import"] < 1.0
@@ -0,0 +1,59 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cases import CASES, run_design
+from engine.stream import design_chunk, parse_fittings, stream_batch
+
+
+def _table(cases):
+    return pd.DataFrame([dict(c, fittings=json.dumps(c["fittings"])) for c in cases])
+
+
+def test_chunk_matches_run_design():
+    frame = design_chunk(_table(CASES).to_dict("records"))
+    for case, row in zip(CASES, frame.itertuples()):
+        result = run_design(case)
+        rec = result["recommended"]
+        assert row.name == case["name"] and row.materials == len(result["compatible_materials"])
+        if rec is None:
+            assert row.recommended is None
+            continue
+        thick = next(t for t in result["thickness"] if t["Material"] == rec)
+        assert row.recommended == rec
+        assert (row.dcrit_m, row.OD_norm_mm, row.t_norm_mm) == \
+            (thick["dcrit (m)"], thick["OD_norm_mm"], thick["t_norm_mm"])
+        assert row.total_cost == pytest.approx(result["prices"][rec]["total_cost"], rel=1e-12)
+
+
+def test_parse_fittings():
+    assert parse_fittings("gate valve:2; coude  90◦:4") == [["gate valve", "2"], ["coude  90◦", "4"]]
+    assert parse_fittings('[["gate valve", 2]]') == [["gate valve", 2]]
+    assert parse_fittings(np.nan) == []
+
+
+def test_resume_after_interruption(tmp_path):
+    source, output = tmp_path / "cases.csv", str(tmp_path / "out.csv")
+    cases = [dict(c, name=f"{c['name']}-{i}") for i in range(8) for c in CASES]
+    _table(cases).to_csv(source, index=False)
+    stream_batch(str(source), output, chunksize=7)
+    expected = open(output, "rb").read()
+
+    def crash(rows):
+        if rows >= 21:
+            raise KeyboardInterrupt
+    with pytest.raises(KeyboardInterrupt):
+        stream_batch(str(source), output, chunksize=7, progress=crash)
+    summary = stream_batch(str(source), output, chunksize=7, resume=True)
+    assert summary["resumed_from"] == 21 and summary["rows"] == len(cases)
+    assert open(output, "rb").read() == expected
+
+
+def test_design_chunk_10k(benchmark):
+    rng = np.random.default_rng(0)
+    table = _table([dict(CASES[i % len(CASES)], flowrate=q) for i, q in
+                    enumerate(rng.uniform(0.25, 4, 10000) * CASES[0]["flowrate"])])
+    frame = benchmark.pedantic(design_chunk, args=(table.to_dict("records"),), rounds=1, iterations=1)
+    assert len(frame) == 10000
@@ -0,0 +1,38 @@
+import numpy as np
+
+from cases import CASES, assert_close, run_design
+from engine.sweep import DesignSpace, parametric_sweep
+
+
+def test_nominal_point_matches_golden(case, case_golden):
+    space = parametric_sweep(case)
+    assert space.shape == (1, 1, 1, len(case_golden["compatible"]))
+    dcrit = {m: space.sel(material=m).item() for m in case_golden["compatible"]}
+    assert_close({m: None if np.isnan(d) else d for m, d in dcrit.items()}, case_golden["dcrit"])
+
+
+def test_non_newtonian_matches_run_design():
+    case = dict(CASES[0], fluid="Polymer Solution (CMC 1%)")
+    design = {m: r["dcrit"] for m, r in run_design(case)["materials"].items()}
+    space = parametric_sweep(case, materials=list(design))
+    assert {m: space.sel(material=m).item() for m in design} == design
+
+
+def test_npz_round_trip(tmp_path):
+    space = parametric_sweep(CASES[0], flowrate="50:500:5", dp_max=[1, 5])
+    space.save(tmp_path / "space.npz")
+    loaded = DesignSpace.load(tmp_path / "space.npz")
+    np.testing.assert_array_equal(loaded.dcrit, space.dcrit)
+    assert list(loaded.coords["material"]) == list(space.coords["material"])
+
+
+def test_sweep_50x50x20_all_materials(benchmark):
+    case = CASES[0]
+    space = benchmark.pedantic(
+        parametric_sweep, args=(case,), rounds=1, iterations=1,
+        kwargs=dict(flowrate=np.linspace(0.25, 4, 50) * case["flowrate"],
+                    length=np.linspace(0.25, 4, 50) * case["length"],
+                    dp_max=np.linspace(0.25, 4, 20) * case["dp_max"]))
+    assert space.shape[:3] == (50, 50, 20)
+    # more flow → never a smaller pipe
+    assert (np.diff(space.dcrit, axis=0) >= 0).all()
@@ -0,0 +1,34 @@
+import numpy as np
+
+from cases import pdo
+from engine.thickness import (
+    F_MAP, material_strength, required_thickness, select_schedule, thickness_matrix,
+)
+
+MATERIALS = pdo.material_df["Material"].tolist()
+DCRIT = np.linspace(20, 900, len(MATERIALS))            # mm
+PRESSURES = np.array([10, 80, 150]) * 1e5                # Pa
+
+
+def test_matrix_matches_scalar_selection():
+    E, Sy = material_strength(pdo.material_df, MATERIALS)
+    sized = thickness_matrix(pdo.sched_df, DCRIT, E, Sy, PRESSURES, corrosion_allowance=3)
+    assert sized["row"].shape == (len(MATERIALS), len(PRESSURES), len(F_MAP))
+    for i in range(len(MATERIALS)):
+        for p, P in enumerate(PRESSURES):
+            for f, F in enumerate(F_MAP.values()):
+                t_req = required_thickness(P, DCRIT[i], F, E[i], Sy[i], 3) * 1000
+                assert sized["t_required_mm"][i, p, f] == t_req
+                best = select_schedule(pdo.sched_df, DCRIT[i] + 2 * t_req, t_req)
+                if best is None:
+                    assert sized["row"][i, p, f] == -1 and np.isnan(sized["t_norm_mm"][i, p, f])
+                else:
+                    assert sized["t_norm_mm"][i, p, f] == best["Wall thickness (mm)"]
+                    assert sized["OD_norm_mm"][i, p, f] == best["Outside diameter (mm)"]
+
+
+def test_thickness_matrix(benchmark):
+    E, Sy = material_strength(pdo.material_df, MATERIALS)
+    pressures = np.linspace(5, 200, 50) * 1e5
+    sized = benchmark(thickness_matrix, pdo.sched_df, DCRIT, E, Sy, pressures, None, 3)
+    assert sized["row"].shape == (len(MATERIALS), 50, 4)
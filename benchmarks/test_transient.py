@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from cases import CASES
+from engine.design import run_design
+from engine.thickness import allowable_pressure, required_thickness
+from engine.transient import surge_design, valve_closure, wave_speed
+
+# water, 10 km of 0.5 m bore at 1 m/s, 20 bar upstream
+RHO, MU, K = 998.0, 1e-3, 4.5e-5
+D, E_WALL, L = 0.5, 0.0127, 10_000.0
+Q = 3600 * np.pi * D ** 2 / 4
+P_IN = 20e5
+
+
+def test_instant_closure_adds_joukowsky():
+    run = valve_closure(Q, L, D, E_WALL, RHO, MU, K, P_IN, closure_time=0, reaches=200)
+    assert run["wave_speed"] == pytest.approx(float(wave_speed(D, E_WALL, RHO)))
+    # with line packing the head behind the valve climbs to reservoir + Joukowsky
+    assert run["p_max"] == pytest.approx(P_IN + run["joukowsky"], rel=0.02)
+    assert run["p_valve"][0] < P_IN and run["x_max"] == L
+
+
+def test_slow_closure_is_milder():
+    rapid = valve_closure(Q, L, D, E_WALL, RHO, MU, K, P_IN, closure_time=5, reaches=200)
+    slow = valve_closure(Q, L, D, E_WALL, RHO, MU, K, P_IN, closure_time=10 * rapid["period"],
+                         reaches=200)
+    assert rapid["period"] > 5                     # closes inside one round trip
+    assert slow["p_max"] < P_IN + 0.3 * rapid["joukowsky"] < rapid["p_max"]
+
+
+def test_allowable_pressure_inverts_required_thickness():
+    P, d = np.array([5e5, 60e5, 150e5]), np.array([100.0, 350.0, 800.0])
+    t = required_thickness(P, d, 0.6, 0.85, 359e6, 3) * 1000
+    np.testing.assert_allclose(allowable_pressure(t, d, 0.6, 0.85, 359e6, 3), P, rtol=1e-12)
+
+
+def test_surge_design():
+    result = run_design(CASES[0])
+    surge = surge_design(result, closure_time=2, reaches=100)
+    (mat, s), = surge.items()
+    assert mat == result["recommended"]
+    assert s["ok"] == (s["p_max_bar"] <= s["allowable_bar"])
+    with pytest.raises(ValueError, match="No schedule pipe"):
+        surge_design(result, ["unobtainium"])
+
+
+def test_design_pressure_governs_a_wider_bore():
+    # the wall was sized for 80 bar on dcrit; on the standard pipe's bore it rates lower
+    result = run_design(dict(CASES[0], design_pressure=80))
+    s, = surge_design(result, closure_time=10, reaches=100).values()
+    assert s["allowable_wall_bar"] < s["p_max_bar"] < 80
+    assert s["ok"] and s["governs"] == "design pressure" and s["allowable_bar"] == pytest.approx(80)
+
+
+def test_valve_closure(benchmark):
+    run = benchmark(valve_closure, Q, L, D, E_WALL, RHO, MU, K, P_IN, 5.0, 2000)
+    assert run["p_max"] > P_IN
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from cases import CASES
+from engine.design import normalize_case, run_design
+from engine.hydraulics import diameter_grid, pack_fittings, pressure_drop_matrix
+from engine.twophase import (
+    BB_PATTERNS, CORRELATIONS, TwoPhaseFlow, beggs_brill_holdup, lockhart_martinelli,
+)
+
+LIQUID = (850.0, 0.01)           # kg/m³, Pa·s
+GAS = (0.8, 1.1e-5)
+K = np.linspace(1e-5, 1e-4, 20)
+FITTINGS = pack_fittings([[("elbow", 4, 800.0, 0.25, 4.0)]])
+CASE = dict(CASES[0], phase="Two-phase", gas="Natural Gas (avg.)", gas_fraction=0.3)
+
+
+@pytest.mark.parametrize("correlation", CORRELATIONS)
+def test_single_phase_limits(correlation):
+    for fraction, (rho, mu) in ((0.0, LIQUID), (1.0, GAS)):
+        flow = TwoPhaseFlow(*LIQUID, *GAS, fraction, correlation)
+        ref = pressure_drop_matrix(250, 5000, rho, mu, 3.0, K, FITTINGS)
+        out = flow.pressure_drop_matrix(250, 5000, 3.0, K, FITTINGS)
+        np.testing.assert_array_equal(np.isnan(out), np.isnan(ref))
+        np.testing.assert_allclose(out, ref, rtol=1e-12)
+
+
+def test_chisholm_combination():
+    D, V_sl, V_sg = 0.2, 1.0, 5.0
+    dp_l = pressure_drop_matrix(3600 * V_sl * np.pi * D ** 2 / 4, 1, *LIQUID, np.inf, 4.5e-5,
+                                diameters=[D])[0, 0]
+    dp_g = pressure_drop_matrix(3600 * V_sg * np.pi * D ** 2 / 4, 1, *GAS, np.inf, 4.5e-5,
+                                diameters=[D])[0, 0]
+    out = lockhart_martinelli(D, V_sl, V_sg, *LIQUID, *GAS, 4.5e-5)
+    assert out == pytest.approx(dp_l + 20 * np.sqrt(dp_l * dp_g) + dp_g, rel=1e-12)
+
+
+def test_beggs_brill_holdup():
+    D = diameter_grid()
+    V = 250 / 3600 / (np.pi * D ** 2 / 4)
+    for lam in (0.05, 0.3, 0.7):
+        H, pattern = beggs_brill_holdup(D, lam * V, (1 - lam) * V)
+        assert np.all((H >= lam - 1e-12) & (H <= 1))
+        assert set(pattern) <= set(range(len(BB_PATTERNS)))
+    # slow, gas-rich flow in a big pipe stratifies; fast flow disperses
+    assert BB_PATTERNS[beggs_brill_holdup(1.0, 0.01, 0.5)[1]] == "segregated"
+    assert BB_PATTERNS[beggs_brill_holdup(0.05, 5.0, 10.0)[1]] == "distributed"
+
+
+def test_two_phase_design():
+    result = run_design(CASE)
+    assert result["fluid"]["two_phase"]["correlation"] == "homogeneous"
+    liquid, gas = run_design(dict(CASE, gas_fraction=0)), run_design(dict(CASE, gas_fraction=1))
+    mat = result["recommended"]
+    dcrit = [r["materials"][mat]["dcrit"] for r in (gas, result, liquid)]
+    assert dcrit == sorted(dcrit)
+    calc = run_design(dict(CASE, correlation="beggs-brill"))["materials"][mat]["calculation"]
+    assert calc["correlation"] == "beggs-brill" and 0.7 <= calc["holdup"] <= 1
+
+
+def test_bad_two_phase_cases():
+    with pytest.raises(ValueError, match="needs 'gas'"):
+        normalize_case(dict(CASE, gas=None))
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        normalize_case(dict(CASE, gas_fraction=1.5))
+    with pytest.raises(ValueError, match="correlation"):
+        normalize_case(dict(CASE, correlation="duns-ros"))
+    with pytest.raises(ValueError, match="Unknown gas"):
+        run_design(dict(CASE, gas="unobtainium"))
+
+
+@pytest.mark.parametrize("correlation", [None, *CORRELATIONS])
+def test_pressure_drop_matrix(benchmark, correlation):
+    if correlation is None:
+        out = benchmark(pressure_drop_matrix, 250, 5000, *LIQUID, 3.0, K, FITTINGS)
+    else:
+        flow = TwoPhaseFlow(*LIQUID, *GAS, 0.4, correlation)
+        out = benchmark(flow.pressure_drop_matrix, 250, 5000, 3.0, K, FITTINGS)
+    assert out.shape == (len(K), len(diameter_grid()))
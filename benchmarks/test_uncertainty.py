@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from cases import CASES, assert_close, case_inputs, pdo, run_design
+from engine.hydraulics import (
+    critical_diameter_search, critical_diameters, diameter_grid, pack_fittings,
+    pressure_drop_matrix,
+)
+from engine.uncertainty import PARAMETERS, monte_carlo, sensitivity
+
+FIXED = {"flowrate": ["fixed"], "viscosity": ["fixed"], "roughness": ["fixed"]}
+
+
+def test_search_matches_full_sweep(case):
+    rho, mu, fittings = case_inputs(case)
+    rng = np.random.default_rng(0)
+    Q = case["flowrate"] * rng.uniform(0.2, 5, 2000)
+    k = pdo.material_roughness(pdo.material_df["Material"].iloc[0]) * rng.uniform(0.1, 10, 2000)
+    packed = pack_fittings([fittings])
+    dp_max = case["dp_max"] * 1e5
+    full = critical_diameters(diameter_grid(), pressure_drop_matrix(
+        Q, case["length"], rho, mu, case["velocity"], k, packed), dp_max)
+    fast = critical_diameter_search(Q, case["length"], rho, mu, case["velocity"], k, dp_max, packed)
+    np.testing.assert_array_equal(fast, full)
+
+
+def test_fixed_inputs_reproduce_dcrit(case, case_golden):
+    result = monte_carlo(dict(case, uncertainty=FIXED), samples=100, seed=1)
+    for mat, dcrit in case_golden["dcrit"].items():
+        stats = result["materials"][mat]
+        assert_close([stats["P10"], stats["P50"], stats["P90"]], [dcrit] * 3, mat)
+
+
+def test_non_newtonian_matches_run_design():
+    case = dict(CASES[0], fluid="Polymer Solution (CMC 1%)", uncertainty=FIXED)
+    design = {m: r["dcrit"] for m, r in run_design(case)["materials"].items()}
+    result = monte_carlo(case, samples=50, seed=1, materials=list(design))
+    assert {m: s["P50"] for m, s in result["materials"].items()} == design
+
+
+def test_sensitivity_ranks_ties_by_average():
+    rng = np.random.default_rng(5)
+    factors = rng.normal(1, 0.1, (3, 2000))
+    dcrit = np.round(factors[0] * 4) / 4                 # heavy ties, like the diameter grid
+    dcrit[factors[0] > 1.15] = np.nan                    # infeasible: all tie at the top
+    ranked = pd.Series(np.where(np.isnan(dcrit), np.inf, dcrit)).rank()
+    expected = {p: np.corrcoef(pd.Series(x).rank(), ranked)[0, 1] for p, x in zip(PARAMETERS, factors)}
+    result = dict(sensitivity(factors, dcrit))
+    assert result.keys() == expected.keys()
+    np.testing.assert_allclose([result[p] for p in PARAMETERS], [expected[p] for p in PARAMETERS],
+                               rtol=1e-12)
+
+
+def test_monte_carlo_100k(benchmark):
+    result = benchmark.pedantic(monte_carlo, args=(CASES[0],), kwargs=dict(samples=100000, seed=7),
+                                rounds=1, iterations=1)
+    for stats in result["materials"].values():
+        assert stats["P10"] <= stats["P50"] <= stats["P90"]
+        assert stats["sensitivity"][0][0] == "flowrate"
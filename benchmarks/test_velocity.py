@@ -0,0 +1,107 @@
+import asyncio
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cases import CASES
+from engine.catalogues import fluid_properties, get_catalogues
+from engine.design import normalize_case, run_design
+from engine.service import CalculationService
+from engine.stream import design_chunk
+from engine.velocity import erosional_velocity, velocity_limit, velocity_limits
+
+CAT = get_catalogues()
+API = {"velocity_limit": "api-rp-14e", "c_factor": 100}
+CUSTOM = {"velocity_limit": "custom", "velocity_expression": "min(25, 150 / sqrt(rho)) * (mu / mu) ** 0"}
+
+
+def test_erosional_velocity_units():
+    # C = 100 in ft/s·(lb/ft³)^½ for water at 62.43 lb/ft³
+    ve_ft = 100 / np.sqrt(1000 / 16.018463)
+    assert erosional_velocity(1000.0) == pytest.approx(ve_ft * 0.3048, rel=1e-6)
+    case = normalize_case(dict(CASES[0], velocity_limit="API RP 14E", c_factor="intermittent"))
+    assert case["velocity_limit"] == "api-rp-14e" and case["c_factor"] == 125
+    assert velocity_limit(case, 1e-4, 0.0) == case["velocity"]            # capped by "velocity"
+
+
+def test_design_uses_the_model():
+    for base in (CASES[0], CASES[4]):
+        rho, mu = fluid_properties(CAT.liquid_df, CAT.gas_df, base["phase"], base["fluid"])
+        case = {k: v for k, v in base.items() if k != "velocity"}
+        for spec, vmax in ((API, float(erosional_velocity(rho))),
+                           (CUSTOM, min(25, 150 / np.sqrt(rho)))):
+            result = run_design(dict(case, **spec), CAT)
+            fixed = run_design(dict(base, velocity=vmax), CAT)
+            assert result["case"]["velocity"] == pytest.approx(vmax, rel=1e-12)
+            assert result["dcrit_velocity"] == pytest.approx(fixed["dcrit_velocity"], rel=1e-12)
+            assert result["recommended"] == fixed["recommended"]
+
+
+def test_bad_specs():
+    case = {k: v for k, v in CASES[0].items() if k != "velocity"}
+    with pytest.raises(ValueError, match="missing: velocity"):
+        normalize_case(case)
+    for spec in ({"velocity_limit": "custom", "velocity_expression": "__import__('os')"},
+                 {"velocity_limit": "custom", "velocity_expression": "rho.real"},
+                 {"velocity_limit": "custom"},
+                 {"velocity_limit": "api-rp-14e", "c_factor": -1},
+                 {"velocity_limit": "nozzle"}):
+        with pytest.raises(ValueError):
+            normalize_case(dict(case, **spec))
+    callable_case = normalize_case(dict(case, velocity_limit=lambda rho, mu: 2 + 0 * rho))
+    np.testing.assert_array_equal(velocity_limit(callable_case, np.ones(3), 1e-3), 2.0)
+
+
+def test_batch_mixes_models():
+    specs = [{}, API, CUSTOM]
+    cases = [dict(c, name=f"{c['name']}-{i}", **spec) for i, spec in enumerate(specs) for c in CASES]
+    table = pd.DataFrame([dict(c, fittings=json.dumps(c["fittings"])) for c in cases])
+    frame = design_chunk(table.to_dict("records"), CAT)
+    for case, row in zip(cases, frame.itertuples()):
+        result = run_design(case, CAT)
+        assert row.dcrit_velocity_m == pytest.approx(result["dcrit_velocity"], rel=1e-12)
+        assert row.recommended == result["recommended"]
+
+
+def test_expressions_stay_bounded():
+    custom = dict(CASES[0], velocity_limit="custom")
+    for text in ("9**9**9**9", "-1", "0", "sqrt(-rho)"):         # overflow, negative, zero, NaN
+        case = normalize_case(dict(custom, velocity_expression=text))
+        with pytest.raises(ValueError, match="finite and positive"):
+            velocity_limit(case, 850.0, 0.01)
+        with pytest.raises(ValueError, match="finite and positive"):
+            run_design(case, CAT)
+    with pytest.raises(ValueError, match="finite"):
+        normalize_case(dict(custom, velocity_expression="1e999 / rho"))
+    bad = dict(custom, name="bad", velocity_expression="-1")
+    frame = design_chunk([dict(c, fittings=json.dumps(c["fittings"])) for c in (CASES[0], bad)], CAT)
+    assert frame["error"].isna().tolist() == [True, False] and "finite" in frame["error"][1]
+    assert frame["recommended"][0] == run_design(CASES[0], CAT)["recommended"]
+
+
+def test_service_accepts_a_model():
+    service = CalculationService(workers=0)
+    try:
+        body = dict(CASES[4], **API)
+        del body["velocity"]
+        status, reply = asyncio.run(service.dispatch("POST", "/critical-diameter",
+                                                     json.dumps(body).encode()))
+        assert status == 200
+        result = run_design(body, CAT)
+        assert reply["dcrit_velocity"] == pytest.approx(result["dcrit_velocity"], rel=1e-12)
+        body.update(velocity_limit="custom", velocity_expression="9**9**9**9 + rho")
+        status, reply = asyncio.run(service.dispatch("POST", "/critical-diameter",
+                                                     json.dumps(body).encode()))
+        assert status == 400 and "finite and positive" in reply["error"]
+    finally:
+        service.close()
+
+
+def test_velocity_limits(benchmark):
+    cases = [normalize_case(dict(CASES[i % 5], **(API, CUSTOM, {})[i % 3])) for i in range(30000)]
+    rho = np.random.default_rng(0).uniform(0.5, 1200, len(cases))
+    vmax = benchmark(velocity_limits, cases, rho, 1e-3)
+    ref = [velocity_limit(c, r, 1e-3) for c, r in zip(cases[:300], rho)]
+    np.testing.assert_allclose(vmax[:300], ref, rtol=1e-15)
@@ -0,0 +1 @@
+"""Headless calculation engine of the Pipe Design Optimizer (no Tk imports)."""
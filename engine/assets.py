@@ -0,0 +1,71 @@
+"""Image assets for the GUI: decoded once, scaled once per size.
+
+:class:`ImageCache` keeps each source image decoded in memory and the scaled
+copies (and their Tk ``PhotoImage``) in a small LRU keyed by path and size, so
+switching pages reuses the background instead of resizing it again. A file
+that changes on disk is decoded again. ImageTk is imported on first use so the
+cache itself works without a display.
+"""
+import os
+from collections import OrderedDict
+
+from PIL import Image
+
+MAX_SIZES = 3              # full-screen RGB copies: ~25 MB each at 4K
+
+
+class ImageCache:
+    """Decoded sources plus an LRU of scaled images / PhotoImages."""
+
+    def __init__(self, max_sizes=MAX_SIZES):
+        self.max_sizes = max_sizes
+        self._sources = {}                   # path → (mtime, size, Image)
+        self._scaled = OrderedDict()         # (path, (w, h)) → Image
+        self._photos = OrderedDict()         # (path, (w, h)) → PhotoImage
+        self.resizes = 0
+
+    def source(self, path):
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._sources.get(path)
+        if cached is None or cached[0] != stamp:
+            with Image.open(path) as img:
+                img.load()
+                cached = self._sources[path] = (stamp, img.copy())
+            self._drop(path)
+        return cached[1]
+
+    def scaled(self, path, size):
+        """``path`` resized to ``size`` (width, height); resized once per size."""
+        src = self.source(path)
+        key = (path, tuple(size))
+        img = self._scaled.get(key)
+        if img is None:
+            img = src if src.size == key[1] else src.resize(key[1])
+            self.resizes += 1
+            self._scaled[key] = img
+            self._trim(self._scaled)
+        self._scaled.move_to_end(key)
+        return img
+
+    def photo(self, path, size):
+        """Tk PhotoImage of :meth:`scaled`; needs a Tk root, shared by every page."""
+        from PIL import ImageTk
+
+        key = (path, tuple(size))
+        img = self.scaled(path, size)        # also notices a changed file
+        photo = self._photos.get(key)
+        if photo is None:
+            photo = self._photos[key] = ImageTk.PhotoImage(img)
+            self._trim(self._photos)
+        self._photos.move_to_end(key)
+        return photo
+
+    def _trim(self, lru):
+        while len(lru) > self.max_sizes:
+            lru.popitem(last=False)
+
+    def _drop(self, path):
+        for lru in (self._scaled, self._photos):
+            for key in [k for k in lru if k[0] == path]:
+                del lru[key]
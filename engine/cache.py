@@ -0,0 +1,135 @@
+"""Persistent cache of complete designs (``design_cache.sqlite``).
+
+Entries are keyed by a SHA-256 of the normalized case (without its name), of
+the catalogue fingerprint and of :data:`CACHE_FORMAT`, so any change to a
+workbook, to the catalogue database or to what a design computes gives new
+keys; entries made under another fingerprint or format are dropped when the
+cache is opened. Values are the zlib-compressed JSON results of
+:func:`run_design`. The file is bounded in size: the least recently used
+entries are evicted first.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+
+from engine import catalogues as cat_mod
+from engine.design import normalize_case, run_design
+from engine.resources import app_dir
+
+CACHE_FILE = "design_cache.sqlite"
+CACHE_FORMAT = 2                # bump whenever run_design results change meaning
+MAX_BYTES = 256 * 1024 * 1024
+UNKEYED_FIELDS = ("project_name", "name")      # labels only, no effect on the design
+
+
+def catalogue_fingerprint(cat):
+    """Hash of the workbook files (size, mtime) and the database version."""
+    h = hashlib.sha256()
+    for path in (cat.liquid_path, cat.gas_path, cat.material_path, cat.fittings_path,
+                 cat.schedule_path):
+        try:
+            st = os.stat(path)
+            h.update(f"{os.path.basename(path)}:{st.st_mtime_ns}:{st.st_size};".encode())
+        except OSError:
+            h.update(f"{os.path.basename(path)}:missing;".encode())
+    if cat.db is not None:
+        h.update(f"db:{cat.db.version}".encode())
+    return h.hexdigest()[:16]
+
+
+def case_key(case, fingerprint):
+    """Content address of a case: same inputs and catalogues → same key."""
+    case = {k: v for k, v in normalize_case(case).items() if k not in UNKEYED_FIELDS}
+    blob = json.dumps([CACHE_FORMAT, case, fingerprint], sort_keys=True, ensure_ascii=False,
+                      separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class DesignCache:
+    """Size-bounded LRU store of design results."""
+
+    def __init__(self, path=None, max_bytes=MAX_BYTES, catalogues=None):
+        self.path = path or os.path.join(app_dir(), CACHE_FILE)
+        self.max_bytes = max_bytes
+        self.catalogues = catalogues or cat_mod.get_catalogues()
+        self.fingerprint = catalogue_fingerprint(self.catalogues)
+        self.stamp = f"{self.fingerprint}:{CACHE_FORMAT}"
+        self.hits = self.misses = 0
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS designs (key TEXT PRIMARY KEY, "
+                          "fingerprint TEXT, value BLOB, size INTEGER, last_used REAL)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS designs_lru ON designs (last_used)")
+        self.conn.execute("DELETE FROM designs WHERE fingerprint != ?", (self.stamp,))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT count(*) FROM designs").fetchone()[0]
+
+    @property
+    def size(self):
+        return self.conn.execute("SELECT coalesce(sum(size), 0) FROM designs").fetchone()[0]
+
+    def get(self, key):
+        row = self.conn.execute("SELECT value FROM designs WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.conn.execute("UPDATE designs SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key, result):
+        value = zlib.compress(json.dumps(result, ensure_ascii=False).encode("utf-8"))
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute("INSERT OR REPLACE INTO designs VALUES (?, ?, ?, ?, ?)",
+                              (key, self.stamp, value, len(value), time.time()))
+            self._evict()
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def _evict(self):
+        excess = self.size - self.max_bytes
+        if excess <= 0:
+            return
+        freed, doomed = 0, []
+        for key, size in self.conn.execute("SELECT key, size FROM designs ORDER BY last_used"):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self.conn.executemany("DELETE FROM designs WHERE key = ?", doomed)
+
+    def clear(self):
+        self.conn.execute("DELETE FROM designs")
+
+    def design(self, case):
+        """``run_design(case)``, from the cache when the same case was designed before."""
+        key = case_key(case, self.fingerprint)
+        result = self.get(key)
+        if result is None:
+            result = run_design(case, self.catalogues)
+            self.put(key, result)
+        else:                                   # the resolved case, with this case's labels
+            case = normalize_case(case)
+            for field in UNKEYED_FIELDS:
+                if field in case:
+                    result["case"][field] = case[field]
+                else:
+                    result["case"].pop(field, None)
+        return result
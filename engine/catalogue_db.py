@@ -0,0 +1,251 @@
+"""SQLite copy of the Excel catalogues (``catalogue.sqlite`` next to the .xlsx files).
+
+The workbooks stay the source for bulk edits: :meth:`CatalogueDB.import_excel`
+re-reads a workbook only when its size or modification time changed, and
+:meth:`CatalogueDB.export_excel` writes the tables back. Everything else
+(start-up loading, lookups, adding a fluid) goes through the database: one
+indexed query or one single-row insert in a WAL-mode transaction instead of
+parsing or rewriting a whole workbook.
+
+Tables keep the sheets exactly as read (column names, mixed cell types), so
+exporting gives back the workbook and :meth:`CatalogueDB.dataframe` the frame
+``pd.read_excel`` would. Fluids added in the application
+survive a later re-import of their workbook; the other tables are replaced.
+
+WAL needs every writer on the same machine; on a network share keep one
+database per workstation and share the workbooks.
+"""
+import contextlib
+import os
+import sqlite3
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from engine import catalogues as cat_mod
+
+DB_FILE = "catalogue.sqlite"
+
+# table → (workbook, key column); tables hold the sheets as read, the
+# prepare_* steps of engine.catalogues run when frames are built.
+TABLES = {
+    "liquids": (cat_mod.LIQUID_FILE, "Liquid"),
+    "gases": (cat_mod.GAS_FILE, "Gas"),
+    "materials": (cat_mod.MATERIAL_FILE, "Material"),
+    "fittings": (cat_mod.FITTINGS_FILE, "Fitting Type"),
+    "schedule": (cat_mod.SCHEDULE_FILE, None),
+}
+FLUID_TABLES = {"Liquid": "liquids", "Gas": "gases"}
+INDEXES = {
+    "liquids": ['lower("Liquid")'],
+    "gases": ['lower("Gas")'],
+    "materials": ['"Material"',
+                  '"Temperature Min", "Temperature Max", "Pressure Min", "Pressure Max"'],
+    "fittings": ['lower(trim("Fitting Type"))'],
+    "schedule": ['"Outside diameter (mm)", "Wall thickness (mm)"'],
+}
+
+# SQLite orders text after every number: skip cells that are not numbers,
+# as the frame-based code does by coercing them to NaN.
+_NUMERIC = "AND typeof({0}) IN ('integer', 'real') "
+_NUMERIC_MATERIAL = "".join(_NUMERIC.format(f'"{c}"') for c in (
+    "Temperature Min", "Temperature Max", "Pressure Min", "Pressure Max"))
+_NUMERIC_SCHEDULE = "".join(_NUMERIC.format(f'"{c}"') for c in (
+    "Outside diameter (mm)", "Wall thickness (mm)"))
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _sql_value(value):
+    """Cell value → something sqlite3 stores as-is (NaN → NULL)."""
+    if value is None or (np.ndim(value) == 0 and pd.isna(value)):
+        return None
+    if isinstance(value, (str, bytes)):
+        return value
+    if hasattr(value, "item"):                   # numpy scalars
+        return value.item()
+    if isinstance(value, (int, float)):
+        return value
+    return str(value)                            # dates typed into number cells
+
+
+def _signature(path):
+    st = os.stat(path)
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+class CatalogueDB:
+    """Catalogue database connection; usable as a context manager."""
+
+    def __init__(self, path):
+        self.path = path
+        # opened by the GUI's loader thread, then used from the Tk thread
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Write transaction; the database lock is taken up front."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    # ---- metadata ----
+    def _meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
+
+    def _bump_version(self):
+        self._set_meta("version", int(self.version) + 1)
+
+    @property
+    def version(self):
+        """Counter increased by every change; part of cache keys."""
+        return int(self._meta("version", 0))
+
+    def has_table(self, table):
+        return self.conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                 (table,)).fetchone() is not None
+
+    def columns(self, table):
+        return [r[1] for r in self.conn.execute(f"PRAGMA table_info({_quote(table)})")]
+
+    # ---- Excel sync ----
+    def _write_table(self, table, df):
+        """Replace ``table`` by ``df`` (inside a transaction)."""
+        self.conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+        cols = ", ".join(_quote(c) for c in df.columns)      # no types: values kept as given
+        self.conn.execute(f"CREATE TABLE {_quote(table)} ({cols})")
+        for i, expr in enumerate(INDEXES.get(table, [])):
+            self.conn.execute(f"CREATE INDEX {_quote(f'{table}_idx{i}')} ON {_quote(table)} ({expr})")
+        marks = ", ".join("?" * len(df.columns))
+        self.conn.executemany(f"INSERT INTO {_quote(table)} VALUES ({marks})",
+                              ([_sql_value(v) for v in row] for row in df.itertuples(index=False)))
+
+    def import_excel(self, folder, tables=None, force=False):
+        """Load changed workbooks from ``folder``; returns the names of the tables imported."""
+        imported = []
+        for table in tables or TABLES:
+            file, key = TABLES[table]
+            path = os.path.join(folder, file)
+            if not os.path.isfile(path):
+                continue
+            signature = _signature(path)
+            if not force and self.has_table(table) and self._meta(f"source:{file}") == signature:
+                continue
+            try:
+                df = pd.read_excel(path)
+            except Exception as e:
+                print(f"❌ Failed to load {file}: {e}")
+                continue
+            with self.transaction():
+                if table in FLUID_TABLES.values() and self.has_table(table):
+                    names = {str(n).lower() for n in df[key].dropna()}
+                    own = self.dataframe(table)               # rows added in the app
+                    own = own[~own[key].astype(str).str.lower().isin(names)]
+                    df = pd.concat([df, own.reindex(columns=df.columns)], ignore_index=True)
+                self._write_table(table, df)
+                self._set_meta(f"source:{file}", signature)
+                self._bump_version()
+            imported.append(table)
+        return imported
+
+    def mark_imported(self, folder, files):
+        """Record workbooks ``files`` in ``folder`` as imported, e.g. copies of the sources."""
+        with self.transaction():
+            for file in files:
+                self._set_meta(f"source:{file}", _signature(os.path.join(folder, file)))
+
+    def export_excel(self, folder, tables=None):
+        """Write tables back to their workbooks in ``folder`` (atomically)."""
+        for table in tables or TABLES:
+            if not self.has_table(table):
+                continue
+            file = TABLES[table][0]
+            path = os.path.join(folder, file)
+            fd, tmp = tempfile.mkstemp(suffix=".xlsx", dir=folder)
+            os.close(fd)
+            try:
+                self.dataframe(table).to_excel(tmp, index=False)
+                os.replace(tmp, path)
+            except BaseException:
+                os.remove(tmp)
+                raise
+            with self.transaction():
+                self._set_meta(f"source:{file}", _signature(path))   # no re-import of our own file
+
+    # ---- reads ----
+    def dataframe(self, table):
+        df = pd.read_sql_query(f"SELECT * FROM {_quote(table)} ORDER BY rowid", self.conn)
+        return df.where(df.notna(), np.nan).infer_objects()
+
+    def fluid_properties(self, phase, name):
+        """Density (kg/m³) and viscosity (Pa·s) by name; raises ValueError if unknown."""
+        table = FLUID_TABLES[phase]
+        key = TABLES[table][1]
+        cols = self.columns(table)
+        rho_col, mu_col = cols[1], cols[2]
+        row = self.conn.execute(
+            f"SELECT {_quote(rho_col)}, {_quote(mu_col)} FROM {_quote(table)} "
+            f"WHERE lower({_quote(key)}) = lower(?) ORDER BY rowid LIMIT 1", (name,)).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown {phase.lower()}: {name!r}")
+        return cat_mod.parse_fluid_row(phase, *row)
+
+    def compatible_materials(self, temp, pressure):
+        rows = self.conn.execute(
+            'SELECT "Material" FROM materials WHERE "Temperature Min" <= ? AND "Temperature Max" >= ? '
+            'AND "Pressure Min" <= ? AND "Pressure Max" >= ? ' + _NUMERIC_MATERIAL + ' ORDER BY rowid',
+            (temp, temp, pressure, pressure))
+        return [r[0] for r in rows]
+
+    def select_schedule(self, od_mm, t_req_mm):
+        """Schedule row (dict) with the smallest OD ≥ od_mm and wall ≥ t_req_mm, or None."""
+        cur = self.conn.execute(
+            'SELECT * FROM schedule WHERE "Outside diameter (mm)" = '
+            '(SELECT min("Outside diameter (mm)") FROM schedule WHERE "Outside diameter (mm)" >= ? '
+            + _NUMERIC_SCHEDULE + ') AND "Wall thickness (mm)" >= ? ' + _NUMERIC_SCHEDULE +
+            ' ORDER BY rowid LIMIT 1', (od_mm, t_req_mm))
+        row = cur.fetchone()
+        return dict(zip([d[0] for d in cur.description], row)) if row else None
+
+    # ---- writes ----
+    def add_fluid(self, phase, values):
+        """Insert one fluid row ({column: value}); raises ValueError if the name exists."""
+        table = FLUID_TABLES[phase]
+        key = TABLES[table][1]
+        name = str(values.get(key, "")).strip()
+        if not name:
+            raise ValueError(f"{key} is required!")
+        values = dict(values, **{key: name})
+        cols = self.columns(table)
+        with self.transaction():
+            exists = self.conn.execute(
+                f"SELECT 1 FROM {_quote(table)} WHERE lower({_quote(key)}) = lower(?)", (name,)).fetchone()
+            if exists:
+                raise ValueError(f"{phase} already exists!")
+            marks = ", ".join("?" * len(cols))
+            self.conn.execute(f"INSERT INTO {_quote(table)} VALUES ({marks})",
+                              [_sql_value(values.get(c)) if values.get(c) != "" else None for c in cols])
+            self._bump_version()
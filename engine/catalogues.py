@@ -0,0 +1,196 @@
+import functools
+import os
+
+import pandas as pd
+
+from engine.resources import install_bundled, resource_path
+
+LIQUID_FILE = "liquid_properties.xlsx"
+GAS_FILE = "gas_properties.xlsx"
+MATERIAL_FILE = "material_properties.xlsx"
+FITTINGS_FILE = "fittings.xlsx"
+SCHEDULE_FILE = "schedule.xlsx"
+
+MATERIAL_COLUMNS = [
+    "Material", "Specification", "Weld Joint Factor (E)", "SMYS (MPa)",
+    "Roughness (mm)", "Pressure Min", "Pressure Max",
+    "Temperature Min", "Temperature Max", "Price"
+]
+
+
+# ------------------------------------------------------------------
+# Readers
+# ------------------------------------------------------------------
+def read_materials(path):
+    return prepare_materials(pd.read_excel(path))
+
+
+def read_fittings(path):
+    return prepare_fittings(pd.read_excel(path))
+
+
+def read_schedule(path):
+    return prepare_schedule(pd.read_excel(path))
+
+
+# The prepare_* steps turn a raw sheet into the frame the application uses;
+# they are shared by the workbook readers and the SQLite catalogue.
+def prepare_materials(material_df):
+    # MATERIALS  – 10 columns + Price
+    material_df = material_df.copy()
+    material_df.columns = MATERIAL_COLUMNS
+    return material_df
+
+
+def prepare_fittings(fittings_df):
+    # FITTINGS  – 6 columns (Method + Type + K1 + K∞ + Kd + Price)
+    fittings_df = fittings_df.copy()
+    fittings_df.columns = ["Method", "Fitting Type", "K1", "K∞", "Kd", "Price"]
+    fittings_df = fittings_df[["Fitting Type", "K1", "K∞", "Kd", "Price"]]  # drop the unused Method column
+    fittings_df.columns = fittings_df.columns.str.strip()
+    fittings_df = fittings_df.dropna(subset=["Fitting Type"])
+
+    # Sanity-check the fittings columns we actually need
+    if not {'Fitting Type', 'K1', 'K∞', 'Kd', 'Price'}.issubset(fittings_df.columns):
+        raise ValueError("Fittings file missing required columns.")
+    return fittings_df
+
+
+def prepare_schedule(sched_df):
+    sched_df = sched_df.copy()
+    sched_df["Outside diameter (mm)"] = pd.to_numeric(sched_df["Outside diameter (mm)"], errors="coerce")
+    sched_df["Wall thickness (mm)"] = pd.to_numeric(sched_df["Wall thickness (mm)"], errors="coerce")
+    sched_df.dropna(subset=["Outside diameter (mm)", "Wall thickness (mm)"], inplace=True)
+    return sched_df
+
+
+class Catalogues:
+    """The five catalogues, loaded once.
+
+    Built from the workbooks directly, or with :meth:`from_database` from the
+    SQLite copy (``db`` is then the open :class:`CatalogueDB`, else None).
+    """
+
+    db = None
+
+    def __init__(self, folder=None):
+        path = (lambda name: os.path.join(folder, name)) if folder else resource_path
+        self.liquid_path = path(LIQUID_FILE)
+        self.gas_path = path(GAS_FILE)
+        self.material_path = path(MATERIAL_FILE)
+        self.fittings_path = path(FITTINGS_FILE)
+        self.liquid_df = pd.read_excel(self.liquid_path)
+        self.gas_df = pd.read_excel(self.gas_path)
+        self.material_df = read_materials(self.material_path)
+        self.fittings_df = read_fittings(self.fittings_path)
+        self.schedule_path = path(SCHEDULE_FILE)
+        try:
+            self.sched_df = read_schedule(self.schedule_path)
+        except Exception as e:
+            print(f"❌ Failed to load schedule file: {e}")
+            self.sched_df = None
+
+    @classmethod
+    def from_database(cls, db, folder=None):
+        """Catalogues read from a :class:`CatalogueDB` (workbook paths kept for export)."""
+        self = cls.__new__(cls)
+        path = (lambda name: os.path.join(folder, name)) if folder else resource_path
+        self.liquid_path = path(LIQUID_FILE)
+        self.gas_path = path(GAS_FILE)
+        self.material_path = path(MATERIAL_FILE)
+        self.fittings_path = path(FITTINGS_FILE)
+        self.schedule_path = path(SCHEDULE_FILE)
+        self.db = db
+        self.liquid_df = db.dataframe("liquids")
+        self.gas_df = db.dataframe("gases")
+        self.material_df = prepare_materials(db.dataframe("materials"))
+        self.fittings_df = prepare_fittings(db.dataframe("fittings"))
+        try:
+            self.sched_df = prepare_schedule(db.dataframe("schedule"))
+        except Exception as e:
+            print(f"❌ Failed to load schedule file: {e}")
+            self.sched_df = None
+        return self
+
+
+@functools.lru_cache(maxsize=None)
+def get_catalogues():
+    """Process-wide catalogues from the application folder.
+
+    Served from ``catalogue.sqlite`` (refreshed from any changed workbook);
+    falls back to reading the workbooks if the database cannot be used. A
+    frozen build first copies its bundled workbooks and prebuilt database next
+    to the exe, so the first start does not parse the workbooks.
+    """
+    import sqlite3
+    from engine.catalogue_db import DB_FILE, TABLES, CatalogueDB
+
+    installed = install_bundled([file for file, _ in TABLES.values()] + [DB_FILE])
+    folder = os.path.dirname(resource_path(LIQUID_FILE))
+    try:
+        db = CatalogueDB(os.path.join(folder, DB_FILE))
+        if DB_FILE in installed:                 # built from the workbooks installed with it
+            db.mark_imported(folder, [f for f in installed if f != DB_FILE])
+        db.import_excel(folder)
+        if all(db.has_table(t) for t in ("liquids", "gases", "materials", "fittings")):
+            return Catalogues.from_database(db, folder)
+        db.close()
+    except sqlite3.Error as e:
+        print(f"⚠ Catalogue database unavailable, reading the workbooks: {e}")
+    return Catalogues()
+
+
+# ------------------------------------------------------------------
+# Lookups
+# ------------------------------------------------------------------
+def get_compatible_materials(material_df, temp, pressure):
+    out = []
+    for _, r in material_df.iterrows():
+        try:
+            if (float(r["Temperature Min"]) <= temp <= float(r["Temperature Max"]) and
+                    float(r["Pressure Min"]) <= pressure <= float(r["Pressure Max"])):
+                out.append(r["Material"])
+        except Exception:
+            pass
+    return out
+
+
+def fluid_properties(liquid_df, gas_df, phase, fluid):
+    """Density (kg/m³) and dynamic viscosity (Pa·s) of a catalogue fluid."""
+    if phase not in ("Liquid", "Gas"):
+        raise ValueError(f"Phase {phase!r} has no single-fluid properties; "
+                         "two-phase cases go through run_design")
+    if phase == "Liquid":
+        props = liquid_df[liquid_df["Liquid"] == fluid].iloc[0]
+        return parse_fluid_row(phase, props["Density (kg/mÂ³)"], props["Viscosity (mPaÂ·s)"])
+    props = gas_df[gas_df["Gas"] == fluid].iloc[0]
+    return parse_fluid_row(phase, props["Density (kg/m³)"], props["Viscosity (μPa·s)"])
+
+
+def fluid_rheology(liquid_df, fluid):
+    """(n, K, tau0) of a non-Newtonian catalogue liquid, None if it is Newtonian.
+
+    Workbooks without the rheology columns hold Newtonian liquids only.
+    """
+    from engine.rheology import COLUMNS, parse_rheology
+
+    if COLUMNS["model"] not in liquid_df:
+        return None
+    row = liquid_df[liquid_df["Liquid"] == fluid].iloc[0]
+    return parse_rheology(*(row.get(COLUMNS[key]) for key in ("model", "n", "K", "tau0")))
+
+
+def parse_fluid_row(phase, density, viscosity):
+    """(rho, mu) in SI from the raw density / viscosity cells of a fluid row."""
+    rho = float(str(density).replace("Â", ""))
+    if phase == "Liquid":
+        mu = float(str(viscosity).replace("Â", "")) * 1e-3
+    else:
+        mu = float(str(viscosity)) * 1e-6
+    return rho, mu
+
+
+def material_roughness(material_df, mat):
+    """Absolute roughness (m) of a catalogue material."""
+    row = material_df[material_df["Material"] == mat].iloc[0]
+    return float(str(row["Roughness (mm)"]).replace("Â", "")) * 1e-3
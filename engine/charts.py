@@ -0,0 +1,428 @@
+"""Precomputed design charts: interpolated critical diameters for quick screening.
+
+Without fittings, the pressure-drop critical diameter of a catalogue fluid in
+a material depends smoothly on flowrate, length and ΔP limit. :func:`build_charts`
+tabulates it offline on a log-spaced grid of those three axes for every
+catalogue fluid and every roughness value of the material catalogue (the
+materials share a handful of them), and writes ``design_charts.npz``::
+
+    charts.json      header: axes, fluids (ρ, μ, rheology), materials, catalogue fingerprint
+    log_dcrit.npy    ln dcrit (m), float32, (tables, flowrate, length, dp_max)
+    error.npy        relative interpolation error at each cell centre, float32
+
+The arrays are stored uncompressed and memory-mapped on opening, as in
+:mod:`engine.project`, so a chart file of any size opens instantly.
+:meth:`DesignCharts.lookup` interpolates ln dcrit trilinearly in ln Q, ln L
+and ln ΔP (where ΔP ∝ Q^~1.8·L/D^~4.8 is close to a plane), then applies the
+velocity limit in closed form::
+
+    charts = load_charts()
+    dcrit, error = charts.lookup("Crude Oil", "API 5L X52 (SAW)", Q, L, dp_max, velocity=3)
+
+``error`` is the interpolation error measured at the centre of the cell each
+point falls in (0 where the full solver answered); cells that straddle the
+laminar/turbulent jump of the friction factor are marked infinite. Points
+outside the tabulated range, in cells with an error above ``max_error`` and
+all points with fittings go to the full solver instead. :meth:`DesignCharts.lookup_one`
+answers a single point in a few microseconds. By default the
+answer is rounded up to the design diameter grid, as the solver's is.
+
+The tabulated and fallback diameters both come from :func:`pressure_dcrit`,
+a bisection on a fine geometric grid (relative step 5·10⁻⁶).
+"""
+import bisect
+import functools
+import json
+import math
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+from engine import catalogues as cat_mod
+from engine.hydraulics import (
+    critical_diameter_search, diameter_grid, pack_fittings, velocity_critical_diameter,
+)
+from engine.resources import app_dir
+
+CHART_FILE = "design_charts.npz"
+CHART_FORMAT = 1
+AXES = {"flowrate": (0.5, 1e5), "length": (10.0, 2e5), "dp_max": (0.01, 50.0)}   # m³/h, m, bar
+POINTS_PER_DECADE = 6
+SOLVER_POINTS = 2 ** 20 + 1
+DEFAULT_MAX_ERROR = 0.01
+
+
+# ------------------------------------------------------------------
+# Solver
+# ------------------------------------------------------------------
+@functools.lru_cache(maxsize=None)
+def solver_diameters():
+    """Fine geometric grid (m) spanning the design grid, for near-continuous dcrit."""
+    grid = diameter_grid()
+    return np.geomspace(grid[0], grid[-1], SOLVER_POINTS)
+
+
+def pressure_dcrit(Q, L, rho, mu, k, dp_max, fittings=None, rheology=None):
+    """Smallest diameter (m) with ΔP ≤ dp_max (Pa), ignoring the velocity; NaN if none.
+
+    Row-wise like :func:`engine.hydraulics.critical_diameter_search`.
+    """
+    return critical_diameter_search(Q, L, rho, mu, np.inf, k, dp_max, fittings,
+                                    solver_diameters(), rheology)
+
+
+def chart_axis(lo, hi, per_decade=POINTS_PER_DECADE):
+    """Log-spaced axis from ``lo`` to ``hi`` with at least ``per_decade`` points a decade."""
+    return np.geomspace(lo, hi, int(np.ceil(np.log10(hi / lo) * per_decade)) + 1)
+
+
+@functools.lru_cache(maxsize=None)
+def _grid_list():
+    return diameter_grid().tolist()
+
+
+def _snap(dcrit):
+    """Round up to the design diameter grid, as the full solver answers."""
+    grid = diameter_grid()
+    with np.errstate(invalid="ignore"):
+        idx = np.searchsorted(grid, dcrit, side="left")
+    return np.where(idx < len(grid), grid[np.minimum(idx, len(grid) - 1)], np.nan)
+
+
+# ------------------------------------------------------------------
+# Charts
+# ------------------------------------------------------------------
+class DesignCharts:
+    """Memory-mapped dcrit tables of a chart file; see the module docstring."""
+
+    def __init__(self, path):
+        from engine.project import _map_member
+
+        self.path = path
+        with zipfile.ZipFile(path) as zf:
+            try:
+                header = json.loads(zf.read("charts.json"))
+            except KeyError:
+                raise ValueError(f"{path} is not a design chart file") from None
+            if header.get("format", 0) > CHART_FORMAT:
+                raise ValueError(f"{path} was written by a newer version (format {header['format']})")
+            self.log_dcrit = _map_member(path, zf, "log_dcrit.npy")
+            self.error = _map_member(path, zf, "error.npy")
+        self._log_dcrit, self._error = np.asarray(self.log_dcrit), np.asarray(self.error)
+        self.fingerprint = header["fingerprint"]
+        self.axes = {d: tuple(header["axes"][d]) for d in AXES}
+        self.fluids = header["fluids"]
+        self.materials = header["materials"]
+        self.roughness = header["roughness"]
+        self._cat = None
+
+    def __repr__(self):
+        points = "×".join(str(n) for _, _, n in self.axes.values())
+        return (f"<DesignCharts: {len(self.fluids)} fluid(s) × {len(self.roughness)} roughness "
+                f"value(s), {points} points each>")
+
+    def coords(self, dim):
+        lo, hi, n = self.axes[dim]
+        return np.geomspace(lo, hi, n)
+
+    def is_current(self, catalogues=None):
+        """Whether the charts were built from the current catalogues."""
+        from engine.cache import catalogue_fingerprint
+
+        return self.fingerprint == catalogue_fingerprint(catalogues or cat_mod.get_catalogues())
+
+    # ---- properties of fluids and materials, tabulated or from the catalogues ----
+    def _catalogues(self):
+        if self._cat is None:
+            self._cat = cat_mod.get_catalogues()
+        return self._cat
+
+    def _fluid(self, fluid, phase=None):
+        entry = self.fluids.get(fluid)
+        if entry is not None and phase in (None, entry["phase"]):
+            return entry["rho"], entry["mu"], entry["rheology"] and tuple(entry["rheology"])
+        cat, phase = self._catalogues(), phase or "Liquid"
+        try:
+            rho, mu = cat_mod.fluid_properties(cat.liquid_df, cat.gas_df, phase, fluid)
+        except (IndexError, KeyError):
+            raise ValueError(f"Unknown {phase.lower()}: {fluid!r}") from None
+        rheology = cat_mod.fluid_rheology(cat.liquid_df, fluid) if phase == "Liquid" else None
+        return rho, mu, rheology
+
+    def _roughness(self, material):
+        if material in self.materials:
+            return self.roughness[self.materials[material]]
+        try:
+            return cat_mod.material_roughness(self._catalogues().material_df, material)
+        except IndexError:
+            raise ValueError(f"Unknown material: {material!r}") from None
+
+    def _table(self, fluid, material, phase=None):
+        """Table index of a tabulated (fluid, material) pair, or None."""
+        entry = self.fluids.get(fluid)
+        if entry is None or phase not in (None, entry["phase"]) or material not in self.materials:
+            return None
+        return entry["table"] + self.materials[material]
+
+    # ---- lookup ----
+    def _interpolate(self, table, Q, L, dp_max):
+        """Trilinear ln dcrit and the cell error at (Q, L, dp_max); inputs inside the axes."""
+        index, frac = [], []
+        for dim, x in zip(AXES, (Q, L, dp_max)):
+            lo, hi, n = self.axes[dim]
+            u = (np.log(x) - np.log(lo)) / (np.log(hi) - np.log(lo)) * (n - 1)
+            i = np.clip(np.floor(u).astype(np.intp), 0, n - 2)
+            index.append(i)
+            frac.append(u - i)
+        (i, j, l), (a, b, c) = index, frac
+        t = self.log_dcrit[table]
+        out = 0.0
+        for di, wa in ((0, 1 - a), (1, a)):
+            for dj, wb in ((0, 1 - b), (1, b)):
+                for dl, wc in ((0, 1 - c), (1, c)):
+                    out = out + wa * wb * wc * t[i + di, j + dj, l + dl]
+        return out, self.error[table][i, j, l]
+
+    def lookup(self, fluid, material, flowrate, length, dp_max, velocity=np.inf, fittings=(),
+               phase=None, max_error=DEFAULT_MAX_ERROR, snap=True):
+        """Critical diameter (m) and its relative error estimate, element-wise.
+
+        ``flowrate`` (m³/h), ``length`` (m), ``dp_max`` (bar) and ``velocity``
+        (m/s) broadcast. ``fittings`` are resolved rows
+        (:func:`engine.hydraulics.resolve_fittings`); with any, every point is
+        solved. Fluids and materials that are not tabulated are solved with
+        their catalogue properties. NaN where no diameter of the grid is
+        large enough.
+        """
+        Q, L, dp, vmax = np.broadcast_arrays(*(np.asarray(a, dtype=float)
+                                               for a in (flowrate, length, dp_max, velocity)))
+        log_d = np.full(Q.shape, np.nan)
+        error = np.full(Q.shape, np.inf)
+        table = None if len(fittings) else self._table(fluid, material, phase)
+        if table is not None:
+            inside = np.ones(Q.shape, dtype=bool)
+            for dim, x in zip(AXES, (Q, L, dp)):
+                lo, hi, _ = self.axes[dim]
+                inside &= (x >= lo) & (x <= hi)
+            if inside.all():
+                log_d, error = (np.asarray(a, dtype=float) for a in self._interpolate(table, Q, L, dp))
+            elif inside.any():
+                log_d[inside], error[inside] = self._interpolate(table, Q[inside], L[inside], dp[inside])
+        with np.errstate(invalid="ignore"):
+            solve = ~(error <= max_error)                   # NaN tables cells are solved too
+        dcrit = np.array(np.exp(log_d))
+        if solve.any():
+            rho, mu, rheology = self._fluid(fluid, phase)
+            packed = pack_fittings([fittings]) if len(fittings) else None
+            dcrit[solve] = pressure_dcrit(Q[solve], L[solve], rho, mu, self._roughness(material),
+                                          dp[solve] * 1e5, packed, rheology)
+            error[solve] = 0.0
+        dcrit = np.maximum(dcrit, velocity_critical_diameter(Q, vmax))
+        return (_snap(dcrit) if snap else dcrit), error
+
+    def lookup_one(self, fluid, material, flowrate, length, dp_max, velocity=math.inf, phase=None,
+                   max_error=DEFAULT_MAX_ERROR, snap=True):
+        """:meth:`lookup` of one point without fittings, in plain float arithmetic (a few µs)."""
+        table = self._table(fluid, material, phase)
+        pos = []
+        for dim, x in zip(AXES, (flowrate, length, dp_max)):
+            lo, hi, n = self.axes[dim]
+            if table is None or not lo <= x <= hi:
+                break
+            u = math.log(x / lo) / math.log(hi / lo) * (n - 1)
+            i = min(int(u), n - 2)
+            pos.append((i, u - i))
+        else:
+            (i, a), (j, b), (l, c) = pos
+            error = float(self._error[table, i, j, l])
+            if error <= max_error:
+                (c000, c001), (c010, c011) = self._log_dcrit[table, i, j:j + 2, l:l + 2].tolist()
+                (c100, c101), (c110, c111) = self._log_dcrit[table, i + 1, j:j + 2, l:l + 2].tolist()
+                c00, c01 = c000 + a * (c100 - c000), c001 + a * (c101 - c001)
+                c10, c11 = c010 + a * (c110 - c010), c011 + a * (c111 - c011)
+                c0, c1 = c00 + b * (c10 - c00), c01 + b * (c11 - c01)
+                dcrit = max(math.exp(c0 + c * (c1 - c0)),
+                            math.sqrt(4 * flowrate / 3600 / (math.pi * velocity)))
+                if snap:
+                    grid = _grid_list()
+                    idx = bisect.bisect_left(grid, dcrit)
+                    dcrit = grid[idx] if idx < len(grid) else math.nan
+                return dcrit, error
+        dcrit, error = self.lookup(fluid, material, flowrate, length, dp_max, velocity, (), phase,
+                                   max_error, snap)
+        return float(dcrit), float(error)
+
+    def lookup_case(self, case, catalogues=None, max_error=DEFAULT_MAX_ERROR):
+        """Screening answer for a case: {material: {dcrit, error}} and the velocity dcrit (m).
+
+        Charts built from other catalogues are not used (every material is
+        solved). Two-phase cases are not covered.
+        """
+        from engine.design import normalize_case
+        from engine.hydraulics import resolve_fittings
+        from engine.twophase import PHASE as TWO_PHASE
+        from engine.velocity import velocity_limit
+
+        case = normalize_case(case)
+        if case["phase"] == TWO_PHASE:
+            raise ValueError("Design charts cover single-phase fluids only; use 'design'")
+        cat = catalogues or self._catalogues()
+        if not self.is_current(cat):
+            max_error = -1.0                             # stale charts: solve everything
+        fittings = resolve_fittings(cat.fittings_df, case["fittings"])
+        materials = cat_mod.get_compatible_materials(cat.material_df, case["temperature"], case["pressure"])
+        vmax = velocity_limit(case, *self._fluid(case["fluid"], case["phase"])[:2])
+        out = {}
+        for mat in materials:
+            dcrit, error = self.lookup(case["fluid"], mat, case["flowrate"], case["length"],
+                                       case["dp_max"], vmax, fittings, case["phase"],
+                                       max_error)
+            out[mat] = {"dcrit": None if np.isnan(dcrit) else float(dcrit), "error": float(error)}
+        return {"dcrit_velocity": float(velocity_critical_diameter(case["flowrate"], vmax)),
+                "materials": out}
+
+
+def load_charts(path=None):
+    """Open a chart file (default: ``design_charts.npz`` in the app folder)."""
+    return DesignCharts(path or os.path.join(app_dir(), CHART_FILE))
+
+
+# ------------------------------------------------------------------
+# Build
+# ------------------------------------------------------------------
+def _catalogue_fluids(cat):
+    """(phase, name) of every usable catalogue fluid, liquids first; names are unique."""
+    out, seen = [], set()
+    for phase, df, col in (("Liquid", cat.liquid_df, "Liquid"), ("Gas", cat.gas_df, "Gas")):
+        for name in df[col].dropna():
+            if name in seen:
+                continue
+            try:
+                cat_mod.fluid_properties(cat.liquid_df, cat.gas_df, phase, name)
+                if phase == "Liquid":
+                    cat_mod.fluid_rheology(cat.liquid_df, name)
+            except (TypeError, ValueError, IndexError):
+                continue                                  # unusable catalogue row
+            out.append((phase, name))
+            seen.add(name)
+    return out
+
+
+def _regime(Q, D, rho, mu, rheology):
+    """Flow regime at the tabulated diameters: 0 laminar, 1 pinned at the jump, 2 turbulent.
+
+    Where ΔP jumps across the laminar/turbulent switch, dcrit stays at
+    Re = RE_LAMINAR over a band of inputs ("pinned"). A Bingham plastic has
+    no jump and is all 0.
+    """
+    from engine.hydraulics import RE_LAMINAR
+    from engine.rheology import metzner_reed_reynolds
+
+    n, K, tau0 = rheology or (1.0, mu, 0.0)
+    if tau0 > 0:
+        return np.zeros(np.shape(D), dtype=np.int8)
+    V = Q / 3600 / (np.pi * D ** 2 / 4)
+    with np.errstate(invalid="ignore"):
+        Re = metzner_reed_reynolds(rho, V, D, n, K)
+    return np.digitize(Re, [RE_LAMINAR * (1 - 1e-4), RE_LAMINAR * (1 + 1e-4)]).astype(np.int8)
+
+
+def _straddles(regime):
+    """Cells of (tables, *grid) regimes whose eight corners are not all in the same one."""
+    lo, hi = regime[:, :-1, :-1, :-1], regime[:, :-1, :-1, :-1]
+    for di in (0, 1):
+        for dj in (0, 1):
+            for dl in (0, 1):
+                corner = regime[:, di:di + regime.shape[1] - 1, dj:dj + regime.shape[2] - 1,
+                                dl:dl + regime.shape[3] - 1]
+                lo, hi = np.minimum(lo, corner), np.maximum(hi, corner)
+    return lo != hi
+
+
+def build_charts(path=None, catalogues=None, fluids=None, per_decade=POINTS_PER_DECADE, axes=None,
+                 progress=None):
+    """Tabulate dcrit for ``fluids`` (default: the whole catalogue) and write the chart file.
+
+    ``axes`` overrides the (low, high) range of some of :data:`AXES`;
+    ``progress(done, total)`` is called after each fluid. Returns the path.
+    """
+    from engine.cache import catalogue_fingerprint
+
+    cat = catalogues or cat_mod.get_catalogues()
+    path = path or os.path.join(app_dir(), CHART_FILE)
+    available = _catalogue_fluids(cat)
+    if fluids is not None:
+        unknown = set(fluids) - {name for _, name in available}
+        if unknown:
+            raise ValueError(f"Unknown or unusable fluid(s): {', '.join(sorted(unknown))}")
+        available = [(p, n) for p, n in available if n in fluids]
+    ranges = dict(AXES, **(axes or {}))
+    coords = {d: chart_axis(*ranges[d], per_decade) for d in AXES}
+
+    materials, roughness = {}, []
+    for mat in cat.material_df["Material"].drop_duplicates():
+        try:
+            k = cat_mod.material_roughness(cat.material_df, mat)
+        except (TypeError, ValueError):
+            continue
+        if k not in roughness:
+            roughness.append(k)
+        materials[mat] = roughness.index(k)
+
+    # every grid point and every cell centre, for every roughness value
+    nodes = [g.ravel() for g in np.meshgrid(*coords.values(), indexing="ij")]
+    centres = [np.sqrt(c[:-1] * c[1:]) for c in coords.values()]
+    mids = [g.ravel() for g in np.meshgrid(*centres, indexing="ij")]
+    shape = tuple(len(c) for c in coords.values())
+    cell_shape = tuple(n - 1 for n in shape)
+    k = np.repeat(roughness, len(nodes[0]))
+    k_mid = np.repeat(roughness, len(mids[0]))
+
+    log_dcrit = np.empty((len(available) * len(roughness),) + shape, dtype=np.float32)
+    error = np.empty((len(available) * len(roughness),) + cell_shape, dtype=np.float32)
+    header = {"format": CHART_FORMAT, "fingerprint": catalogue_fingerprint(cat),
+              "axes": {d: [float(c[0]), float(c[-1]), len(c)] for d, c in coords.items()},
+              "materials": materials, "roughness": roughness, "fluids": {}}
+    charts = DesignCharts.__new__(DesignCharts)
+    charts.axes = {d: tuple(v) for d, v in header["axes"].items()}
+    charts.log_dcrit = charts._log_dcrit = log_dcrit
+    charts.error = charts._error = error
+
+    R = len(roughness)
+    for f, (phase, name) in enumerate(available):
+        rho, mu = cat_mod.fluid_properties(cat.liquid_df, cat.gas_df, phase, name)
+        rheology = cat_mod.fluid_rheology(cat.liquid_df, name) if phase == "Liquid" else None
+        tile = lambda axes: [np.tile(a, R) for a in axes]
+        Q, L, dp = tile(nodes)
+        d = pressure_dcrit(Q, L, rho, mu, k, dp * 1e5, None, rheology)
+        log_dcrit[f * R:(f + 1) * R] = np.log(d).reshape((R,) + shape)
+        jump = _straddles(_regime(Q, d, rho, mu, rheology).reshape((R,) + shape))
+        Q, L, dp = tile(mids)
+        exact = pressure_dcrit(Q, L, rho, mu, k_mid, dp * 1e5, None, rheology).reshape((R,) + cell_shape)
+        for r in range(R):
+            est, _ = charts._interpolate(f * R + r, *(m.reshape(cell_shape) for m in mids))
+            with np.errstate(invalid="ignore"):
+                error[f * R + r] = np.abs(np.exp(est) / exact[r] - 1)
+        # the centre misses the laminar/turbulent jump of the friction factor
+        error[f * R:(f + 1) * R][jump] = np.inf
+        header["fluids"][name] = {"phase": phase, "rho": float(rho), "mu": float(mu),
+                                  "rheology": rheology and list(rheology), "table": f * R}
+        if progress:
+            progress(f + 1, len(available))
+
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(suffix=".npz", dir=folder)
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_STORED) as zf:
+            zf.writestr("charts.json", json.dumps(header, ensure_ascii=False))
+            for member, array in (("log_dcrit.npy", log_dcrit), ("error.npy", error)):
+                with zf.open(member, "w", force_zip64=True) as fh:
+                    np.lib.format.write_array(fh, np.ascontiguousarray(array), allow_pickle=False)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return path
@@ -0,0 +1,563 @@
+"""Command-line interface of the Pipe Design Optimizer.
+
+    python -m engine design CASE [-o RESULT.json] [--pdf REPORT.pdf] [--project FILE.pdo]
+    python -m engine batch CASES [-o RESULTS.jsonl] [-j JOBS] [--project FILE.pdo] [--table T.csv|.npy] [--no-cache]
+    python -m engine project FILE.pdo
+    python -m engine catalogue {info,import,export} [--folder DIR] [--force]
+    python -m engine report CASE REPORT.pdf
+    python -m engine bench [CASES] [-n REPEAT]
+    python -m engine uncertainty CASE [-n SAMPLES] [--seed SEED] [-j JOBS]
+    python -m engine stream CASES.csv|.parquet -o RESULTS.csv|.parquet [--chunk N] [--resume]
+    python -m engine economic CASE [--lifetime Y] [--rate R] [--tariff T] [--efficiency E] [--hours H] [--curve CURVE.csv]
+    python -m engine rate CASE [--material M ...] [--table TABLE.csv]
+    python -m engine pareto CASE [--material M ...] [--objective O ...] [--table FRONT.csv [--all]] [--plot FIG.png]
+    python -m engine surge CASE [--material M ...|--all] [--closure S] [--reaches N] [--bulk-modulus K]
+    python -m engine sweep CASE [--flowrate AXIS] [--length AXIS] [--dp-max AXIS] -o SPACE.npz|.csv
+    python -m engine charts {build,info,lookup} [CASE] [--file CHARTS.npz] [--fluid F ...] [--per-decade N]
+    python -m engine serve [--host HOST] [--port PORT] [-w WORKERS]
+
+CASE files are JSON or YAML objects with the fields described in
+:mod:`engine.design`; CASES files hold a list of them, or one JSON object per
+line (``.jsonl``). ``design`` and ``batch`` answer repeated cases from the
+persistent design cache (:mod:`engine.cache`). Nothing here imports tkinter, and the numerical stack is
+only imported once a command actually runs.
+"""
+import argparse
+import functools
+import json
+import os
+import sys
+import tempfile
+import time
+
+
+# ------------------------------------------------------------------
+# Input / output
+# ------------------------------------------------------------------
+def load_cases(path):
+    """List of case dicts from a .json, .jsonl, .yaml or .yml file."""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8") as fh:
+        if ext == ".jsonl":
+            data = [json.loads(line) for line in fh if line.strip()]
+        elif ext in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise SystemExit("YAML case files need PyYAML (pip install pyyaml).")
+            data = yaml.safe_load(fh)
+        else:
+            data = json.load(fh)
+    return data if isinstance(data, list) else [data]
+
+
+def case_name(case, index):
+    return str(case.get("name") or case.get("project_name") or f"case-{index + 1}")
+
+
+def _dump(obj, fh, indent=None):
+    json.dump(obj, fh, ensure_ascii=False, indent=indent)
+    fh.write("\n")
+
+
+def _open_out(path):
+    return open(path, "w", encoding="utf-8") if path and path != "-" else sys.stdout
+
+
+def _write_json(obj, path):
+    """Indented JSON to ``path``, or to stdout when it is None or "-"."""
+    out = _open_out(path)
+    try:
+        _dump(obj, out, indent=2)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+def load_case(path, hint="give one case"):
+    """The single case of a case file; exits when the file holds several."""
+    cases = load_cases(path)
+    if len(cases) != 1:
+        raise SystemExit(f"{path} holds {len(cases)} cases; {hint}.")
+    return cases[0]
+
+
+# ------------------------------------------------------------------
+# Commands
+# ------------------------------------------------------------------
+_cache = None
+
+
+def _design(case, keep_sweeps=False):
+    """run_design, through the design cache when one is open (curves are never cached)."""
+    from engine.design import run_design
+
+    if _cache is None or keep_sweeps:
+        return run_design(case, keep_sweeps=keep_sweeps)
+    return _cache.design(case)
+
+
+def _design_or_error(item, keep_sweeps=False):
+    """Worker for ``batch``: never raises, errors are reported per case.
+
+    Returns the row and whether it came from this process's design cache.
+    """
+    index, case = item
+    name = case_name(case, index)
+    hits = _cache.hits if _cache is not None else 0
+    try:
+        row = dict({"name": name}, **_design(case, keep_sweeps))
+    except Exception as exc:
+        row = {"name": name, "error": f"{type(exc).__name__}: {exc}"}
+    return row, _cache is not None and _cache.hits > hits
+
+
+def _warm_catalogues(cache_path=None):
+    """Load the catalogues (and open the design cache) once per process."""
+    global _cache
+    from engine.catalogues import get_catalogues
+    get_catalogues()
+    if cache_path:
+        import sqlite3
+        from engine.cache import DesignCache
+        try:
+            _cache = DesignCache(cache_path)
+        except sqlite3.Error as exc:
+            print(f"design cache disabled: {exc}", file=sys.stderr)
+
+
+def _cache_path(args):
+    if args.no_cache:
+        return None
+    from engine.cache import CACHE_FILE
+    from engine.resources import app_dir
+    return args.cache or os.path.join(app_dir(), CACHE_FILE)
+
+
+def cmd_design(args):
+    from engine.design import write_report
+
+    case = load_case(args.case, "use 'batch'")
+    _warm_catalogues(_cache_path(args))
+    result = _design(case, keep_sweeps=bool(args.pdf or args.project))
+    if args.pdf:
+        with tempfile.TemporaryDirectory() as img_folder:
+            write_report(result, args.pdf, img_folder)
+        print(f"Report saved to: {args.pdf}", file=sys.stderr)
+    if args.project:
+        from engine.project import save_project
+
+        save_project(args.project, [result])
+        print(f"Project saved to: {args.project}", file=sys.stderr)
+    result.pop("sweeps", None)
+    result.pop("diameters", None)
+    _write_json(result, args.output)
+    return 0
+
+
+def cmd_report(args):
+    args.pdf, args.output, args.project = args.pdf_path, os.devnull, None
+    args.no_cache, args.cache = True, None
+    return cmd_design(args)
+
+
+def cmd_batch(args):
+    cases = load_cases(args.cases)
+    items = list(enumerate(cases))
+    cache_path = _cache_path(args)
+    failed = hits = 0
+    designs, tables = [], []
+    if args.table:
+        from engine.results import MaterialResults
+    work = functools.partial(_design_or_error, keep_sweeps=bool(args.project))
+
+    def write(rows, out):
+        nonlocal failed, hits
+        for index, (row, hit) in enumerate(rows):
+            failed += "error" in row
+            hits += hit
+            if args.table and "error" not in row:
+                tables.append(MaterialResults.from_design(row, index))
+            if args.project and "error" not in row:
+                designs.append(row)
+                row = {k: v for k, v in row.items() if k not in ("sweeps", "diameters")}
+            _dump(row, out)
+
+    out = _open_out(args.output)
+    try:
+        if args.jobs > 1:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(args.jobs, initializer=_warm_catalogues,
+                                     initargs=(cache_path,)) as pool:
+                write(pool.map(work, items, chunksize=max(1, len(items) // (args.jobs * 8))), out)
+        else:
+            _warm_catalogues(cache_path)
+            write(map(work, items), out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    cached = f", {hits} from the design cache" if cache_path else ""
+    print(f"{len(items) - failed}/{len(items)} cases designed{cached}", file=sys.stderr)
+    if args.project:
+        from engine.project import save_project
+
+        save_project(args.project, designs, os.path.splitext(os.path.basename(args.project))[0])
+        print(f"Project saved to: {args.project}", file=sys.stderr)
+    if args.table:
+        _write_table(args.table, tables)
+    return 1 if failed else 0
+
+
+def _write_table(path, tables):
+    """Per-material results of all cases: .npy keeps the structured array, else CSV."""
+    import numpy as np
+    from engine.results import MaterialResults
+
+    table = MaterialResults.concat(tables)
+    if path.lower().endswith(".npy"):
+        np.save(path, table.records)
+    else:
+        table.to_frame().to_csv(path, index=False)
+    print(f"{len(table)} material rows saved to: {path}", file=sys.stderr)
+
+
+def cmd_stream(args):
+    from engine.stream import stream_batch
+
+    t0 = time.perf_counter()
+    progress = lambda rows: print(f"\r{rows:,} cases", end="", file=sys.stderr, flush=True)
+    summary = stream_batch(args.cases, args.output, args.chunk, args.resume, progress=progress)
+    done = summary["rows"] - summary["resumed_from"]
+    print(f"\r{summary['rows'] - summary['failed']:,}/{summary['rows']:,} cases designed "
+          f"({done:,} in {time.perf_counter() - t0:.1f} s)", file=sys.stderr)
+    return 1 if summary["failed"] else 0
+
+
+def cmd_project(args):
+    from engine.project import load_project
+
+    t0 = time.perf_counter()
+    project = load_project(args.project)
+    print(f"{project.name}: {len(project)} segment(s), opened in "
+          f"{(time.perf_counter() - t0) * 1e3:.1f} ms")
+    print(f"{'#':>4}  {'fluid':<18} {'Q (m³/h)':>9} {'L (m)':>9}  {'recommended':<28} {'total cost':>12}")
+    for i, seg in enumerate(project.segments):
+        case, rec = seg["case"], seg["recommended"]
+        cost = f"{seg['prices'][rec]['total_cost']:12,.0f}" if rec else f"{'—':>12}"
+        print(f"{i + 1:>4}  {case['fluid'][:18]:<18} {case['flowrate']:9g} {case['length']:9g}  "
+              f"{(rec or 'none')[:28]:<28} {cost}")
+    return 0
+
+
+def cmd_catalogue(args):
+    from engine.catalogue_db import DB_FILE, TABLES, CatalogueDB
+    from engine.resources import app_dir
+
+    folder = args.folder or app_dir()
+    with CatalogueDB(os.path.join(folder, DB_FILE)) as db:
+        if args.action == "import":
+            done = db.import_excel(folder, force=args.force)
+            print(f"imported: {', '.join(done) if done else 'nothing changed'}")
+        elif args.action == "export":
+            db.export_excel(folder)
+            print(f"workbooks written to {folder}")
+        print(f"{db.path} (version {db.version})")
+        for table in TABLES:
+            rows = db.conn.execute(f'SELECT count(*) FROM "{table}"').fetchone()[0] \
+                if db.has_table(table) else "-"
+            print(f"  {table:<10} {rows:>6} rows")
+    return 0
+
+
+def cmd_bench(args):
+    t0 = time.perf_counter()
+    from engine.catalogues import get_catalogues
+    from engine.design import run_design
+    t_import = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    get_catalogues()
+    t_load = time.perf_counter() - t0
+
+    path = args.cases or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                      "benchmarks", "reference_cases.json")
+    cases = load_cases(path)
+    print(f"import engine      {t_import * 1e3:9.1f} ms")
+    print(f"load catalogues    {t_load * 1e3:9.1f} ms")
+    print(f"{'case':<24} {'min (ms)':>9} {'mean (ms)':>10}")
+    for i, case in enumerate(cases):
+        times = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            run_design(case)
+            times.append(time.perf_counter() - t0)
+        print(f"{case_name(case, i)[:24]:<24} {min(times) * 1e3:9.2f} {sum(times) / len(times) * 1e3:10.2f}")
+    return 0
+
+
+def cmd_uncertainty(args):
+    from engine.uncertainty import monte_carlo
+
+    case = load_case(args.case)
+    t0 = time.perf_counter()
+    result = monte_carlo(case, args.samples, args.seed, args.jobs)
+    print(f"{args.samples:,} samples in {time.perf_counter() - t0:.2f} s", file=sys.stderr)
+    _write_json(result, args.output)
+    return 0
+
+
+def cmd_sweep(args):
+    from engine.sweep import parametric_sweep
+
+    case = load_case(args.case)
+    t0 = time.perf_counter()
+    space = parametric_sweep(case, args.flowrate, args.length, args.dp_max)
+    print(f"{space!r}: {space.dcrit.size:,} designs in {time.perf_counter() - t0:.2f} s",
+          file=sys.stderr)
+    if args.output.lower().endswith(".csv"):
+        space.to_frame().to_csv(args.output, index=False)
+    else:
+        space.save(args.output)
+    return 0
+
+
+def cmd_economic(args):
+    import pandas as pd
+    from engine.economics import economic_diameter
+
+    case = load_case(args.case)
+    t0 = time.perf_counter()
+    eco = economic_diameter(case, lifetime=args.lifetime, discount_rate=args.rate,
+                            tariff=args.tariff, efficiency=args.efficiency, hours=args.hours)
+    print(f"{eco!r} priced in {(time.perf_counter() - t0) * 1e3:.1f} ms", file=sys.stderr)
+    if args.curve:
+        curves = [eco.curve(m) for m in eco.materials]
+        pd.concat(curves, ignore_index=True).to_csv(args.curve, index=False)
+        print(f"Cost curves saved to: {args.curve}", file=sys.stderr)
+    _write_json(eco.summary(), args.output)
+    return 0
+
+
+def cmd_rate(args):
+    from engine.rating import rate_schedule
+
+    case = load_case(args.case)
+    t0 = time.perf_counter()
+    rating = rate_schedule(case, materials=args.material)
+    print(f"{rating!r} rated in {(time.perf_counter() - t0) * 1e3:.1f} ms", file=sys.stderr)
+    if args.table:
+        rating.table().to_csv(args.table, index=False)
+        print(f"Rating table saved to: {args.table}", file=sys.stderr)
+    _write_json(rating.summary(), args.output)
+    return 0
+
+
+def cmd_pareto(args):
+    from engine.pareto import pareto_designs
+
+    case = load_case(args.case)
+    t0 = time.perf_counter()
+    pareto = pareto_designs(case, materials=args.material, objectives=args.objective)
+    print(f"{pareto!r} in {(time.perf_counter() - t0) * 1e3:.1f} ms", file=sys.stderr)
+    if args.table:
+        pareto.table(front_only=not args.all).to_csv(args.table, index=False)
+        print(f"Candidate table saved to: {args.table}", file=sys.stderr)
+    if args.plot:
+        from engine.plots import pareto_figure, save_figure
+
+        axes = pareto.objectives + [o for o in ("cost", "dp_bar") if o not in pareto.objectives]
+        save_figure(pareto_figure(pareto, *axes[:2]), args.plot)
+        print(f"Scatter saved to: {args.plot}", file=sys.stderr)
+    _write_json(pareto.summary(), args.output)
+    return 0
+
+
+def cmd_surge(args):
+    from engine.design import run_design
+    from engine.transient import surge_design
+
+    case = load_case(args.case)
+    result = run_design(case)
+    materials = [t["Material"] for t in result["thickness"]] if args.all else args.material
+    t0 = time.perf_counter()
+    surge = surge_design(result, materials, closure_time=args.closure, reaches=args.reaches,
+                         bulk_modulus=args.bulk_modulus)
+    print(f"{len(surge)} pipe(s) simulated in {time.perf_counter() - t0:.2f} s", file=sys.stderr)
+    for mat, s in surge.items():
+        print(f"{mat[:28]:<28} NPS {s['NPS']:>6}  peak {s['p_max_bar']:8.2f} bar  "
+              f"allowable {s['allowable_bar']:8.2f} bar ({s['governs']})  {'ok' if s['ok'] else 'EXCEEDED'}"
+              f"{'  (cavitation)' if s['cavitation'] else ''}", file=sys.stderr)
+    _write_json(surge, args.output)
+    return 0 if all(s["ok"] for s in surge.values()) else 1
+
+
+def cmd_charts(args):
+    from engine.charts import CHART_FILE, build_charts, load_charts
+    from engine.resources import app_dir
+
+    path = args.file or os.path.join(app_dir(), CHART_FILE)
+    if args.action == "build":
+        t0 = time.perf_counter()
+        build_charts(path, fluids=args.fluid, per_decade=args.per_decade,
+                     progress=lambda done, total: print(f"\r{done}/{total} fluids", end="", file=sys.stderr))
+        print(f"\nCharts written to {path} in {time.perf_counter() - t0:.1f} s", file=sys.stderr)
+    charts = load_charts(path)
+    if args.action != "lookup":
+        print(f"{charts!r}, {os.path.getsize(path) / 2 ** 20:.1f} MB")
+        for dim, (lo, hi, n) in charts.axes.items():
+            print(f"  {dim:<9} {lo:g} … {hi:g} ({n} points)")
+        print(f"  built from the current catalogues: {'yes' if charts.is_current() else 'no'}")
+        return 0
+    if not args.case:
+        raise SystemExit("charts lookup needs a CASE file")
+    case = load_case(args.case)
+    _write_json(charts.lookup_case(case), None)
+    return 0
+
+
+def cmd_serve(args):
+    from engine.service import run
+
+    run(args.host, args.port, args.workers, args.batch_window_ms)
+    return 0
+
+
+# ------------------------------------------------------------------
+# Entry point
+# ------------------------------------------------------------------
+def _cache_arguments(p):
+    p.add_argument("--cache", help="design cache file (default: design_cache.sqlite in the app folder)")
+    p.add_argument("--no-cache", action="store_true", help="always recompute, do not use the design cache")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m engine",
+                                     description="Headless Pipe Design Optimizer.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("design", help="design one case and print the JSON result")
+    p.add_argument("case", help="case file (.json/.yaml)")
+    p.add_argument("-o", "--output", help="write the JSON result here instead of stdout")
+    p.add_argument("--pdf", help="also build the PDF report")
+    p.add_argument("--project", help="also save a project file (.pdo) with the ΔP curves")
+    _cache_arguments(p)
+    p.set_defaults(func=cmd_design)
+
+    p = sub.add_parser("batch", help="design many cases, one JSON line per case")
+    p.add_argument("cases", help="case list (.json/.jsonl/.yaml)")
+    p.add_argument("-o", "--output", help="JSON-lines output file (default stdout)")
+    p.add_argument("-j", "--jobs", type=int, default=1, help="worker processes (default 1)")
+    p.add_argument("--project", help="also save the designed cases as segments of a project (.pdo)")
+    p.add_argument("--table", help="also save one row per (case, material) to a .csv or .npy table")
+    _cache_arguments(p)
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser("stream", help="design a large case table chunk by chunk, with resume")
+    p.add_argument("cases", help="case table (.csv or .parquet), one case per row")
+    p.add_argument("-o", "--output", required=True, help="summary table (.csv or .parquet directory)")
+    p.add_argument("--chunk", type=int, default=10000, help="cases per chunk (default 10000)")
+    p.add_argument("--resume", action="store_true", help="continue an interrupted run from its checkpoint")
+    p.set_defaults(func=cmd_stream)
+
+    p = sub.add_parser("project", help="list the segments of a project file")
+    p.add_argument("project", help="project file (.pdo)")
+    p.set_defaults(func=cmd_project)
+
+    p = sub.add_parser("report", help="design one case and build the PDF report")
+    p.add_argument("case", help="case file (.json/.yaml)")
+    p.add_argument("pdf_path", help="PDF file to write")
+    p.set_defaults(func=cmd_report)
+
+    p = sub.add_parser("catalogue", help="SQLite catalogue: show, import or export the workbooks")
+    p.add_argument("action", choices=["info", "import", "export"])
+    p.add_argument("--folder", help="folder of the workbooks and catalogue.sqlite (default: app folder)")
+    p.add_argument("--force", action="store_true", help="import even unchanged workbooks")
+    p.set_defaults(func=cmd_catalogue)
+
+    p = sub.add_parser("bench", help="time the design chain on reference cases")
+    p.add_argument("cases", nargs="?", help="case list (default: benchmarks/reference_cases.json)")
+    p.add_argument("-n", "--repeat", type=int, default=20, help="runs per case (default 20)")
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("uncertainty", help="Monte Carlo P10/P50/P90 critical diameters")
+    p.add_argument("case", help="case file (.json/.yaml); optional 'uncertainty' entry")
+    p.add_argument("-n", "--samples", type=int, default=100000, help="realizations (default 100000)")
+    p.add_argument("--seed", type=int, help="random seed (default: fresh, reported in the output)")
+    p.add_argument("-j", "--jobs", type=int, default=0, help="worker processes (default: one per CPU)")
+    p.add_argument("-o", "--output", help="write the JSON result here instead of stdout")
+    p.set_defaults(func=cmd_uncertainty)
+
+    p = sub.add_parser("sweep", help="critical diameter over a flowrate × length × ΔP-max grid")
+    p.add_argument("case", help="case file (.json/.yaml) giving the nominal values")
+    for axis, unit in (("flowrate", "m³/h"), ("length", "m"), ("dp-max", "bar")):
+        p.add_argument(f"--{axis}", help=f"{unit}: START:STOP:NUM or V1,V2,... (default: case value)")
+    p.add_argument("-o", "--output", required=True, help="result file (.npz, or .csv long form)")
+    p.set_defaults(func=cmd_sweep)
+
+    p = sub.add_parser("economic", help="NPV-optimal pipe: installed cost + discounted pumping energy")
+    p.add_argument("case", help="case file (.json/.yaml); optional 'economics' entry")
+    p.add_argument("--lifetime", type=float, help="years of operation (default 20)")
+    p.add_argument("--rate", type=float, help="discount rate per year (default 0.08)")
+    p.add_argument("--tariff", type=float, help="energy price per kWh (default 0.12)")
+    p.add_argument("--efficiency", type=float, help="pump and motor efficiency (default 0.75)")
+    p.add_argument("--hours", type=float, help="operating hours per year (default 8000)")
+    p.add_argument("--curve", help="also save the cost curve of every material to a CSV file")
+    p.add_argument("-o", "--output", help="write the JSON result here instead of stdout")
+    p.set_defaults(func=cmd_economic)
+
+    p = sub.add_parser("rate", help="maximum flowrate of every schedule pipe (capacity rating)")
+    p.add_argument("case", help="case file (.json/.yaml); 'flowrate' optional")
+    p.add_argument("--material", action="append", help="material to rate (repeatable; default: compatible)")
+    p.add_argument("--table", help="also save one row per material and schedule pipe to a CSV file")
+    p.add_argument("-o", "--output", help="write the JSON result here instead of stdout")
+    p.set_defaults(func=cmd_rate)
+
+    p = sub.add_parser("pareto", help="non-dominated (material, OD, wall) candidates on several objectives")
+    p.add_argument("case", help="case file (.json/.yaml)")
+    p.add_argument("--material", action="append", help="material to include (repeatable; default: compatible)")
+    p.add_argument("--objective", action="append",
+                   help="objective to compare (repeatable; default: all of cost, dp_bar, "
+                        "velocity_margin, mass_kg, thickness_margin)")
+    p.add_argument("--table", help="also save the non-dominated candidates to a CSV file")
+    p.add_argument("--all", action="store_true", help="with --table, save every candidate with its flags")
+    p.add_argument("--plot", help="save a scatter of the first two objectives to an image file")
+    p.add_argument("-o", "--output", help="write the JSON result here instead of stdout")
+    p.set_defaults(func=cmd_pareto)
+
+    p = sub.add_parser("surge", help="valve-closure water hammer on the designed pipe (MOC)")
+    p.add_argument("case", help="case file (.json/.yaml) of a liquid line")
+    p.add_argument("--material", action="append", help="material to check (repeatable; default: recommended)")
+    p.add_argument("--all", action="store_true", help="check the schedule pipe of every material")
+    p.add_argument("--closure", type=float, default=5.0, help="valve closure time in s (default 5)")
+    p.add_argument("--reaches", type=int, default=500, help="pipe reaches of the grid (default 500)")
+    p.add_argument("--bulk-modulus", type=float, default=2.2e9, help="liquid bulk modulus in Pa (default 2.2e9)")
+    p.add_argument("-o", "--output", help="write the JSON result here instead of stdout")
+    p.set_defaults(func=cmd_surge)
+
+    p = sub.add_parser("charts", help="precomputed dcrit charts: build, show, or look up a case")
+    p.add_argument("action", choices=["build", "info", "lookup"])
+    p.add_argument("case", nargs="?", help="case file (.json/.yaml) for lookup")
+    p.add_argument("--file", help="chart file (default: design_charts.npz in the app folder)")
+    p.add_argument("--fluid", action="append", help="fluid to tabulate (repeatable; default: all)")
+    p.add_argument("--per-decade", type=int, default=6, help="grid points per decade (default 6)")
+    p.set_defaults(func=cmd_charts)
+
+    p = sub.add_parser("serve", help="run the local HTTP calculation service")
+    p.add_argument("--host", default="127.0.0.1", help="bind address (default 127.0.0.1)")
+    p.add_argument("--port", type=int, default=8765, help="TCP port (default 8765)")
+    p.add_argument("-w", "--workers", type=int, default=None,
+                   help="worker processes (default: one per CPU, 0 = in-process)")
+    p.add_argument("--batch-window-ms", type=float, default=2.0,
+                   help="how long to collect requests into one batch (default 2 ms)")
+    p.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (ValueError, OSError, ImportError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
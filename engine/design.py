@@ -0,0 +1,231 @@
+"""Headless version of the GUI workflow: one case in, one design out.
+
+A *case* carries the same inputs as the input form and the pressure-drop
+page::
+
+    {"project_name": "Line 12", "flowrate": 250, "length": 5000,
+     "phase": "Liquid", "fluid": "Crude Oil", "location": "<46 buildings",
+     "velocity": 3.0, "temperature": 50, "pressure": 60,
+     "design_pressure": 80, "corrosion_allowance": 3, "dp_max": 5,
+     "fittings": [["gate valve", 2], ["coude  90◦", 4]]}
+
+Units are those of the GUI: m³/h, m, m/s, °C, bar and mm. A ``"Two-phase"``
+case also names a ``"gas"``, its ``"gas_fraction"`` and optionally a
+``"correlation"`` (see :mod:`engine.twophase`); ``"fluid"`` is then the liquid.
+Instead of a fixed ``"velocity"`` a case may choose a ``"velocity_limit"``
+model such as the API RP 14E erosional velocity (see :mod:`engine.velocity`).
+"""
+from pathlib import Path
+
+from engine import catalogues as cat_mod
+from engine.hydraulics import (
+    diameter_grid, material_hydraulics, resolve_fittings, velocity_critical_diameter,
+)
+from engine.pricing import calculate_pipe_prices
+from engine.rheology import model_name
+from engine.thickness import F_MAP, thickness_schedule
+from engine.twophase import CORRELATIONS, DEFAULT_CORRELATION, PHASE as TWO_PHASE, TwoPhaseFlow
+from engine.velocity import parse_velocity_limit, velocity_limit
+
+NUMERIC_FIELDS = ("flowrate", "length", "velocity", "temperature", "pressure",
+                  "design_pressure", "corrosion_allowance", "dp_max")
+POSITIVE_FIELDS = ("flowrate", "length", "velocity", "dp_max")
+DEFAULTS = {"project_name": "Untitled Project", "phase": "Liquid",
+            "location": "<10 buildings", "fittings": []}
+
+
+# ------------------------------------------------------------------
+# Case handling
+# ------------------------------------------------------------------
+def normalize_case(case):
+    """Validated copy of a case with defaults filled in; raises ValueError."""
+    if not isinstance(case, dict):
+        raise ValueError("A case must be a JSON object.")
+    out = dict(DEFAULTS)
+    out.update(case)
+    parse_velocity_limit(out)
+    missing = [k for k in NUMERIC_FIELDS + ("fluid",) if out.get(k) in (None, "")]
+    if missing:
+        raise ValueError(f"Case is missing: {', '.join(missing)}")
+    for key in NUMERIC_FIELDS:
+        try:
+            out[key] = float(out[key])
+        except (TypeError, ValueError):
+            raise ValueError(f"'{key}' must be a number, got {out[key]!r}") from None
+    for key in POSITIVE_FIELDS:
+        if not out[key] > 0:                        # NaN too
+            raise ValueError(f"'{key}' must be positive, got {out[key]:g}")
+    if out["phase"] not in ("Liquid", "Gas", TWO_PHASE):
+        raise ValueError(f"'phase' must be 'Liquid', 'Gas' or '{TWO_PHASE}', got {out['phase']!r}")
+    if out["phase"] == TWO_PHASE:
+        if out.get("gas") in (None, "") or out.get("gas_fraction") in (None, ""):
+            raise ValueError("A two-phase case needs 'gas' and 'gas_fraction'")
+        try:
+            out["gas_fraction"] = float(out["gas_fraction"])
+        except (TypeError, ValueError):
+            raise ValueError(f"'gas_fraction' must be a number, got {out['gas_fraction']!r}") from None
+        if not 0 <= out["gas_fraction"] <= 1:
+            raise ValueError("'gas_fraction' must be between 0 and 1")
+        out["correlation"] = out.get("correlation") or DEFAULT_CORRELATION
+        if out["correlation"] not in CORRELATIONS:
+            raise ValueError(f"'correlation' must be one of {list(CORRELATIONS)}")
+    if out["location"] not in F_MAP:
+        raise ValueError(f"'location' must be one of {list(F_MAP)}")
+
+    fittings = out["fittings"]
+    if isinstance(fittings, dict):
+        fittings = fittings.items()
+    try:
+        out["fittings"] = [[str(typ), int(n)] for typ, n in fittings]
+    except (TypeError, ValueError):
+        raise ValueError("'fittings' must be [type, count] pairs or a {type: count} object") from None
+    return out
+
+
+# ------------------------------------------------------------------
+# Design chain
+# ------------------------------------------------------------------
+def run_design(case, catalogues=None, keep_sweeps=False):
+    """Compatibility → ΔP sweep → thickness/schedule → prices for one case.
+
+    Returns plain Python values (JSON-serialisable). With ``keep_sweeps`` the
+    ΔP curves are kept under ``"sweeps"`` as arrays for plotting.
+    """
+    case = normalize_case(case)
+    cat = catalogues or cat_mod.get_catalogues()
+    two_phase = rheology = None
+    if case["phase"] == TWO_PHASE:
+        two_phase = TwoPhaseFlow.from_case(case, cat)
+        rho, mu = two_phase.rho, two_phase.mu
+    else:
+        try:
+            rho, mu = cat_mod.fluid_properties(cat.liquid_df, cat.gas_df, case["phase"], case["fluid"])
+        except (IndexError, KeyError):
+            raise ValueError(f"Unknown {case['phase'].lower()}: {case['fluid']!r}") from None
+        if case["phase"] == "Liquid":
+            rheology = cat_mod.fluid_rheology(cat.liquid_df, case["fluid"])
+
+    vmax = velocity_limit(case, rho, mu)
+    if "velocity_limit" in case:
+        case["velocity"] = vmax                  # the limit the design used
+    Q, L = case["flowrate"], case["length"]
+    dp_max = case["dp_max"] * 1e5
+    fittings = resolve_fittings(cat.fittings_df, case["fittings"])
+    materials = cat_mod.get_compatible_materials(cat.material_df, case["temperature"], case["pressure"])
+    dcrit_velocity = velocity_critical_diameter(Q, vmax)
+
+    diameters = diameter_grid()
+    sweeps, per_material, pressure_drop_results = {}, {}, {}
+    roughness = [cat_mod.material_roughness(cat.material_df, mat) for mat in materials]
+    hydraulics = material_hydraulics(roughness, Q, L, rho, mu, vmax, fittings, dp_max, diameters,
+                                     two_phase=two_phase, rheology=rheology)
+    for mat, (td, dcrit, calc) in zip(materials, hydraulics):
+        sweeps[mat] = td
+        pressure_drop_results[mat] = {
+            "Critical Diameter (m)": dcrit,
+            "Critical Diameter (mm)": dcrit * 1000 if dcrit else None
+        }
+        per_material[mat] = {"dcrit": dcrit, "calculation": _plain(calc)}
+
+    thickness = thickness_schedule(materials, cat.material_df, cat.sched_df, dcrit_velocity,
+                                   pressure_drop_results, F_MAP[case["location"]],
+                                   case["design_pressure"] * 1e5, case["corrosion_allowance"])
+    prices = calculate_pipe_prices(thickness, cat.material_df, cat.fittings_df,
+                                   case["fittings"], L)
+    result = {
+        "case": case,
+        "fluid": {"rho": rho, "mu": mu},
+        "compatible_materials": materials,
+        "dcrit_velocity": dcrit_velocity,
+        "materials": per_material,
+        "thickness": _plain(thickness),
+        "prices": _plain(prices),
+        "recommended": min(prices, key=lambda m: prices[m]["total_cost"]) if prices else None,
+    }
+    if two_phase is not None:
+        result["fluid"]["two_phase"] = two_phase.summary()
+    if rheology is not None:
+        result["fluid"]["rheology"] = dict(zip(("n", "K", "tau0"), rheology),
+                                           model=model_name(rheology))
+    if keep_sweeps:
+        result["sweeps"] = sweeps
+        result["diameters"] = diameters
+    return result
+
+
+def _plain(value):
+    """numpy / pandas scalars → Python values, recursively."""
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+# ------------------------------------------------------------------
+# Report
+# ------------------------------------------------------------------
+def report_arguments(result, catalogues=None):
+    """Keyword arguments for ``build_pipeline_report``, as the GUI assembles them."""
+    cat = catalogues or cat_mod.get_catalogues()
+    case = result["case"]
+    inputs = {
+        "project_name": case["project_name"],
+        "flowrate_m3h": case["flowrate"],
+        "pipe_length_m": case["length"],
+        "phase": case["phase"],
+        "fluid": (f"{case['fluid']} + {case['gas']} ({case['gas_fraction']:.0%} gas, "
+                  f"{case['correlation']})" if case["phase"] == TWO_PHASE else case["fluid"]),
+        "max_velocity_mps": case["velocity"],
+        "temperature_c": case["temperature"],
+        "operating_pressure_bar": case["pressure"],
+        "design_pressure_bar": case["design_pressure"],
+        "location_type": case["location"],
+        "fittings": [tuple(f) for f in case["fittings"] if f[0].strip() and f[1] > 0],
+    }
+
+    compatible = []
+    for mat in result["compatible_materials"]:
+        row = cat.material_df[cat.material_df["Material"] == mat].iloc[0]
+        compatible.append((mat, float(row["Temperature Min"]), float(row["Temperature Max"]),
+                           float(row["Pressure Min"]), float(row["Pressure Max"])))
+
+    dcrits = [m["dcrit"] for m in result["materials"].values() if m["dcrit"] is not None]
+    plots = {
+        "dcrit_velocity": result["dcrit_velocity"],
+        "dcrit_pressure": min(dcrits, default=0),
+        "chosen_d": min(result["dcrit_velocity"], *dcrits),
+    }
+
+    # Results – first material for the legacy hydraulic results
+    calc = None
+    if result["compatible_materials"]:
+        calc = result["materials"][result["compatible_materials"][0]]["calculation"]
+    if calc:
+        results = {"V": calc["velocity"], "Re": calc["reynolds"], "lambda": calc["lambda"],
+                   "H": calc["H"], "dp_linear": calc["dp_linear"], "dp_singular": calc["dp_singular"]}
+        fittings = [(ft, n, K) for ft, n, K in calc["details"]]
+    else:
+        results = {"V": 0, "Re": 0, "lambda": 0, "H": 0, "dp_linear": 0, "dp_singular": 0}
+        fittings = []
+
+    return dict(inputs=inputs, compatible=compatible, plots=plots,
+                thickness_results=result["thickness"], results=results,
+                fittings=fittings, prices=result["prices"])
+
+
+def write_report(result, file_path, img_folder):
+    """Render the plots of a ``run_design(..., keep_sweeps=True)`` result and build the PDF."""
+    from engine.plots import pressure_drop_figure, save_figure, velocity_figure
+    from engine.report import build_pipeline_report
+
+    case = result["case"]
+    img_folder = Path(img_folder)
+    img_folder.mkdir(parents=True, exist_ok=True)
+    save_figure(velocity_figure(case["flowrate"], case["velocity"], result["dcrit_velocity"]),
+                img_folder / "velocity_vs_diameter.png")
+    save_figure(pressure_drop_figure(result["diameters"], result["sweeps"], case["dp_max"] * 1e5),
+                img_folder / "pressure_drop_vs_diameter.png")
+    build_pipeline_report(**report_arguments(result), file_path=Path(file_path), img_folder=img_folder)
@@ -0,0 +1,194 @@
+"""Economic pipe diameter: installed cost plus discounted pumping energy.
+
+The design chain picks the *smallest* standard pipe that meets the velocity,
+ΔP and wall-thickness limits. A larger pipe costs more steel but less pumping
+energy over the life of the line; :func:`economic_diameter` prices every
+schedule entry for every compatible material in one broadcast and returns an
+:class:`EconomicDesign` with the NPV-optimal size and the cost curve::
+
+    eco = economic_diameter(case, lifetime=25, discount_rate=0.07, tariff=0.15)
+    eco.recommended                     # (material, schedule row) of least NPV
+    eco.best("API 5L X52 (SAW)")        # its optimum as a dict
+    eco.curve("API 5L X52 (SAW)")       # cost vs size, cheapest wall per OD
+
+Per (material, schedule entry)::
+
+    capital    = (steel mass · price/kg + fittings) · MARKUP
+    energy NPV = ΔP·Q / efficiency · hours/year · tariff · annuity(lifetime, rate)
+
+Steel and fittings are priced as in :mod:`engine.pricing`. A pipe is feasible
+when its velocity and ΔP are within the case limits and its wall is at least
+the required thickness for its bore. The parameters may also be given in the
+case as an ``"economics"`` object with the same names.
+"""
+import numpy as np
+import pandas as pd
+
+from engine import catalogues as cat_mod
+from engine.design import normalize_case
+from engine.hydraulics import pack_fittings, pressure_drop, resolve_fittings
+from engine.pricing import MARKUP, fittings_cost, pipe_mass
+from engine.thickness import F_MAP, required_thickness
+from engine.velocity import velocity_limit
+
+LIFETIME_YEARS = 20
+DISCOUNT_RATE = 0.08       # per year
+TARIFF = 0.12              # currency per kWh, the currency of the catalogue prices
+PUMP_EFFICIENCY = 0.75     # pump × motor
+HOURS_PER_YEAR = 8000
+PARAMETERS = ("lifetime", "discount_rate", "tariff", "efficiency", "hours")
+DEFAULTS = dict(zip(PARAMETERS, (LIFETIME_YEARS, DISCOUNT_RATE, TARIFF, PUMP_EFFICIENCY,
+                                 HOURS_PER_YEAR)))
+
+
+def annuity_factor(lifetime, rate):
+    """Present value of 1 per year over ``lifetime`` years at discount ``rate``."""
+    if rate == 0:
+        return float(lifetime)
+    return (1 - (1 + rate) ** -lifetime) / rate
+
+
+class EconomicDesign:
+    """Cost of every (material, schedule entry) pair; NaN where the pipe is not feasible."""
+
+    def __init__(self, materials, schedule, dp, capital, energy_npv, feasible, parameters=None):
+        self.materials = list(materials)
+        self.schedule = schedule.reset_index(drop=True)
+        self.dp = dp                         # Pa, (materials, entries)
+        self.capital = capital
+        self.energy_npv = energy_npv
+        self.feasible = feasible
+        self.total = np.where(feasible, capital + energy_npv, np.nan)
+        self.parameters = dict(parameters or {})
+
+    def __repr__(self):
+        return (f"<EconomicDesign: {len(self.materials)} material(s) × {len(self.schedule)} "
+                f"schedule entries, {int(self.feasible.sum())} feasible>")
+
+    def _row(self, material):
+        try:
+            return self.materials.index(material)
+        except ValueError:
+            raise KeyError(f"{material!r} is not in the economic design") from None
+
+    def _describe(self, i, j):
+        entry = self.schedule.iloc[j]
+        od, t = float(entry["Outside diameter (mm)"]), float(entry["Wall thickness (mm)"])
+        return {
+            "Material": self.materials[i],
+            "NPS": str(entry.get("Nominal size (inches)", "N/A")),
+            "OD_norm_mm": od,
+            "t_norm_mm": t,
+            "ID_mm": od - 2 * t,
+            "dp_bar": float(self.dp[i, j]) / 1e5,
+            "capital": float(self.capital[i, j]),
+            "energy_npv": float(self.energy_npv[i, j]),
+            "total_npv": float(self.total[i, j]),
+        }
+
+    def best(self, material):
+        """NPV-optimal pipe of one material as a dict, or None if nothing is feasible."""
+        i = self._row(material)
+        if not self.feasible[i].any():
+            return None
+        return self._describe(i, int(np.nanargmin(self.total[i])))
+
+    def smallest(self, material):
+        """Smallest feasible OD with its cheapest wall, to compare with :meth:`best`."""
+        i = self._row(material)
+        js = np.flatnonzero(self.feasible[i])
+        if not len(js):
+            return None
+        od = self.schedule["Outside diameter (mm)"].to_numpy(dtype=float)[js]
+        js = js[od == od.min()]
+        return self._describe(i, int(js[np.argmin(self.capital[i, js])]))
+
+    @property
+    def recommended(self):
+        """(material, schedule position) of the least total NPV, or None."""
+        if not self.feasible.any():
+            return None
+        i, j = np.unravel_index(np.nanargmin(self.total), self.total.shape)
+        return self.materials[i], int(j)
+
+    def curve(self, material):
+        """Cost curve of one material: cheapest feasible wall per OD, by increasing OD."""
+        i = self._row(material)
+        od = self.schedule["Outside diameter (mm)"].to_numpy(dtype=float)
+        js = np.flatnonzero(self.feasible[i])
+        js = js[np.lexsort((self.total[i, js], od[js]))]
+        js = js[np.unique(od[js], return_index=True)[1]]
+        return pd.DataFrame([self._describe(i, int(j)) for j in js])
+
+    def summary(self):
+        """JSON-ready result: parameters, optimum and smallest pipe per material."""
+        rec = self.recommended
+        return {
+            "parameters": self.parameters,
+            "materials": {m: {"economic": self.best(m), "smallest": self.smallest(m)}
+                          for m in self.materials},
+            "recommended": self._describe(self.materials.index(rec[0]), rec[1]) if rec else None,
+        }
+
+
+def economic_diameter(case, catalogues=None, materials=None, **parameters):
+    """Price every schedule entry for every material of ``case``; see the module docstring.
+
+    Keyword ``parameters`` (``lifetime`` years, ``discount_rate``, ``tariff``
+    per kWh, pump ``efficiency``, operating ``hours`` per year) override the
+    case's ``"economics"`` entry, which overrides :data:`DEFAULTS`.
+    """
+    case = normalize_case(case)
+    unknown = set(parameters) | set(case.get("economics") or {})
+    unknown -= set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown economic parameter(s): {', '.join(sorted(unknown))}")
+    params = dict(DEFAULTS)
+    params.update(case.get("economics") or {})
+    params.update((k, v) for k, v in parameters.items() if v is not None)
+    try:
+        params = {k: float(v) for k, v in params.items()}
+    except (TypeError, ValueError):
+        raise ValueError("Economic parameters must be numbers") from None
+    if params["efficiency"] <= 0 or params["efficiency"] > 1:
+        raise ValueError("'efficiency' must be in (0, 1]")
+    if params["lifetime"] < 0 or params["hours"] < 0 or params["discount_rate"] <= -1:
+        raise ValueError("'lifetime' and 'hours' must be ≥ 0 and 'discount_rate' > -1")
+
+    cat = catalogues or cat_mod.get_catalogues()
+    try:
+        rho, mu = cat_mod.fluid_properties(cat.liquid_df, cat.gas_df, case["phase"], case["fluid"])
+    except (IndexError, KeyError):
+        raise ValueError(f"Unknown {case['phase'].lower()}: {case['fluid']!r}") from None
+    rheology = None
+    if case["phase"] == "Liquid":
+        rheology = cat_mod.fluid_rheology(cat.liquid_df, case["fluid"])
+    if materials is None:
+        materials = cat_mod.get_compatible_materials(cat.material_df, case["temperature"], case["pressure"])
+    if cat.sched_df is None:
+        raise ValueError("No schedule table loaded")
+
+    # material columns (M, 1) and schedule rows (1, S)
+    rows = cat.material_df.drop_duplicates("Material").set_index("Material").reindex(materials)
+    number = lambda col: pd.to_numeric(rows[col], errors="coerce").to_numpy(dtype=float)[:, None]
+    E, Sy, price = number("Weld Joint Factor (E)"), number("SMYS (MPa)") * 1e6, number("Price")
+    k = np.array([cat_mod.material_roughness(cat.material_df, m) for m in materials])[:, None]
+    od = cat.sched_df["Outside diameter (mm)"].to_numpy(dtype=float)[None, :]
+    wall = cat.sched_df["Wall thickness (mm)"].to_numpy(dtype=float)[None, :]
+    inner = od - 2 * wall                                    # mm
+
+    Q, L = case["flowrate"], case["length"]
+    fittings = resolve_fittings(cat.fittings_df, case["fittings"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dp = pressure_drop(inner / 1000, Q, L, rho, mu, velocity_limit(case, rho, mu), k,
+                           pack_fittings([fittings]), rheology)
+        t_req = required_thickness(case["design_pressure"] * 1e5, inner, F_MAP[case["location"]],
+                                   E, Sy, case["corrosion_allowance"]) * 1000
+    capital = (pipe_mass(od, wall, L) * price
+               + fittings_cost(cat.fittings_df, case["fittings"])) * MARKUP
+    energy_kwh = dp * (Q / 3600) / params["efficiency"] * params["hours"] / 1000
+    energy_npv = energy_kwh * params["tariff"] * annuity_factor(params["lifetime"],
+                                                                params["discount_rate"])
+    feasible = ((inner > 0) & (dp <= case["dp_max"] * 1e5) & (wall >= t_req)
+                & np.isfinite(capital) & np.isfinite(energy_npv))
+    return EconomicDesign(materials, cat.sched_df, dp, capital, energy_npv, feasible, params)
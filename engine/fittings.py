@@ -0,0 +1,108 @@
+"""Fittings list of a line: the (type, count) rows behind the fittings editor.
+
+:class:`FittingList` is the plain data model the GUI table shows; lists are
+pasted from a spreadsheet or imported from CSV with :func:`parse_fitting_table`
+(one ``type, count`` row per line, comma, semicolon or tab separated, an
+optional header line and types matched to the catalogue ignoring case and
+surrounding spaces).
+"""
+import csv
+import io
+
+
+class FittingList:
+    """Ordered (type, count) rows; counts are non-negative integers."""
+
+    def __init__(self, rows=()):
+        self.rows = []
+        self.extend(rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __getitem__(self, index):
+        return self.rows[index]
+
+    @staticmethod
+    def _count(value):
+        count = float(str(value).strip() or 0)          # "4", "4.0", 4
+        if count < 0 or not count.is_integer():
+            raise ValueError(f"A fitting count must be a whole number ≥ 0, got {value!r}")
+        return int(count)
+
+    def append(self, typ="", count=0):
+        self.rows.append((str(typ), self._count(count)))
+        return len(self.rows) - 1
+
+    def extend(self, rows):
+        for typ, count in rows:
+            self.append(typ, count)
+
+    def set(self, index, typ=None, count=None):
+        """Change the type and/or count of a row; raises ValueError for a bad count."""
+        old_typ, old_count = self.rows[index]
+        self.rows[index] = (old_typ if typ is None else str(typ),
+                            old_count if count is None else self._count(count))
+
+    def remove(self, indices):
+        for i in sorted(set(indices), reverse=True):
+            del self.rows[i]
+
+    def clear(self):
+        self.rows.clear()
+
+    def entries(self):
+        """(type, count) pairs with a type, as the design chain takes them."""
+        return [(typ.strip(), n) for typ, n in self.rows if typ.strip()]
+
+    @property
+    def total(self):
+        return sum(n for _, n in self.rows)
+
+
+def _delimiter(text):
+    first = text.lstrip().split("\n", 1)[0]
+    for delim in ("\t", ";", ","):
+        if delim in first:
+            return delim
+    return ","
+
+
+def parse_fitting_table(text, known_types=None):
+    """(rows, unknown) from pasted or CSV text.
+
+    ``rows`` are (type, count) pairs; a line with only a type counts one
+    fitting. With ``known_types`` (the catalogue's fitting types) each type is
+    replaced by its catalogue spelling and unknown types are returned in
+    ``unknown`` instead of ``rows``.
+    """
+    canonical = None
+    if known_types is not None:
+        canonical = {str(t).strip().lower(): t for t in known_types}
+    rows, unknown = [], []
+    for line_no, cells in enumerate(csv.reader(io.StringIO(text), delimiter=_delimiter(text))):
+        cells = [c.strip() for c in cells]
+        if not cells or not cells[0]:
+            continue
+        typ, count = cells[0], (cells[1] if len(cells) > 1 and cells[1] else "1")
+        try:
+            count = FittingList._count(count)
+        except ValueError:
+            if line_no == 0:
+                continue                             # header line
+            raise ValueError(f"Line {line_no + 1}: bad count {cells[1]!r} for {typ!r}") from None
+        if canonical is not None:
+            if typ.lower() not in canonical:
+                unknown.append(typ)
+                continue
+            typ = canonical[typ.lower()]
+        rows.append((typ, count))
+    return rows, unknown
+
+
+def read_fitting_csv(path, known_types=None):
+    with open(path, encoding="utf-8-sig", newline="") as fh:
+        return parse_fitting_table(fh.read(), known_types)
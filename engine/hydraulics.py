@@ -0,0 +1,265 @@
+import numpy as np
+
+# ------------------------------------------------------------------
+# Constants
+# ------------------------------------------------------------------
+G = 9.81                 # m/s²
+RE_LAMINAR = 2300        # laminar / turbulent switch
+
+
+def diameter_grid():
+    """Default diameter sweep used by the GUI (m)."""
+    return np.linspace(0.008, 2.05, 1000)
+
+
+# ------------------------------------------------------------------
+# Friction
+# ------------------------------------------------------------------
+def colebrook(Re, D, k):
+    """Swamee–Jain explicit approximation to Colebrook-White.
+
+    Accepts scalars or arrays; returns a float for scalar input.
+    """
+    Re, D = np.asarray(Re, dtype=float), np.asarray(D, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        A = (k / D / 3.7) ** 1.11 + 5.74 / Re ** 0.9
+        f = 0.25 / (np.log10(A) ** 2)
+    f = np.where((Re <= 0) | (D <= 0), 0.02, np.maximum(f, 1e-4))  # safe fallback
+    return float(f) if f.ndim == 0 else f
+
+
+def friction_factor(Re, D, k):
+    """Darcy friction factor: 64/Re in laminar flow, Swamee–Jain otherwise."""
+    Re = np.asarray(Re, dtype=float)
+    with np.errstate(divide="ignore"):
+        lam = np.where((Re > 0) & (Re < RE_LAMINAR), 64 / Re, colebrook(Re, D, k))
+    return float(lam) if lam.ndim == 0 else lam
+
+
+def fitting_k(Re, K1, Kinf, Kd):
+    """3-K loss coefficient of one fitting at Reynolds number Re."""
+    return Kinf + (K1 - Kinf) * (Re ** (-1 / Kd))
+
+
+# ------------------------------------------------------------------
+# Fittings
+# ------------------------------------------------------------------
+def resolve_fittings(fittings_df, fittings):
+    """Turn (type, count) pairs into (type, n, K1, K∞, Kd) rows.
+
+    Blank types, non-positive counts and unknown fittings are skipped, the
+    same way the GUI always ignored them.
+    """
+    keys = fittings_df["Fitting Type"].str.strip().str.lower()
+    out = []
+    for typ, n in fittings:
+        typ = str(typ).strip()
+        if not typ or n <= 0:
+            continue
+        frow = fittings_df[keys == typ.lower()]
+        if frow.empty:
+            continue
+        frow = frow.iloc[0]
+        out.append((typ, int(n), float(frow["K1"]), float(frow["K∞"]), float(frow["Kd"])))
+    return out
+
+
+# ------------------------------------------------------------------
+# Pressure drop
+# ------------------------------------------------------------------
+def pack_fittings(fittings_rows):
+    """Pad one resolved fittings list per row into (n, K1, K∞, Kd) arrays.
+
+    Each array has shape (rows, most fittings in a row); padding entries have
+    n = 0 and therefore add nothing to the singular ΔP.
+    """
+    m = len(fittings_rows)
+    f = max((len(row) for row in fittings_rows), default=0)
+    n, K1, Kinf = np.zeros((m, f)), np.zeros((m, f)), np.zeros((m, f))
+    Kd = np.ones((m, f))
+    for i, row in enumerate(fittings_rows):
+        for j, (_, cnt, k1, kinf, kd) in enumerate(row):
+            n[i, j], K1[i, j], Kinf[i, j], Kd[i, j] = cnt, k1, kinf, kd
+    return n, K1, Kinf, Kd
+
+
+def pressure_drop(D, Q, L, rho, mu, vmax, k, fittings=None, rheology=None):
+    """Element-wise total ΔP (Pa); all inputs broadcast, NaN where V > vmax.
+
+    ``fittings`` is the output of :func:`pack_fittings`, one row per leading
+    row of the broadcast inputs. ``rheology`` is an (n, K, tau0) triple of a
+    non-Newtonian liquid (:mod:`engine.rheology`); it replaces ``mu``. 2-D
+    Newtonian inputs go through the fused Numba kernel when it is installed
+    (:mod:`engine.kernels`).
+    """
+    from engine import kernels
+
+    if rheology is None and kernels.backend() == "numba":
+        fused = kernels.fused_pressure_drop(D, Q, L, rho, mu, vmax, k, fittings)
+        if fused is not None:
+            return fused
+    V = (Q / 3600) / ((np.pi * D ** 2) / 4)
+    if rheology is None:
+        Re = rho * V * D / mu
+        lam = friction_factor(Re, D, k)
+    else:
+        from engine.rheology import friction_factor as rheology_friction
+        lam, Re = rheology_friction(rho, V, D, k, rheology)
+    H = V ** 2 / (2 * G)
+    dP_lin = lam * (L / D) * rho * G * H
+    return np.where(V > vmax, np.nan, dP_lin + singular_pressure_drop(Re, rho, V, fittings))
+
+
+def singular_pressure_drop(Re, rho, V, fittings=None):
+    """ΔP (Pa) of the packed fittings (:func:`pack_fittings`) at Re and V; 0 without."""
+    dP_sing = np.zeros(np.broadcast(Re, V).shape)
+    if fittings is not None:
+        n, K1, Kinf, Kd = fittings
+        for j in range(n.shape[1]):
+            with np.errstate(divide="ignore"):
+                K = fitting_k(Re, K1[:, j:j + 1], Kinf[:, j:j + 1], Kd[:, j:j + 1])
+            K = np.where(Re > 0, K, 0.0)                    # no flow, no fitting loss
+            dP_sing = dP_sing + n[:, j:j + 1] * K * rho * V ** 2 / 2
+    return dP_sing
+
+
+def _columns(*arrays):
+    return tuple(np.asarray(a, dtype=float).reshape(-1, 1) for a in arrays)
+
+
+def pressure_drop_matrix(Q, L, rho, mu, vmax, k, fittings=None, diameters=None, rheology=None):
+    """Total ΔP (Pa) of many cases at once: one row per case, one column per diameter.
+
+    Q, L, rho, mu, vmax and k are scalars or 1-D arrays of the same length;
+    ``fittings`` is the output of :func:`pack_fittings` and ``rheology`` one
+    (n, K, tau0) triple of scalars or such arrays. NaN where V > vmax.
+    """
+    D = (diameter_grid() if diameters is None else np.asarray(diameters, dtype=float))[None, :]
+    Q, L, rho, mu, vmax, k = _columns(Q, L, rho, mu, vmax, k)
+    if rheology is not None:
+        rheology = _columns(*rheology)
+    return pressure_drop(D, Q, L, rho, mu, vmax, k, fittings, rheology)
+
+
+def pressure_drop_sweep(Q, L, rho, mu, vmax, k, fittings=(), diameters=None, rheology=None):
+    """Total ΔP (Pa) over the diameter grid; NaN where V > vmax.
+
+    Q is in m³/h, k the absolute roughness in m and ``fittings`` the output
+    of :func:`resolve_fittings`.
+    """
+    return pressure_drop_matrix(Q, L, rho, mu, vmax, k, pack_fittings([fittings]), diameters,
+                                rheology)[0]
+
+
+def critical_diameter(diameters, total_deltas, dp_max):
+    """Smallest diameter whose ΔP is within dp_max, or None."""
+    valid = (total_deltas <= dp_max) & (~np.isnan(total_deltas))
+    idx = np.flatnonzero(valid)
+    return float(diameters[idx[0]]) if len(idx) else None
+
+
+def critical_diameters(diameters, matrix, dp_max):
+    """Row-wise :func:`critical_diameter` of a ΔP matrix; NaN where none is valid."""
+    dp_max = np.asarray(dp_max, dtype=float).reshape(-1, 1)
+    valid = (matrix <= dp_max) & (~np.isnan(matrix))
+    first = valid.argmax(axis=1)
+    return np.where(valid.any(axis=1), np.asarray(diameters)[first], np.nan)
+
+
+def critical_diameter_search(Q, L, rho, mu, vmax, k, dp_max, fittings=None, diameters=None,
+                             rheology=None):
+    """Same result as ``critical_diameters(pressure_drop_matrix(...))`` for many cases.
+
+    ΔP and V both fall as D grows, so "V ≤ vmax and ΔP ≤ dp_max" flips from
+    false to true once along the grid and a bisection finds the first valid
+    diameter in log2(len(grid)) evaluations instead of one per grid point.
+    """
+    diameters = diameter_grid() if diameters is None else np.asarray(diameters, dtype=float)
+    Q, L, rho, mu, vmax, k, dp_max = np.broadcast_arrays(*_columns(Q, L, rho, mu, vmax, k, dp_max))
+    if rheology is not None:
+        rheology = _columns(*rheology)
+    n = len(diameters)
+    lo = np.zeros(Q.shape, dtype=np.intp)
+    hi = np.full(Q.shape, n, dtype=np.intp)
+    for _ in range(int(np.ceil(np.log2(n + 1)))):
+        mid = (lo + hi) // 2
+        dp = pressure_drop(diameters[np.minimum(mid, n - 1)], Q, L, rho, mu, vmax, k, fittings,
+                           rheology)
+        ok = (dp <= dp_max) & (mid < n)
+        hi = np.where(ok, mid, hi)
+        lo = np.where(ok, lo, np.maximum(mid + 1, lo))
+    lo = lo[:, 0]
+    return np.where(lo < n, diameters[np.minimum(lo, n - 1)], np.nan)
+
+
+def material_hydraulics(roughness, Q, L, rho, mu, vmax, fittings, dp_max, diameters=None,
+                        max_workers=None, two_phase=None, rheology=None):
+    """ΔP sweep, critical diameter and detailed calculation per roughness value.
+
+    Returns one (sweep, dcrit, calculation or None) tuple per entry of
+    ``roughness``, in order. The materials are split across the shared thread
+    pool (:mod:`engine.parallel`); each chunk is one :func:`pressure_drop_matrix`
+    call, so the result does not depend on the number of workers. With a
+    :class:`engine.twophase.TwoPhaseFlow` as ``two_phase`` the mixture's
+    correlation is used and ``rho`` / ``mu`` are ignored; ``rheology`` is the
+    (n, K, tau0) triple of a non-Newtonian liquid.
+    """
+    from engine.parallel import map_chunks
+
+    diameters = diameter_grid() if diameters is None else np.asarray(diameters, dtype=float)
+    packed = pack_fittings([fittings])               # one row, broadcast over the materials
+
+    def chunk(ks):
+        if two_phase is None:
+            matrix = pressure_drop_matrix(Q, L, rho, mu, vmax, ks, packed, diameters, rheology)
+        else:
+            matrix = two_phase.pressure_drop_matrix(Q, L, vmax, ks, packed, diameters)
+        out = []
+        for k, td in zip(ks, matrix):
+            dcrit = critical_diameter(diameters, td, dp_max)
+            calc = None
+            if dcrit and two_phase is not None:
+                calc = two_phase.detailed_calculation(dcrit, Q, L, k, fittings)
+            elif dcrit:
+                calc = detailed_calculation(dcrit, Q, L, rho, mu, k, fittings, rheology)
+            out.append((td, dcrit, calc))
+        return out
+
+    return map_chunks(chunk, roughness, max_workers)
+
+
+def velocity_critical_diameter(Q, vmax):
+    """Diameter (m) at which the velocity equals vmax."""
+    return (4 * (Q / 3600) / (np.pi * vmax)) ** 0.5
+
+
+def detailed_calculation(D, Q, L, rho, mu, k, fittings=(), rheology=None):
+    """Hydraulic breakdown at one diameter, as shown in the details window.
+
+    For a non-Newtonian ``rheology`` the Reynolds number is the generalized one.
+    """
+    V = (Q / 3600) / ((np.pi * D ** 2) / 4)
+    if rheology is None:
+        Re = rho * V * D / mu
+        lam = friction_factor(Re, D, k)
+    else:
+        from engine.rheology import friction_factor as rheology_friction
+        lam, Re = (float(a) for a in rheology_friction(rho, V, D, k, rheology))
+    H = V ** 2 / (2 * G)
+    dP_lin = lam * (L / D) * rho * G * H
+    dP_sing = 0.0
+    details = []
+    for typ, n, K1, Kinf, Kd in fittings:
+        K = fitting_k(Re, K1, Kinf, Kd)
+        dP_sing += n * K * rho * V ** 2 / 2
+        details.append((typ, n, K))
+    return {
+        'diameter': D,
+        'velocity': V,
+        'reynolds': Re,
+        'lambda': lam,
+        'H': H,
+        'dp_linear': dP_lin,
+        'dp_singular': dP_sing,
+        'details': details
+    }
@@ -0,0 +1,131 @@
+"""Optional Numba backend for :func:`engine.hydraulics.pressure_drop`.
+
+The NumPy expression in ``pressure_drop`` builds a dozen temporaries the
+size of the (cases × diameters) grid. With Numba installed the same formula
+(velocity → Re → friction → linear + 3-K singular ΔP) runs as one fused loop,
+parallel over the rows, with no temporaries. The result is the same array as
+the NumPy path (to rounding). Without Numba, or with ``PDO_KERNELS=numpy``,
+the NumPy path is used and nothing here is compiled::
+
+    from engine import kernels
+    kernels.backend()          # "numba" or "numpy"
+    kernels.use("numpy")       # force a backend, e.g. to compare them
+
+The first call in a process compiles the kernel; ``cache=True`` keeps the
+machine code on disk for the next process.
+"""
+import math
+import os
+import threading
+import types
+
+import numpy as np
+
+from engine.hydraulics import G, RE_LAMINAR
+
+BACKEND_ENV = "PDO_KERNELS"
+
+_backend = None
+_fused = None              # compiled on first use of the numba backend
+# The kernel already uses every core, and Numba's default "workqueue" threading
+# layer must not be entered from two threads at once (engine.parallel).
+_kernel_lock = threading.Lock()
+
+
+def _rows(D, Q, L, rho, mu, vmax, k, n, K1, Kinf, Kd, out):
+    """Scalar loop over a broadcast (rows, cols) grid; the fittings have 1 or ``rows`` rows.
+
+    Plain Python here (``prange`` is ``range``); :func:`_compile` builds the
+    Numba version from the same code with ``numba.prange``.
+    """
+    rows, cols = out.shape
+    shared = n.shape[0] == 1
+    for i in prange(rows):
+        fi = 0 if shared else i
+        for j in range(cols):
+            d = D[i, j]
+            V = (Q[i, j] / 3600) / ((math.pi * d ** 2) / 4)
+            if V > vmax[i, j]:
+                out[i, j] = np.nan
+                continue
+            Re = rho[i, j] * V * d / mu[i, j]
+            if Re <= 0 or d <= 0:
+                lam = 0.02
+            elif Re < RE_LAMINAR:
+                lam = 64 / Re
+            else:
+                A = (k[i, j] / d / 3.7) ** 1.11 + 5.74 / Re ** 0.9
+                lam = 0.25 / (math.log10(A) ** 2)
+                if lam < 1e-4:
+                    lam = 1e-4
+            H = V ** 2 / (2 * G)
+            dp = lam * (L[i, j] / d) * rho[i, j] * G * H
+            sing = 0.0
+            for f in range(n.shape[1] if Re > 0 else 0):          # no flow, no fitting loss
+                K = Kinf[fi, f] + (K1[fi, f] - Kinf[fi, f]) * (Re ** (-1 / Kd[fi, f]))
+                sing = sing + n[fi, f] * K * rho[i, j] * V ** 2 / 2
+            out[i, j] = dp + sing
+    return out
+
+
+prange = range
+
+
+def _compile():
+    import numba
+
+    code = types.FunctionType(_rows.__code__, dict(globals(), prange=numba.prange), "_rows")
+    return numba.njit(parallel=True, error_model="numpy", cache=True)(code)
+
+
+def available():
+    """True if Numba can be imported."""
+    try:
+        import numba  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def backend():
+    """The backend in use: ``PDO_KERNELS`` if set, else "numba" when installed."""
+    if _backend is None:
+        wanted = os.environ.get(BACKEND_ENV, "").strip().lower()
+        if wanted not in ("", "numba", "numpy"):
+            raise ValueError(f"{BACKEND_ENV} must be 'numba' or 'numpy', got {wanted!r}")
+        use(wanted or ("numba" if available() else "numpy"))
+    return _backend
+
+
+def use(name):
+    """Select the backend; "numba" raises ImportError if Numba is not installed."""
+    global _backend, _fused
+    if name not in ("numba", "numpy"):
+        raise ValueError(f"Unknown kernel backend {name!r}; use 'numba' or 'numpy'")
+    if name == "numba" and _fused is None:
+        try:
+            _fused = _compile()
+        except ImportError:
+            raise ImportError("The numba backend needs Numba (pip install numba)") from None
+    _backend = name
+
+
+def fused_pressure_drop(D, Q, L, rho, mu, vmax, k, fittings=None, kernel=None):
+    """:func:`engine.hydraulics.pressure_drop` as one loop; None if the inputs are not 2-D.
+
+    ``kernel`` defaults to the compiled Numba kernel; :func:`_rows` gives the
+    same result in plain Python (slow, used by the tests).
+    """
+    arrays = np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (D, Q, L, rho, mu, vmax, k)))
+    if arrays[0].ndim != 2:
+        return None
+    if fittings is None:
+        fittings = (np.zeros((1, 0)), np.zeros((1, 0)), np.zeros((1, 0)), np.ones((1, 0)))
+    n, K1, Kinf, Kd = (np.asarray(a, dtype=float) for a in fittings)
+    if n.shape[0] not in (1, arrays[0].shape[0]):
+        return None
+    out = np.empty(arrays[0].shape)
+    if kernel is not None:
+        return kernel(*arrays, n, K1, Kinf, Kd, out)
+    with _kernel_lock:
+        return _fused(*arrays, n, K1, Kinf, Kd, out)
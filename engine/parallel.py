@@ -0,0 +1,47 @@
+"""Shared thread pool for the per-material calculations.
+
+NumPy releases the GIL inside its array loops, so the ΔP sweeps of different
+materials run side by side on threads without pickling anything. The pool is
+created on first use and shared by every caller (GUI worker, ``run_design``),
+so a design never starts more threads than there are cores.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+THREAD_PREFIX = "material"
+
+_pool = None
+_lock = threading.Lock()
+
+
+def workers():
+    return os.cpu_count() or 1
+
+
+def shared_pool():
+    """The process-wide ThreadPoolExecutor (one thread per core)."""
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(workers(), thread_name_prefix=THREAD_PREFIX)
+    return _pool
+
+
+def map_chunks(fn, items, max_workers=None):
+    """``fn(chunk)`` over contiguous chunks of ``items``; results concatenated in input order.
+
+    ``fn`` takes a list and returns a list of the same length. One chunk per
+    worker; with one worker or one item, or when called from a pool thread,
+    it runs in the calling thread.
+    """
+    items = list(items)
+    n = min(max_workers or workers(), len(items))
+    if n <= 1 or threading.current_thread().name.startswith(THREAD_PREFIX):   # no nested waits
+        return list(fn(items))
+    bounds = [len(items) * i // n for i in range(n + 1)]
+    futures = [shared_pool().submit(fn, items[lo:hi]) for lo, hi in zip(bounds, bounds[1:])]
+    out = []
+    for future in futures:                       # submission order: deterministic merge
+        out.extend(future.result())
+    return out
@@ -0,0 +1,213 @@
+"""Pareto exploration of every (material, schedule entry) candidate of a case.
+
+The design chain collapses to one critical diameter per material and then to
+the cheapest material. :func:`pareto_designs` keeps the trade-offs instead:
+every schedule entry (OD and wall) of every compatible material is one
+candidate, scored on the objectives of :data:`OBJECTIVES`::
+
+    pareto = pareto_designs(case)
+    pareto.table()                      # the non-dominated candidates
+    pareto.table(front_only=False)      # every candidate, with "feasible" and "pareto"
+    pareto.summary()
+
+==================  ======================================  ========
+cost                (steel mass · price + fittings)·MARKUP   minimize
+dp_bar              ΔP over the line with its fittings       minimize
+velocity_margin     (vmax − V)/vmax                          maximize
+mass_kg             steel mass                               minimize
+thickness_margin    wall − required wall (mm)                maximize
+==================  ======================================  ========
+
+A candidate is feasible when its velocity and ΔP are within the case limits
+and its wall is at least the required thickness for its bore. Among the
+feasible ones :func:`non_dominated` keeps those that no other candidate beats
+on every objective; ``objectives`` restricts the comparison to a subset.
+"""
+import numpy as np
+import pandas as pd
+
+from engine import catalogues as cat_mod
+from engine.design import normalize_case
+from engine.hydraulics import pack_fittings, pressure_drop, resolve_fittings
+from engine.pricing import MARKUP, fittings_cost, pipe_mass
+from engine.thickness import F_MAP, material_strength, required_thickness
+from engine.twophase import PHASE as TWO_PHASE, TwoPhaseFlow
+from engine.velocity import velocity_limit
+
+OBJECTIVES = {"cost": 1, "dp_bar": 1, "velocity_margin": -1, "mass_kg": 1,
+              "thickness_margin": -1}                   # 1 minimize, -1 maximize
+LABELS = {"cost": "Installed cost", "dp_bar": "ΔP (bar)", "velocity_margin": "Velocity margin",
+          "mass_kg": "Steel mass (kg)", "thickness_margin": "Thickness margin (mm)"}
+BLOCK = 64                                              # candidates compared per step
+
+
+# ------------------------------------------------------------------
+# Dominance filter
+# ------------------------------------------------------------------
+def non_dominated(F, block=BLOCK):
+    """Sorted indices of the rows of ``F`` (n, k) that no other row dominates.
+
+    Every column is minimized. Rows are taken by increasing sum of their
+    per-column ranks. A dominating row has a strictly smaller sum, so it
+    always comes first, and well-balanced rows, which dominate the most, lead.
+    Each block of ``block`` rows is reduced to its own front, which is then
+    final. That front removes every later row it dominates, so the work
+    scales with the front rather than with n². Equal rows do not dominate
+    each other.
+    """
+    F = np.asarray(F, dtype=float)
+    if F.ndim != 2:
+        raise ValueError("Objectives must be an (n, k) array")
+    ranks = sum(np.unique(column, return_inverse=True)[1].ravel() for column in F.T)
+    rest = np.argsort(ranks, kind="stable") if F.shape[1] else np.arange(len(F))
+    front = []
+
+    def dominated(H, R):
+        """(len(R),) mask: R rows dominated by some H row, without an (h, r, k) array."""
+        le = H[:, 0, None] <= R[None, :, 0]
+        for c in range(1, F.shape[1]):
+            le &= H[:, c, None] <= R[None, :, c]
+        hit = le.any(axis=0)
+        # ≤ everywhere is domination unless the rows are equal, which is rare
+        idx = np.flatnonzero(hit)
+        ne = H[:, 0, None] != R[None, idx, 0]
+        for c in range(1, F.shape[1]):
+            ne |= H[:, c, None] != R[None, idx, c]
+        hit[idx] = (le[:, idx] & ne).any(axis=0)
+        return hit
+
+    while len(rest):
+        head, rest = rest[:block], rest[block:]
+        head = head[~dominated(F[head], F[head])]
+        front.append(head)
+        if len(rest):
+            rest = rest[~dominated(F[head], F[rest])]
+    return np.sort(np.concatenate(front)) if front else np.zeros(0, dtype=int)
+
+
+# ------------------------------------------------------------------
+# Candidates
+# ------------------------------------------------------------------
+class ParetoSet:
+    """Objectives of every (material, schedule entry) pair and the non-dominated ones."""
+
+    def __init__(self, case, materials, schedule, values, feasible, objectives):
+        self.case = case
+        self.materials = list(materials)
+        self.schedule = schedule.reset_index(drop=True)
+        self.values = values                 # {objective: (materials, entries)}
+        self.feasible = feasible
+        self.objectives = list(objectives)
+        m, s = feasible.shape
+        cand = np.flatnonzero(feasible.ravel())
+        F = np.column_stack([values[o].ravel()[cand] * OBJECTIVES[o] for o in self.objectives])
+        self.pareto = np.zeros((m, s), dtype=bool)
+        self.pareto.ravel()[cand[non_dominated(F)]] = True
+
+    def __repr__(self):
+        return (f"<ParetoSet: {self.feasible.size} candidates, {int(self.feasible.sum())} feasible, "
+                f"{int(self.pareto.sum())} non-dominated>")
+
+    def __len__(self):
+        return int(self.pareto.sum())
+
+    def table(self, front_only=True):
+        """One row per candidate (the non-dominated ones by default), cheapest first."""
+        od = self.schedule["Outside diameter (mm)"].to_numpy(dtype=float)
+        wall = self.schedule["Wall thickness (mm)"].to_numpy(dtype=float)
+        m, s = self.feasible.shape
+        frame = pd.DataFrame({
+            "Material": np.repeat(self.materials, s),
+            "NPS": np.tile(self.schedule.get("Nominal size (inches)", pd.Series(["N/A"] * s))
+                           .astype(str).to_numpy(), m),
+            "OD_norm_mm": np.tile(od, m),
+            "t_norm_mm": np.tile(wall, m),
+            "ID_mm": np.tile(od - 2 * wall, m),
+            **{o: self.values[o].ravel() for o in OBJECTIVES},
+            "feasible": self.feasible.ravel(),
+            "pareto": self.pareto.ravel(),
+        })
+        if front_only:
+            frame = frame[frame["pareto"]].drop(columns=["feasible", "pareto"])
+        return frame.sort_values(["cost", "Material"], kind="stable").reset_index(drop=True)
+
+    def best(self, objective):
+        """Non-dominated candidate that is best on one objective, as a dict; None if none."""
+        if objective not in OBJECTIVES:
+            raise KeyError(f"Unknown objective {objective!r}; use one of {list(OBJECTIVES)}")
+        front = self.table()
+        if front.empty:
+            return None
+        i = (front[objective] * OBJECTIVES[objective]).to_numpy().argmin()
+        return {k: (v.item() if hasattr(v, "item") else v) for k, v in front.iloc[i].items()}
+
+    def summary(self):
+        """JSON-ready result: counts, the best candidate per objective and the front."""
+        front = self.table()
+        return {
+            "objectives": self.objectives,
+            "candidates": int(self.feasible.size),
+            "feasible": int(self.feasible.sum()),
+            "best": {o: self.best(o) for o in self.objectives},
+            "front": front.to_dict("records"),
+        }
+
+
+def pareto_designs(case, catalogues=None, materials=None, objectives=None):
+    """Score every schedule entry of every material of ``case``; see the module docstring.
+
+    ``materials`` defaults to those compatible with the case's temperature and
+    pressure, ``objectives`` to all of :data:`OBJECTIVES`. Raises ValueError
+    for unknown fluids or objectives, or without a schedule.
+    """
+    case = normalize_case(case)
+    objectives = list(objectives or OBJECTIVES)
+    unknown = [o for o in objectives if o not in OBJECTIVES]
+    if unknown or not objectives:
+        raise ValueError(f"Unknown objective(s) {', '.join(unknown)}; use {list(OBJECTIVES)}")
+    cat = catalogues or cat_mod.get_catalogues()
+    two_phase = rheology = None
+    if case["phase"] == TWO_PHASE:
+        two_phase = TwoPhaseFlow.from_case(case, cat)
+        rho, mu = two_phase.rho, two_phase.mu
+    else:
+        try:
+            rho, mu = cat_mod.fluid_properties(cat.liquid_df, cat.gas_df, case["phase"], case["fluid"])
+        except (IndexError, KeyError):
+            raise ValueError(f"Unknown {case['phase'].lower()}: {case['fluid']!r}") from None
+        if case["phase"] == "Liquid":
+            rheology = cat_mod.fluid_rheology(cat.liquid_df, case["fluid"])
+    if materials is None:
+        materials = cat_mod.get_compatible_materials(cat.material_df, case["temperature"], case["pressure"])
+    if cat.sched_df is None:
+        raise ValueError("No schedule table loaded")
+
+    # material columns (M, 1) and schedule rows (1, S)
+    E, Sy = (a[:, None] for a in material_strength(cat.material_df, materials))
+    rows = cat.material_df.drop_duplicates("Material").set_index("Material").reindex(materials)
+    price = pd.to_numeric(rows["Price"], errors="coerce").to_numpy(dtype=float)[:, None]
+    k = np.array([cat_mod.material_roughness(cat.material_df, m) for m in materials])[:, None]
+    od = cat.sched_df["Outside diameter (mm)"].to_numpy(dtype=float)[None, :]
+    wall = cat.sched_df["Wall thickness (mm)"].to_numpy(dtype=float)[None, :]
+    inner = od - 2 * wall                                    # mm
+
+    Q, L = case["flowrate"], case["length"]
+    vmax = velocity_limit(case, rho, mu)
+    fittings = pack_fittings([resolve_fittings(cat.fittings_df, case["fittings"])])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        V = Q / 3600 / (np.pi * (inner / 1000) ** 2 / 4)
+        if two_phase is None:
+            dp = pressure_drop(inner / 1000, Q, L, rho, mu, np.inf, k, fittings, rheology)
+        else:
+            dp = two_phase.pressure_drop(inner / 1000, Q, L, np.inf, k, fittings)
+        t_req = required_thickness(case["design_pressure"] * 1e5, inner, F_MAP[case["location"]],
+                                   E, Sy, case["corrosion_allowance"]) * 1000
+        margin = np.where(np.isinf(vmax), 1.0, (vmax - V) / vmax)
+    mass = np.broadcast_to(pipe_mass(od, wall, L), dp.shape)
+    cost = (mass * price + fittings_cost(cat.fittings_df, case["fittings"])) * MARKUP
+    values = {"cost": cost, "dp_bar": dp / 1e5, "velocity_margin": np.broadcast_to(margin, dp.shape),
+              "mass_kg": mass, "thickness_margin": wall - t_req}
+    values = {o: np.broadcast_to(v, dp.shape).astype(float) for o, v in values.items()}
+    feasible = ((inner > 0) & (V <= vmax) & (dp <= case["dp_max"] * 1e5) & (wall >= t_req)
+                & np.logical_and.reduce([np.isfinite(v) for v in values.values()]))
+    return ParetoSet(case, materials, cat.sched_df, values, feasible, objectives)
@@ -0,0 +1,113 @@
+import numpy as np
+
+from engine.hydraulics import diameter_grid
+
+
+# ------------------------------------------------------------------
+# Report figures (matplotlib is imported on first use)
+# ------------------------------------------------------------------
+def velocity_figure(Q, vmax, dcrit_velocity, diameters=None):
+    """Velocity vs diameter with the velocity limit and critical diameter."""
+    import matplotlib.pyplot as plt
+
+    diameters = diameter_grid() if diameters is None else diameters
+    velocities = (Q / 3600) / ((np.pi * diameters ** 2) / 4)
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.plot(diameters, velocities, label="Velocity vs Diameter", color="cyan", linewidth=2)
+    ax.axhline(vmax, color="red", linestyle="--", linewidth=2, label=f"Max Velocity = {vmax:.2f} m/s")
+    ax.axvline(dcrit_velocity, color="green", linestyle="--", linewidth=2,
+               label=f"Critical Diameter = {dcrit_velocity:.4f} m")
+    ax.set_xlabel("Diameter (m)")
+    ax.set_ylabel("Velocity (m/s)")
+    ax.set_title("Velocity vs Diameter")
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    return fig
+
+
+def pressure_drop_figure(diameters, sweeps, dp_max):
+    """Total ΔP (bar) vs diameter per material; ``sweeps`` maps material → ΔP in Pa."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 7))
+    for mat, td in sweeps.items():
+        ax.plot(diameters, td / 1e5, label=mat, linewidth=2)
+
+    ax.axhline(dp_max / 1e5, color="red",
+               linestyle="--", linewidth=2, label="ΔP max")
+    ax.set_xlabel("Diameter (m)")
+    ax.set_ylabel("Total ΔP (bar)")
+    ax.set_title("Total Pressure Drop vs Diameter")
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    return fig
+
+
+def design_space_figure(space, material, dp_max, fig=None):
+    """Filled contours of dcrit (mm) over flowrate × length for one material and ΔP limit.
+
+    Draws into ``fig`` when given (e.g. a figure embedded in a Tk window).
+    """
+    if fig is None:
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(8, 6))
+    fig.clear()
+    ax = fig.add_subplot()
+    Q, L = space.coords["flowrate"], space.coords["length"]
+    z = space.sel(material=material, dp_max=dp_max).T * 1000          # rows = length
+    dp = space.coords["dp_max"][space.index("dp_max", dp_max)]
+    if len(Q) > 1 and len(L) > 1:
+        cs = ax.contourf(Q, L, z, levels=15, cmap="viridis")
+        ax.contour(cs, colors="k", linewidths=0.4)
+        fig.colorbar(cs, ax=ax, label="Critical diameter (mm)")
+        ax.set_xlabel("Flowrate (m³/h)")
+        ax.set_ylabel("Length (m)")
+    else:                                       # only one axis swept: a curve
+        x, y, label = (Q, z[0], "Flowrate (m³/h)") if len(Q) > 1 else (L, z[:, 0], "Length (m)")
+        ax.plot(x, y, color="cyan", linewidth=2, marker="o" if len(x) == 1 else None)
+        ax.set_xlabel(label)
+        ax.set_ylabel("Critical diameter (mm)")
+    ax.set_title(f"{material} — ΔP max {dp:g} bar")
+    ax.grid(True, alpha=0.3)
+    return fig
+
+
+def pareto_figure(pareto, x="cost", y="dp_bar", fig=None):
+    """Scatter of a :class:`engine.pareto.ParetoSet` on two objectives.
+
+    Feasible candidates are grey; the non-dominated ones are coloured by
+    material, drawn as one pickable collection in ``pareto.table()`` order
+    so that the ``ind`` of a pick event indexes that table.
+    """
+    import matplotlib
+    from engine.pareto import LABELS
+
+    if fig is None:
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(8, 6))
+    fig.clear()
+    ax = fig.add_subplot()
+    every = pareto.table(front_only=False)
+    others = every[every["feasible"] & ~every["pareto"]]
+    ax.scatter(others[x], others[y], s=6, color="0.75", label="feasible")
+    front = pareto.table()
+    names = sorted(set(front["Material"]))
+    codes = front["Material"].map({m: i for i, m in enumerate(names)}).to_numpy()
+    cmap = matplotlib.colormaps["tab20"].resampled(max(len(names), 1))
+    ax.scatter(front[x], front[y], s=18, c=cmap(codes), edgecolors="k", linewidths=0.3,
+               picker=5, zorder=3)
+    for i, name in enumerate(names):
+        ax.scatter([], [], s=18, color=cmap(i), label=name)
+    ax.set_xlabel(LABELS[x])
+    ax.set_ylabel(LABELS[y])
+    ax.set_title(f"Pareto front: {len(front)} of {int(pareto.feasible.sum())} feasible pipes")
+    ax.legend(fontsize=7, loc="best")
+    ax.grid(True, alpha=0.3)
+    return fig
+
+
+def save_figure(fig, path):
+    import matplotlib.pyplot as plt
+
+    fig.savefig(path, dpi=150, bbox_inches="tight")
+    plt.close(fig)
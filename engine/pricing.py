@@ -0,0 +1,48 @@
+import numpy as np
+
+STEEL_DENSITY = 7850     # kg/m³
+MARKUP = 1.10            # overhead on material + fittings
+
+
+def fittings_cost(fittings_df, fittings):
+    """Purchase cost of (type, count) fittings; unknown types cost nothing."""
+    keys = fittings_df["Fitting Type"].str.strip().str.lower()
+    cost = 0.0
+    for typ, qty in fittings:
+        typ = str(typ).strip()
+        if not typ:
+            continue
+        row = fittings_df[keys == typ.lower()]
+        if not row.empty:
+            cost += qty * float(row.iloc[0]["Price"])
+    return cost
+
+
+def pipe_mass(od_mm, t_mm, length, density=STEEL_DENSITY):
+    """Steel mass (kg) of a pipe of given OD and wall over length (m)."""
+    OD_m = od_mm / 1000
+    t_m = t_mm / 1000
+    volume = np.pi * (OD_m ** 2 - (OD_m - 2 * t_m) ** 2) / 4 * length
+    return volume * density
+
+
+def calculate_pipe_prices(thickness_results, material_df, fittings_df, fittings, pipe_length):
+    """Material, fittings and total cost per material of the thickness results."""
+    prices = {}
+    f_cost = fittings_cost(fittings_df, fittings)
+    for r in thickness_results:
+        mat = r["Material"]
+        try:
+            mat_row = material_df[material_df["Material"] == mat].iloc[0]
+            price_per_kg = float(mat_row["Price"])
+            mass = pipe_mass(r["OD_norm_mm"], r["t_norm_mm"], pipe_length)
+            material_cost = mass * price_per_kg
+            prices[mat] = {
+                'material_cost': material_cost,
+                'fittings_cost': f_cost,
+                'total_cost': (material_cost + f_cost) * MARKUP,
+                'mass': mass
+            }
+        except Exception as e:
+            print(f"Price calc error for {mat}: {e}")
+    return prices
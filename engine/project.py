@@ -0,0 +1,147 @@
+"""Project files (``.pdo``): designs plus their ΔP curves, reopened without recomputing.
+
+A project is an uncompressed zip archive holding
+
+    project.json    header: format version, name and one entry per segment
+                    (inputs, fluid, compatible materials, critical diameters,
+                    detailed calculations, thickness, prices, recommendation)
+    diameters.npy   the diameter grid (m)
+    curves.npy      ΔP curves (Pa, float32 – they are only plotted), one row
+                    per (segment, material)
+
+The arrays are stored rather than deflated, so :func:`load_project` maps them
+straight from the file: opening a project of hundreds of segments reads the
+JSON header and nothing else until a curve is actually plotted.
+"""
+import json
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+from engine.design import _plain
+
+PROJECT_FORMAT = 1
+EXTENSION = ".pdo"
+SEGMENT_KEYS = ("case", "fluid", "compatible_materials", "dcrit_velocity", "materials",
+                "thickness", "prices", "recommended")
+
+
+# ------------------------------------------------------------------
+# Save
+# ------------------------------------------------------------------
+def save_project(path, designs, name=None):
+    """Write ``run_design`` results (one per segment) to a project file.
+
+    Designs made with ``keep_sweeps=True`` keep their ΔP curves; the others
+    are stored without. The file is replaced atomically.
+    """
+    diameters = None
+    curves, segments = [], []
+    for design in designs:
+        segment = {k: _plain(design[k]) for k in SEGMENT_KEYS}
+        rows = {}
+        for mat, td in (design.get("sweeps") or {}).items():
+            if diameters is None:
+                diameters = np.asarray(design["diameters"], dtype=float)
+            elif len(design["diameters"]) != len(diameters) or not np.allclose(design["diameters"], diameters):
+                raise ValueError("All segments of a project must share one diameter grid.")
+            rows[mat] = len(curves)
+            curves.append(np.asarray(td, dtype=np.float32))
+        segment["curve_rows"] = rows
+        segments.append(segment)
+
+    if name is None:
+        name = segments[0]["case"].get("project_name", "Untitled Project") if segments else "Untitled Project"
+    header = {"format": PROJECT_FORMAT, "name": name, "segments": segments}
+    if diameters is None:
+        diameters = np.empty(0)
+    curves = np.vstack(curves) if curves else np.empty((0, len(diameters)), dtype=np.float32)
+
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(suffix=EXTENSION, dir=folder)
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(tmp, "w", zipfile.ZIP_STORED) as zf:
+            zf.writestr("project.json", json.dumps(header, ensure_ascii=False))
+            for member, array in (("diameters.npy", diameters), ("curves.npy", curves)):
+                with zf.open(member, "w", force_zip64=True) as fh:
+                    np.lib.format.write_array(fh, np.ascontiguousarray(array), allow_pickle=False)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return path
+
+
+# ------------------------------------------------------------------
+# Load
+# ------------------------------------------------------------------
+def _map_member(path, zf, member):
+    """Read-only memory map of a stored ``.npy`` member of an open zip file."""
+    info = zf.getinfo(member)
+    if info.compress_type != zipfile.ZIP_STORED:
+        with zf.open(member) as fh:
+            return np.lib.format.read_array(fh, allow_pickle=False)
+    with open(path, "rb") as fh:
+        fh.seek(info.header_offset)
+        local = fh.read(30)                               # local file header
+        name_len = int.from_bytes(local[26:28], "little")
+        extra_len = int.from_bytes(local[28:30], "little")
+        fh.seek(info.header_offset + 30 + name_len + extra_len)
+        version = np.lib.format.read_magic(fh)
+        read_header = (np.lib.format.read_array_header_1_0 if version == (1, 0)
+                       else np.lib.format.read_array_header_2_0)
+        shape, fortran, dtype = read_header(fh)
+        offset = fh.tell()
+    if 0 in shape:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                     order="F" if fortran else "C")
+
+
+class Project:
+    """A loaded project: header data plus memory-mapped ΔP curves."""
+
+    def __init__(self, path):
+        self.path = path
+        with zipfile.ZipFile(path) as zf:
+            try:
+                header = json.loads(zf.read("project.json"))
+            except KeyError:
+                raise ValueError(f"{path} is not a Pipe Design Optimizer project") from None
+            if header.get("format", 0) > PROJECT_FORMAT:
+                raise ValueError(f"{path} was written by a newer version (format {header['format']})")
+            self.diameters = _map_member(path, zf, "diameters.npy")
+            self.curves = _map_member(path, zf, "curves.npy")
+        self.name = header["name"]
+        self.segments = header["segments"]
+
+    def __len__(self):
+        return len(self.segments)
+
+    def __repr__(self):
+        return f"<Project {self.name!r}: {len(self)} segment(s)>"
+
+    def sweeps(self, index):
+        """{material: ΔP curve (Pa)} of one segment; views into the mapped file."""
+        return {mat: self.curves[row] for mat, row in self.segments[index]["curve_rows"].items()}
+
+    def design(self, index):
+        """Segment as a ``run_design(..., keep_sweeps=True)``-style result."""
+        result = {k: v for k, v in self.segments[index].items() if k != "curve_rows"}
+        if self.segments[index]["curve_rows"]:
+            result["sweeps"] = self.sweeps(index)
+            result["diameters"] = self.diameters
+        return result
+
+    def results(self):
+        """All segments as one :class:`~engine.results.MaterialResults` table (case = segment)."""
+        from engine.results import MaterialResults
+
+        return MaterialResults.from_designs(self.segments)
+
+
+def load_project(path):
+    return Project(path)
@@ -0,0 +1,241 @@
+"""Capacity rating of existing lines: the maximum flowrate of every schedule pipe.
+
+The design chain answers "which pipe carries Q"; :func:`rate_schedule` answers
+the inverse question for every (compatible material, schedule entry) pair of a
+case at once: the largest flowrate that keeps the velocity within the case's
+``"velocity"`` and the ΔP over ``"length"`` (with the case's fittings) within
+``"dp_max"``::
+
+    rating = rate_schedule(case)
+    rating.table()                      # one row per material and schedule entry
+    rating.capacity("API 5L X52 (SAW)", row)
+    rating.smallest("API 5L X52 (SAW)")  # smallest pipe that carries the case's flowrate
+
+The velocity limit gives the flowrate directly. ΔP grows monotonically with
+Q, so the pressure-drop limit is the root of ``log ΔP(Q) − log dp_max``
+between zero and the velocity limit. :func:`max_flowrate` finds it for all
+pipes together with a vectorized Illinois (modified regula falsi) iteration
+in log–log space, where ΔP is nearly a straight line of slope 1 (laminar) to 2
+(rough turbulent). Only the unconverged pipes are re-evaluated. At the
+laminar/turbulent jump of the friction factor the root is the last flow below
+the jump.
+
+``"flowrate"`` is optional in the case; when given, ``carries`` tells which
+pipes take it. ``allowable_bar`` is the pressure the wall is good for
+(:func:`engine.thickness.allowable_pressure`) and ``wall_ok`` whether that
+covers the case's design pressure.
+"""
+import numpy as np
+import pandas as pd
+
+from engine import catalogues as cat_mod
+from engine.design import normalize_case
+from engine.hydraulics import pack_fittings, pressure_drop, resolve_fittings
+from engine.thickness import F_MAP, allowable_pressure, material_strength
+from engine.twophase import PHASE as TWO_PHASE, TwoPhaseFlow
+from engine.velocity import velocity_limit
+
+LIMITS = ("velocity", "pressure drop")
+MAX_ITERATIONS = 100
+TOLERANCE = 1e-12          # on log Q and on log ΔP
+TURNDOWN = 1e-9            # lowest flow tried, as a fraction of the velocity limit
+
+
+# ------------------------------------------------------------------
+# Root-finder
+# ------------------------------------------------------------------
+def max_flowrate(D, L, rho, mu, vmax, k, dp_max, fittings=None, rheology=None, two_phase=None):
+    """Largest flowrate (m³/h) with V ≤ vmax and ΔP ≤ dp_max, element-wise.
+
+    Inputs broadcast like those of :func:`engine.hydraulics.pressure_drop`;
+    ``fittings`` is one packed row (:func:`engine.hydraulics.pack_fittings`).
+    Returns ``(Q, limit)`` with ``limit`` an index into :data:`LIMITS`. Q is
+    0 where even a trickle exceeds ``dp_max`` (the yield stress of a Bingham
+    plastic) and NaN where D ≤ 0.
+    """
+    D, L, rho, mu, vmax, k, dp_max = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (D, L, rho, mu, vmax, k, dp_max)))
+    shape = D.shape
+    D, L, rho, mu, vmax, k, dp_max = (a.reshape(-1, 1) for a in (D, L, rho, mu, vmax, k, dp_max))
+
+    def g(logQ, rows):
+        Q = np.exp(logQ)
+        if two_phase is None:
+            dp = pressure_drop(D[rows], Q, L[rows], rho[rows], mu[rows], np.inf, k[rows],
+                               fittings, rheology)
+        else:
+            dp = two_phase.pressure_drop(D[rows], Q, L[rows], np.inf, k[rows], fittings)
+        return np.log(dp) - np.log(dp_max[rows])
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        hi = np.log(3600 * vmax * np.pi * D ** 2 / 4)       # velocity limit
+        lo = hi + np.log(TURNDOWN)
+        valid = np.flatnonzero((D > 0).ravel())
+        g_hi, g_lo = np.full(hi.shape, np.nan), np.full(lo.shape, np.nan)
+        g_hi[valid], g_lo[valid] = g(hi[valid], valid), g(lo[valid], valid)
+
+        logQ = np.where(g_hi <= 0, hi, -np.inf)
+        limit = np.where(g_hi <= 0, 0, 1)
+        rows = np.flatnonzero(((g_hi > 0) & (g_lo <= 0)).ravel())
+        side = np.zeros(hi.shape, dtype=np.int8)             # side moved last: -1 lo, +1 hi
+        for _ in range(MAX_ITERATIONS):
+            if not len(rows):
+                break
+            a, b, ga, gb = lo[rows], hi[rows], g_lo[rows], g_hi[rows]
+            x = (a * gb - b * ga) / (gb - ga)
+            x = np.where((x > a) & (x < b), x, (a + b) / 2)
+            gx = g(x, rows)
+            below = gx <= 0
+            # Illinois: halve the value kept at an end that survived twice running
+            g_lo[rows] = np.where(below, gx, np.where(side[rows] == 1, ga / 2, ga))
+            g_hi[rows] = np.where(below, np.where(side[rows] == -1, gb / 2, gb), gx)
+            lo[rows], hi[rows] = np.where(below, x, a), np.where(below, b, x)
+            side[rows] = np.where(below, -1, 1)
+            root = np.abs(gx) <= TOLERANCE
+            done = root | (hi[rows] - lo[rows] <= TOLERANCE)
+            logQ[rows] = np.where(done, np.where(root, x, lo[rows]), logQ[rows])
+            rows = rows[~done.ravel()]
+        logQ[rows] = lo[rows]                                # feasible end of the bracket
+        Q = np.where(D > 0, np.exp(logQ), np.nan)
+    return Q.reshape(shape), limit.reshape(shape)
+
+
+# ------------------------------------------------------------------
+# Schedule rating
+# ------------------------------------------------------------------
+class CapacityRating:
+    """Maximum flowrate of every (material, schedule entry) pair."""
+
+    def __init__(self, case, materials, schedule, Q_max, limit, dp, allowable):
+        self.case = case
+        self.materials = list(materials)
+        self.schedule = schedule.reset_index(drop=True)
+        self.Q_max = Q_max                   # m³/h, (materials, entries)
+        self.limit = limit                   # index into LIMITS
+        self.dp = dp                         # Pa at Q_max
+        self.allowable = allowable           # Pa the wall is good for
+
+    def __repr__(self):
+        return (f"<CapacityRating: {len(self.materials)} material(s) × {len(self.schedule)} "
+                f"schedule entries>")
+
+    def _row(self, material):
+        try:
+            return self.materials.index(material)
+        except ValueError:
+            raise KeyError(f"{material!r} is not in the rating") from None
+
+    def capacity(self, material, row):
+        """Maximum flowrate (m³/h) of one material and schedule position."""
+        return float(self.Q_max[self._row(material), row])
+
+    def table(self):
+        """Long table: one row per material and schedule entry, in catalogue order."""
+        od = self.schedule["Outside diameter (mm)"].to_numpy(dtype=float)
+        wall = self.schedule["Wall thickness (mm)"].to_numpy(dtype=float)
+        inner = od - 2 * wall
+        m, s = len(self.materials), len(self.schedule)
+        with np.errstate(invalid="ignore"):
+            velocity = self.Q_max / 3600 / (np.pi * (inner / 1000) ** 2 / 4)
+        frame = pd.DataFrame({
+            "Material": np.repeat(self.materials, s),
+            "NPS": np.tile(self.schedule.get("Nominal size (inches)", pd.Series(["N/A"] * s))
+                           .astype(str).to_numpy(), m),
+            "OD_norm_mm": np.tile(od, m),
+            "t_norm_mm": np.tile(wall, m),
+            "ID_mm": np.tile(inner, m),
+            "Q_max_m3h": self.Q_max.ravel(),
+            "velocity_mps": velocity.ravel(),
+            "dp_bar": self.dp.ravel() / 1e5,
+            "limit": np.array(LIMITS)[self.limit.ravel()],
+            "allowable_bar": self.allowable.ravel() / 1e5,
+            "wall_ok": (self.allowable >= self.case["design_pressure"] * 1e5).ravel(),
+        })
+        if self.case["flowrate"] > 0:
+            frame["carries"] = frame["Q_max_m3h"] >= self.case["flowrate"]
+        return frame
+
+    def _describe(self, i, j):
+        entry = self.schedule.iloc[j]
+        od, t = float(entry["Outside diameter (mm)"]), float(entry["Wall thickness (mm)"])
+        return {
+            "Material": self.materials[i],
+            "NPS": str(entry.get("Nominal size (inches)", "N/A")),
+            "OD_norm_mm": od,
+            "t_norm_mm": t,
+            "ID_mm": od - 2 * t,
+            "Q_max_m3h": float(self.Q_max[i, j]),
+            "dp_bar": float(self.dp[i, j]) / 1e5,
+            "limit": LIMITS[self.limit[i, j]],
+            "allowable_bar": float(self.allowable[i, j]) / 1e5,
+        }
+
+    def smallest(self, material, flowrate=None):
+        """Smallest-bore pipe that carries ``flowrate`` with a wall good for the design pressure.
+
+        ``flowrate`` defaults to the case's. Returns a dict, or None if no pipe qualifies.
+        """
+        i = self._row(material)
+        flowrate = self.case["flowrate"] if flowrate is None else flowrate
+        ok = (self.Q_max[i] >= flowrate) & (self.allowable[i] >= self.case["design_pressure"] * 1e5)
+        js = np.flatnonzero(ok)
+        if not len(js):
+            return None
+        od = self.schedule["Outside diameter (mm)"].to_numpy(dtype=float)
+        wall = self.schedule["Wall thickness (mm)"].to_numpy(dtype=float)
+        return self._describe(i, int(js[np.lexsort((wall[js], od[js] - 2 * wall[js]))[0]]))
+
+    def summary(self):
+        """JSON-ready result: per material, the smallest pipe that carries the case's flowrate."""
+        return {"flowrate": self.case["flowrate"] or None,
+                "materials": {m: self.smallest(m) for m in self.materials}}
+
+
+def rate_schedule(case, catalogues=None, materials=None):
+    """Rate every schedule entry for every material of ``case``; see the module docstring.
+
+    ``materials`` defaults to those compatible with the case's temperature and
+    pressure. Raises ValueError for unknown fluids or without a schedule.
+    """
+    given = case.get("flowrate") not in (None, "", 0)
+    case = normalize_case(dict(case, flowrate=case.get("flowrate") if given else 1.0))
+    if not given:
+        case["flowrate"] = 0.0                      # no flowrate to check the pipes against
+    cat = catalogues or cat_mod.get_catalogues()
+    two_phase = rheology = None
+    rho = mu = np.nan
+    if case["phase"] == TWO_PHASE:
+        two_phase = TwoPhaseFlow.from_case(case, cat)
+    else:
+        try:
+            rho, mu = cat_mod.fluid_properties(cat.liquid_df, cat.gas_df, case["phase"], case["fluid"])
+        except (IndexError, KeyError):
+            raise ValueError(f"Unknown {case['phase'].lower()}: {case['fluid']!r}") from None
+        if case["phase"] == "Liquid":
+            rheology = cat_mod.fluid_rheology(cat.liquid_df, case["fluid"])
+    if materials is None:
+        materials = cat_mod.get_compatible_materials(cat.material_df, case["temperature"], case["pressure"])
+    if cat.sched_df is None:
+        raise ValueError("No schedule table loaded")
+
+    # material columns (M, 1) and schedule rows (1, S)
+    E, Sy = (a[:, None] for a in material_strength(cat.material_df, materials))
+    k = np.array([cat_mod.material_roughness(cat.material_df, m) for m in materials])[:, None]
+    od = cat.sched_df["Outside diameter (mm)"].to_numpy(dtype=float)[None, :]
+    wall = cat.sched_df["Wall thickness (mm)"].to_numpy(dtype=float)[None, :]
+    inner = od - 2 * wall                                    # mm
+
+    fittings = pack_fittings([resolve_fittings(cat.fittings_df, case["fittings"])])
+    vmax = velocity_limit(case, two_phase.rho, two_phase.mu) if two_phase else velocity_limit(case, rho, mu)
+    L, dp_max = case["length"], case["dp_max"] * 1e5
+    Q, limit = max_flowrate(inner / 1000, L, rho, mu, vmax, k, dp_max, fittings, rheology, two_phase)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if two_phase is None:
+            dp = pressure_drop(inner / 1000, Q, L, rho, mu, np.inf, k, fittings, rheology)
+        else:
+            dp = two_phase.pressure_drop(inner / 1000, Q, L, np.inf, k, fittings)
+        allowable = allowable_pressure(wall, inner, F_MAP[case["location"]], E, Sy,
+                                       case["corrosion_allowance"])
+    allowable = np.broadcast_to(np.maximum(allowable, 0.0), Q.shape)
+    return CapacityRating(case, materials, cat.sched_df, Q, limit, np.where(Q == 0, 0.0, dp),
+                          allowable)
@@ -0,0 +1,513 @@
+# Enhanced Pipeline Report Generator with Professional Styling
+# ------------------------------------------------------------------
+from reportlab.platypus import (
+    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    Image as RLImage, HRFlowable
+)
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+from pathlib import Path
+from datetime import datetime
+
+from engine.resources import resource_path
+
+# Custom color palette for ReportLab
+CORPORATE_BLUE = colors.Color(0.1, 0.2, 0.4)  # Dark blue
+ACCENT_BLUE = colors.Color(0.2, 0.4, 0.7)     # Medium blue
+LIGHT_BLUE = colors.Color(0.9, 0.95, 1.0)     # Very light blue
+GRAY_HEADER = colors.Color(0.3, 0.3, 0.3)     # Dark gray
+LIGHT_GRAY = colors.Color(0.95, 0.95, 0.95)   # Light gray
+
+# Matplotlib-compatible colors (RGB tuples)
+MPL_CORPORATE_BLUE = (0.1, 0.2, 0.4)
+MPL_ACCENT_BLUE = (0.2, 0.4, 0.7)
+MPL_GRAY_HEADER = (0.3, 0.3, 0.3)
+
+
+def _cheapest_material(prices: dict) -> str:
+    """Return the material key that has the lowest total_cost."""
+    if not prices:
+        return "N/A"
+    return min(prices, key=lambda m: prices[m]["total_cost"])
+
+
+def create_custom_styles():
+    """Create professional custom styles"""
+    styles = getSampleStyleSheet()
+    
+    # Check if custom styles already exist, if not add them
+    custom_style_names = ['MainTitle', 'SubTitle', 'SectionHeader', 'BodyText', 'KeyValue']
+    
+    for style_name in custom_style_names:
+        if style_name in styles:
+            continue  # Skip if already exists
+    
+    # Main title style
+    if 'MainTitle' not in styles:
+        styles.add(ParagraphStyle(
+            name='MainTitle',
+            parent=styles['Title'],
+            fontSize=24,
+            textColor=CORPORATE_BLUE,
+            spaceAfter=12,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        ))
+    
+    # Subtitle style
+    if 'SubTitle' not in styles:
+        styles.add(ParagraphStyle(
+            name='SubTitle',
+            parent=styles['Heading2'],
+            fontSize=16,
+            textColor=ACCENT_BLUE,
+            spaceAfter=20,
+            alignment=TA_CENTER,
+            fontName='Helvetica'
+        ))
+    
+    # Section heading style
+    if 'SectionHeader' not in styles:
+        styles.add(ParagraphStyle(
+            name='SectionHeader',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=CORPORATE_BLUE,
+            spaceBefore=15,
+            spaceAfter=8,
+            fontName='Helvetica-Bold',
+            borderWidth=0,
+            borderColor=ACCENT_BLUE,
+            borderPadding=5,
+            backColor=LIGHT_BLUE
+        ))
+    
+    # Body text with better spacing
+    if 'BodyText' not in styles:
+        styles.add(ParagraphStyle(
+            name='BodyText',
+            parent=styles['Normal'],
+            fontSize=10,
+            spaceAfter=6,
+            leading=14,
+            alignment=TA_JUSTIFY
+        ))
+    
+    # Key-value pair style
+    if 'KeyValue' not in styles:
+        styles.add(ParagraphStyle(
+            name='KeyValue',
+            parent=styles['Normal'],
+            fontSize=10,
+            spaceAfter=4,
+            leftIndent=10,
+            leading=13
+        ))
+    
+    return styles
+
+def create_side_by_side_plots(img_folder):
+    """Create side-by-side plots layout"""
+    import matplotlib.pyplot as plt
+    from matplotlib.gridspec import GridSpec
+    import matplotlib.image as mpimg
+    
+    # Check if individual plots exist
+    vel_img_path = img_folder / "velocity_vs_diameter.png"
+    dp_img_path = img_folder / "pressure_drop_vs_diameter.png"
+    
+    if vel_img_path.exists() and dp_img_path.exists():
+        # Create a figure with side-by-side subplots
+        fig = plt.figure(figsize=(12, 5))
+        gs = GridSpec(1, 2, figure=fig, hspace=0.1, wspace=0.3)
+        
+        # Load and display the individual plots
+        ax1 = fig.add_subplot(gs[0, 0])
+        ax2 = fig.add_subplot(gs[0, 1])
+        
+        # Load the saved images
+        vel_img = mpimg.imread(vel_img_path)
+        dp_img = mpimg.imread(dp_img_path)
+        
+        # Display the images
+        ax1.imshow(vel_img)
+        ax1.axis('off')
+        ax1.set_title('Velocity vs Diameter', fontweight='bold', color=MPL_CORPORATE_BLUE, pad=10)
+        
+        ax2.imshow(dp_img)
+        ax2.axis('off')
+        ax2.set_title('Pressure Drop vs Diameter', fontweight='bold', color=MPL_CORPORATE_BLUE, pad=10)
+        
+        # Adjust layout (remove tight_layout to avoid warning with image subplots)
+        plt.subplots_adjust(left=0.05, right=0.95, top=0.85, bottom=0.1, wspace=0.3)
+        
+        # Save combined plot
+        combined_img = img_folder / "combined_plots.png"
+        plt.savefig(combined_img, dpi=200, bbox_inches="tight", facecolor='white')
+        plt.close()
+        
+        return combined_img
+    else:
+        # If individual plots don't exist, create a placeholder
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
+        
+        ax1.text(0.5, 0.5, 'Velocity vs Diameter\n(Plot not available)', 
+                ha='center', va='center', transform=ax1.transAxes,
+                fontsize=12, color=MPL_GRAY_HEADER)
+        ax1.set_title('Velocity vs Diameter', fontweight='bold', color=MPL_CORPORATE_BLUE)
+        
+        ax2.text(0.5, 0.5, 'Pressure Drop vs Diameter\n(Plot not available)', 
+                ha='center', va='center', transform=ax2.transAxes,
+                fontsize=12, color=MPL_GRAY_HEADER)
+        ax2.set_title('Pressure Drop vs Diameter', fontweight='bold', color=MPL_CORPORATE_BLUE)
+        
+        # Style the axes
+        for ax in [ax1, ax2]:
+            ax.grid(True, alpha=0.3)
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            ax.spines['left'].set_color(MPL_GRAY_HEADER)
+            ax.spines['bottom'].set_color(MPL_GRAY_HEADER)
+        
+        plt.subplots_adjust(left=0.1, right=0.9, top=0.85, bottom=0.15, wspace=0.3)
+        
+        # Save combined plot
+        combined_img = img_folder / "combined_plots.png"
+        plt.savefig(combined_img, dpi=200, bbox_inches="tight", facecolor='white')
+        plt.close()
+        
+        return combined_img
+
+def build_pipeline_report(inputs, compatible, plots, thickness_results, results, fittings, prices, file_path: Path,
+                          img_folder=None):
+    # ------------------------------------------------------------------
+    # 0. Setup and save plots
+    # ------------------------------------------------------------------
+    img_folder = Path(img_folder) if img_folder else Path(resource_path("report_imgs"))
+    img_folder.mkdir(exist_ok=True)
+
+    # Create side-by-side plots
+    combined_plots_img = create_side_by_side_plots(img_folder)
+
+    # ------------------------------------------------------------------
+    # 1. Document setup with better margins
+    # ------------------------------------------------------------------
+    doc = SimpleDocTemplate(
+        str(file_path), 
+        pagesize=A4, 
+        topMargin=0.8*inch,
+        bottomMargin=0.8*inch,
+        leftMargin=0.8*inch,
+        rightMargin=0.8*inch
+    )
+
+    # Enhanced header with company info
+    def header_footer(canvas, doc):
+        canvas.saveState()
+        
+        # Header
+        logo_path = Path(resource_path("eppm.png"))
+        if logo_path.exists():
+            # Left logo
+            canvas.drawImage(str(logo_path), 40, A4[1]-60, width=40, height=40, preserveAspectRatio=True)
+            # Right logo
+            canvas.drawImage(str(logo_path), A4[0]-80, A4[1]-60, width=40, height=40, preserveAspectRatio=True)
+        
+        # Header line
+        canvas.setStrokeColor(ACCENT_BLUE)
+        canvas.setLineWidth(2)
+        canvas.line(40, A4[1]-70, A4[0]-40, A4[1]-70)
+        
+        # Footer
+        canvas.setFont('Helvetica', 8)
+        canvas.setFillColor(GRAY_HEADER)
+        
+        # Date and page number
+        date_str = datetime.now().strftime("%B %d, %Y")
+        canvas.drawString(40, 40, f"Generated on: {date_str}")
+        canvas.drawRightString(A4[0]-40, 40, f"Page {doc.page}")
+        
+        # Footer line
+        canvas.setStrokeColor(ACCENT_BLUE)
+        canvas.setLineWidth(1)
+        canvas.line(40, 50, A4[0]-40, 50)
+        
+        canvas.restoreState()
+
+    # ------------------------------------------------------------------
+    # 2. Content
+    # ------------------------------------------------------------------
+    story = []
+    styles = create_custom_styles()
+
+    # Title section with better formatting
+    story.append(Spacer(1, 20))
+    story.append(Paragraph("Pipeline Design Optimization Report", styles["MainTitle"]))
+    story.append(Paragraph(inputs.get("project_name", "Untitled Project"), styles["SubTitle"]))
+    
+    # Add decorative line
+    story.append(HRFlowable(width="100%", thickness=2, color=ACCENT_BLUE, spaceBefore=10, spaceAfter=20))
+
+    # Executive Summary (new section)
+    story.append(Paragraph("Executive Summary", styles["SectionHeader"]))
+    summary_text = f"""
+    This report presents the results of pipeline design optimization for the {inputs.get('project_name', 'project')} 
+    with a flowrate of {inputs.get('flowrate_m3h', '')} m³/h over {inputs.get('pipe_length_m', '')} meters. 
+    The analysis determined an optimal diameter of {plots['chosen_d']:.4f} m based on velocity and pressure drop constraints, 
+    resulting in a velocity of {results['V']:.3f} m/s and total pressure drop of {(results['dp_linear'] + results['dp_singular'])/1e5:.4f} bar.
+    """
+    story.append(Paragraph(summary_text, styles["BodyText"]))
+    story.append(Spacer(1, 15))
+
+    # User Input section 
+    story.append(Paragraph("Design Parameters", styles["SectionHeader"]))
+    
+    # Create input table
+    input_data = [
+        ["Parameter", "Value", "Unit"],
+        ["Project Name", inputs.get('project_name', ''), ""],
+        ["Flowrate", f"{inputs.get('flowrate_m3h', '')}", "m³/h"],
+        ["Pipe Length", f"{inputs.get('pipe_length_m', '')}", "m"],
+        ["Phase", inputs.get('phase', ''), ""],
+        ["Fluid", inputs.get('fluid', ''), ""],
+        ["Maximum Velocity", f"{inputs.get('max_velocity_mps', '')}", "m/s"],
+        ["Temperature", f"{inputs.get('temperature_c', '')}", "°C"],
+        ["Operating Pressure", f"{inputs.get('operating_pressure_bar', '')}", "bar"],
+        ["Design Pressure", f"{inputs.get('design_pressure_bar', '')}", "bar"],
+        ["Location Type", inputs.get('location_type', ''), ""],
+    ]
+    
+    input_table = Table(input_data, colWidths=[2.5*inch, 1.5*inch, 0.8*inch])
+    input_table.setStyle(TableStyle([
+        # Header styling
+        ('BACKGROUND', (0,0), (-1,0), CORPORATE_BLUE),
+        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0,0), (-1,0), 11),
+        
+        # Body styling
+        ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
+        ('FONTSIZE', (0,1), (-1,-1), 10),
+        ('BACKGROUND', (0,1), (-1,-1), colors.white),
+        ('ALTERNATEROWCOLOR', (0,1), (-1,-1), [colors.white, LIGHT_GRAY]),
+        
+        # Grid and alignment
+        ('GRID', (0,0), (-1,-1), 0.5, GRAY_HEADER),
+        ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+        ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, LIGHT_GRAY]),
+    ]))
+    story.append(input_table)
+    story.append(Spacer(1, 10))
+
+    # Fittings subsection
+    if fittings:
+        story.append(Paragraph("System Fittings", styles["SectionHeader"]))
+        fitting_data = [["Quantity", "Fitting Type", "Loss Coefficient (K)"]]
+        for ft, n, k in fittings:
+            fitting_data.append([str(n), ft, f"{k:.3f}"])
+        
+        fitting_table = Table(fitting_data, colWidths=[1*inch, 3*inch, 1.5*inch])
+        fitting_table.setStyle(TableStyle([
+            ('BACKGROUND', (0,0), (-1,0), ACCENT_BLUE),
+            ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0,0), (-1,0), 10),
+            ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
+            ('FONTSIZE', (0,1), (-1,-1), 9),
+            ('GRID', (0,0), (-1,-1), 0.5, GRAY_HEADER),
+            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+            ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, LIGHT_GRAY]),
+        ]))
+        story.append(fitting_table)
+        story.append(Spacer(1, 15))
+
+    # Material Compatibility section
+    story.append(Paragraph("Material Compatibility Analysis", styles["SectionHeader"]))
+    if compatible:
+        material_data = [["Material Grade", "Temperature Range (°C)", "Pressure Range (bar)"]]
+        for m, tmin, tmax, pmin, pmax in compatible:
+            temp_range = f"{tmin:.0f} to {tmax:.0f}"
+            pressure_range = f"{pmin:.0f} to {pmax:.0f}"
+            material_data.append([m, temp_range, pressure_range])
+        
+        material_table = Table(material_data, colWidths=[2.5*inch, 1.8*inch, 1.5*inch])
+        material_table.setStyle(TableStyle([
+            ('BACKGROUND', (0,0), (-1,0), CORPORATE_BLUE),
+            ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0,0), (-1,0), 10),
+            ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
+            ('FONTSIZE', (0,1), (-1,-1), 9),
+            ('GRID', (0,0), (-1,-1), 0.5, GRAY_HEADER),
+            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+            ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, LIGHT_GRAY]),
+        ]))
+        story.append(material_table)
+    else:
+        story.append(Paragraph("⚠ No compatible materials found for the specified conditions.", styles["BodyText"]))
+    story.append(Spacer(1, 15))
+
+    # Design Analysis section
+    story.append(Paragraph("Design Analysis & Optimization", styles["SectionHeader"]))
+    
+    # Key design metrics in a professional box
+    design_data = [
+        ["Design Metric", "Value", "Unit", "Status"],
+        ["Critical Diameter (Velocity)", f"{plots['dcrit_velocity']:.4f}", "m", "✓ Calculated"],
+        ["Critical Diameter (Pressure)", f"{plots['dcrit_pressure']:.4f}", "m", "✓ Calculated"],
+        ["Optimized Diameter", f"{plots['chosen_d']:.4f}", "m", "✓ Selected"],
+        ["Actual Velocity", f"{results['V']:.3f}", "m/s", "✓ Within limits"],
+        ["Reynolds Number", f"{results['Re']:.0f}", "-", "✓ Acceptable"],
+        ["Friction Factor", f"{results['lambda']:.6f}", "-", "✓ Calculated"],
+    ]
+    
+    design_table = Table(design_data, colWidths=[2.2*inch, 1.2*inch, 0.8*inch, 1.3*inch])
+    design_table.setStyle(TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), CORPORATE_BLUE),
+        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0,0), (-1,0), 10),
+        ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
+        ('FONTSIZE', (0,1), (-1,-1), 9),
+        ('GRID', (0,0), (-1,-1), 0.5, GRAY_HEADER),
+        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+        ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, LIGHT_GRAY]),
+    ]))
+    story.append(design_table)
+    story.append(Spacer(1, 15))
+
+    # Optimization Charts (side by side)
+    story.append(Paragraph("Optimization Charts", styles["SectionHeader"]))
+    if combined_plots_img.exists():
+        story.append(RLImage(str(combined_plots_img), width=7*inch, height=3*inch))
+    story.append(Spacer(1, 15))
+
+    # Pressure Analysis section
+    story.append(Paragraph("Hydraulic Analysis Results", styles["SectionHeader"]))
+    
+    pressure_data = [
+        ["Pressure Component", "Value", "Unit", "Percentage"],
+        ["Linear Pressure Drop", f"{results['dp_linear']/1e5:.4f}", "bar", f"{results['dp_linear']/(results['dp_linear'] + results['dp_singular'])*100:.1f}%"],
+        ["Singular Pressure Drop", f"{results['dp_singular']/1e5:.4f}", "bar", f"{results['dp_singular']/(results['dp_linear'] + results['dp_singular'])*100:.1f}%"],
+        ["Total Pressure Drop", f"{(results['dp_linear'] + results['dp_singular'])/1e5:.4f}", "bar", "100.0%"],
+        ["Velocity Head", f"{results['H']:.4f}", "m", "N/A"],
+    ]
+    
+    pressure_table = Table(pressure_data, colWidths=[2.2*inch, 1.2*inch, 0.8*inch, 1.3*inch])
+    pressure_table.setStyle(TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), ACCENT_BLUE),
+        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0,0), (-1,0), 10),
+        ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
+        ('FONTSIZE', (0,1), (-1,-1), 9),
+        ('GRID', (0,0), (-1,-1), 0.5, GRAY_HEADER),
+        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+        ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, LIGHT_GRAY]),
+        # Highlight total row
+        ('BACKGROUND', (0,-1), (-1,-1), LIGHT_BLUE),
+        ('FONTNAME', (0,-1), (-1,-1), 'Helvetica-Bold'),
+    ]))
+    story.append(pressure_table)
+    story.append(Spacer(1, 15))
+
+    # ------------------------------------------------------------------
+    # Wall Thickness Design  ––  one table per material
+    # ------------------------------------------------------------------
+    story.append(Paragraph("Wall Thickness Design", styles["SectionHeader"]))
+
+    if thickness_results:               # thickness_results is the list you already have
+        for r in thickness_results:
+            mat_name = r["Material"]
+            story.append(Paragraph(f"<b>{mat_name}</b>", styles["BodyText"]))
+            tbl_data = [
+                ["Parameter", "Value", "Unit"],
+                ["Required Thickness",   f"{r['t_required_mm']:.2f}", "mm"],
+                ["Outside Diameter",     f"{r['OD_norm_mm']:.2f}",    "mm"],
+                ["Selected Thickness",   f"{r['t_norm_mm']:.2f}",     "mm"],
+                ["Nominal Pipe Size",    f"{r['NPS']}",               ""],
+                ["API Specification",    f"{r['API']}",               ""]
+            ]
+            t = Table(tbl_data, colWidths=[2.5*inch, 1.5*inch, 1*inch])
+            t.setStyle(TableStyle([
+                ('BACKGROUND', (0,0), (-1,0), CORPORATE_BLUE),
+                ('TEXTCOLOR',  (0,0), (-1,0), colors.white),
+                ('FONTNAME',   (0,0), (-1,0), 'Helvetica-Bold'),
+                ('FONTSIZE',   (0,0), (-1,0), 10),
+                ('FONTNAME',   (0,1), (-1,-1), 'Helvetica'),
+                ('FONTSIZE',   (0,1), (-1,-1), 9),
+                ('GRID',       (0,0), (-1,-1), 0.5, GRAY_HEADER),
+                ('ALIGN',      (0,0), (-1,-1), 'LEFT'),
+                ('VALIGN',     (0,0), (-1,-1), 'MIDDLE'),
+                ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, LIGHT_GRAY]),
+            ]))
+            story.append(t)
+            story.append(Spacer(1, 10))
+    else:
+        story.append(Paragraph("No thickness data available.", styles["BodyText"]))
+    story.append(Spacer(1, 15))
+
+    
+    # Cost Analysis section
+    story.append(Paragraph("Cost Analysis", styles["SectionHeader"]))
+    if prices:
+        price_data = [["Material", "Mass (kg)", "Material Cost ($)", "Fittings Cost ($)", "Total Cost ($)"]]
+        for mat, info in prices.items():
+            if info:
+                price_data.append([
+                    mat,
+                    f"{info['mass']:.1f}",
+                    f"${info['material_cost']:.2f}",
+                    f"${info['fittings_cost']:.2f}",
+                    f"${info['total_cost']:.2f}"
+                ])
+
+        price_table = Table(price_data, colWidths=[2.2*inch, 1.2*inch, 1.3*inch, 1.3*inch, 1.3*inch])
+        price_table.setStyle(TableStyle([
+            ('BACKGROUND', (0,0), (-1,0), CORPORATE_BLUE),
+            ('TEXTCOLOR', (0,0), (-1,0), colors.white),
+            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0,0), (-1,0), 10),
+            ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
+            ('FONTSIZE', (0,1), (-1,-1), 9),
+            ('GRID', (0,0), (-1,-1), 0.5, GRAY_HEADER),
+            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
+            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+            ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, LIGHT_GRAY]),
+        ]))
+        story.append(price_table)
+    else:
+        story.append(Paragraph("No cost data available.", styles["BodyText"]))
+    # ------------------------------------------------------------------
+    # Conclusions – automatically pick the cheapest material
+    # ------------------------------------------------------------------
+    story.append(Paragraph("Design Recommendations", styles["SectionHeader"]))
+
+    cheapest_mat = _cheapest_material(prices)
+
+    # find the thickness record that belongs to the cheapest material
+    thickness_rec = next((t for t in thickness_results if t["Material"] == cheapest_mat), {})
+
+    recommendations = f"""
+    Based on the comprehensive analysis performed, the following design specifications are recommended:
+
+    • <b>Material:</b> {cheapest_mat} (lowest total cost: ${prices.get(cheapest_mat, {}).get('total_cost', 0):.2f})
+    • <b>Pipe Diameter:</b> {thickness_rec.get('OD_norm_mm', 'N/A')} mm (NPS {thickness_rec.get('NPS', 'N/A')})
+    • <b>Wall Thickness:</b> {thickness_rec.get('t_norm_mm', 'N/A')} mm per {thickness_rec.get('API', 'N/A')} specification
+    • <b>Operating Velocity:</b> {results.get('V', 'N/A'):.3f} m/s (within acceptable limits)
+    • <b>Total System Pressure Drop:</b> {(results.get('dp_linear', 0) + results.get('dp_singular', 0)) / 1e5:.4f} bar
+
+    The design meets all specified constraints and provides optimal performance for the given operating conditions.
+    """
+    story.append(Paragraph(recommendations, styles["BodyText"]))
+
+    # Build the document
+    doc.build(story, onFirstPage=header_footer, onLaterPages=header_footer)
@@ -0,0 +1,46 @@
+import os
+import shutil
+import sys
+
+
+def app_dir():
+    """Folder holding the catalogues and assets (next to the exe when frozen)."""
+    if getattr(sys, 'frozen', False):  # exe mode
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def bundle_dir():
+    """Folder of the files bundled into the exe (``_internal``); the app folder in dev."""
+    return getattr(sys, '_MEIPASS', app_dir())
+
+
+def resource_path(relative_path: str):
+    """Absolute path of a resource: next to the exe if it is there, else the bundled copy."""
+    path = os.path.join(app_dir(), relative_path)
+    if not os.path.exists(path):
+        bundled = os.path.join(bundle_dir(), relative_path)
+        if os.path.exists(bundled):
+            return bundled
+    return path
+
+
+def install_bundled(names):
+    """Copy bundled files that are missing next to the exe (first start of a build).
+
+    The catalogues must live in a writable folder (the SQLite copy is updated,
+    fluids are added). Returns the names copied.
+    """
+    copied = []
+    if bundle_dir() == app_dir():
+        return copied
+    for name in names:
+        src, dst = os.path.join(bundle_dir(), name), os.path.join(app_dir(), name)
+        if os.path.isfile(src) and not os.path.exists(dst):
+            try:
+                shutil.copy2(src, dst)
+            except OSError as e:                 # read-only install: use the bundled copy
+                print(f"⚠ Could not copy {name} next to the exe: {e}")
+                continue
+            copied.append(name)
+    return copied
@@ -0,0 +1,174 @@
+"""Columnar design results: one record per (case, material) in a NumPy structured array.
+
+``run_design`` returns nested dicts – a detailed calculation per material,
+lists of dicts for thickness and prices – which suit JSON but cost a few kB
+per material and cannot be computed on as arrays. :class:`MaterialResults`
+holds the same numbers as columns of one structured array::
+
+    table = MaterialResults.from_designs(designs)
+    table["total_cost"]              # view, no copy
+    table.view("material", "OD_norm_mm", "t_norm_mm")   # report table, no copy
+    table.case(3).recommended        # per-case slice, still a view
+    table.to_frame()                 # DataFrame on demand
+
+Missing values (no valid diameter, no schedule pipe, no price) are NaN;
+NPS and API are kept as text. The 3-K coefficients of the fittings are a
+separate (records, fittings) array aligned with :attr:`fittings`.
+"""
+import numpy as np
+
+FLOAT_FIELDS = (
+    "dcrit_pressure", "dcrit", "velocity", "reynolds", "lambda", "H", "dp_linear", "dp_singular",
+    "t_required_mm", "OD_computed_mm", "OD_norm_mm", "t_norm_mm",
+    "mass", "material_cost", "fittings_cost", "total_cost",
+)
+TEXT_FIELDS = ("NPS", "API")
+CALCULATION_KEYS = ("velocity", "reynolds", "lambda", "H", "dp_linear", "dp_singular")
+THICKNESS_KEYS = {"dcrit": "dcrit (m)", "t_required_mm": "t_required_mm",
+                  "OD_computed_mm": "OD_computed_mm", "OD_norm_mm": "OD_norm_mm",
+                  "t_norm_mm": "t_norm_mm", "NPS": "NPS", "API": "API"}
+PRICE_KEYS = ("mass", "material_cost", "fittings_cost", "total_cost")
+
+
+def result_dtype(material_len=64, text_len=16):
+    return np.dtype([("case", "i4"), ("material", f"U{material_len}")]
+                    + [(f, "f8") for f in FLOAT_FIELDS]
+                    + [(f, f"U{text_len}") for f in TEXT_FIELDS])
+
+
+def _number(value):
+    return np.nan if value is None else float(value)
+
+
+class MaterialResults:
+    """Per-material results of one or more designs, stored column-wise."""
+
+    __slots__ = ("records", "fittings", "fitting_k")
+
+    def __init__(self, records, fittings=(), fitting_k=None):
+        self.records = records
+        self.fittings = [tuple(f) for f in fittings]
+        self.fitting_k = (np.full((len(records), len(self.fittings)), np.nan)
+                          if fitting_k is None else fitting_k)
+
+    # ---- construction ----
+    @classmethod
+    def from_design(cls, result, case=0):
+        """Table of one ``run_design`` result (``case`` fills the case column)."""
+        materials = list(result["compatible_materials"])
+        thickness = {t["Material"]: t for t in result.get("thickness") or ()}
+        prices = result.get("prices") or {}
+        texts = [str(thickness[m][k]) for m in thickness for k in TEXT_FIELDS]
+        records = np.zeros(len(materials), dtype=result_dtype(
+            max(map(len, materials), default=1), max(map(len, texts), default=1)))
+        records["case"] = case
+        records["material"] = materials
+        for f in FLOAT_FIELDS:
+            records[f] = np.nan
+
+        fittings = [tuple(f) for f in result["case"]["fittings"]]
+        fitting_k = np.full((len(materials), 0), np.nan)
+        for i, mat in enumerate(materials):
+            per = result["materials"].get(mat, {})
+            records["dcrit_pressure"][i] = _number(per.get("dcrit"))
+            calc = per.get("calculation")
+            if calc:
+                for key in CALCULATION_KEYS:
+                    records[key][i] = calc[key]
+                if not fitting_k.shape[1] and calc["details"]:
+                    fittings = [(typ, n) for typ, n, _ in calc["details"]]
+                    fitting_k = np.full((len(materials), len(fittings)), np.nan)
+                for j, (_, _, K) in enumerate(calc["details"]):
+                    fitting_k[i, j] = K
+            if mat in thickness:
+                for field, key in THICKNESS_KEYS.items():
+                    records[field][i] = thickness[mat][key] if field in TEXT_FIELDS \
+                        else _number(thickness[mat][key])
+            for key in PRICE_KEYS if mat in prices else ():
+                records[key][i] = prices[mat][key]
+        if not fitting_k.shape[1]:
+            fittings = []                        # no calculation: nothing resolved
+        return cls(records, fittings, fitting_k)
+
+    @classmethod
+    def from_designs(cls, results):
+        """One table for many designs; the case column is the position in ``results``."""
+        return cls.concat([cls.from_design(r, i) for i, r in enumerate(results)])
+
+    @classmethod
+    def concat(cls, tables):
+        """Stack tables (fitting coefficients are kept only if all share one fittings list)."""
+        tables = list(tables)
+        if not tables:
+            return cls(np.zeros(0, dtype=result_dtype(1, 1)))
+        dtype = result_dtype(max(t.records.dtype["material"].itemsize // 4 for t in tables),
+                             max(t.records.dtype["NPS"].itemsize // 4 for t in tables))
+        records = np.concatenate([t.records.astype(dtype) for t in tables])
+        if all(t.fittings == tables[0].fittings for t in tables):
+            return cls(records, tables[0].fittings, np.vstack([t.fitting_k for t in tables]))
+        return cls(records)
+
+    # ---- access (views into ``records``) ----
+    def __len__(self):
+        return len(self.records)
+
+    def __repr__(self):
+        return f"<MaterialResults: {len(self)} record(s), {len(np.unique(self.records['case']))} case(s)>"
+
+    def __getitem__(self, field):
+        """Column view, e.g. ``table["total_cost"]``."""
+        return self.records[field]
+
+    @property
+    def materials(self):
+        return self.records["material"]
+
+    def view(self, *fields):
+        """Multi-column structured view (no copy), e.g. for a report table."""
+        return self.records[list(fields)]
+
+    def case(self, index):
+        """Records of one case as a table sharing memory with this one."""
+        cases = self.records["case"]
+        lo, hi = np.searchsorted(cases, index, "left"), np.searchsorted(cases, index, "right")
+        return MaterialResults(self.records[lo:hi], self.fittings, self.fitting_k[lo:hi])
+
+    def index(self, material):
+        hits = np.flatnonzero(self.records["material"] == material)
+        if not len(hits):
+            raise KeyError(f"{material!r} is not in the results")
+        return int(hits[0])
+
+    @property
+    def feasible(self):
+        """Mask of the records with a price, i.e. a schedule pipe was found."""
+        return ~np.isnan(self.records["total_cost"])
+
+    @property
+    def recommended(self):
+        """Cheapest material (first on ties), or None; single-case tables only."""
+        cost = self.records["total_cost"]
+        if not len(cost) or np.isnan(cost).all():
+            return None
+        return str(self.records["material"][np.nanargmin(cost)])
+
+    def to_frame(self):
+        """pandas DataFrame (a copy), one row per record, fitting K as ``K[type]`` columns."""
+        import pandas as pd
+
+        frame = pd.DataFrame(self.records)
+        for j, (typ, _) in enumerate(self.fittings):
+            frame[f"K[{typ}]"] = self.fitting_k[:, j]
+        return frame
+
+    # ---- back to the dict form used by the report and the JSON output ----
+    def thickness_results(self):
+        rows = self.records[~np.isnan(self.records["t_norm_mm"])]
+        return [dict({"Material": str(r["material"])},
+                     **{key: str(r[field]) if field in TEXT_FIELDS else float(r[field])
+                        for field, key in THICKNESS_KEYS.items()})
+                for r in rows]
+
+    def prices(self):
+        rows = self.records[self.feasible]
+        return {str(r["material"]): {k: float(r[k]) for k in PRICE_KEYS} for r in rows}
@@ -0,0 +1,173 @@
+"""Non-Newtonian liquids: power-law and Bingham-plastic pipe friction.
+
+A liquid's rheology is the triple ``(n, K, tau0)``, packed like the fittings
+and broadcast with the other inputs of :func:`engine.hydraulics.pressure_drop`:
+
+================  ===========================  =================
+Newtonian         τ = μ·γ̇                      (1, μ, 0)
+Power-law         τ = K·γ̇ⁿ                     (n, K, 0)
+Bingham plastic   τ = τ0 + μp·γ̇                (1, μp, τ0)
+================  ===========================  =================
+
+Power-law fluids use the Metzner–Reed Reynolds number, 64/Re in laminar flow
+and Dodge–Metzner above :data:`engine.hydraulics.RE_LAMINAR`. Bingham
+plastics use Darby–Melson, which blends the Buckingham–Reiner laminar factor
+and a Hedström-dependent turbulent one and needs no regime switch. Both are
+smooth-pipe correlations. Newtonian entries keep Swamee–Jain with roughness,
+so a mixed batch gives the Newtonian rows exactly their usual result.
+
+In the liquid catalogue the columns of :data:`COLUMNS` hold the model; blank
+cells mean Newtonian. For a Bingham plastic K is the plastic viscosity (Pa·s).
+"""
+import numpy as np
+
+from engine.hydraulics import RE_LAMINAR, friction_factor as newtonian_friction
+
+MODELS = ("Newtonian", "Power-law", "Bingham")
+COLUMNS = {"model": "Rheology", "n": "Flow Index n", "K": "Consistency K (Pa·sⁿ)",
+           "tau0": "Yield Stress (Pa)"}
+DODGE_METZNER_ITERATIONS = 6        # Newton steps on 1/√f
+BUCKINGHAM_ITERATIONS = 20          # Newton steps on τ0/τw, at most
+TOLERANCE = 1e-13
+
+
+# ------------------------------------------------------------------
+# Parameters
+# ------------------------------------------------------------------
+def _blank(value):
+    return value is None or (isinstance(value, float) and np.isnan(value)) or str(value).strip() == ""
+
+
+def parse_rheology(model, n=None, K=None, tau0=None):
+    """(n, K, tau0) from catalogue cells, or None for a Newtonian liquid; raises ValueError."""
+    if _blank(model) or str(model).strip().lower() == "newtonian":
+        return None
+    model = str(model).strip().lower()
+    try:
+        n, K, tau0 = (None if _blank(v) else float(v) for v in (n, K, tau0))
+    except (TypeError, ValueError):
+        raise ValueError("Rheology parameters must be numbers") from None
+    if model == "power-law":
+        if not (n and n > 0 and K and K > 0):
+            raise ValueError("A power-law liquid needs a flow index n > 0 and a consistency K > 0")
+        return (n, K, 0.0)
+    if model == "bingham":
+        if not (K and K > 0 and tau0 is not None and tau0 >= 0):
+            raise ValueError("A Bingham liquid needs a plastic viscosity K > 0 and a yield stress ≥ 0")
+        return (1.0, K, tau0)
+    raise ValueError(f"Unknown rheology {model!r}; use one of {list(MODELS)}")
+
+
+def model_name(rheology):
+    """'Newtonian', 'Power-law' or 'Bingham' for one (n, K, tau0) triple or None."""
+    if rheology is None:
+        return "Newtonian"
+    n, _, tau0 = rheology
+    return "Bingham" if tau0 > 0 else "Power-law" if n != 1 else "Newtonian"
+
+
+def pack_rheology(rheologies, mu):
+    """One (n, K, tau0) column per row; None entries become Newtonian with their ``mu``.
+
+    Returns None when every row is Newtonian, so callers keep the plain path.
+    """
+    if all(r is None for r in rheologies):
+        return None
+    mu = np.broadcast_to(np.asarray(mu, dtype=float), (len(rheologies),))
+    rows = [(1.0, m, 0.0) if r is None else r for r, m in zip(rheologies, mu)]
+    n, K, tau0 = (np.array(col, dtype=float).reshape(-1, 1) for col in zip(*rows))
+    return n, K, tau0
+
+
+# ------------------------------------------------------------------
+# Correlations (Darcy friction factors)
+# ------------------------------------------------------------------
+def metzner_reed_reynolds(rho, V, D, n, K):
+    """Generalized Reynolds number; ρVD/K for n = 1."""
+    return rho * V ** (2 - n) * D ** n / (K * 8 ** (n - 1) * ((3 * n + 1) / (4 * n)) ** n)
+
+
+def dodge_metzner(Re, n):
+    """Turbulent power-law friction: 1/√f = 4/n^0.75·log10(Re·f^(1−n/2)) − 0.4/n^1.2 (Fanning)."""
+    a, b = 4 / n ** 0.75, 0.4 / n ** 1.2
+    c = a * (2 - n) / np.log(10)
+    rhs = a * np.log10(Re) - b
+    x = np.full(np.broadcast(Re, n).shape, 10.0)          # 1/√f, Fanning
+    for _ in range(DODGE_METZNER_ITERATIONS):
+        x = x - (x - rhs + c * np.log(x)) / (1 + c / x)
+    return 4 / x ** 2
+
+
+def hedstrom(rho, D, mu_p, tau0):
+    return rho * tau0 * D ** 2 / mu_p ** 2
+
+
+def buckingham_reiner(Re, He):
+    """Laminar Bingham friction (Darcy), solved for ξ = τ0/τw by Newton's method."""
+    c = He / (8 * Re)
+    # ξ = c·(1 − 4ξ/3 + ξ⁴/3); both guesses are below the root (the second
+    # one tight for plug flow, c ≫ 1), and h is concave, so Newton climbs to it
+    a, b = 1 + 4 * c / 3, c / 3                         # h(ξ) = a·ξ − c − b·ξ⁴
+    with np.errstate(divide="ignore"):
+        xi = np.maximum(c / a, 1 - 1 / np.sqrt(2 * c))
+    for _ in range(BUCKINGHAM_ITERATIONS):
+        xi3 = xi * xi * xi
+        step = (a * xi - c - b * xi3 * xi) / (a - 4 * b * xi3)
+        xi = np.minimum(xi - step, 1.0)
+        if not np.any(np.abs(step) > TOLERANCE):
+            break
+    xi2 = xi * xi
+    return 64 / (Re * (1 - 4 * xi / 3 + xi2 * xi2 / 3))
+
+
+def darby_melson(Re, He):
+    """Bingham friction over all regimes (Darby & Melson), Darcy."""
+    f_L = buckingham_reiner(Re, He) / 4
+    f_T = np.exp(-1.47 * np.log(10) * (1 + 0.146 * np.exp(-2.9e-5 * He)) - 0.193 * np.log(Re))
+    m = 1.7 + 40000 / Re
+    # (f_L^m + f_T^m)^(1/m) scaled by the larger one: f^m underflows at low Re
+    top, low = np.maximum(f_L, f_T), np.minimum(f_L, f_T)
+    return 4 * top * np.exp(np.log1p(np.exp(m * np.log(low / top))) / m)
+
+
+def _fill(out, mask, fn, *arrays):
+    """out[mask] = fn(*arrays[mask]), without the gather when every element is selected."""
+    if mask.all():
+        out[...] = fn(*arrays)
+    elif mask.any():
+        out[mask] = fn(*(a[mask] for a in arrays))
+
+
+def _power_law(Re, n):
+    f = np.empty(Re.shape)
+    _fill(f, Re < RE_LAMINAR, lambda Re: 64 / Re, Re)
+    _fill(f, Re >= RE_LAMINAR, dodge_metzner, Re, n)
+    return f
+
+
+def friction_factor(rho, V, D, k, rheology):
+    """Darcy friction factor and generalized Reynolds number for broadcast inputs.
+
+    Each model is evaluated on its own elements only. The power-law and
+    Bingham correlations do not depend on the roughness, so they are
+    evaluated without broadcasting over ``k``: one row per diameter grid
+    serves every material.
+    """
+    n, K, tau0 = rheology
+    rho, V, D, n, K, tau0 = np.broadcast_arrays(*(np.asarray(a, dtype=float)
+                                                  for a in (rho, V, D, n, K, tau0)))
+    Re = metzner_reed_reynolds(rho, V, D, n, K)
+    f = np.empty(Re.shape)
+    bingham = tau0 > 0
+    power = ~bingham & (n != 1)
+    newtonian = ~bingham & ~power
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        _fill(f, power, _power_law, Re, n)
+        _fill(f, bingham, lambda Re, He: darby_melson(Re, He), Re, hedstrom(rho, D, K, tau0))
+    if newtonian.any():
+        shape = np.broadcast_shapes(f.shape, np.shape(k))
+        f, Re, D, newtonian = (np.broadcast_to(a, shape) for a in (f, Re, D, newtonian))
+        k = np.broadcast_to(np.asarray(k, dtype=float), shape)
+        f = f.copy()
+        _fill(f, newtonian, newtonian_friction, Re, D, k)
+    return np.broadcast_to(f, np.broadcast_shapes(f.shape, np.shape(k))), Re
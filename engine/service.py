@@ -0,0 +1,425 @@
+"""Local HTTP calculation service (``python -m engine serve``).
+
+A small asyncio HTTP/1.1 server (standard library only) exposing the sizing
+chain as JSON endpoints:
+
+    GET  /health               liveness + catalogue sizes
+    GET  /catalogues           fluids, materials and fitting types
+    POST /compatibility        {temperature, pressure}
+    POST /critical-diameter    hydraulic inputs → dcrit per material
+    POST /screen               hydraulic inputs → dcrit per material from the design charts
+    POST /sweep                hydraulic inputs → ΔP curves per material
+    POST /thickness            full case → wall thickness & schedule
+    POST /prices               full case → thickness, schedule and prices
+    POST /design               full case → complete design (as the CLI)
+
+Hydraulic inputs are the case fields of :mod:`engine.design` (``fluid`` may
+be replaced by explicit ``rho``/``mu`` and ``temperature``/``pressure`` by a
+``materials`` list); the velocity limit may be any model of
+:mod:`engine.velocity`. Concurrent ``/critical-diameter`` and ``/sweep``
+requests are collected for a few milliseconds and evaluated as one
+:func:`pressure_drop_matrix` call in the worker pool, so the cost per request
+falls as load rises. ``/screen`` answers from the precomputed design charts
+(:mod:`engine.charts`) in the service process itself. The catalogues stay
+loaded in every process.
+"""
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from engine import catalogues as cat_mod
+from engine.hydraulics import (
+    critical_diameters, diameter_grid, pack_fittings, pressure_drop_matrix,
+    velocity_critical_diameter,
+)
+from engine.rheology import pack_rheology
+from engine.velocity import parse_velocity_limit, velocity_limit
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+MAX_BODY = 4 * 1024 * 1024
+VELOCITY_FIELDS = ("velocity", "velocity_limit", "c_factor", "velocity_expression")
+
+
+class BadRequest(ValueError):
+    pass
+
+
+# ------------------------------------------------------------------
+# Warm lookup tables (built once per process)
+# ------------------------------------------------------------------
+class WarmTables:
+    """Dict/array views of the catalogues for per-request lookups."""
+
+    def __init__(self, cat):
+        self.cat = cat
+        m = cat.material_df
+        self.materials = m["Material"].tolist()
+        num = {c: pd.to_numeric(m[c], errors="coerce").to_numpy(dtype=float)
+               for c in ("Temperature Min", "Temperature Max", "Pressure Min", "Pressure Max")}
+        self._tmin, self._tmax = num["Temperature Min"], num["Temperature Max"]
+        self._pmin, self._pmax = num["Pressure Min"], num["Pressure Max"]
+        self.roughness = {}
+        for mat in self.materials:
+            try:
+                self.roughness[mat] = cat_mod.material_roughness(m, mat)
+            except (TypeError, ValueError):
+                pass
+
+        self.fluids, self.rheology = {}, {}
+        for phase, df, col in (("Liquid", cat.liquid_df, "Liquid"), ("Gas", cat.gas_df, "Gas")):
+            for name in df[col].dropna():
+                try:
+                    self.fluids[(phase, name)] = cat_mod.fluid_properties(
+                        cat.liquid_df, cat.gas_df, phase, name)
+                    if phase == "Liquid":
+                        self.rheology[(phase, name)] = cat_mod.fluid_rheology(cat.liquid_df, name)
+                except (TypeError, ValueError):
+                    self.fluids.pop((phase, name), None)      # unusable catalogue row
+
+        f = cat.fittings_df
+        self.fittings = {}
+        for _, r in f.iterrows():
+            key = str(r["Fitting Type"]).strip().lower()
+            self.fittings.setdefault(key, (float(r["K1"]), float(r["K∞"]), float(r["Kd"])))
+
+    def compatible(self, temp, pressure):
+        ok = ((self._tmin <= temp) & (temp <= self._tmax) &
+              (self._pmin <= pressure) & (pressure <= self._pmax))
+        return [m for m, good in zip(self.materials, ok) if good]
+
+    def resolve_fittings(self, fittings):
+        out = []
+        for typ, n in fittings:
+            typ = str(typ).strip()
+            K = self.fittings.get(typ.lower())
+            if typ and n > 0 and K:
+                out.append((typ, int(n)) + K)
+        return out
+
+
+_tables = None
+
+
+def _warm():
+    """Process-pool initializer: load catalogues and tables once per worker."""
+    global _tables
+    if _tables is None:
+        _tables = WarmTables(cat_mod.get_catalogues())
+    return _tables
+
+
+# ------------------------------------------------------------------
+# Work executed in the pool (top-level so it pickles)
+# ------------------------------------------------------------------
+def _evaluate_rows(columns, fittings, with_curves, rheology=None):
+    """One vectorized sweep over every queued (request, material) row."""
+    Q, L, rho, mu, vmax, k, dp_max = columns
+    diameters = diameter_grid()
+    matrix = pressure_drop_matrix(Q, L, rho, mu, vmax, k, fittings, diameters, rheology)
+    dcrit = critical_diameters(diameters, matrix, dp_max)
+    return dcrit, (matrix if with_curves else None)
+
+
+def _number(body, key, default=None):
+    value = body.get(key, default)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise BadRequest(f"'{key}' must be a number, got {value!r}") from None
+
+
+def _hydraulic_rows(body):
+    """Per-material sweep rows of a request, plus the material names.
+
+    Runs in the pool: a custom velocity expression is evaluated here, off the
+    event loop.
+    """
+    tables = _warm()
+    Q, L = _number(body, "flowrate"), _number(body, "length")
+    limit = parse_velocity_limit({k: body[k] for k in VELOCITY_FIELDS if k in body})
+    vmax, dp_max = _number(limit, "velocity"), _number(body, "dp_max", "inf")
+    for key, value in (("flowrate", Q), ("length", L), ("velocity", vmax), ("dp_max", dp_max)):
+        if not value > 0:                           # as engine.design.normalize_case
+            raise BadRequest(f"'{key}' must be positive, got {value:g}")
+    dp_max *= 1e5
+    rheology = None
+    if "rho" in body and "mu" in body:
+        rho, mu = _number(body, "rho"), _number(body, "mu")
+    else:
+        key = (body.get("phase", "Liquid"), body.get("fluid"))
+        if key not in tables.fluids:
+            raise BadRequest(f"Unknown {key[0].lower()}: {key[1]!r}")
+        rho, mu = tables.fluids[key]
+        rheology = tables.rheology.get(key)
+    if "velocity_limit" in limit:
+        vmax = velocity_limit(dict(limit, velocity=vmax), rho, mu)
+    if "materials" in body:
+        materials = [m for m in body["materials"] if m in tables.roughness]
+    else:
+        materials = tables.compatible(_number(body, "temperature"), _number(body, "pressure"))
+    fittings = body.get("fittings", [])
+    if isinstance(fittings, dict):
+        fittings = list(fittings.items())
+    try:
+        fittings = tables.resolve_fittings(fittings)
+    except (TypeError, ValueError):
+        raise BadRequest("'fittings' must be [type, count] pairs or a {type: count} object") from None
+    rows = [(Q, L, rho, mu, vmax, tables.roughness[m], dp_max, fittings, rheology)
+            for m in materials]
+    return materials, rows, velocity_critical_diameter(Q, vmax)
+
+
+
+def _design(case, upto):
+    from engine.design import run_design
+
+    _warm()
+    result = run_design(case)
+    if upto == "thickness":
+        return {k: result[k] for k in ("case", "compatible_materials", "dcrit_velocity", "thickness")}
+    if upto == "prices":
+        return {k: result[k] for k in ("case", "compatible_materials", "dcrit_velocity",
+                                        "thickness", "prices", "recommended")}
+    return result
+
+
+# ------------------------------------------------------------------
+# Micro-batching
+# ------------------------------------------------------------------
+class MicroBatcher:
+    """Collects sweep rows from concurrent requests into one pool call."""
+
+    def __init__(self, run, window=0.002, max_rows=4096, with_curves=False):
+        self.run = run                     # coroutine fn(columns, fittings, with_curves, rheology)
+        self.window = window
+        self.max_rows = max_rows
+        self.with_curves = with_curves
+        self._pending = []
+        self._flush_handle = None
+        self.batches = 0
+        self.rows = 0
+
+    async def submit(self, rows):
+        """rows: list of (Q, L, rho, mu, vmax, k, dp_max, fittings[, rheology]) → list of results."""
+        fut = asyncio.get_running_loop().create_future()
+        self._pending.append((rows, fut))
+        if sum(len(r) for r, _ in self._pending) >= self.max_rows:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await fut
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        if pending:
+            asyncio.ensure_future(self._run_batch(pending))
+
+    async def _run_batch(self, pending):
+        flat = [row for rows, _ in pending for row in rows]
+        self.batches += 1
+        self.rows += len(flat)
+        try:
+            columns = tuple(np.array([row[i] for row in flat], dtype=float) for i in range(7))
+            fittings = pack_fittings([row[7] for row in flat])
+            rheology = pack_rheology([row[8] if len(row) > 8 else None for row in flat], columns[3])
+            dcrit, curves = await self.run(columns, fittings, self.with_curves, rheology)
+        except Exception as exc:
+            for _, fut in pending:
+                if not fut.done():
+                    fut.set_exception(exc)
+            return
+        start = 0
+        for rows, fut in pending:
+            stop = start + len(rows)
+            part = (dcrit[start:stop], None if curves is None else curves[start:stop])
+            if not fut.done():
+                fut.set_result(part)
+            start = stop
+
+
+# ------------------------------------------------------------------
+# Service
+# ------------------------------------------------------------------
+class CalculationService:
+    def __init__(self, workers=None, batch_window=0.002):
+        self.tables = _warm()
+        workers = os.cpu_count() if workers is None else workers
+        if workers > 0:
+            self.pool = ProcessPoolExecutor(workers, initializer=_warm)
+        else:                                           # in-process (tests, 1-core boxes)
+            self.pool = ThreadPoolExecutor(1)
+        self.dcrit_batcher = MicroBatcher(self._run_rows, batch_window)
+        self.sweep_batcher = MicroBatcher(self._run_rows, batch_window, max_rows=512, with_curves=True)
+        self.started = time.time()
+        self.requests = 0
+        self._charts = None
+        self.routes = {
+            ("GET", "/health"): self.health,
+            ("GET", "/catalogues"): self.catalogues,
+            ("POST", "/compatibility"): self.compatibility,
+            ("POST", "/critical-diameter"): self.critical_diameter,
+            ("POST", "/screen"): self.screen,
+            ("POST", "/sweep"): self.sweep,
+            ("POST", "/thickness"): lambda body: self._pool_design(body, "thickness"),
+            ("POST", "/prices"): lambda body: self._pool_design(body, "prices"),
+            ("POST", "/design"): lambda body: self._pool_design(body, "design"),
+        }
+
+    async def _run_rows(self, columns, fittings, with_curves, rheology=None):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, _evaluate_rows, columns, fittings, with_curves,
+                                          rheology)
+
+    async def _pool_design(self, body, upto):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, _design, body, upto)
+
+    async def _hydraulic_rows(self, body):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, _hydraulic_rows, body)
+
+    # ---- inputs ----
+    def _number(self, body, key, default=None):
+        return _number(body, key, default)
+
+    # ---- handlers ----
+    async def health(self, body):
+        return {"status": "ok", "uptime_s": round(time.time() - self.started, 1),
+                "requests": self.requests,
+                "batches": self.dcrit_batcher.batches + self.sweep_batcher.batches,
+                "materials": len(self.tables.materials), "fluids": len(self.tables.fluids)}
+
+    async def catalogues(self, body):
+        return {"liquids": [n for p, n in self.tables.fluids if p == "Liquid"],
+                "gases": [n for p, n in self.tables.fluids if p == "Gas"],
+                "materials": self.tables.materials,
+                "fittings": self.tables.cat.fittings_df["Fitting Type"].str.strip().tolist()}
+
+    async def compatibility(self, body):
+        return {"materials": self.tables.compatible(self._number(body, "temperature"),
+                                                    self._number(body, "pressure"))}
+
+    async def critical_diameter(self, body):
+        materials, rows, dcrit_velocity = await self._hydraulic_rows(body)
+        dcrit, _ = await self.dcrit_batcher.submit(rows) if rows else ([], None)
+        return {"dcrit_velocity": dcrit_velocity,
+                "dcrit": {m: (None if np.isnan(d) else float(d)) for m, d in zip(materials, dcrit)}}
+
+    def _design_charts(self):
+        """Design charts of the app folder, opened on first use; stale ones only fall back."""
+        if self._charts is None:
+            from engine.charts import DEFAULT_MAX_ERROR, load_charts
+
+            try:
+                charts = load_charts()
+            except FileNotFoundError:
+                raise BadRequest("No design charts; build them with 'python -m engine charts build'") from None
+            self._charts = charts, DEFAULT_MAX_ERROR if charts.is_current(self.tables.cat) else -1.0
+        return self._charts
+
+    async def screen(self, body):
+        charts, max_error = self._design_charts()
+        if "fluid" not in body:
+            raise BadRequest("'/screen' needs a catalogue 'fluid'")
+        materials, rows, dcrit_velocity = await self._hydraulic_rows(body)
+        fluid, phase = body["fluid"], body.get("phase", "Liquid")
+        dcrit, error = {}, {}
+        for mat, (Q, L, _, _, vmax, _, dp_max, fittings, _) in zip(materials, rows):
+            if fittings:
+                d, e = charts.lookup(fluid, mat, Q, L, dp_max / 1e5, vmax, fittings, phase, max_error)
+            else:
+                d, e = charts.lookup_one(fluid, mat, Q, L, dp_max / 1e5, vmax, phase, max_error)
+            dcrit[mat], error[mat] = (None if np.isnan(d) else float(d)), float(e)
+        return {"dcrit_velocity": dcrit_velocity, "dcrit": dcrit, "error": error}
+
+    async def sweep(self, body):
+        materials, rows, dcrit_velocity = await self._hydraulic_rows(body)
+        dcrit, curves = await self.sweep_batcher.submit(rows) if rows else ([], [])
+        return {"diameters_m": diameter_grid().tolist(),
+                "dcrit_velocity": dcrit_velocity,
+                "materials": {m: {"dcrit": None if np.isnan(d) else float(d),
+                                  "dp_bar": [None if np.isnan(v) else v / 1e5 for v in curve.tolist()]}
+                              for m, d, curve in zip(materials, dcrit, curves)}}
+
+    # ---- HTTP ----
+    async def dispatch(self, method, path, body):
+        handler = self.routes.get((method, path))
+        if handler is None:
+            known = {p for _, p in self.routes}
+            return (405 if path in known else 404), {"error": f"{method} {path} not supported"}
+        try:
+            data = json.loads(body or b"{}")
+            if not isinstance(data, dict):
+                raise BadRequest("Request body must be a JSON object.")
+            return 200, await handler(data)
+        except (BadRequest, ValueError, json.JSONDecodeError) as exc:
+            return 400, {"error": str(exc)}
+        except Exception as exc:
+            return 500, {"error": f"{type(exc).__name__}: {exc}"}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, target, version = line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = h.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY:
+                    status, payload = 413, {"error": "request body too large"}
+                    body = b""
+                else:
+                    body = await reader.readexactly(length)
+                    self.requests += 1
+                    status, payload = await self.dispatch(method, target.split("?", 1)[0], body)
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                keep_alive = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                              and status != 413)
+                writer.write(
+                    f"{version} {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"Pipe Design Optimizer service on http://{host}:{port}", flush=True)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+
+def run(host="127.0.0.1", port=8765, workers=None, batch_window_ms=2.0):
+    service = CalculationService(workers, batch_window_ms / 1000)
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
@@ -0,0 +1,69 @@
+"""GUI start-up: catalogues loaded behind a future, time-to-first-frame measured.
+
+The window only needs tkinter, ttkbootstrap and PIL to draw the project-name
+page. :func:`load_catalogues` starts one background thread that imports the
+numerical modules (numpy, pandas and the engine) and loads the catalogues
+while that page is on screen; ReportLab and matplotlib are not imported until
+a report or a plot is made. Code that needs the catalogues calls
+``load_catalogues().result()``, which normally returns at once because the
+user is still typing a project name.
+"""
+import importlib
+import json
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+# set by benchmarks/bundle_report.py: write the marks to this file and quit
+PROBE_ENV = "PDO_STARTUP_PROBE"
+
+# imported by the loader thread, before the catalogues are read
+PRELOAD = ("numpy", "pandas", "engine.hydraulics", "engine.thickness", "engine.pricing",
+           "engine.catalogues")
+
+_future = None
+_lock = threading.Lock()
+
+
+def load_catalogues(preload=PRELOAD):
+    """Future of :func:`engine.catalogues.get_catalogues`; the first call starts the loader thread."""
+    global _future
+    with _lock:
+        if _future is None:
+            _future = Future()
+            threading.Thread(target=_load, args=(_future, preload), name="catalogue-loader",
+                             daemon=True).start()
+    return _future
+
+
+def _load(future, preload):
+    if not future.set_running_or_notify_cancel():
+        return
+    try:
+        for name in preload:
+            importlib.import_module(name)
+        from engine.catalogues import get_catalogues
+        future.set_result(get_catalogues())
+    except BaseException as exc:                  # reported where the result is used
+        future.set_exception(exc)
+
+
+class StartupTimer:
+    """Wall-clock marks from ``t0`` (the first line of the application)."""
+
+    def __init__(self, t0=None):
+        self.t0 = time.perf_counter() if t0 is None else t0
+        self.marks = {}
+
+    def mark(self, label):
+        self.marks[label] = time.perf_counter() - self.t0
+        return self.marks[label]
+
+    def report(self, file=None):
+        line = ", ".join(f"{label} {t:.2f} s" for label, t in self.marks.items())
+        print(f"⏱ Start-up: {line}", file=file or sys.stdout)
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.marks, fh)
@@ -0,0 +1,335 @@
+"""Streaming batch runs for case tables too large to hold in memory.
+
+Cases are rows of a CSV (or Parquet) table with the fields of a case file as
+columns; ``fittings`` holds ``type:count`` pairs separated by ``;`` or a JSON
+list. The table is read in chunks and each chunk is sized in one vectorized
+pass – compatibility, critical diameters of every (case, material) pair,
+thickness, schedule and prices – giving one summary row per case::
+
+    name, fluid, rho, mu, dcrit_velocity_m, materials, recommended, dcrit_m,
+    t_required_mm, OD_norm_mm, t_norm_mm, NPS, API, mass_kg, total_cost, error
+
+Rows are appended to the output (CSV, or a directory of Parquet parts) as
+soon as a chunk is done, and ``<output>.checkpoint.json`` records the
+progress after every chunk, so ``resume=True`` continues an interrupted run
+from the last finished chunk instead of from zero.
+"""
+import json
+import math
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from engine import catalogues as cat_mod
+from engine.design import normalize_case
+from engine.hydraulics import (
+    critical_diameter_search, pack_fittings, resolve_fittings, velocity_critical_diameter,
+)
+from engine.pricing import MARKUP, fittings_cost, pipe_mass
+from engine.rheology import pack_rheology
+from engine.thickness import F_MAP, required_thickness, select_schedule_many
+from engine.velocity import describe, velocity_limits
+
+CHUNK = 10000
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+OUTPUT_COLUMNS = ["name", "fluid", "rho", "mu", "dcrit_velocity_m", "materials", "recommended",
+                  "dcrit_m", "t_required_mm", "OD_norm_mm", "t_norm_mm", "NPS", "API",
+                  "mass_kg", "total_cost", "error"]
+TEXT_COLUMNS = ("name", "project_name", "phase", "fluid", "location", "fittings", "velocity_limit",
+                "velocity_expression")
+
+
+# ------------------------------------------------------------------
+# Table rows → cases
+# ------------------------------------------------------------------
+def parse_fittings(value):
+    """Fittings cell → [[type, count], ...]: JSON text or ``type:count; type:count``."""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return []
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    if text.startswith(("[", "{")):
+        return json.loads(text)
+    pairs = []
+    for item in filter(None, (p.strip() for p in text.split(";"))):
+        typ, sep, count = item.rpartition(":")
+        if not sep:
+            raise ValueError(f"Bad fittings entry {item!r}; use type:count")
+        pairs.append([typ, count])
+    return pairs
+
+
+def row_case(record):
+    """Case dict of one table row (empty cells are left out)."""
+    case = {k: v for k, v in record.items()
+            if not (v is None or (isinstance(v, float) and math.isnan(v)))}
+    if "fittings" in case:
+        case["fittings"] = parse_fittings(case["fittings"])
+    return case
+
+
+# ------------------------------------------------------------------
+# Vectorized design of a chunk
+# ------------------------------------------------------------------
+def _float_or_nan(value):
+    try:
+        return float(str(value).replace("Â", ""))
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class MaterialTable:
+    """Material catalogue as arrays; unusable cells are NaN (and never match)."""
+
+    def __init__(self, material_df):
+        self.names = material_df["Material"].to_numpy()
+        num = lambda col: np.array([_float_or_nan(v) for v in material_df[col]])
+        self.t_min, self.t_max = num("Temperature Min"), num("Temperature Max")
+        self.p_min, self.p_max = num("Pressure Min"), num("Pressure Max")
+        self.roughness = num("Roughness (mm)") * 1e-3
+        self.E, self.Sy = num("Weld Joint Factor (E)"), num("SMYS (MPa)") * 1e6
+        self.price = num("Price")
+
+    def compatible(self, temp, pressure):
+        """(cases, materials) mask, as :func:`get_compatible_materials` per case."""
+        temp, pressure = temp[:, None], pressure[:, None]
+        return ((self.t_min <= temp) & (temp <= self.t_max) &
+                (self.p_min <= pressure) & (pressure <= self.p_max))
+
+
+def design_chunk(records, catalogues=None, start=0, materials=None):
+    """Summary rows (DataFrame) of a list of case records; ``start`` numbers unnamed cases."""
+    cat = catalogues or cat_mod.get_catalogues()
+    if cat.sched_df is None:
+        raise ValueError("The schedule catalogue is not loaded.")
+    mt = materials or MaterialTable(cat.material_df)
+    n = len(records)
+    out = {c: np.full(n, np.nan) for c in OUTPUT_COLUMNS}
+    for c in ("name", "fluid", "recommended", "NPS", "API", "error"):
+        out[c] = np.full(n, None, dtype=object)
+    out["materials"] = np.zeros(n, dtype=int)
+
+    # ---- per case: validation, fluid, fittings (cached by value) ----
+    fluids, fittings_cache = {}, {}
+    cases, rows, rheologies = [], [], []
+    for i, record in enumerate(records):
+        names = [record.get(k) for k in ("name", "project_name")]
+        out["name"][i] = next((str(v) for v in names if isinstance(v, str) and v),
+                              f"case-{start + i + 1}")
+        try:
+            case = normalize_case(row_case(record))
+            key = (case["phase"], case["fluid"])
+            if key not in fluids:                 # bad catalogue rows fail once per chunk
+                try:
+                    rheology = (cat_mod.fluid_rheology(cat.liquid_df, key[1])
+                                if key[0] == "Liquid" else None)
+                    fluids[key] = cat_mod.fluid_properties(cat.liquid_df, cat.gas_df, *key) + (rheology,)
+                except (IndexError, KeyError):
+                    fluids[key] = ValueError(f"Unknown {case['phase'].lower()}: {case['fluid']!r}")
+                except ValueError as exc:
+                    fluids[key] = exc
+            if isinstance(fluids[key], Exception):
+                raise fluids[key]
+            fkey = tuple(map(tuple, case["fittings"]))
+            if fkey not in fittings_cache:
+                fittings_cache[fkey] = (resolve_fittings(cat.fittings_df, case["fittings"]),
+                                        fittings_cost(cat.fittings_df, case["fittings"]))
+        except Exception as exc:
+            out["error"][i] = f"{type(exc).__name__}: {exc}"
+            continue
+        out["fluid"][i] = case["fluid"]
+        out["rho"][i], out["mu"][i], rheology = fluids[key]
+        cases.append(case)
+        rheologies.append(rheology)
+        rows.append(i)
+    rows = np.array(rows, dtype=int)
+    rho, mu = out["rho"][rows].astype(float), out["mu"][rows].astype(float)
+    vmax = velocity_limits(cases, rho, mu) if len(rows) else np.zeros(0)
+    bad = np.flatnonzero(np.isnan(vmax))              # no usable limit from the velocity model
+    for j in bad:
+        out["error"][rows[j]] = (f"ValueError: Velocity limit ({describe(cases[j])}) is not "
+                                 "finite and positive")
+    if len(bad):
+        keep = np.flatnonzero(~np.isnan(vmax))
+        cases, rheologies = [cases[j] for j in keep], [rheologies[j] for j in keep]
+        rows, rho, mu, vmax = rows[keep], rho[keep], mu[keep], vmax[keep]
+    if not len(rows):
+        return pd.DataFrame(out, columns=OUTPUT_COLUMNS)
+
+    field = lambda k: np.array([c[k] for c in cases])
+    Q, L, dp_max = field("flowrate"), field("length"), field("dp_max") * 1e5
+    rheology = pack_rheology(rheologies, mu)           # None unless a liquid is non-Newtonian
+    F = np.array([F_MAP[c["location"]] for c in cases])
+    resolved = [fittings_cache[tuple(map(tuple, c["fittings"]))] for c in cases]
+    packed = pack_fittings([r[0] for r in resolved])
+    f_cost = np.array([r[1] for r in resolved])
+    dcrit_velocity = velocity_critical_diameter(Q, vmax)
+    out["dcrit_velocity_m"][rows] = dcrit_velocity
+
+    # ---- every compatible (case, material) pair at once ----
+    compat = mt.compatible(field("temperature"), field("pressure"))
+    out["materials"][rows] = compat.sum(axis=1)
+    c, m = np.nonzero(compat)
+    dcrit_p = critical_diameter_search(Q[c], L[c], rho[c], mu[c], vmax[c], mt.roughness[m],
+                                       dp_max[c], tuple(a[c] for a in packed),
+                                       rheology=rheology and tuple(a[c] for a in rheology))
+    dc_vel = dcrit_velocity[c] * 1000
+    dcrit = np.where(np.isnan(dcrit_p), dc_vel, np.minimum(dc_vel, dcrit_p * 1000))
+    with np.errstate(invalid="ignore"):
+        t_req = required_thickness(field("design_pressure")[c] * 1e5, dcrit, F[c], mt.E[m], mt.Sy[m],
+                                   field("corrosion_allowance")[c])
+    od = dcrit + 2 * t_req * 1000
+    sched = select_schedule_many(cat.sched_df, od, t_req * 1000)
+    ok = (sched >= 0) & ~np.isnan(t_req)
+    c, m, dcrit, t_req, sched = c[ok], m[ok], dcrit[ok], t_req[ok], sched[ok]
+    od_norm = cat.sched_df["Outside diameter (mm)"].to_numpy(dtype=float)[sched]
+    t_norm = cat.sched_df["Wall thickness (mm)"].to_numpy(dtype=float)[sched]
+    mass = pipe_mass(od_norm, t_norm, L[c])
+    total = (mass * mt.price[m] + f_cost[c]) * MARKUP
+
+    # ---- cheapest material per case (first in catalogue order on ties) ----
+    cost = np.full(compat.shape, np.inf)
+    cost[c, m] = np.where(np.isnan(total), np.inf, total)
+    pair = np.full(compat.shape, -1)
+    pair[c, m] = np.arange(len(c))
+    best = pair[np.arange(len(rows)), cost.argmin(axis=1)]
+    has = best >= 0
+    best, target = best[has], rows[has]
+    out["recommended"][target] = mt.names[m[best]]
+    out["dcrit_m"][target] = dcrit[best] / 1000
+    out["t_required_mm"][target] = t_req[best] * 1000
+    out["OD_norm_mm"][target], out["t_norm_mm"][target] = od_norm[best], t_norm[best]
+    for col, src in (("NPS", "Nominal size (inches)"), ("API", "Specif. API")):
+        values = cat.sched_df[src].to_numpy() if src in cat.sched_df else np.full(len(cat.sched_df), "N/A")
+        out[col][target] = values[sched[best]]
+    out["mass_kg"][target], out["total_cost"][target] = mass[best], total[best]
+    return pd.DataFrame(out, columns=OUTPUT_COLUMNS)
+
+
+# ------------------------------------------------------------------
+# Streaming runner
+# ------------------------------------------------------------------
+def _require_pyarrow():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet files need pyarrow (pip install pyarrow)") from None
+    return pq
+
+
+def _is_parquet(path):
+    return os.path.splitext(path.rstrip("/\\"))[1].lower() in (".parquet", ".pq")
+
+
+def read_chunks(source, chunksize=CHUNK, skip=0):
+    """Record lists of ``chunksize`` cases from a CSV or Parquet table, after ``skip`` rows."""
+    if _is_parquet(source):
+        pq = _require_pyarrow()
+        seen = 0
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunksize):
+            records = batch.to_pylist()
+            seen += len(records)
+            if seen > skip:
+                yield records[max(0, len(records) - (seen - skip)):]
+        return
+    dtype = {c: str for c in TEXT_COLUMNS}
+    reader = pd.read_csv(source, chunksize=chunksize, dtype=dtype,
+                         skiprows=(lambda i: 0 < i <= skip) if skip else None)
+    with reader:
+        for frame in reader:
+            yield frame.to_dict("records")
+
+
+def _signature(path):
+    st = os.stat(path)
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def _save_checkpoint(path, state):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(state, fh)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+class _CsvSink:
+    def __init__(self, path, offset):
+        mode = "r+b" if offset else "wb"
+        self.fh = open(path, mode)
+        self.fh.truncate(offset)                 # drop rows written after the checkpoint
+        self.fh.seek(offset)
+
+    def write(self, frame, state):
+        frame.to_csv(self.fh, header=self.fh.tell() == 0, index=False, encoding="utf-8")
+        self.fh.flush()
+        os.fsync(self.fh.fileno())
+        state["bytes"] = self.fh.tell()
+
+    def close(self):
+        self.fh.close()
+
+
+class _ParquetSink:
+    def __init__(self, path, parts):
+        _require_pyarrow()
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):            # parts written after the checkpoint
+            if name.startswith("part-") and int(name[5:10]) >= parts:
+                os.remove(os.path.join(path, name))
+
+    def write(self, frame, state):
+        frame.to_parquet(os.path.join(self.path, f"part-{state['parts']:05d}.parquet"), index=False)
+        state["parts"] += 1
+
+    def close(self):
+        pass
+
+
+def stream_batch(source, output, chunksize=CHUNK, resume=False, catalogues=None, progress=None):
+    """Design every case of ``source`` into ``output`` chunk by chunk.
+
+    Memory stays bounded by one chunk. With ``resume`` an existing checkpoint
+    of the same input and catalogues is continued; otherwise the run starts
+    over. ``progress(rows_done)`` is called after each chunk. Returns
+    ``{"rows", "failed", "resumed_from"}``.
+    """
+    from engine.cache import catalogue_fingerprint
+
+    cat = catalogues or cat_mod.get_catalogues()
+    checkpoint = output.rstrip("/\\") + CHECKPOINT_SUFFIX
+    state = {"source": os.path.abspath(source), "signature": _signature(source),
+             "catalogues": catalogue_fingerprint(cat), "rows": 0, "failed": 0, "bytes": 0, "parts": 0}
+    if resume and os.path.exists(checkpoint):
+        with open(checkpoint, encoding="utf-8") as fh:
+            saved = json.load(fh)
+        for key in ("source", "signature", "catalogues"):
+            if saved.get(key) != state[key]:
+                raise ValueError(f"{checkpoint} belongs to another run ({key} differs); "
+                                 "start again without resume")
+        state = saved
+    elif _is_parquet(output) and os.path.isdir(output):
+        shutil.rmtree(output)
+    resumed_from = state["rows"]
+
+    sink = _ParquetSink(output, state["parts"]) if _is_parquet(output) else _CsvSink(output, state["bytes"])
+    materials = MaterialTable(cat.material_df)
+    try:
+        for records in read_chunks(source, chunksize, skip=state["rows"]):
+            frame = design_chunk(records, cat, start=state["rows"], materials=materials)
+            sink.write(frame, state)
+            state["rows"] += len(frame)
+            state["failed"] += int(frame["error"].notna().sum())
+            _save_checkpoint(checkpoint, state)
+            if progress:
+                progress(state["rows"])
+    finally:
+        sink.close()
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)                    # finished: nothing to resume
+    return {"rows": state["rows"], "failed": state["failed"], "resumed_from": resumed_from}
@@ -0,0 +1,159 @@
+"""Parametric design-space sweep: dcrit over flowrate × length × ΔP limit × material.
+
+Every grid point is one row of a single vectorized
+:func:`critical_diameter_search`, evaluated in chunks of rows. The result is a
+:class:`DesignSpace`, a small labelled array in the spirit of xarray::
+
+    space = parametric_sweep(case, flowrate=np.linspace(50, 500, 50),
+                             length=np.linspace(1e3, 2e4, 50), dp_max=[1, 2, 5])
+    space.sel(material="API 5L X52 (SAW)", dp_max=2)   # 50 × 50 dcrit (m)
+    space.to_frame()                                     # long-form DataFrame
+
+Axes that are not given keep the case's single nominal value.
+"""
+import numpy as np
+
+from engine import catalogues as cat_mod
+from engine.design import normalize_case
+from engine.hydraulics import (
+    critical_diameter_search, diameter_grid, pack_fittings, resolve_fittings,
+)
+from engine.velocity import velocity_limit
+
+DIMS = ("flowrate", "length", "dp_max", "material")
+UNITS = {"flowrate": "m³/h", "length": "m", "dp_max": "bar", "material": ""}
+CHUNK = 250000
+
+
+class DesignSpace:
+    """Critical diameters (m) on a labelled (flowrate, length, dp_max, material) grid.
+
+    NaN marks grid points where no diameter meets both limits.
+    """
+
+    def __init__(self, coords, dcrit, case=None):
+        self.coords = {d: np.asarray(coords[d]) for d in DIMS}
+        self.dcrit = np.asarray(dcrit, dtype=float)
+        self.case = case
+        if self.dcrit.shape != self.shape:
+            raise ValueError(f"dcrit has shape {self.dcrit.shape}, coordinates give {self.shape}")
+
+    @property
+    def dims(self):
+        return DIMS
+
+    @property
+    def shape(self):
+        return tuple(len(self.coords[d]) for d in DIMS)
+
+    def __repr__(self):
+        axes = ", ".join(f"{d}: {n}" for d, n in zip(DIMS, self.shape))
+        return f"<DesignSpace ({axes})>"
+
+    def index(self, dim, label):
+        """Position of ``label`` on axis ``dim`` (nearest value for numeric axes)."""
+        values = self.coords[dim]
+        if dim == "material":
+            hits = np.flatnonzero(values == label)
+            if not len(hits):
+                raise KeyError(f"{label!r} is not a swept material")
+            return int(hits[0])
+        return int(np.abs(values.astype(float) - float(label)).argmin())
+
+    def sel(self, **labels):
+        """dcrit with the named axes fixed, e.g. ``sel(material=m, dp_max=2)``."""
+        unknown = set(labels) - set(DIMS)
+        if unknown:
+            raise KeyError(f"Unknown dimension(s): {', '.join(sorted(unknown))}")
+        key = tuple(self.index(d, labels[d]) if d in labels else slice(None) for d in DIMS)
+        return self.dcrit[key]
+
+    def to_records(self):
+        """Flat structured array with one record per grid point."""
+        material_len = max((len(str(m)) for m in self.coords["material"]), default=1)
+        dtype = [("flowrate", "f8"), ("length", "f8"), ("dp_max", "f8"),
+                 ("material", f"U{material_len}"), ("dcrit", "f8")]
+        grids = np.meshgrid(*(self.coords[d] for d in DIMS), indexing="ij")
+        out = np.empty(self.dcrit.size, dtype=dtype)
+        for dim, grid in zip(DIMS, grids):
+            out[dim] = grid.ravel()
+        out["dcrit"] = self.dcrit.ravel()
+        return out
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.to_records())
+
+    def to_xarray(self):
+        """xarray.DataArray of dcrit (needs the optional xarray package)."""
+        try:
+            import xarray as xr
+        except ImportError:
+            raise ImportError("to_xarray() needs xarray (pip install xarray)") from None
+        return xr.DataArray(self.dcrit, coords=self.coords, dims=DIMS, name="dcrit",
+                            attrs={"units": "m"})
+
+    def save(self, path):
+        """Write coordinates and dcrit to a compressed .npz file."""
+        np.savez_compressed(path, dcrit=self.dcrit,
+                            **{f"coord_{d}": self.coords[d] for d in DIMS})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls({d: data[f"coord_{d}"] for d in DIMS}, data["dcrit"])
+
+
+def parse_axis(spec):
+    """Axis values from a list, a number, or ``"start:stop:num"`` (inclusive linspace)."""
+    if isinstance(spec, str):
+        parts = spec.split(":")
+        try:
+            if len(parts) == 3:
+                return np.linspace(float(parts[0]), float(parts[1]), int(parts[2]))
+            return np.array([float(p) for p in spec.split(",")])
+        except ValueError:
+            raise ValueError(f"Bad axis {spec!r}; use START:STOP:NUM or V1,V2,...") from None
+    values = np.atleast_1d(np.asarray(spec, dtype=float))
+    if values.ndim != 1 or not len(values):
+        raise ValueError("An axis must be a non-empty list of numbers")
+    return values
+
+
+def parametric_sweep(case, flowrate=None, length=None, dp_max=None, materials=None,
+                     catalogues=None, chunk=CHUNK):
+    """Critical diameter on the full flowrate × length × dp_max × material grid.
+
+    ``materials`` defaults to those compatible with the case; dp_max is in bar.
+    """
+    case = normalize_case(case)
+    cat = catalogues or cat_mod.get_catalogues()
+    try:
+        rho, mu = cat_mod.fluid_properties(cat.liquid_df, cat.gas_df, case["phase"], case["fluid"])
+    except (IndexError, KeyError):
+        raise ValueError(f"Unknown {case['phase'].lower()}: {case['fluid']!r}") from None
+    rheology = None
+    if case["phase"] == "Liquid":
+        rheology = cat_mod.fluid_rheology(cat.liquid_df, case["fluid"])
+    if materials is None:
+        materials = cat_mod.get_compatible_materials(cat.material_df, case["temperature"], case["pressure"])
+    coords = {
+        "flowrate": parse_axis(case["flowrate"] if flowrate is None else flowrate),
+        "length": parse_axis(case["length"] if length is None else length),
+        "dp_max": parse_axis(case["dp_max"] if dp_max is None else dp_max),
+        "material": np.array(materials, dtype=str),
+    }
+    roughness = np.array([cat_mod.material_roughness(cat.material_df, m) for m in materials])
+    fittings = pack_fittings([resolve_fittings(cat.fittings_df, case["fittings"])])
+    diameters = diameter_grid()
+    vmax = velocity_limit(case, rho, mu)
+
+    shape = tuple(len(coords[d]) for d in DIMS)
+    dcrit = np.empty(int(np.prod(shape)))
+    for start in range(0, dcrit.size, chunk):
+        idx = np.unravel_index(np.arange(start, min(start + chunk, dcrit.size)), shape)
+        dcrit[start:start + chunk] = critical_diameter_search(
+            coords["flowrate"][idx[0]], coords["length"][idx[1]], rho, mu, vmax,
+            roughness[idx[3]], coords["dp_max"][idx[2]] * 1e5, fittings, diameters, rheology)
+    return DesignSpace(coords, dcrit.reshape(shape), case)
@@ -0,0 +1,136 @@
+import numpy as np
+
+# ------------------------------------------------------------------
+# Location class design factors
+# ------------------------------------------------------------------
+F_MAP = {"<10 buildings": 0.72, "<46 buildings": 0.60,
+         ">46 buildings": 0.50, "High-density/traffic": 0.40}
+
+
+def required_thickness(design_pressure, dcrit_mm, F, E, Sy, corrosion_allowance_mm):
+    """Required wall thickness (m) for a design pressure and SMYS in Pa."""
+    S = F * E * Sy
+    CA = corrosion_allowance_mm / 1000
+    return (design_pressure * 10 * (dcrit_mm / 1000)) / (20 * S - 2 * design_pressure) + CA
+
+
+def allowable_pressure(t_mm, d_mm, F, E, Sy, corrosion_allowance_mm):
+    """Pressure (Pa) a wall of ``t_mm`` on bore ``d_mm`` is good for: inverse of :func:`required_thickness`."""
+    t = (t_mm - corrosion_allowance_mm) / 1000
+    return 20 * F * E * Sy * t / (10 * d_mm / 1000 + 2 * t)
+
+
+def select_schedule(sched_df, od_mm, t_req_mm):
+    """First schedule row with the smallest OD ≥ od_mm and wall ≥ t_req_mm, or None."""
+    cand = sched_df[sched_df["Outside diameter (mm)"] >= od_mm]
+    if cand.empty:
+        return None
+    min_od = cand["Outside diameter (mm)"].min()
+    cand = cand[cand["Outside diameter (mm)"] == min_od]
+    cand = cand[cand["Wall thickness (mm)"] >= t_req_mm]
+    if cand.empty:
+        return None
+    return cand.iloc[0]
+
+
+def select_schedule_many(sched_df, od_mm, t_req_mm):
+    """Vectorized :func:`select_schedule`: positions in ``sched_df`` (-1 where none).
+
+    Rows are grouped by OD (catalogue order kept within a group); a running
+    maximum of the walls of a group turns "first wall ≥ t" into a binary search.
+    """
+    od_mm, t_req_mm = np.broadcast_arrays(np.asarray(od_mm, dtype=float),
+                                          np.asarray(t_req_mm, dtype=float))
+    od = sched_df["Outside diameter (mm)"].to_numpy(dtype=float)
+    wall = sched_df["Wall thickness (mm)"].to_numpy(dtype=float)
+    order = np.argsort(od, kind="stable")
+    sizes, starts = np.unique(od[order], return_index=True)
+    ends = np.append(starts[1:], len(order))
+
+    out = np.full(od_mm.shape, -1, dtype=np.intp)
+    group = np.searchsorted(sizes, od_mm, side="left")      # smallest OD ≥ od_mm
+    for g in np.unique(group[group < len(sizes)]):
+        rows = order[starts[g]:ends[g]]
+        hit = group == g
+        pos = np.searchsorted(np.maximum.accumulate(wall[rows]), t_req_mm[hit], side="left")
+        out[hit] = np.where(pos < len(rows), rows[np.minimum(pos, len(rows) - 1)], -1)
+    return out
+
+
+def material_strength(material_df, materials):
+    """Weld joint factor E and SMYS (Pa) of ``materials`` as arrays; NaN where not a number."""
+    import pandas as pd
+
+    rows = material_df.drop_duplicates("Material").set_index("Material").reindex(list(materials))
+    E = pd.to_numeric(rows["Weld Joint Factor (E)"], errors="coerce").to_numpy(dtype=float)
+    Sy = pd.to_numeric(rows["SMYS (MPa)"], errors="coerce").to_numpy(dtype=float) * 1e6
+    return E, Sy
+
+
+def thickness_matrix(sched_df, dcrit_mm, E, Sy, design_pressure, F=None, corrosion_allowance=0.0):
+    """Required wall and standard pipe for every (material, design pressure, location class).
+
+    ``dcrit_mm``, ``E`` and ``Sy`` (Pa) are per material, ``design_pressure``
+    (Pa) a scalar or a list, ``F`` the location factors (default: all of
+    :data:`F_MAP`). Returns arrays of shape (materials, pressures, factors):
+    ``t_required_mm``, ``OD_computed_mm``, ``row`` (position in ``sched_df``,
+    -1 where no pipe fits), ``OD_norm_mm`` and ``t_norm_mm`` (NaN where none).
+    """
+    F = np.asarray(list(F_MAP.values()) if F is None else F, dtype=float)
+    dcrit = np.asarray(dcrit_mm, dtype=float)[:, None, None]
+    E = np.asarray(E, dtype=float)[:, None, None]
+    Sy = np.asarray(Sy, dtype=float)[:, None, None]
+    P = np.atleast_1d(np.asarray(design_pressure, dtype=float))[None, :, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_req = required_thickness(P, dcrit, F[None, None, :], E, Sy, corrosion_allowance) * 1000
+    od = dcrit + 2 * t_req
+    row = select_schedule_many(sched_df, od, t_req)
+    hit = row >= 0
+    pick = lambda col: np.where(hit, sched_df[col].to_numpy(dtype=float)[np.where(hit, row, 0)],
+                                np.nan)
+    return {"F": F, "t_required_mm": t_req, "OD_computed_mm": od, "row": row,
+            "OD_norm_mm": pick("Outside diameter (mm)"), "t_norm_mm": pick("Wall thickness (mm)")}
+
+
+def sizing_diameters(materials, dcrit_velocity, pressure_drop_results):
+    """Diameter (mm) each material's wall is sized for, from the velocity and ΔP steps."""
+    dc_vel = dcrit_velocity * 1000
+    out = []
+    for mat in materials:
+        dc_pres = pressure_drop_results.get(mat, {}).get("Critical Diameter (mm)")
+        out.append(min(dc_vel, dc_pres) if dc_pres else dc_vel)
+    return out
+
+
+def thickness_schedule(materials, material_df, sched_df, dcrit_velocity, pressure_drop_results,
+                       F, design_pressure, corrosion_allowance):
+    """Wall thickness and standard pipe for every material.
+
+    ``dcrit_velocity`` is in m, ``design_pressure`` in Pa and
+    ``pressure_drop_results`` is the dict filled by the ΔP step.
+    Materials without a matching schedule entry are left out.
+    All materials are sized in one :func:`thickness_matrix` call.
+    """
+    dcrit = sizing_diameters(materials, dcrit_velocity, pressure_drop_results)
+    if not len(dcrit):
+        return []
+    E, Sy = material_strength(material_df, materials)
+    sized = thickness_matrix(sched_df, dcrit, E, Sy, design_pressure, [F], corrosion_allowance)
+
+    results = []
+    for i, mat in enumerate(materials):
+        pos = sized["row"][i, 0, 0]
+        if pos < 0:
+            continue
+        best = sched_df.iloc[pos]
+        results.append({
+            "Material": mat,
+            "dcrit (m)": dcrit[i] / 1000,
+            "t_required_mm": sized["t_required_mm"][i, 0, 0],
+            "OD_computed_mm": sized["OD_computed_mm"][i, 0, 0],
+            "OD_norm_mm": best["Outside diameter (mm)"],
+            "t_norm_mm": best["Wall thickness (mm)"],
+            "NPS": best.get("Nominal size (inches)", "N/A"),
+            "API": best.get("Specif. API", "N/A")
+        })
+    return results
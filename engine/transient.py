@@ -0,0 +1,171 @@
+"""Valve-closure surge (water hammer) by the method of characteristics.
+
+The line runs from a constant-pressure upstream end (the operating pressure)
+to a valve that closes linearly over ``closure_time`` seconds. The pipe is
+split into ``reaches`` equal reaches with ``dt = dx / a`` (Courant number 1),
+and every time step updates all nodes at once from the C+ and C- characteristics::
+
+    Cp = H[i-1] + B·Q[i-1] − R·Q[i-1]·|Q[i-1]|
+    Cm = H[i+1] − B·Q[i+1] + R·Q[i+1]·|Q[i+1]|
+    H[i] = (Cp + Cm) / 2,   Q[i] = (Cp − Cm) / 2B
+
+The wave speed follows from the fluid bulk modulus and the pipe's bore, wall
+and steel modulus (Korteweg, pipe anchored against axial movement). Only the
+pressure envelope and the valve history are kept, so memory does not grow
+with the run length. Column separation is not modelled: when the pressure
+drops below vapour pressure, the result is flagged as ``cavitation``.
+"""
+import numpy as np
+
+from engine.hydraulics import G, friction_factor
+from engine.thickness import allowable_pressure
+
+BULK_MODULUS = 2.2e9       # Pa, water; most hydrocarbon liquids 1.0–1.6e9
+STEEL_MODULUS = 207e9      # Pa
+POISSON = 0.3
+REACHES = 500
+CLOSURE_TIME = 5.0         # s
+VAPOUR_GAUGE = -0.98e5     # Pa gauge, about vapour pressure at sea level
+
+
+def wave_speed(D, e, rho, bulk_modulus=BULK_MODULUS, pipe_modulus=STEEL_MODULUS):
+    """Pressure wave speed (m/s) in a liquid-filled pipe of bore ``D`` and wall ``e`` (m)."""
+    restraint = 1 - POISSON ** 2
+    return np.sqrt(bulk_modulus / rho / (1 + bulk_modulus * D * restraint / (pipe_modulus * e)))
+
+
+def valve_closure(Q, L, D, e, rho, mu, k, p_in, closure_time=CLOSURE_TIME, reaches=REACHES,
+                  duration=None, bulk_modulus=BULK_MODULUS, pipe_modulus=STEEL_MODULUS):
+    """Surge from closing the downstream valve; pressures are gauge, in Pa.
+
+    Q is in m³/h, L, D (bore), e (wall) and k in m, ``p_in`` is the upstream
+    pressure. ``duration`` defaults to the closure plus three wave round
+    trips. Returns a dict with the peak and minimum pressure, their envelopes
+    along ``x`` and the valve pressure against ``times``.
+    """
+    if reaches < 2:
+        raise ValueError("'reaches' must be at least 2")
+    if closure_time < 0:
+        raise ValueError("'closure_time' must be ≥ 0")
+    a = float(wave_speed(D, e, rho, bulk_modulus, pipe_modulus))
+    A = np.pi * D ** 2 / 4
+    Q0 = Q / 3600
+    V0 = Q0 / A
+    f = float(friction_factor(rho * V0 * D / mu, D, k))
+    dx = L / reaches
+    dt = dx / a
+    B = a / (G * A)
+    R = f * dx / (2 * G * D * A ** 2)
+
+    x = np.linspace(0, L, reaches + 1)
+    H0 = p_in / (rho * G)
+    H = H0 - R * Q0 ** 2 * x / dx                  # steady friction gradient
+    Qn = np.full(reaches + 1, Q0)
+    if H[-1] <= 0:
+        raise ValueError("The inlet pressure does not cover the friction loss of the line")
+    Cv0 = Q0 ** 2 / (2 * H[-1])                     # valve: Q² = 2·Cv·H, fully open
+
+    if duration is None:
+        duration = closure_time + 6 * L / a
+    steps = int(np.ceil(duration / dt))
+    h_max, h_min = H.copy(), H.copy()
+    h_valve = np.empty(steps + 1)
+    h_valve[0] = H[-1]
+    H_new, Q_new = np.empty_like(H), np.empty_like(Qn)
+    for n in range(1, steps + 1):
+        tau = max(0.0, 1 - n * dt / closure_time) if closure_time > 0 else 0.0
+        Cp = H[:-1] + B * Qn[:-1] - R * Qn[:-1] * np.abs(Qn[:-1])      # reaching nodes 1..N
+        Cm = H[1:] - B * Qn[1:] + R * Qn[1:] * np.abs(Qn[1:])          # reaching nodes 0..N-1
+        H_new[1:-1] = 0.5 * (Cp[:-1] + Cm[1:])
+        Q_new[1:-1] = (Cp[:-1] - Cm[1:]) / (2 * B)
+        H_new[0] = H0                                                  # reservoir
+        Q_new[0] = (H0 - Cm[0]) / B
+        Cv = tau ** 2 * Cv0                                            # valve
+        disc = (B * Cv) ** 2 + 2 * Cv * Cp[-1]
+        Q_new[-1] = -B * Cv + np.sqrt(disc) if Cv > 0 and disc > 0 else 0.0
+        H_new[-1] = Cp[-1] - B * Q_new[-1]
+        H, H_new, Qn, Q_new = H_new, H, Q_new, Qn
+        np.maximum(h_max, H, out=h_max)
+        np.minimum(h_min, H, out=h_min)
+        h_valve[n] = H[-1]
+
+    p = lambda h: rho * G * h
+    return {
+        "wave_speed": a,
+        "period": 2 * L / a,
+        "dt": dt,
+        "x": x,
+        "times": np.arange(steps + 1) * dt,
+        "p_valve": p(h_valve),
+        "p_envelope_max": p(h_max),
+        "p_envelope_min": p(h_min),
+        "p_max": float(p(h_max.max())),
+        "p_min": float(p(h_min.min())),
+        "x_max": float(x[h_max.argmax()]),
+        "joukowsky": rho * a * V0,
+        "cavitation": bool(p(h_min.min()) < VAPOUR_GAUGE),
+    }
+
+
+def pipe_surge(Q, L, rho, mu, k, p_in, od_mm, t_mm, E, Sy, F, corrosion_allowance_mm,
+               closure_time=CLOSURE_TIME, reaches=REACHES, bulk_modulus=BULK_MODULUS,
+               design_pressure=None):
+    """Surge of one standard pipe checked against the pressure its wall allows.
+
+    The wall's own rating is :func:`engine.thickness.allowable_pressure` of
+    the schedule wall on its bore, with the case's location factor F, weld
+    factor E and SMYS ``Sy`` (Pa). A design sizes the wall for
+    ``design_pressure`` (Pa) on the critical diameter, which is smaller than
+    the bore of the standard pipe, so that rating may fall below the design
+    pressure; the larger of the two is then the allowable. Returns the
+    :func:`valve_closure` summary (no arrays) plus ``allowable`` and
+    ``allowable_wall`` (Pa), ``governs`` ("wall" or "design pressure") and ``ok``.
+    """
+    bore = od_mm - 2 * t_mm
+    run = valve_closure(Q, L, bore / 1000, t_mm / 1000, rho, mu, k, p_in, closure_time, reaches,
+                        bulk_modulus=bulk_modulus)
+    wall = float(allowable_pressure(t_mm, bore, F, E, Sy, corrosion_allowance_mm))
+    allowable, governs = wall, "wall"
+    if design_pressure is not None and design_pressure > wall:
+        allowable, governs = float(design_pressure), "design pressure"
+    out = {key: value for key, value in run.items() if np.ndim(value) == 0}
+    out.update(allowable=allowable, allowable_wall=wall, governs=governs,
+               ok=bool(run["p_max"] <= allowable))
+    return out
+
+
+def surge_design(result, materials=None, catalogues=None, closure_time=CLOSURE_TIME,
+                 reaches=REACHES, bulk_modulus=BULK_MODULUS):
+    """:func:`pipe_surge` for the schedule pipes of a ``run_design`` result.
+
+    ``materials`` defaults to the recommended one. Returns {material: summary}
+    with the pressures converted to bar.
+    """
+    from engine import catalogues as cat_mod
+    from engine.thickness import F_MAP, material_strength
+
+    case = result["case"]
+    if case["phase"] != "Liquid":
+        raise ValueError("Water hammer is only computed for liquid lines")
+    cat = catalogues or cat_mod.get_catalogues()
+    pipes = {t["Material"]: t for t in result["thickness"]}
+    if materials is None:
+        materials = [result["recommended"]] if result.get("recommended") else []
+    unknown = [m for m in materials if m not in pipes]
+    if unknown:
+        raise ValueError(f"No schedule pipe for: {', '.join(unknown)}")
+    E, Sy = material_strength(cat.material_df, materials)
+    out = {}
+    for i, mat in enumerate(materials):
+        pipe = pipes[mat]
+        summary = pipe_surge(case["flowrate"], case["length"], result["fluid"]["rho"],
+                             result["fluid"]["mu"], cat_mod.material_roughness(cat.material_df, mat),
+                             case["pressure"] * 1e5, float(pipe["OD_norm_mm"]), float(pipe["t_norm_mm"]),
+                             E[i], Sy[i], F_MAP[case["location"]], case["corrosion_allowance"],
+                             closure_time, reaches, bulk_modulus, case["design_pressure"] * 1e5)
+        for key in ("p_max", "p_min", "joukowsky", "allowable", "allowable_wall"):
+            summary[key + "_bar"] = summary.pop(key) / 1e5
+        summary.update(NPS=str(pipe["NPS"]), OD_norm_mm=float(pipe["OD_norm_mm"]),
+                       t_norm_mm=float(pipe["t_norm_mm"]), design_pressure_bar=case["design_pressure"])
+        out[mat] = summary
+    return out
@@ -0,0 +1,229 @@
+"""Two-phase gas–liquid pressure drop.
+
+A two-phase case combines a catalogue liquid (``"fluid"``) and gas
+(``"gas"``) with the no-slip gas volume fraction ``"gas_fraction"``
+(Qgas / Qtotal at line conditions); ``"flowrate"`` is the total volumetric
+flow. The frictional gradient comes from one of :data:`CORRELATIONS`:
+
+``homogeneous``
+    One pseudo-fluid with no-slip density and Dukler (volume-weighted)
+    viscosity.
+``lockhart-martinelli``
+    Each phase alone at its superficial velocity, combined by Chisholm's
+    ``ΔP = ΔP_L + C·√(ΔP_L·ΔP_G) + ΔP_G`` with C = 5…20 by flow regime.
+``beggs-brill``
+    Horizontal Beggs & Brill (revised flow-pattern map): holdup from the
+    mixture Froude number and the no-slip holdup, two-phase friction factor
+    ``f_n·e^S``. The line is taken as horizontal, so there is no elevation
+    term and no inclination correction.
+
+Every correlation takes broadcast arrays, so a whole diameter grid (and one
+row per material) is one call, as for the single-phase sweep. Fittings are
+charged on the homogeneous mixture.
+"""
+import numpy as np
+
+from engine.hydraulics import (
+    G, RE_LAMINAR, diameter_grid, fitting_k, friction_factor, singular_pressure_drop,
+)
+
+PHASE = "Two-phase"
+DEFAULT_CORRELATION = "homogeneous"
+
+
+# ------------------------------------------------------------------
+# Correlations: frictional gradient (Pa/m) from superficial velocities
+# ------------------------------------------------------------------
+def _no_slip(V_sl, V_sg, liquid, gas):
+    lam_g = V_sg / (V_sl + V_sg)
+    return lam_g * gas + (1 - lam_g) * liquid
+
+
+def homogeneous(D, V_sl, V_sg, rho_l, mu_l, rho_g, mu_g, k):
+    """No-slip pseudo-fluid."""
+    V = V_sl + V_sg
+    rho, mu = _no_slip(V_sl, V_sg, rho_l, rho_g), _no_slip(V_sl, V_sg, mu_l, mu_g)
+    return friction_factor(rho * V * D / mu, D, k) / D * rho * V ** 2 / 2
+
+
+def _single(D, V, rho, mu, k):
+    """Gradient of one phase alone at superficial velocity V (zero where V = 0)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dp = friction_factor(rho * V * D / mu, D, k) / D * rho * V ** 2 / 2
+    return np.where(V > 0, dp, 0.0)
+
+
+def lockhart_martinelli(D, V_sl, V_sg, rho_l, mu_l, rho_g, mu_g, k):
+    """Lockhart–Martinelli with the Chisholm constant."""
+    dp_l = _single(D, V_sl, rho_l, mu_l, k)
+    dp_g = _single(D, V_sg, rho_g, mu_g, k)
+    turb_l = rho_l * V_sl * D / mu_l >= RE_LAMINAR
+    turb_g = rho_g * V_sg * D / mu_g >= RE_LAMINAR
+    C = np.where(turb_l, np.where(turb_g, 20.0, 10.0), np.where(turb_g, 12.0, 5.0))
+    return dp_l + C * np.sqrt(dp_l * dp_g) + dp_g
+
+
+# Beggs–Brill horizontal holdup constants (a, b, c) per flow pattern
+BB_PATTERNS = ("segregated", "transition", "intermittent", "distributed")
+_BB_HOLDUP = {"segregated": (0.98, 0.4846, 0.0868),
+              "intermittent": (0.845, 0.5351, 0.0173),
+              "distributed": (1.065, 0.5824, 0.0609)}
+
+
+def beggs_brill_holdup(D, V_sl, V_sg):
+    """Horizontal liquid holdup and flow-pattern index into :data:`BB_PATTERNS`."""
+    V = V_sl + V_sg
+    lam = np.clip(V_sl / V, 0.0, 1.0)
+    Fr = V ** 2 / (G * D)
+    with np.errstate(divide="ignore"):
+        L1 = 316 * lam ** 0.302
+        L2 = 0.0009252 * lam ** -2.4684
+        L3 = 0.10 * lam ** -1.4516
+        L4 = 0.5 * lam ** -6.738
+    segregated = ((lam < 0.01) & (Fr < L1)) | ((lam >= 0.01) & (Fr < L2))
+    transition = (lam >= 0.01) & (Fr >= L2) & (Fr <= L3)
+    intermittent = (((lam >= 0.01) & (lam < 0.4) & (Fr > L3) & (Fr <= L1))
+                    | ((lam >= 0.4) & (Fr > L3) & (Fr <= L4)))
+    pattern = np.select([segregated, transition, intermittent], [0, 1, 2], 3)
+
+    def holdup(name):
+        a, b, c = _BB_HOLDUP[name]
+        return np.clip(a * lam ** b / Fr ** c, lam, 1.0)
+
+    seg, inter = holdup("segregated"), holdup("intermittent")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        A = (L3 - Fr) / (L3 - L2)
+    H = np.select([pattern == 0, pattern == 1, pattern == 2],
+                  [seg, A * seg + (1 - A) * inter, inter], holdup("distributed"))
+    return H, pattern
+
+
+def beggs_brill(D, V_sl, V_sg, rho_l, mu_l, rho_g, mu_g, k):
+    """Horizontal Beggs & Brill."""
+    V = V_sl + V_sg
+    rho, mu = _no_slip(V_sl, V_sg, rho_l, rho_g), _no_slip(V_sl, V_sg, mu_l, mu_g)
+    f_n = friction_factor(rho * V * D / mu, D, k)
+    H, _ = beggs_brill_holdup(D, V_sl, V_sg)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y = np.where(H > 0, (V_sl / V) / H ** 2, 1.0)
+        ln_y = np.log(y)
+        S = np.where((y > 1) & (y < 1.2), np.log(2.2 * y - 1.2),
+                     ln_y / (-0.0523 + 3.182 * ln_y - 0.8725 * ln_y ** 2 + 0.01853 * ln_y ** 4))
+    S = np.where(y == 1, 0.0, S)
+    return f_n * np.exp(S) / D * rho * V ** 2 / 2
+
+
+CORRELATIONS = {
+    "homogeneous": homogeneous,
+    "lockhart-martinelli": lockhart_martinelli,
+    "beggs-brill": beggs_brill,
+}
+
+
+# ------------------------------------------------------------------
+# Mixture
+# ------------------------------------------------------------------
+class TwoPhaseFlow:
+    """A catalogue liquid and gas flowing together at a fixed gas fraction.
+
+    ``rho`` and ``mu`` are the no-slip mixture properties (shown in the GUI
+    and used for the fittings); the line ΔP uses ``correlation``.
+    """
+
+    def __init__(self, rho_l, mu_l, rho_g, mu_g, gas_fraction, correlation=DEFAULT_CORRELATION,
+                 liquid=None, gas=None):
+        if not 0 <= gas_fraction <= 1:
+            raise ValueError(f"'gas_fraction' must be between 0 and 1, got {gas_fraction!r}")
+        if correlation not in CORRELATIONS:
+            raise ValueError(f"'correlation' must be one of {list(CORRELATIONS)}, got {correlation!r}")
+        self.rho_l, self.mu_l, self.rho_g, self.mu_g = rho_l, mu_l, rho_g, mu_g
+        self.gas_fraction = float(gas_fraction)
+        self.correlation = correlation
+        self.liquid, self.gas = liquid, gas
+
+    @classmethod
+    def from_case(cls, case, catalogues):
+        """Mixture of a normalized two-phase case; raises ValueError for unknown fluids."""
+        from engine.catalogues import fluid_properties
+
+        props = []
+        for phase, name in (("Liquid", case["fluid"]), ("Gas", case["gas"])):
+            try:
+                props += fluid_properties(catalogues.liquid_df, catalogues.gas_df, phase, name)
+            except (IndexError, KeyError):
+                raise ValueError(f"Unknown {phase.lower()}: {name!r}") from None
+        return cls(*props, case["gas_fraction"], case["correlation"], case["fluid"], case["gas"])
+
+    def __repr__(self):
+        return (f"<TwoPhaseFlow: {self.liquid or 'liquid'} + {self.gas or 'gas'}, "
+                f"{self.gas_fraction:.0%} gas, {self.correlation}>")
+
+    @property
+    def rho(self):
+        return self.gas_fraction * self.rho_g + (1 - self.gas_fraction) * self.rho_l
+
+    @property
+    def mu(self):
+        return self.gas_fraction * self.mu_g + (1 - self.gas_fraction) * self.mu_l
+
+    def label(self):
+        """Short description for reports, e.g. 'Water + Air (30% gas, beggs-brill)'."""
+        return f"{self.liquid} + {self.gas} ({self.gas_fraction:.0%} gas, {self.correlation})"
+
+    def summary(self):
+        """JSON-ready description of the mixture."""
+        return {"liquid": self.liquid, "gas": self.gas, "gas_fraction": self.gas_fraction,
+                "correlation": self.correlation, "rho_liquid": self.rho_l, "mu_liquid": self.mu_l,
+                "rho_gas": self.rho_g, "mu_gas": self.mu_g}
+
+    def _velocities(self, D, Q):
+        V = (Q / 3600) / ((np.pi * D ** 2) / 4)
+        return V, (1 - self.gas_fraction) * V, self.gas_fraction * V
+
+    def pressure_drop(self, D, Q, L, vmax, k, fittings=None):
+        """Element-wise total ΔP (Pa), as :func:`engine.hydraulics.pressure_drop`."""
+        V, V_sl, V_sg = self._velocities(D, Q)
+        grad = CORRELATIONS[self.correlation](D, V_sl, V_sg, self.rho_l, self.mu_l,
+                                              self.rho_g, self.mu_g, k)
+        dp = grad * L + singular_pressure_drop(self.rho * V * D / self.mu, self.rho, V, fittings)
+        return np.where(V > vmax, np.nan, dp)
+
+    def pressure_drop_matrix(self, Q, L, vmax, k, fittings=None, diameters=None):
+        """One row per entry of the 1-D inputs, one column per diameter."""
+        D = (diameter_grid() if diameters is None else np.asarray(diameters, dtype=float))[None, :]
+        Q, L, vmax, k = (np.asarray(a, dtype=float).reshape(-1, 1) for a in (Q, L, vmax, k))
+        return self.pressure_drop(D, Q, L, vmax, k, fittings)
+
+    def detailed_calculation(self, D, Q, L, k, fittings=()):
+        """Breakdown at one diameter, with the keys of ``hydraulics.detailed_calculation``.
+
+        ``lambda`` is the equivalent Darcy factor of the correlation on the
+        no-slip mixture and ``holdup`` the liquid holdup (no-slip except for
+        Beggs–Brill).
+        """
+        V, V_sl, V_sg = self._velocities(D, Q)
+        Re = self.rho * V * D / self.mu
+        H = V ** 2 / (2 * G)
+        grad = float(CORRELATIONS[self.correlation](D, V_sl, V_sg, self.rho_l, self.mu_l,
+                                                    self.rho_g, self.mu_g, k))
+        dP_sing = 0.0
+        details = []
+        for typ, n, K1, Kinf, Kd in fittings:
+            K = fitting_k(Re, K1, Kinf, Kd)
+            dP_sing += n * K * self.rho * V ** 2 / 2
+            details.append((typ, n, K))
+        holdup = 1 - self.gas_fraction
+        if self.correlation == "beggs-brill":
+            holdup = float(beggs_brill_holdup(D, V_sl, V_sg)[0])
+        return {
+            'diameter': D,
+            'velocity': V,
+            'reynolds': Re,
+            'lambda': grad * D / (self.rho * G * H),
+            'H': H,
+            'dp_linear': grad * L,
+            'dp_singular': dP_sing,
+            'details': details,
+            'correlation': self.correlation,
+            'holdup': holdup,
+        }
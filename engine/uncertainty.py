@@ -0,0 +1,193 @@
+"""Monte Carlo uncertainty and sensitivity of the critical diameter.
+
+Flowrate, viscosity and pipe roughness are rarely known exactly. Each one is
+given a distribution of *multiplicative factors* around its nominal value::
+
+    {"flowrate":  ["normal", 0.05],        # mean 1, standard deviation 5 %
+     "viscosity": ["lognormal", 0.25],     # median 1, sigma of ln(factor)
+     "roughness": ["uniform", 0.5, 2.0]}   # between half and twice nominal
+
+A case may carry such a dict under ``"uncertainty"``; missing entries fall
+back to :data:`DEFAULT_UNCERTAINTY` and ``["fixed"]`` switches one off.
+For a non-Newtonian liquid the viscosity factor scales the consistency K.
+Samples are evaluated in chunks (bounded memory) with
+:func:`critical_diameter_search`; chunks go to a process pool when
+``workers > 1``. Every chunk has its own seed, so results do not depend on
+the number of workers.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from engine import catalogues as cat_mod
+from engine.design import normalize_case
+from engine.hydraulics import (
+    critical_diameter_search, diameter_grid, pack_fittings, resolve_fittings,
+)
+from engine.velocity import velocity_limit
+
+PARAMETERS = ("flowrate", "viscosity", "roughness")
+DEFAULT_UNCERTAINTY = {
+    "flowrate": ["normal", 0.05],
+    "viscosity": ["lognormal", 0.25],
+    "roughness": ["uniform", 0.5, 2.0],
+}
+PERCENTILES = (10, 50, 90)
+CHUNK = 20000
+
+
+# ------------------------------------------------------------------
+# Distributions
+# ------------------------------------------------------------------
+def uncertainty_spec(case):
+    """Validated {parameter: [kind, *args]} of a case; raises ValueError."""
+    spec = dict(DEFAULT_UNCERTAINTY)
+    spec.update(case.get("uncertainty") or {})
+    unknown = set(spec) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown uncertain parameter(s): {', '.join(sorted(unknown))}")
+    for name, dist in spec.items():
+        if isinstance(dist, str):
+            dist = [dist]
+        kind, args = dist[0], list(dist[1:])
+        expected = {"fixed": 0, "normal": 1, "lognormal": 1, "uniform": 2}.get(kind)
+        if expected is None or len(args) != expected:
+            raise ValueError(f"'{name}': expected fixed | normal SD | lognormal SIGMA | uniform LO HI, got {dist!r}")
+        try:
+            args = [float(a) for a in args]
+        except (TypeError, ValueError):
+            raise ValueError(f"'{name}': distribution arguments must be numbers") from None
+        spec[name] = [kind] + args
+    return spec
+
+
+def sample_factors(rng, dist, n):
+    kind, args = dist[0], dist[1:]
+    if kind == "normal":
+        return np.maximum(rng.normal(1.0, args[0], n), 1e-6)   # no negative flows
+    if kind == "lognormal":
+        return rng.lognormal(0.0, args[0], n)
+    if kind == "uniform":
+        return rng.uniform(args[0], args[1], n)
+    return np.ones(n)
+
+
+# ------------------------------------------------------------------
+# Chunk evaluation (top-level so it pickles)
+# ------------------------------------------------------------------
+def _run_chunk(job):
+    """Sampled factors (3, n) and {material: dcrit} of one chunk."""
+    seed, n, nominal, spec, roughness, fittings, diameters = job
+    rng = np.random.default_rng(seed)
+    factors = np.vstack([sample_factors(rng, spec[p], n) for p in PARAMETERS])
+    Q = nominal["Q"] * factors[0]
+    mu = nominal["mu"] * factors[1]
+    rheology = nominal["rheology"]
+    if rheology is not None:
+        n_flow, K, tau0 = rheology
+        rheology = (n_flow, K * factors[1], tau0)
+    packed = pack_fittings([fittings])          # one row, broadcast over samples
+    out = {}
+    for mat, k in roughness.items():
+        out[mat] = critical_diameter_search(Q, nominal["L"], nominal["rho"], mu, nominal["vmax"],
+                                            k * factors[2], nominal["dp_max"], packed, diameters,
+                                            rheology)
+    return factors, out
+
+
+# ------------------------------------------------------------------
+# Statistics
+# ------------------------------------------------------------------
+def _ranks(x):
+    """Ranks from 0, tied values sharing their average rank.
+
+    dcrit snaps to the diameter grid and infeasible samples all tie at inf,
+    so ties are common; ranking them by sample order would bias the
+    correlation towards zero.
+    """
+    _, inverse, counts = np.unique(x, return_inverse=True, return_counts=True)
+    return (np.cumsum(counts) - (counts + 1) / 2)[inverse.ravel()]
+
+
+def sensitivity(factors, dcrit):
+    """Spearman rank correlation of each input factor with dcrit, strongest first.
+
+    Infeasible samples (no grid diameter works) rank above every feasible one.
+    """
+    y = _ranks(np.where(np.isnan(dcrit), np.inf, dcrit))
+    out = []
+    for name, x in zip(PARAMETERS, factors):
+        if np.ptp(x) == 0 or np.ptp(y) == 0:
+            out.append((name, 0.0))
+        else:
+            out.append((name, float(np.corrcoef(_ranks(x), y)[0, 1])))
+    return sorted(out, key=lambda item: -abs(item[1]))
+
+
+def summarize(dcrit):
+    """Percentiles (m) of dcrit; None where the percentile falls among infeasible samples."""
+    values = np.where(np.isnan(dcrit), np.inf, dcrit)
+    pct = np.percentile(values, PERCENTILES, method="higher")
+    feasible = values[np.isfinite(values)]
+    stats = {f"P{p}": (float(v) if np.isfinite(v) else None) for p, v in zip(PERCENTILES, pct)}
+    stats["mean"] = float(feasible.mean()) if len(feasible) else None
+    stats["feasible"] = float(len(feasible) / len(values))
+    return stats
+
+
+# ------------------------------------------------------------------
+# Entry point
+# ------------------------------------------------------------------
+def monte_carlo(case, samples=100000, seed=None, workers=1, chunk=CHUNK, catalogues=None,
+                materials=None):
+    """P10/P50/P90 critical diameters and sensitivity ranking per material.
+
+    ``materials`` defaults to the materials compatible with the case.
+    Returns plain Python values (JSON-serialisable).
+    """
+    spec = uncertainty_spec(case)
+    case = normalize_case(case)
+    if samples < 1:
+        raise ValueError("'samples' must be at least 1")
+    cat = catalogues or cat_mod.get_catalogues()
+    try:
+        rho, mu = cat_mod.fluid_properties(cat.liquid_df, cat.gas_df, case["phase"], case["fluid"])
+    except (IndexError, KeyError):
+        raise ValueError(f"Unknown {case['phase'].lower()}: {case['fluid']!r}") from None
+    rheology = None
+    if case["phase"] == "Liquid":
+        rheology = cat_mod.fluid_rheology(cat.liquid_df, case["fluid"])
+    if materials is None:
+        materials = cat_mod.get_compatible_materials(cat.material_df, case["temperature"], case["pressure"])
+    roughness = {m: cat_mod.material_roughness(cat.material_df, m) for m in materials}
+    nominal = {"Q": case["flowrate"], "L": case["length"], "rho": rho, "mu": mu,
+               "vmax": velocity_limit(case, rho, mu), "dp_max": case["dp_max"] * 1e5,
+               "rheology": rheology}
+    fittings = resolve_fittings(cat.fittings_df, case["fittings"])
+    diameters = diameter_grid()
+
+    sizes = [min(chunk, samples - start) for start in range(0, samples, chunk)]
+    root = np.random.SeedSequence(seed)
+    seeds = root.spawn(len(sizes))
+    jobs = [(s, n, nominal, spec, roughness, fittings, diameters) for s, n in zip(seeds, sizes)]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            parts = list(pool.map(_run_chunk, jobs))
+    else:
+        parts = [_run_chunk(job) for job in jobs]
+
+    factors = np.hstack([f for f, _ in parts])
+    per_material = {}
+    for mat in materials:
+        dcrit = np.concatenate([d[mat] for _, d in parts])
+        stats = summarize(dcrit)
+        stats["sensitivity"] = sensitivity(factors, dcrit)
+        per_material[mat] = stats
+    return {
+        "samples": samples,
+        "seed": root.entropy,              # re-run with this seed to reproduce
+        "uncertainty": spec,
+        "materials": per_material,
+    }
@@ -0,0 +1,198 @@
+"""Maximum flow velocity of a case: fixed, erosional (API RP 14E) or custom.
+
+By default a case's ``"velocity"`` (m/s) is the limit. A case may instead
+choose a model that derives the limit from the fluid, evaluated at the
+density and viscosity the design uses (the no-slip mixture for two-phase
+cases)::
+
+    {"velocity_limit": "api-rp-14e", "c_factor": 100}
+    {"velocity_limit": "custom", "velocity_expression": "min(4, 120 / sqrt(rho))"}
+
+API RP 14E gives the erosional velocity Ve = C/√ρ with C in its customary
+units (ft/s·(lb/ft³)^½): about 100 for continuous and 125 for intermittent
+service. In SI, Ve = :data:`API_SI`·C/√ρ with ρ in kg/m³. A custom
+expression may use ``rho`` (kg/m³), ``mu`` (Pa·s) and the functions of
+:data:`FUNCTIONS`. From Python, ``"velocity_limit"`` may also be a callable
+``f(rho, mu)`` returning m/s. With either model, ``"velocity"`` is optional
+and caps the derived limit when given.
+
+Every limit is vectorized over ``rho`` and ``mu``: :func:`velocity_limits`
+resolves a whole chunk of batch cases at once.
+"""
+import ast
+import math
+import sys
+
+import numpy as np
+
+MODELS = ("fixed", "api-rp-14e", "custom")
+DEFAULT_C = 100.0
+SERVICE_C = {"continuous": 100.0, "intermittent": 125.0}
+API_SI = 0.3048 / math.sqrt(0.3048 ** 3 / 0.45359237)    # ≈ 1.22
+FUNCTIONS = {"sqrt": np.sqrt, "log": np.log, "log10": np.log10, "exp": np.exp,
+             "abs": np.abs, "min": np.minimum, "max": np.maximum}
+CONSTANTS = {"pi": math.pi}
+VARIABLES = ("rho", "mu")
+
+
+# ------------------------------------------------------------------
+# Models
+# ------------------------------------------------------------------
+def erosional_velocity(rho, c_factor=DEFAULT_C):
+    """API RP 14E erosional velocity (m/s) for a density in kg/m³."""
+    with np.errstate(divide="ignore"):
+        return API_SI * np.asarray(c_factor, dtype=float) / np.sqrt(np.asarray(rho, dtype=float))
+
+
+class _Float64(ast.NodeTransformer):
+    """Wraps every number in ``_float64(...)``, which also keeps it out of constant folding."""
+
+    def visit_Constant(self, node):
+        return ast.Call(ast.Name("_float64", ast.Load()), [node], [])
+
+
+def compile_expression(text):
+    """Vectorized ``f(rho, mu)`` of a custom limit expression; raises ValueError.
+
+    Only numbers, :data:`VARIABLES`, :data:`CONSTANTS`, arithmetic and calls
+    to :data:`FUNCTIONS` are allowed. Numbers become float64, so a huge power
+    overflows to inf instead of running as an unbounded integer power.
+    """
+    try:
+        tree = ast.parse(str(text).strip(), mode="eval")
+    except SyntaxError:
+        raise ValueError(f"Bad velocity expression {text!r}") from None
+    allowed = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+               ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.USub, ast.UAdd)
+    for node in ast.walk(tree):
+        if not isinstance(node, allowed):
+            raise ValueError(f"Velocity expression {text!r}: {type(node).__name__} is not allowed")
+        if isinstance(node, ast.Constant) and (not isinstance(node.value, (int, float))
+                                               or abs(node.value) > sys.float_info.max):
+            raise ValueError(f"Velocity expression {text!r}: only finite numbers are allowed")
+        if isinstance(node, ast.Name) and node.id not in (*VARIABLES, *CONSTANTS, *FUNCTIONS):
+            raise ValueError(f"Velocity expression {text!r}: unknown name {node.id!r}; "
+                             f"use {', '.join(VARIABLES)} and {', '.join(FUNCTIONS)}")
+        if isinstance(node, ast.Call) and (node.keywords or not isinstance(node.func, ast.Name)
+                                           or node.func.id not in FUNCTIONS):
+            raise ValueError(f"Velocity expression {text!r}: only {', '.join(FUNCTIONS)} can be called")
+    tree = ast.fix_missing_locations(_Float64().visit(tree))
+    code = compile(tree, "<velocity expression>", "eval")
+    namespace = {"__builtins__": {}, "_float64": np.float64, **FUNCTIONS,
+                 **{name: np.float64(value) for name, value in CONSTANTS.items()}}
+
+    def limit(rho, mu):
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            return eval(code, namespace, {"rho": rho, "mu": mu})
+    return limit
+
+
+def parse_velocity_limit(case):
+    """Validate the velocity-limit fields of a case in place (see :func:`engine.design.normalize_case`).
+
+    Fixed-limit cases are left as they are. Otherwise ``"velocity_limit"``
+    becomes a model name (or stays a callable), ``"c_factor"`` and
+    ``"velocity_expression"`` are checked, and a missing ``"velocity"`` means
+    no cap (``inf``).
+    """
+    model = case.get("velocity_limit")
+    if not (model is None or callable(model)):
+        model = "-".join(str(model).lower().replace("_", " ").split()) or None   # "API RP 14E" too
+    if model in (None, "fixed"):
+        case.pop("velocity_limit", None)
+        return case
+    if not callable(model):
+        if model not in MODELS:
+            raise ValueError(f"'velocity_limit' must be one of {list(MODELS)}, got {case['velocity_limit']!r}")
+        case["velocity_limit"] = model
+    if model == "api-rp-14e":
+        c = case.get("c_factor")
+        c = SERVICE_C.get(str(c).strip().lower(), c) if c not in (None, "") else DEFAULT_C
+        try:
+            case["c_factor"] = float(c)
+        except (TypeError, ValueError):
+            raise ValueError(f"'c_factor' must be a number or one of {list(SERVICE_C)}, got {c!r}") from None
+        if case["c_factor"] <= 0:
+            raise ValueError("'c_factor' must be positive")
+    elif model == "custom":
+        if case.get("velocity_expression") in (None, ""):
+            raise ValueError("A custom velocity limit needs a 'velocity_expression'")
+        compile_expression(case["velocity_expression"])
+    if case.get("velocity") in (None, ""):
+        case["velocity"] = math.inf
+    return case
+
+
+def _custom(case):
+    model = case.get("velocity_limit")
+    return model if callable(model) else compile_expression(case["velocity_expression"])
+
+
+def _valid(limit):
+    """Mask of derived limits that are usable: finite and positive."""
+    return np.isfinite(limit) & (limit > 0)
+
+
+def velocity_limit(case, rho, mu):
+    """Maximum velocity (m/s) of a normalized case at ``rho`` (kg/m³) and ``mu`` (Pa·s).
+
+    ``rho`` and ``mu`` may be arrays; the result broadcasts with them. Raises
+    ValueError when the model gives a limit that is not finite and positive.
+    """
+    model = case.get("velocity_limit")
+    if model is None:
+        return case["velocity"]
+    if model == "api-rp-14e":
+        limit = erosional_velocity(rho, case["c_factor"])
+    else:
+        limit = np.asarray(_custom(case)(np.asarray(rho, dtype=float), np.asarray(mu, dtype=float)),
+                           dtype=float)
+    ok = _valid(limit)
+    if not ok.all():
+        bad = float(np.broadcast_to(limit, ok.shape)[~ok].flat[0])
+        raise ValueError(f"Velocity limit ({describe(case)}) gives {bad:g} m/s; "
+                         "it must be finite and positive")
+    limit = np.minimum(limit, case["velocity"])
+    return float(limit) if limit.ndim == 0 else limit
+
+
+def velocity_limits(cases, rho, mu):
+    """Maximum velocity (m/s) of every case of a list at once.
+
+    Fixed and API RP 14E cases are one array expression each; custom cases
+    are grouped by expression, one evaluation per group. Where a model gives
+    a limit that is not finite and positive the result is NaN, so a batch can
+    report those cases one by one.
+    """
+    n = len(cases)
+    rho, mu = (np.broadcast_to(np.asarray(a, dtype=float), (n,)) for a in (rho, mu))
+    vmax = np.array([c["velocity"] for c in cases], dtype=float)
+    models = [c.get("velocity_limit") for c in cases]
+    api = np.array([m == "api-rp-14e" for m in models], dtype=bool)
+    if api.any():
+        c_factor = np.array([c["c_factor"] for c in cases if c.get("velocity_limit") == "api-rp-14e"])
+        limit = erosional_velocity(rho[api], c_factor)
+        vmax[api] = np.where(_valid(limit), np.minimum(vmax[api], limit), np.nan)
+    groups = {}
+    for i, (case, model) in enumerate(zip(cases, models)):
+        if model is not None and model != "api-rp-14e":
+            key = model if callable(model) else case["velocity_expression"]
+            groups.setdefault(key, []).append(i)
+    for idx in groups.values():
+        idx = np.array(idx)
+        limit = np.asarray(_custom(cases[idx[0]])(rho[idx], mu[idx]), dtype=float)
+        limit = np.broadcast_to(limit, idx.shape)
+        vmax[idx] = np.where(_valid(limit), np.minimum(vmax[idx], limit), np.nan)
+    return vmax
+
+
+def describe(case):
+    """Short label of a case's velocity-limit model, for tables and reports."""
+    model = case.get("velocity_limit")
+    if model is None:
+        return "fixed"
+    if model == "api-rp-14e":
+        label = f"API RP 14E, C={case['c_factor']:g}"
+    else:
+        label = "custom" if callable(model) else f"custom: {case['velocity_expression']}"
+    return label if math.isinf(case["velocity"]) else f"{label}, ≤ {case['velocity']:g} m/s"
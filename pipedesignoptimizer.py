@@ -1,13 +1,12 @@
+import time
+_T_START = time.perf_counter()          # time-to-first-frame is measured from here
+
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-import pandas as pd
-import numpy as np
-import matplotlib
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
-from PIL import Image, ImageTk
-import os, sys
-import tempfile
+import os
+import sqlite3
 import threading
 
 
@@ -23,582 +22,253 @@ except Exception:
 
     
 
-# Enhanced Pipeline Report Generator with Professional Styling
-# ------------------------------------------------------------------
-from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
-    Image as RLImage, PageBreak, FrameBreak, KeepTogether, HRFlowable
-)
-from reportlab.lib.units import inch, cm, mm
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 from pathlib import Path
-import matplotlib.pyplot as plt
-from datetime import datetime
 
-# Custom color palette for ReportLab
-CORPORATE_BLUE = colors.Color(0.1, 0.2, 0.4)  # Dark blue
-ACCENT_BLUE = colors.Color(0.2, 0.4, 0.7)     # Medium blue
-LIGHT_BLUE = colors.Color(0.9, 0.95, 1.0)     # Very light blue
-GRAY_HEADER = colors.Color(0.3, 0.3, 0.3)     # Dark gray
-LIGHT_GRAY = colors.Color(0.95, 0.95, 0.95)   # Light gray
+# Only what the first page needs is imported above. numpy, pandas and the
+# engine are imported by the catalogue loader thread (engine.startup);
+# matplotlib and ReportLab on first use.
+from engine import startup
+from engine.assets import ImageCache
+from engine.fittings import FittingList, parse_fitting_table
+from engine.resources import resource_path
 
-# Matplotlib-compatible colors (RGB tuples)
-MPL_CORPORATE_BLUE = (0.1, 0.2, 0.4)
-MPL_ACCENT_BLUE = (0.2, 0.4, 0.7)
-MPL_GRAY_HEADER = (0.3, 0.3, 0.3)
+UNCERTAINTY_SAMPLES = 50000
+RESIZE_DEBOUNCE_MS = 150          # background rescale once a window resize settles
+VELOCITY_LIMITS = {"Fixed": "fixed", "API RP 14E": "api-rp-14e", "Custom": "custom"}   # engine.velocity
 
+# ------------------------------------------------------------------
+# 2.  Data loading (background thread, see engine.startup)
+# ------------------------------------------------------------------
+CATALOGUE_FRAMES = ("liquid_df", "gas_df", "material_df", "fittings_df", "sched_df")
+_catalogues = None
+
+
+def _use_catalogues():
+    """Wait for the catalogue loader and publish the frames as module globals."""
+    global _catalogues, liquid_df, gas_df, material_df, fittings_df, sched_df
+    if _catalogues is None:
+        cat = startup.load_catalogues().result()
+        liquid_df, gas_df, material_df, fittings_df, sched_df = (
+            cat.liquid_df, cat.gas_df, cat.material_df, cat.fittings_df, cat.sched_df)
+        _catalogues = cat
+    return _catalogues
+
+
+def __getattr__(name):
+    # module attributes for code importing this file: loaded on first access
+    if name in CATALOGUE_FRAMES:
+        _use_catalogues()
+        return globals()[name]
+    if name == "build_pipeline_report":
+        from engine.report import build_pipeline_report
+        return build_pipeline_report
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
+# ------------------------------------------------------------------
+# 3.  Helper
+# ------------------------------------------------------------------
+def get_compatible_materials(temp, pressure):
+    from engine import catalogues
+    return catalogues.get_compatible_materials(_use_catalogues().material_df, temp, pressure)
 
 
+def fluid_properties(phase, fluid):
+    """Density (kg/m³) and dynamic viscosity (Pa·s) of a catalogue fluid."""
+    from engine import catalogues
+    cat = _use_catalogues()
+    return catalogues.fluid_properties(cat.liquid_df, cat.gas_df, phase, fluid)
 
-def resource_path(relative_path: str):
-    """ Get absolute path to resource for dev and for PyInstaller """
-    if getattr(sys, 'frozen', False):  # exe mode
-        return os.path.join(os.path.dirname(sys.executable), relative_path)
-    return os.path.join(os.path.dirname(__file__), relative_path)
 
+def fluid_rheology(fluid):
+    """(n, K, tau0) of a non-Newtonian catalogue liquid, None if it is Newtonian."""
+    from engine import catalogues
+    return catalogues.fluid_rheology(_use_catalogues().liquid_df, fluid)
 
-def _cheapest_material(prices: dict) -> str:
-    """Return the material key that has the lowest total_cost."""
-    if not prices:
-        return "N/A"
-    return min(prices, key=lambda m: prices[m]["total_cost"])
 
+def material_roughness(mat):
+    """Absolute roughness (m) of a catalogue material."""
+    from engine import catalogues
+    return catalogues.material_roughness(_use_catalogues().material_df, mat)
 
-def create_custom_styles():
-    """Create professional custom styles"""
-    styles = getSampleStyleSheet()
-    
-    # Check if custom styles already exist, if not add them
-    custom_style_names = ['MainTitle', 'SubTitle', 'SectionHeader', 'BodyText', 'KeyValue']
-    
-    for style_name in custom_style_names:
-        if style_name in styles:
-            continue  # Skip if already exists
-    
-    # Main title style
-    if 'MainTitle' not in styles:
-        styles.add(ParagraphStyle(
-            name='MainTitle',
-            parent=styles['Title'],
-            fontSize=24,
-            textColor=CORPORATE_BLUE,
-            spaceAfter=12,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        ))
-    
-    # Subtitle style
-    if 'SubTitle' not in styles:
-        styles.add(ParagraphStyle(
-            name='SubTitle',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=ACCENT_BLUE,
-            spaceAfter=20,
-            alignment=TA_CENTER,
-            fontName='Helvetica'
-        ))
-    
-    # Section heading style
-    if 'SectionHeader' not in styles:
-        styles.add(ParagraphStyle(
-            name='SectionHeader',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=CORPORATE_BLUE,
-            spaceBefore=15,
-            spaceAfter=8,
-            fontName='Helvetica-Bold',
-            borderWidth=0,
-            borderColor=ACCENT_BLUE,
-            borderPadding=5,
-            backColor=LIGHT_BLUE
-        ))
-    
-    # Body text with better spacing
-    if 'BodyText' not in styles:
-        styles.add(ParagraphStyle(
-            name='BodyText',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=6,
-            leading=14,
-            alignment=TA_JUSTIFY
-        ))
-    
-    # Key-value pair style
-    if 'KeyValue' not in styles:
-        styles.add(ParagraphStyle(
-            name='KeyValue',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=4,
-            leftIndent=10,
-            leading=13
-        ))
-    
-    return styles
 
-def create_side_by_side_plots(img_folder):
-    """Create side-by-side plots layout"""
-    import matplotlib.pyplot as plt
-    from matplotlib.gridspec import GridSpec
-    import matplotlib.image as mpimg
-    
-    # Check if individual plots exist
-    vel_img_path = img_folder / "velocity_vs_diameter.png"
-    dp_img_path = img_folder / "pressure_drop_vs_diameter.png"
-    
-    if vel_img_path.exists() and dp_img_path.exists():
-        # Create a figure with side-by-side subplots
-        fig = plt.figure(figsize=(12, 5))
-        gs = GridSpec(1, 2, figure=fig, hspace=0.1, wspace=0.3)
-        
-        # Load and display the individual plots
-        ax1 = fig.add_subplot(gs[0, 0])
-        ax2 = fig.add_subplot(gs[0, 1])
-        
-        # Load the saved images
-        vel_img = mpimg.imread(vel_img_path)
-        dp_img = mpimg.imread(dp_img_path)
-        
-        # Display the images
-        ax1.imshow(vel_img)
-        ax1.axis('off')
-        ax1.set_title('Velocity vs Diameter', fontweight='bold', color=MPL_CORPORATE_BLUE, pad=10)
-        
-        ax2.imshow(dp_img)
-        ax2.axis('off')
-        ax2.set_title('Pressure Drop vs Diameter', fontweight='bold', color=MPL_CORPORATE_BLUE, pad=10)
-        
-        # Adjust layout (remove tight_layout to avoid warning with image subplots)
-        plt.subplots_adjust(left=0.05, right=0.95, top=0.85, bottom=0.1, wspace=0.3)
-        
-        # Save combined plot
-        combined_img = img_folder / "combined_plots.png"
-        plt.savefig(combined_img, dpi=200, bbox_inches="tight", facecolor='white')
-        plt.close()
-        
-        return combined_img
-    else:
-        # If individual plots don't exist, create a placeholder
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
-        
-        ax1.text(0.5, 0.5, 'Velocity vs Diameter\n(Plot not available)', 
-                ha='center', va='center', transform=ax1.transAxes,
-                fontsize=12, color=MPL_GRAY_HEADER)
-        ax1.set_title('Velocity vs Diameter', fontweight='bold', color=MPL_CORPORATE_BLUE)
-        
-        ax2.text(0.5, 0.5, 'Pressure Drop vs Diameter\n(Plot not available)', 
-                ha='center', va='center', transform=ax2.transAxes,
-                fontsize=12, color=MPL_GRAY_HEADER)
-        ax2.set_title('Pressure Drop vs Diameter', fontweight='bold', color=MPL_CORPORATE_BLUE)
-        
-        # Style the axes
-        for ax in [ax1, ax2]:
-            ax.grid(True, alpha=0.3)
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            ax.spines['left'].set_color(MPL_GRAY_HEADER)
-            ax.spines['bottom'].set_color(MPL_GRAY_HEADER)
-        
-        plt.subplots_adjust(left=0.1, right=0.9, top=0.85, bottom=0.15, wspace=0.3)
-        
-        # Save combined plot
-        combined_img = img_folder / "combined_plots.png"
-        plt.savefig(combined_img, dpi=200, bbox_inches="tight", facecolor='white')
-        plt.close()
-        
-        return combined_img
-
-def build_pipeline_report(inputs, compatible, plots, thickness_results, results, fittings, prices, file_path: Path):
-    # ------------------------------------------------------------------
-    # 0. Setup and save plots
-    # ------------------------------------------------------------------
-    img_folder = Path(__file__).parent / "report_imgs"
-    img_folder.mkdir(exist_ok=True)
-
-    # Create side-by-side plots
-    combined_plots_img = create_side_by_side_plots(img_folder)
-
-    # ------------------------------------------------------------------
-    # 1. Document setup with better margins
-    # ------------------------------------------------------------------
-    doc = SimpleDocTemplate(
-        str(file_path), 
-        pagesize=A4, 
-        topMargin=0.8*inch,
-        bottomMargin=0.8*inch,
-        leftMargin=0.8*inch,
-        rightMargin=0.8*inch
-    )
-
-    # Enhanced header with company info
-    def header_footer(canvas, doc):
-        canvas.saveState()
-        
-        # Header
-        logo_path = Path(__file__).with_name("eppm.png")
-        if logo_path.exists():
-            # Left logo
-            canvas.drawImage(str(logo_path), 40, A4[1]-60, width=40, height=40, preserveAspectRatio=True)
-            # Right logo
-            canvas.drawImage(str(logo_path), A4[0]-80, A4[1]-60, width=40, height=40, preserveAspectRatio=True)
-        
-        # Header line
-        canvas.setStrokeColor(ACCENT_BLUE)
-        canvas.setLineWidth(2)
-        canvas.line(40, A4[1]-70, A4[0]-40, A4[1]-70)
-        
-        # Footer
-        canvas.setFont('Helvetica', 8)
-        canvas.setFillColor(GRAY_HEADER)
-        
-        # Date and page number
-        date_str = datetime.now().strftime("%B %d, %Y")
-        canvas.drawString(40, 40, f"Generated on: {date_str}")
-        canvas.drawRightString(A4[0]-40, 40, f"Page {doc.page}")
-        
-        # Footer line
-        canvas.setStrokeColor(ACCENT_BLUE)
-        canvas.setLineWidth(1)
-        canvas.line(40, 50, A4[0]-40, 50)
-        
-        canvas.restoreState()
-
-    # ------------------------------------------------------------------
-    # 2. Content
-    # ------------------------------------------------------------------
-    story = []
-    styles = create_custom_styles()
-
-    # Title section with better formatting
-    story.append(Spacer(1, 20))
-    story.append(Paragraph("Pipeline Design Optimization Report", styles["MainTitle"]))
-    story.append(Paragraph(inputs.get("project_name", "Untitled Project"), styles["SubTitle"]))
-    
-    # Add decorative line
-    story.append(HRFlowable(width="100%", thickness=2, color=ACCENT_BLUE, spaceBefore=10, spaceAfter=20))
-
-    # Executive Summary (new section)
-    story.append(Paragraph("Executive Summary", styles["SectionHeader"]))
-    summary_text = f"""
-    This report presents the results of pipeline design optimization for the {inputs.get('project_name', 'project')} 
-    with a flowrate of {inputs.get('flowrate_m3h', '')} m³/h over {inputs.get('pipe_length_m', '')} meters. 
-    The analysis determined an optimal diameter of {plots['chosen_d']:.4f} m based on velocity and pressure drop constraints, 
-    resulting in a velocity of {results['V']:.3f} m/s and total pressure drop of {(results['dp_linear'] + results['dp_singular'])/1e5:.4f} bar.
-    """
-    story.append(Paragraph(summary_text, styles["BodyText"]))
-    story.append(Spacer(1, 15))
-
-    # User Input section 
-    story.append(Paragraph("Design Parameters", styles["SectionHeader"]))
-    
-    # Create input table
-    input_data = [
-        ["Parameter", "Value", "Unit"],
-        ["Project Name", inputs.get('project_name', ''), ""],
-        ["Flowrate", f"{inputs.get('flowrate_m3h', '')}", "m³/h"],
-        ["Pipe Length", f"{inputs.get('pipe_length_m', '')}", "m"],
-        ["Phase", inputs.get('phase', ''), ""],
-        ["Fluid", inputs.get('fluid', ''), ""],
-        ["Maximum Velocity", f"{inputs.get('max_velocity_mps', '')}", "m/s"],
-        ["Temperature", f"{inputs.get('temperature_c', '')}", "°C"],
-        ["Operating Pressure", f"{inputs.get('operating_pressure_bar', '')}", "bar"],
-        ["Design Pressure", f"{inputs.get('design_pressure_bar', '')}", "bar"],
-        ["Location Type", inputs.get('location_type', ''), ""],
-    ]
-    
-    input_table = Table(input_data, colWidths=[2.5*inch, 1.5*inch, 0.8*inch])
-    input_table.setStyle(TableStyle([
-        # Header styling
-        ('BACKGROUND', (0,0), (-1,0), CORPORATE_BLUE),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,0), 11),
-        
-        # Body styling
-        ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,1), (-1,-1), 10),
-        ('BACKGROUND', (0,1), (-1,-1), colors.white),
-        ('ALTERNATEROWCOLOR', (0,1), (-1,-1), [colors.white, LIGHT_GRAY]),
-        
-        # Grid and alignment
-        ('GRID', (0,0), (-1,-1), 0.5, GRAY_HEADER),
-        ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, LIGHT_GRAY]),
-    ]))
-    story.append(input_table)
-    story.append(Spacer(1, 10))
-
-    # Fittings subsection
-    if fittings:
-        story.append(Paragraph("System Fittings", styles["SectionHeader"]))
-        fitting_data = [["Quantity", "Fitting Type", "Loss Coefficient (K)"]]
-        for ft, n, k in fittings:
-            fitting_data.append([str(n), ft, f"{k:.3f}"])
-        
-        fitting_table = Table(fitting_data, colWidths=[1*inch, 3*inch, 1.5*inch])
-        fitting_table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,0), ACCENT_BLUE),
-            ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0,0), (-1,0), 10),
-            ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
-            ('FONTSIZE', (0,1), (-1,-1), 9),
-            ('GRID', (0,0), (-1,-1), 0.5, GRAY_HEADER),
-            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, LIGHT_GRAY]),
-        ]))
-        story.append(fitting_table)
-        story.append(Spacer(1, 15))
-
-    # Material Compatibility section
-    story.append(Paragraph("Material Compatibility Analysis", styles["SectionHeader"]))
-    if compatible:
-        material_data = [["Material Grade", "Temperature Range (°C)", "Pressure Range (bar)"]]
-        for m, tmin, tmax, pmin, pmax in compatible:
-            temp_range = f"{tmin:.0f} to {tmax:.0f}"
-            pressure_range = f"{pmin:.0f} to {pmax:.0f}"
-            material_data.append([m, temp_range, pressure_range])
-        
-        material_table = Table(material_data, colWidths=[2.5*inch, 1.8*inch, 1.5*inch])
-        material_table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,0), CORPORATE_BLUE),
-            ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0,0), (-1,0), 10),
-            ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
-            ('FONTSIZE', (0,1), (-1,-1), 9),
-            ('GRID', (0,0), (-1,-1), 0.5, GRAY_HEADER),
-            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, LIGHT_GRAY]),
-        ]))
-        story.append(material_table)
-    else:
-        story.append(Paragraph("⚠ No compatible materials found for the specified conditions.", styles["BodyText"]))
-    story.append(Spacer(1, 15))
-
-    # Design Analysis section
-    story.append(Paragraph("Design Analysis & Optimization", styles["SectionHeader"]))
-    
-    # Key design metrics in a professional box
-    design_data = [
-        ["Design Metric", "Value", "Unit", "Status"],
-        ["Critical Diameter (Velocity)", f"{plots['dcrit_velocity']:.4f}", "m", "✓ Calculated"],
-        ["Critical Diameter (Pressure)", f"{plots['dcrit_pressure']:.4f}", "m", "✓ Calculated"],
-        ["Optimized Diameter", f"{plots['chosen_d']:.4f}", "m", "✓ Selected"],
-        ["Actual Velocity", f"{results['V']:.3f}", "m/s", "✓ Within limits"],
-        ["Reynolds Number", f"{results['Re']:.0f}", "-", "✓ Acceptable"],
-        ["Friction Factor", f"{results['lambda']:.6f}", "-", "✓ Calculated"],
-    ]
-    
-    design_table = Table(design_data, colWidths=[2.2*inch, 1.2*inch, 0.8*inch, 1.3*inch])
-    design_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), CORPORATE_BLUE),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,0), 10),
-        ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,1), (-1,-1), 9),
-        ('GRID', (0,0), (-1,-1), 0.5, GRAY_HEADER),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, LIGHT_GRAY]),
-    ]))
-    story.append(design_table)
-    story.append(Spacer(1, 15))
-
-    # Optimization Charts (side by side)
-    story.append(Paragraph("Optimization Charts", styles["SectionHeader"]))
-    if combined_plots_img.exists():
-        story.append(RLImage(str(combined_plots_img), width=7*inch, height=3*inch))
-    story.append(Spacer(1, 15))
-
-    # Pressure Analysis section
-    story.append(Paragraph("Hydraulic Analysis Results", styles["SectionHeader"]))
-    
-    pressure_data = [
-        ["Pressure Component", "Value", "Unit", "Percentage"],
-        ["Linear Pressure Drop", f"{results['dp_linear']/1e5:.4f}", "bar", f"{results['dp_linear']/(results['dp_linear'] + results['dp_singular'])*100:.1f}%"],
-        ["Singular Pressure Drop", f"{results['dp_singular']/1e5:.4f}", "bar", f"{results['dp_singular']/(results['dp_linear'] + results['dp_singular'])*100:.1f}%"],
-        ["Total Pressure Drop", f"{(results['dp_linear'] + results['dp_singular'])/1e5:.4f}", "bar", "100.0%"],
-        ["Velocity Head", f"{results['H']:.4f}", "m", "N/A"],
-    ]
-    
-    pressure_table = Table(pressure_data, colWidths=[2.2*inch, 1.2*inch, 0.8*inch, 1.3*inch])
-    pressure_table.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,0), ACCENT_BLUE),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0,0), (-1,0), 10),
-        ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,1), (-1,-1), 9),
-        ('GRID', (0,0), (-1,-1), 0.5, GRAY_HEADER),
-        ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, LIGHT_GRAY]),
-        # Highlight total row
-        ('BACKGROUND', (0,-1), (-1,-1), LIGHT_BLUE),
-        ('FONTNAME', (0,-1), (-1,-1), 'Helvetica-Bold'),
-    ]))
-    story.append(pressure_table)
-    story.append(Spacer(1, 15))
-
-    # ------------------------------------------------------------------
-    # Wall Thickness Design  ––  one table per material
-    # ------------------------------------------------------------------
-    story.append(Paragraph("Wall Thickness Design", styles["SectionHeader"]))
-
-    if thickness_results:               # thickness_results is the list you already have
-        for r in thickness_results:
-            mat_name = r["Material"]
-            story.append(Paragraph(f"<b>{mat_name}</b>", styles["BodyText"]))
-            tbl_data = [
-                ["Parameter", "Value", "Unit"],
-                ["Required Thickness",   f"{r['t_required_mm']:.2f}", "mm"],
-                ["Outside Diameter",     f"{r['OD_norm_mm']:.2f}",    "mm"],
-                ["Selected Thickness",   f"{r['t_norm_mm']:.2f}",     "mm"],
-                ["Nominal Pipe Size",    f"{r['NPS']}",               ""],
-                ["API Specification",    f"{r['API']}",               ""]
-            ]
-            t = Table(tbl_data, colWidths=[2.5*inch, 1.5*inch, 1*inch])
-            t.setStyle(TableStyle([
-                ('BACKGROUND', (0,0), (-1,0), CORPORATE_BLUE),
-                ('TEXTCOLOR',  (0,0), (-1,0), colors.white),
-                ('FONTNAME',   (0,0), (-1,0), 'Helvetica-Bold'),
-                ('FONTSIZE',   (0,0), (-1,0), 10),
-                ('FONTNAME',   (0,1), (-1,-1), 'Helvetica'),
-                ('FONTSIZE',   (0,1), (-1,-1), 9),
-                ('GRID',       (0,0), (-1,-1), 0.5, GRAY_HEADER),
-                ('ALIGN',      (0,0), (-1,-1), 'LEFT'),
-                ('VALIGN',     (0,0), (-1,-1), 'MIDDLE'),
-                ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, LIGHT_GRAY]),
-            ]))
-            story.append(t)
-            story.append(Spacer(1, 10))
-    else:
-        story.append(Paragraph("No thickness data available.", styles["BodyText"]))
-    story.append(Spacer(1, 15))
+# ------------------------------------------------------------------
+# 4.  Fittings editor
+# ------------------------------------------------------------------
+class FittingsEditor(tb.Frame):
+    """Treeview over a FittingList: double-click a cell to edit it in place.
 
-    
-    # Cost Analysis section
-    story.append(Paragraph("Cost Analysis", styles["SectionHeader"]))
-    if prices:
-        price_data = [["Material", "Mass (kg)", "Material Cost ($)", "Fittings Cost ($)", "Total Cost ($)"]]
-        for mat, info in prices.items():
-            if info:
-                price_data.append([
-                    mat,
-                    f"{info['mass']:.1f}",
-                    f"${info['material_cost']:.2f}",
-                    f"${info['fittings_cost']:.2f}",
-                    f"${info['total_cost']:.2f}"
-                ])
-
-        price_table = Table(price_data, colWidths=[2.2*inch, 1.2*inch, 1.3*inch, 1.3*inch, 1.3*inch])
-        price_table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,0), CORPORATE_BLUE),
-            ('TEXTCOLOR', (0,0), (-1,0), colors.white),
-            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0,0), (-1,0), 10),
-            ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
-            ('FONTSIZE', (0,1), (-1,-1), 9),
-            ('GRID', (0,0), (-1,-1), 0.5, GRAY_HEADER),
-            ('ALIGN', (0,0), (-1,-1), 'CENTER'),
-            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0,1), (-1,-1), [colors.white, LIGHT_GRAY]),
-        ]))
-        story.append(price_table)
-    else:
-        story.append(Paragraph("No cost data available.", styles["BodyText"]))
-    # ------------------------------------------------------------------
-    # Conclusions – automatically pick the cheapest material
-    # ------------------------------------------------------------------
-    story.append(Paragraph("Design Recommendations", styles["SectionHeader"]))
-
-    cheapest_mat = _cheapest_material(prices)
-
-    # find the thickness record that belongs to the cheapest material
-    thickness_rec = next((t for t in thickness_results if t["Material"] == cheapest_mat), {})
-
-    recommendations = f"""
-    Based on the comprehensive analysis performed, the following design specifications are recommended:
-
-    • <b>Material:</b> {cheapest_mat} (lowest total cost: ${prices.get(cheapest_mat, {}).get('total_cost', 0):.2f})
-    • <b>Pipe Diameter:</b> {thickness_rec.get('OD_norm_mm', 'N/A')} mm (NPS {thickness_rec.get('NPS', 'N/A')})
-    • <b>Wall Thickness:</b> {thickness_rec.get('t_norm_mm', 'N/A')} mm per {thickness_rec.get('API', 'N/A')} specification
-    • <b>Operating Velocity:</b> {results.get('V', 'N/A'):.3f} m/s (within acceptable limits)
-    • <b>Total System Pressure Drop:</b> {(results.get('dp_linear', 0) + results.get('dp_singular', 0)) / 1e5:.4f} bar
-
-    The design meets all specified constraints and provides optimal performance for the given operating conditions.
+    Only the cell being edited is a widget, so hundreds of rows cost no more
+    than a few. Lists can be pasted (Ctrl+V, e.g. two columns copied from
+    Excel) or imported from a CSV file.
     """
-    story.append(Paragraph(recommendations, styles["BodyText"]))
 
-    # Build the document
-    doc.build(story, onFirstPage=header_footer, onLaterPages=header_footer)
-# ------------------------------------------------------------------
-# 2.  Original data loading
-# ------------------------------------------------------------------
-liquid_df   = pd.read_excel('liquid_properties.xlsx')
-gas_df      = pd.read_excel('gas_properties.xlsx')
-
-# MATERIALS  – 10 columns + Price
-material_df = pd.read_excel('material_properties.xlsx')
-material_df.columns = [
-    "Material", "Specification", "Weld Joint Factor (E)", "SMYS (MPa)",
-    "Roughness (mm)", "Pressure Min", "Pressure Max",
-    "Temperature Min", "Temperature Max", "Price"
-]
-
-# FITTINGS  – 6 columns (Method + Type + K1 + K∞ + Kd + Price)
-fittings_df = pd.read_excel('fittings.xlsx')
-fittings_df.columns = ["Method", "Fitting Type", "K1", "K∞", "Kd", "Price"]
-fittings_df = fittings_df[["Fitting Type", "K1", "K∞", "Kd", "Price"]]  # drop the unused Method column
-fittings_df.columns = fittings_df.columns.str.strip()
-fittings_df.dropna(subset=["Fitting Type"], inplace=True)
-
-# SCHEDULE
-try:
-    sched_df = pd.read_excel("schedule.xlsx")
-    sched_df["Outside diameter (mm)"] = pd.to_numeric(sched_df["Outside diameter (mm)"], errors="coerce")
-    sched_df["Wall thickness (mm)"] = pd.to_numeric(sched_df["Wall thickness (mm)"], errors="coerce")
-    sched_df.dropna(subset=["Outside diameter (mm)", "Wall thickness (mm)"], inplace=True)
-except Exception as e:
-    print(f"❌ Failed to load schedule file: {e}")
+    def __init__(self, master, fitting_types, model=None, height=8):
+        super().__init__(master)
+        self.model = FittingList() if model is None else model
+        self.types = list(fitting_types)
+        self._editor = None
+
+        table = tb.Frame(self)
+        table.pack(fill="both", expand=True)
+        self.tree = tb.Treeview(table, columns=("type", "count"), show="headings",
+                                height=height, selectmode="extended", bootstyle="info")
+        self.tree.heading("type", text="Fitting Type")
+        self.tree.heading("count", text="Number")
+        self.tree.column("type", width=330, anchor="w")
+        self.tree.column("count", width=90, anchor="center")
+        scroll = tb.Scrollbar(table, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scroll.set)
+        self.tree.pack(side="left", fill="both", expand=True)
+        scroll.pack(side="right", fill="y")
+
+        bar = tb.Frame(self)
+        bar.pack(fill="x", pady=(8, 0))
+        for text, style, command in (("Add +", "info-outline", self.add_row),
+                                     ("Remove", "danger-outline", self.remove_selected),
+                                     ("Paste", "secondary-outline", self.paste),
+                                     ("Import CSV…", "secondary-outline", self.import_csv),
+                                     ("Clear", "secondary-outline", self.clear)):
+            tb.Button(bar, text=text, bootstyle=style, command=command).pack(side="left", padx=(0, 6))
+        self.summary = tb.Label(bar, text="", bootstyle="secondary")
+        self.summary.pack(side="right")
+
+        self.tree.bind("<Double-1>", self._begin_edit)
+        self.tree.bind("<Return>", self._begin_edit)
+        self.tree.bind("<Delete>", lambda e: self.remove_selected())
+        self.tree.bind("<Control-v>", lambda e: self.paste())
+        self.refresh()
+
+    # ---- model ↔ view ----
+    def set_rows(self, rows):
+        self.model.clear()
+        self.model.extend(rows)
+        self.refresh()
+
+    def refresh(self):
+        self._end_edit()
+        self.tree.delete(*self.tree.get_children())
+        for i, (typ, n) in enumerate(self.model):
+            self.tree.insert("", "end", iid=str(i), values=(typ, n))
+        self.summary.config(text=f"{len(self.model)} rows · {self.model.total} fittings")
+
+    def _update_row(self, index):
+        typ, n = self.model[index]
+        self.tree.item(str(index), values=(typ, n))
+        self.summary.config(text=f"{len(self.model)} rows · {self.model.total} fittings")
+
+    # ---- commands ----
+    def add_row(self):
+        index = self.model.append(self.types[0] if self.types else "", 1)
+        self.refresh()
+        self.tree.selection_set(str(index))
+        self.tree.see(str(index))
+        self._edit_cell(str(index), "type")
+
+    def remove_selected(self):
+        self.model.remove(int(iid) for iid in self.tree.selection())
+        self.refresh()
+
+    def clear(self):
+        self.set_rows([])
+
+    def _add_table(self, text, source):
+        try:
+            rows, unknown = parse_fitting_table(text, self.types)
+        except ValueError as e:
+            messagebox.showerror(source, str(e))
+            return
+        self.model.extend(rows)
+        self.refresh()
+        if rows:
+            self.tree.see(str(len(self.model) - 1))
+        if unknown:
+            shown = ", ".join(sorted(set(unknown))[:8])
+            messagebox.showwarning(source, f"{len(unknown)} row(s) with unknown fitting types skipped:\n{shown}")
+
+    def paste(self):
+        try:
+            text = self.clipboard_get()
+        except tk.TclError:
+            return
+        self._add_table(text, "Paste Fittings")
 
-# Sanity-check the fittings columns we actually need
-if not {'Fitting Type', 'K1', 'K∞', 'Kd', 'Price'}.issubset(fittings_df.columns):
-    raise ValueError("Fittings file missing required columns.")
+    def import_csv(self):
+        from tkinter import filedialog
 
-# ------------------------------------------------------------------
-# 3.  Helper
-# ------------------------------------------------------------------
-def get_compatible_materials(temp, pressure):
-    out = []
-    for _, r in material_df.iterrows():
+        path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv"), ("Text files", "*.txt"),
+                                                     ("All files", "*.*")])
+        if not path:
+            return
         try:
-            if (float(r["Temperature Min"]) <= temp <= float(r["Temperature Max"]) and
-                    float(r["Pressure Min"]) <= pressure <= float(r["Pressure Max"])):
-                out.append(r["Material"])
-        except Exception:
-            pass
-    return out
+            with open(path, encoding="utf-8-sig", newline="") as fh:
+                text = fh.read()
+        except OSError as e:
+            messagebox.showerror("Import Fittings", str(e))
+            return
+        self._add_table(text, "Import Fittings")
+
+    # ---- in-place editing: one overlay widget on the edited cell ----
+    def _begin_edit(self, event):
+        if event.type == tk.EventType.KeyPress:
+            iid, column = self.tree.focus(), "#1"
+        else:
+            iid, column = self.tree.identify_row(event.y), self.tree.identify_column(event.x)
+        if iid:
+            self._edit_cell(iid, "type" if column == "#1" else "count")
+
+    def _edit_cell(self, iid, column):
+        self._end_edit()
+        self.tree.update_idletasks()
+        bbox = self.tree.bbox(iid, column)
+        if not bbox:
+            return
+        x, y, w, h = bbox
+        typ, n = self.model[int(iid)]
+        if column == "type":
+            widget = tb.Combobox(self.tree, values=self.types)
+            widget.set(typ)
+            widget.bind("<<ComboboxSelected>>", lambda e: self._commit())
+        else:
+            widget = tb.Entry(self.tree, justify="center")
+            widget.insert(0, str(n))
+            widget.select_range(0, "end")
+        widget.place(x=x, y=y, width=w, height=h)
+        widget.focus_set()
+        widget.bind("<Return>", lambda e: self._commit())
+        widget.bind("<Escape>", lambda e: self._end_edit())
+        widget.bind("<FocusOut>", lambda e: self._commit())
+        self._editor = (widget, int(iid), column)
+
+    def _commit(self):
+        if self._editor is None:
+            return
+        widget, index, column = self._editor
+        value = widget.get().strip()
+        try:
+            if column == "type":
+                self.model.set(index, typ=value)
+            else:
+                self.model.set(index, count=value)
+        except ValueError:
+            self.bell()                         # keep the old value
+        self._end_edit()
+        self._update_row(index)
+
+    def _end_edit(self):
+        if self._editor is not None:
+            widget = self._editor[0]
+            self._editor = None
+            widget.destroy()
 
 
 # ------------------------------------------------------------------
-# 4.  Main application
+# 5.  Main application
 # ------------------------------------------------------------------
 class PipeDesignOptimizerApp:
     def __init__(self, root):
         self.root = root
+        self.startup_timer = startup.StartupTimer(_T_START)
+        startup.load_catalogues()               # no-op if __main__ already started it
         self.root.title("Pipe Design Optimizer")
         self.root.state("zoomed")
         # 1. Build the paths
@@ -628,17 +298,66 @@ class PipeDesignOptimizerApp:
 
 
         self.style = tb.Style("cyborg")
+        self.images = ImageCache()
+        self._bg = None                         # (label, path, size) of the current background
+        self._resize_job = None
+        self.root.bind("<Configure>", self._on_root_configure, add="+")
         self.compatible_materials = []
-        self.fitting_widgets = []
+        self.fittings = FittingList()
+        self.two_phase = None                   # TwoPhaseFlow of a two-phase case
+        self.rheology = None                    # (n, K, tau0) of a non-Newtonian liquid
         self.calculation_results = {}
         self.pressure_drop_results = {}
+        self.pressure_drop_sweeps = {}
         self.project_name = ""
 
-        # File paths
-        self.liquid_file_path = 'liquid_properties.xlsx'
-        self.gas_file_path = 'gas_properties.xlsx'
-
         self.create_first_page()
+        self.root.after_idle(self._first_frame_drawn)
+
+    # ----------------------------------------------------------
+    # Start-up: first frame and background catalogue loading
+    # ----------------------------------------------------------
+    def _first_frame_drawn(self):
+        self.root.update_idletasks()
+        self.startup_timer.mark("first frame")
+        try:
+            import pyi_splash                       # PyInstaller splash screen, if any
+            pyi_splash.close()
+        except ImportError:
+            pass
+        self._poll_catalogues()
+
+    def _poll_catalogues(self):
+        """Show the loader state on the first page until the catalogues are ready."""
+        future = startup.load_catalogues()
+        if not future.done():
+            self.root.after(50, self._poll_catalogues)
+            return
+        self.startup_timer.mark("catalogues ready")
+        self.startup_timer.report()
+        probe = os.environ.get(startup.PROBE_ENV)
+        if probe:                                   # cold-start measurement: record and quit
+            self.startup_timer.write(probe)
+            self.root.after_idle(self.root.destroy)
+            return
+        if future.exception() is not None:
+            text, style = f"❌ Failed to load the catalogues: {future.exception()}", "danger"
+        else:
+            text, style = "✓ Catalogues loaded", "success"
+        try:
+            self.catalogue_status.config(text=text, bootstyle=style)
+        except (AttributeError, tk.TclError):
+            pass                                    # first page already left
+
+    def _wait_for_catalogues(self):
+        """Block (busy cursor) until the background load is done; normally it already is."""
+        if not startup.load_catalogues().done():
+            self.root.config(cursor="watch")
+            self.root.update_idletasks()
+        try:
+            return _use_catalogues()
+        finally:
+            self.root.config(cursor="")
 
     # ----------------------------------------------------------
     # First page – ask project name
@@ -704,6 +423,18 @@ class PipeDesignOptimizerApp:
             width=20
         )
         start_button.pack(pady=20)
+
+        tb.Button(
+            content_frame,
+            text="📂 Open Project…",
+            bootstyle="secondary-outline",
+            command=self.open_project,
+            width=20
+        ).pack()
+
+        self.catalogue_status = tb.Label(content_frame, text="⏳ Loading catalogues…",
+                                         font=("Arial", 9), bootstyle="secondary")
+        self.catalogue_status.pack(pady=(15, 0))
         
         # Add enter key binding and focus (with error handling)
         def safe_enter_handler(event):
@@ -732,6 +463,7 @@ class PipeDesignOptimizerApp:
     # Second page – input form
     # ----------------------------------------------------------
     def create_second_page(self):
+        self._wait_for_catalogues()
         self.clear_root()
         bg_file = resource_path("bg_eppm.png")
         print("Looking for background at:", bg_file)
@@ -772,7 +504,7 @@ class PipeDesignOptimizerApp:
         phase_frame.grid(row=0, column=1, sticky="ew")
         self.phase_var = tb.StringVar(value="Liquid")
         self.phase_cb = tb.Combobox(phase_frame, textvariable=self.phase_var, font=("Helvetica", 13),
-                                    width=20, state="readonly", values=["Liquid", "Gas"])
+                                    width=20, state="readonly", values=["Liquid", "Gas", "Two-phase"])
         self.phase_cb.grid(row=0, column=0, padx=(0, 5), sticky="w")
         tb.Button(phase_frame, text="+", bootstyle="success", width=3,
                   command=self.open_add_fluid_window).grid(row=0, column=1)
@@ -784,6 +516,26 @@ class PipeDesignOptimizerApp:
         self.fluid_cb = tb.Combobox(section2, textvariable=self.fluid_var, font=("Helvetica", 13),
                                     width=25, state="readonly")
         self.fluid_cb.grid(row=1, column=1, pady=5, sticky="ew")
+
+        # Two-phase mixture (shown for the "Two-phase" phase only)
+        from engine.twophase import CORRELATIONS, DEFAULT_CORRELATION
+        self.two_phase_frame = tb.Frame(section2)
+        self.two_phase_frame.grid_columnconfigure(1, weight=1)
+        tb.Label(self.two_phase_frame, text="Gas:", font=("Helvetica", 14)).grid(row=0, column=0, sticky="w", pady=5)
+        self.gas_var = tb.StringVar()
+        self.gas_cb = tb.Combobox(self.two_phase_frame, textvariable=self.gas_var, font=("Helvetica", 13),
+                                  width=25, state="readonly")
+        self.gas_cb.grid(row=0, column=1, pady=5, sticky="ew")
+        tb.Label(self.two_phase_frame, text="Gas Fraction (0–1):", font=("Helvetica", 14)).grid(
+            row=1, column=0, sticky="w", pady=5, padx=(0, 10))
+        self.gas_fraction_entry = tb.Entry(self.two_phase_frame, font=("Helvetica", 13), width=20)
+        self.gas_fraction_entry.grid(row=1, column=1, pady=5, sticky="ew")
+        tb.Label(self.two_phase_frame, text="Correlation:", font=("Helvetica", 14)).grid(
+            row=2, column=0, sticky="w", pady=5)
+        self.correlation_var = tb.StringVar(value=DEFAULT_CORRELATION)
+        tb.Combobox(self.two_phase_frame, textvariable=self.correlation_var, font=("Helvetica", 13),
+                    width=25, values=list(CORRELATIONS), state="readonly").grid(row=2, column=1, pady=5, sticky="ew")
+        self.two_phase_frame.grid(row=3, column=0, columnspan=2, sticky="ew")
         self.update_fluid_list()
 
         # Location
@@ -811,6 +563,18 @@ class PipeDesignOptimizerApp:
             self.entries[key] = tb.Entry(section3, font=("Helvetica", 13), width=20)
             self.entries[key].grid(row=i, column=1, pady=5, sticky="ew")
 
+        # Velocity limit model; with API RP 14E or Custom, "Max Velocity" is an optional cap
+        row = len(entry_keys)
+        tb.Label(section3, text="Velocity Limit:", font=("Helvetica", 14)).grid(
+            row=row, column=0, sticky="w", pady=5, padx=5)
+        self.velocity_limit_var = tb.StringVar(value=next(iter(VELOCITY_LIMITS)))
+        tb.Combobox(section3, textvariable=self.velocity_limit_var, font=("Helvetica", 13), width=25,
+                    values=list(VELOCITY_LIMITS), state="readonly").grid(row=row, column=1, pady=5, sticky="ew")
+        tb.Label(section3, text="C Factor / Expression:", font=("Helvetica", 14)).grid(
+            row=row + 1, column=0, sticky="w", pady=5, padx=5)
+        self.velocity_parameter_entry = tb.Entry(section3, font=("Helvetica", 13), width=20)
+        self.velocity_parameter_entry.grid(row=row + 1, column=1, pady=5, sticky="ew")
+
         # Results
         self.result_label = tb.Label(frm, text="", font=("Helvetica", 12), bootstyle="secondary")
         self.result_label.grid(row=4, column=0, columnspan=2, pady=10)
@@ -830,6 +594,9 @@ class PipeDesignOptimizerApp:
     # ----------------------------------------------------------
     def open_add_fluid_window(self):
         phase = self.phase_var.get()
+        if phase not in ("Liquid", "Gas"):
+            messagebox.showinfo("Add Fluid", "Choose Liquid or Gas to add a catalogue fluid.")
+            return
         add_window = tb.Toplevel(self.root)
         add_window.title(f"Add New {phase}")
         add_window.geometry("500x600")
@@ -891,40 +658,55 @@ class PipeDesignOptimizerApp:
                     entry.bind('<FocusIn>', lambda *_: on_in())
                     entry.bind('<FocusOut>', lambda *_: on_out())
 
-    # Add fluid logic
-    def add_fluid():
-        new_data = {}
-        for col, entry in entries.items():
-            val = entry.get().strip()
-            if val.startswith("e.g.,") or not val:
-                if col == columns[0]:  # Name column is mandatory
-                    messagebox.showerror("Error", f"{col} is required!")
+        # Add fluid logic
+        def add_fluid():
+            global liquid_df, gas_df
+            new_data = {}
+            for col, entry in entries.items():
+                val = entry.get().strip()
+                if val.startswith("e.g.,") or not val:
+                    if col == columns[0]:  # Name column is mandatory
+                        messagebox.showerror("Error", f"{col} is required!")
+                        return
+                    new_data[col] = ""
+                else:
+                    new_data[col] = val
+
+            if not new_data.get(columns[0]):
+                messagebox.showerror("Error", f"{columns[0]} is required!")
+                return
+
+            if _catalogues.db is not None:
+                # one-row insert in the catalogue database
+                try:
+                    _catalogues.db.add_fluid(phase, new_data)
+                except ValueError as e:
+                    messagebox.showerror("Error", str(e))
+                    return
+                except sqlite3.Error as e:
+                    messagebox.showerror("Error", f"Could not save the {phase.lower()}: {e}")
                     return
-                new_data[col] = ""
+                if phase == "Liquid":
+                    liquid_df = _catalogues.liquid_df = _catalogues.db.dataframe("liquids")
+                else:
+                    gas_df = _catalogues.gas_df = _catalogues.db.dataframe("gases")
+            elif phase == "Liquid":
+                if new_data[columns[0]].lower() in liquid_df[columns[0]].str.lower().tolist():
+                    messagebox.showerror("Error", "Liquid already exists!")
+                    return
+                liquid_df.loc[len(liquid_df)] = new_data
+                liquid_df.to_excel(_catalogues.liquid_path, index=False)
             else:
-                new_data[col] = val
-
-        if not new_data.get(columns[0]):
-            messagebox.showerror("Error", f"{columns[0]} is required!")
-            return
-
-        if phase == "Liquid":
-            if new_data[columns[0]].lower() in liquid_df[columns[0]].str.lower().tolist():
-                messagebox.showerror("Error", "Liquid already exists!")
-                return
-            liquid_df.loc[len(liquid_df)] = new_data
-            liquid_df.to_excel(self.liquid_file_path, index=False)
-        else:
-            if new_data[columns[0]].lower() in gas_df[columns[0]].str.lower().tolist():
-                messagebox.showerror("Error", "Gas already exists!")
-                return
-            gas_df.loc[len(gas_df)] = new_data
-            gas_df.to_excel(self.gas_file_path, index=False)
+                if new_data[columns[0]].lower() in gas_df[columns[0]].str.lower().tolist():
+                    messagebox.showerror("Error", "Gas already exists!")
+                    return
+                gas_df.loc[len(gas_df)] = new_data
+                gas_df.to_excel(_catalogues.gas_path, index=False)
 
-        self.update_fluid_list()
-        self.fluid_var.set(new_data[columns[0]])
-        messagebox.showinfo("Success", f"{phase} '{new_data[columns[0]]}' added!")
-        add_window.destroy()
+            self.update_fluid_list()
+            self.fluid_var.set(new_data[columns[0]])
+            messagebox.showinfo("Success", f"{phase} '{new_data[columns[0]]}' added!")
+            add_window.destroy()
 
         # Action buttons
         btn_frame = tb.Frame(scroll_frame)
@@ -937,12 +719,15 @@ class PipeDesignOptimizerApp:
     # Process inputs & velocity plot
     # ----------------------------------------------------------
     def process_input(self):
+        import matplotlib.pyplot as plt
+        from engine.hydraulics import velocity_critical_diameter
+        from engine.plots import velocity_figure
+
         try:
             Q = float(self.entries["flowrate"].get())
             L = float(self.entries["length"].get())
             self.selected_fluid = self.fluid_var.get()
             self.selected_phase = self.phase_var.get()
-            vmax = float(self.entries["velocity"].get())
             temp = float(self.entries["temperature"].get())
             pres = float(self.entries["pressure"].get())
             self.design_pressure = float(self.entries["design_pressure"].get()) * 1e5
@@ -950,21 +735,43 @@ class PipeDesignOptimizerApp:
         except ValueError:
             self.result_label.config(text="⚠️ Please enter valid numbers.")
             return
+        if not (Q > 0 and L > 0):
+            self.result_label.config(text="⚠️ Flowrate and length must be positive.")
+            return
+        try:
+            self.velocity_case = self._velocity_case()
+        except ValueError as e:
+            self.result_label.config(text=f"⚠️ {e}")
+            return
 
         # Fluid properties
+        self.two_phase = self.rheology = None
         try:
-            if self.selected_phase == "Liquid":
-                props = liquid_df[liquid_df["Liquid"] == self.selected_fluid].iloc[0]
-                self.rho = float(str(props["Density (kg/mÂ³)"]).replace("Â", ""))
-                self.mu = float(str(props["Viscosity (mPaÂ·s)"]).replace("Â", "")) * 1e-3
+            if self.selected_phase == "Two-phase":
+                from engine.twophase import TwoPhaseFlow
+                try:
+                    gas_fraction = float(self.gas_fraction_entry.get())
+                except ValueError:
+                    raise ValueError("Enter a gas fraction between 0 and 1.") from None
+                self.two_phase = TwoPhaseFlow.from_case(
+                    dict(fluid=self.selected_fluid, gas=self.gas_var.get(), gas_fraction=gas_fraction,
+                         correlation=self.correlation_var.get()), _use_catalogues())
+                self.rho, self.mu = self.two_phase.rho, self.two_phase.mu
             else:
-                props = gas_df[gas_df["Gas"] == self.selected_fluid].iloc[0]
-                self.rho = float(str(props["Density (kg/m³)"]).replace("Â", ""))
-                self.mu = float(str(props["Viscosity (μPa·s)"])) * 1e-6
+                self.rho, self.mu = fluid_properties(self.selected_phase, self.selected_fluid)
+                if self.selected_phase == "Liquid":
+                    self.rheology = fluid_rheology(self.selected_fluid)
         except Exception as e:
             messagebox.showerror("Fluid Error", str(e))
             return
 
+        from engine.velocity import velocity_limit
+        try:
+            vmax = velocity_limit(self.velocity_case, self.rho, self.mu)
+        except ValueError as e:
+            self.result_label.config(text=f"⚠️ {e}")
+            return
+
         # Compatible materials
         self.compatible_materials = get_compatible_materials(temp, pres)
         if not self.compatible_materials:
@@ -977,26 +784,14 @@ class PipeDesignOptimizerApp:
         self.pd_btn.config(state="normal")
 
         # Critical diameter for velocity
-        Q_m3s = Q / 3600
-        self.dcrit_velocity = (4 * Q_m3s / (np.pi * vmax)) ** 0.5
+        self.dcrit_velocity = velocity_critical_diameter(Q, vmax)
 
         # Velocity vs diameter plot
-        diameters = np.linspace(0.008, 2.05, 1000)
-        velocities = Q_m3s / ((np.pi * diameters ** 2) / 4)
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.plot(diameters, velocities, label="Velocity vs Diameter", color="cyan", linewidth=2)
-        ax.axhline(vmax, color="red", linestyle="--", linewidth=2, label=f"Max Velocity = {vmax:.2f} m/s")
-        ax.axvline(self.dcrit_velocity, color="green", linestyle="--", linewidth=2,
-                   label=f"Critical Diameter = {self.dcrit_velocity:.4f} m")
-        ax.set_xlabel("Diameter (m)")
-        ax.set_ylabel("Velocity (m/s)")
-        ax.set_title("Velocity vs Diameter")
-        ax.legend()
-        ax.grid(True, alpha=0.3)
+        velocity_figure(Q, vmax, self.dcrit_velocity)
 
         
         # Save immediately before showing
-        img_folder = Path(__file__).parent / "report_imgs"
+        img_folder = Path(resource_path("report_imgs"))
         img_folder.mkdir(exist_ok=True)
         plt.savefig(img_folder / "velocity_vs_diameter.png", dpi=150, bbox_inches="tight")
         plt.show()
@@ -1008,6 +803,28 @@ class PipeDesignOptimizerApp:
         self.temperature = temp
         self.operating_pressure = pres
 
+    def _velocity_case(self):
+        """Velocity-limit fields of the form, validated (see engine.velocity); raises ValueError."""
+        from engine.velocity import parse_velocity_limit
+
+        model = VELOCITY_LIMITS[self.velocity_limit_var.get()]
+        velocity, parameter = self.entries["velocity"].get().strip(), self.velocity_parameter_entry.get().strip()
+        fields = {"velocity": velocity or None, "velocity_limit": model}
+        if model == "api-rp-14e":
+            fields["c_factor"] = parameter or None
+        elif model == "custom":
+            fields["velocity_expression"] = parameter
+        elif not velocity:
+            raise ValueError("Enter a max velocity.")
+        fields = parse_velocity_limit(fields)
+        try:
+            fields["velocity"] = float(fields["velocity"])
+        except ValueError:
+            raise ValueError("Max velocity must be a number.") from None
+        if not fields["velocity"] > 0:
+            raise ValueError("Max velocity must be positive.")
+        return fields
+
     # ----------------------------------------------------------
     # Pressure-drop page
     # ----------------------------------------------------------
@@ -1025,8 +842,17 @@ class PipeDesignOptimizerApp:
         tb.Label(main_frame, text="Pressure Drop Calculation", font=("Helvetica", 24, "bold"),
                  bootstyle="primary").grid(row=0, column=0, columnspan=4, pady=(0, 20))
 
-        info = (f"Fluid: {self.selected_fluid} | ρ={self.rho:.1f} kg/m³ | μ={self.mu:.5f} Pa·s\n"
-                f"Flowrate: {self.flowrate} m³/h | Length: {self.pipe_length} m | Max Velocity: {self.vmax} m/s")
+        fluid = self.two_phase.label() if self.two_phase else self.selected_fluid
+        if self.rheology:
+            from engine.rheology import model_name
+            n, K, tau0 = self.rheology
+            fluid += (f" (Bingham: τ0={tau0:g} Pa, μp={K:g} Pa·s)" if model_name(self.rheology) == "Bingham"
+                      else f" ({model_name(self.rheology)}: n={n:g}, K={K:g} Pa·sⁿ)")
+        from engine.velocity import describe
+        limit = "" if "velocity_limit" not in self.velocity_case else f" ({describe(self.velocity_case)})"
+        info = (f"Fluid: {fluid} | ρ={self.rho:.1f} kg/m³ | μ={self.mu:.5f} Pa·s\n"
+                f"Flowrate: {self.flowrate} m³/h | Length: {self.pipe_length} m | "
+                f"Max Velocity: {self.vmax:.3g} m/s{limit}")
         tb.Label(main_frame, text=info, font=("Helvetica", 14), bootstyle="info").grid(
             row=1, column=0, columnspan=4, pady=(0, 20))
 
@@ -1038,20 +864,16 @@ class PipeDesignOptimizerApp:
         tb.Label(main_frame, text="Fittings Configuration:", font=("Helvetica", 16, "bold"),
                  bootstyle="warning").grid(row=3, column=0, columnspan=4, pady=(20, 10), sticky="w")
 
-        headers = ["Fitting Type:", "Number:"]
-        for i, h in enumerate(headers):
-            tb.Label(main_frame, text=h, font=("Helvetica", 12, "bold")).grid(
-                row=4, column=i, sticky="w", padx=(20 if i == 0 else 0, 10))
-
-        self.fitting_widgets = []
-        self.add_fitting_row(main_frame, 5)
-
-        tb.Button(main_frame, text="Add Fitting +", style="info-outline",
-                  command=lambda: self.add_new_fitting_row(main_frame), width=15).grid(
-            row=100, column=0, columnspan=2, pady=20, sticky="w", padx=(20, 0))
+        self.fittings.clear()
+        self.fittings_editor = FittingsEditor(main_frame, fittings_df["Fitting Type"].tolist(),
+                                              self.fittings)
+        self.fittings_editor.grid(row=4, column=0, columnspan=4, sticky="ew", padx=(20, 0), pady=(0, 10))
 
         tb.Button(main_frame, text="Calculate Pressure Drop", bootstyle="success-outline",
-                  width=25, command=self.calculate_pressure_drop).grid(row=101, column=0, columnspan=4, pady=20)
+                  width=25, command=self.calculate_pressure_drop).grid(row=101, column=0, columnspan=2, pady=20)
+        single_phase = "disabled" if self.two_phase else "normal"   # Monte Carlo and sweep: single phase
+        tb.Button(main_frame, text="Uncertainty (P50/P90)", bootstyle="warning-outline", width=25,
+                  command=self.run_uncertainty, state=single_phase).grid(row=101, column=2, columnspan=2, pady=20)
 
         self.result_label = tb.Label(main_frame, text="", font=("Helvetica", 12), bootstyle="info")
         self.result_label.grid(row=102, column=0, columnspan=4, pady=20)
@@ -1062,19 +884,32 @@ class PipeDesignOptimizerApp:
         tb.Button(main_frame, text="Thickness & Schedule Selection", bootstyle="primary-outline",
                   command=self.create_thickness_schedule_page, width=30).grid(row=104, column=0, columnspan=4, pady=10)
 
+        tb.Button(main_frame, text="Design Space Explorer", bootstyle="info-outline", state=single_phase,
+                  command=self.open_design_space_explorer, width=30).grid(row=105, column=0, columnspan=4, pady=10)
+
+        tb.Button(main_frame, text="Pareto Explorer", bootstyle="info-outline",
+                  command=self.open_pareto_explorer, width=30).grid(row=106, column=0, columnspan=4, pady=10)
+
     # ----------------------------------------------------------
     # Fitting utilities
     # ----------------------------------------------------------
-    def add_fitting_row(self, parent, row_num):
-        cb = tb.Combobox(parent, font=("Helvetica", 12), width=30,
-                         values=fittings_df["Fitting Type"].tolist(), state="readonly")
-        cb.grid(row=row_num, column=0, padx=(20, 10), pady=5, sticky="w")
-        ent = tb.Entry(parent, font=("Helvetica", 12), width=15)
-        ent.grid(row=row_num, column=1, padx=(0, 10), pady=5, sticky="w")
-        self.fitting_widgets.append((cb, ent))
-
-    def add_new_fitting_row(self, parent):
-        self.add_fitting_row(parent, 5 + len(self.fitting_widgets))
+    def _fitting_entries(self):
+        """(type, count) pairs from the fittings table."""
+        return self.fittings.entries()
+
+    def _case(self, dp_max):
+        """The current inputs as a case (see engine.design), with ``dp_max`` in bar."""
+        case = dict(project_name=self.project_name, phase=self.selected_phase,
+                    fluid=self.selected_fluid, flowrate=self.flowrate, length=self.pipe_length,
+                    velocity=self.vmax, temperature=self.temperature,
+                    pressure=self.operating_pressure, design_pressure=self.design_pressure / 1e5,
+                    corrosion_allowance=self.corrosion_allowance,
+                    location=self.location_var.get(), dp_max=dp_max,
+                    fittings=self._fitting_entries())
+        if self.two_phase:
+            case.update(gas=self.two_phase.gas, gas_fraction=self.two_phase.gas_fraction,
+                        correlation=self.two_phase.correlation)
+        return case
 
     # ----------------------------------------------------------
     # Pressure-drop calculation
@@ -1084,6 +919,8 @@ class PipeDesignOptimizerApp:
     # ----------------------------------------------------------
     def calculate_pressure_drop(self):
         """Shows a tiny modal progress window and starts the worker."""
+        from engine.hydraulics import diameter_grid, resolve_fittings
+
         self.progress = tb.Toplevel(self.root)
         self.progress.title("Calculating…")
         self.progress.geometry("300x120")
@@ -1104,12 +941,15 @@ class PipeDesignOptimizerApp:
         # gather the input values **before** the thread
         try:
             dp_max = float(self.dp_max_entry.get()) * 1e5
+            if not dp_max > 0:
+                raise ValueError
         except ValueError:
-            self.result_label.config(text="⚠️ Enter valid max pressure drop.")
+            self.result_label.config(text="⚠️ Enter a positive max pressure drop.")
             self.progress.destroy()
             return
 
-        # pack what the thread needs into a dict
+        # pack what the thread needs into a dict (widgets are read here,
+        # never from the worker)
         job = dict(
             dp_max=dp_max,
             Q=self.flowrate,
@@ -1117,9 +957,11 @@ class PipeDesignOptimizerApp:
             rho=self.rho,
             mu=self.mu,
             vmax=self.vmax,
-            diameters=np.linspace(0.008, 2.05, 1000),
+            diameters=diameter_grid(),
             compatible_materials=self.compatible_materials,
-            fitting_widgets=self.fitting_widgets,
+            fittings=resolve_fittings(fittings_df, self._fitting_entries()),
+            two_phase=self.two_phase,
+            rheology=self.rheology,
         )
 
         # launch the worker
@@ -1135,119 +977,41 @@ class PipeDesignOptimizerApp:
     # ----------------------------------------------------------
     def _pressure_drop_worker(self, job):
         """Heavy calculation (no GUI calls)."""
+        import matplotlib
+        from engine.hydraulics import material_hydraulics
+        from engine.plots import pressure_drop_figure, save_figure
+
+        diameters = job["diameters"]
+        sweeps = {}
         try:
-            diameters = np.linspace(0.008, 2.05, 1000)   # <- ADD THIS LINE
             results = []
             calc_results = {}
 
-            for mat in job["compatible_materials"]:
-                row = material_df[material_df["Material"] == mat].iloc[0]
-                k = float(str(row["Roughness (mm)"]).replace("Â", "")) * 1e-3
-                total_deltas = []
-
-                for D in diameters:
-                    V = (job["Q"] / 3600) / ((np.pi * D ** 2) / 4)
-                    if V > job["vmax"]:
-                        total_deltas.append(np.nan)
-                        continue
-                    Re = job["rho"] * V * D / job["mu"]
-                    lam = 64 / Re if Re < 2300 else self.colebrook(Re, D, k)
-                    H = V ** 2 / (2 * 9.81)
-                    dP_lin = lam * (job["L"] / D) * job["rho"] * 9.81 * H
-
-                    dP_sing = 0
-                    for cb, e in job["fitting_widgets"]:
-                        typ = cb.get().strip()
-                        if not typ:
-                            continue
-                        try:
-                            n = int(e.get() or 0)
-                        except ValueError:
-                            n = 0
-                        if n > 0:
-                            frow = fittings_df[
-                                fittings_df["Fitting Type"].str.strip().str.lower() == typ.strip().lower()]
-                            if frow.empty:
-                                continue
-                            frow = frow.iloc[0]
-                            K1, Kinf, Kd = float(frow["K1"]), float(frow["K∞"]), float(frow["Kd"])
-                            K = Kinf + (K1 - Kinf) * (Re ** (-1 / Kd))
-                            dP_sing += n * K * job["rho"] * V ** 2 / 2
-                    total_deltas.append(dP_lin + dP_sing)
-
-                td = np.array(total_deltas)
-                valid = (td <= job["dp_max"]) & (~np.isnan(td))
-                idx = np.where(valid)[0]
-                dcrit = diameters[idx[0]] if len(idx) else None
+            # materials are evaluated on the shared thread pool, merged in order
+            materials = job["compatible_materials"]
+            per_material = material_hydraulics([material_roughness(mat) for mat in materials],
+                                               job["Q"], job["L"], job["rho"], job["mu"],
+                                               job["vmax"], job["fittings"], job["dp_max"],
+                                               diameters, two_phase=job["two_phase"],
+                                               rheology=job["rheology"])
+            for mat, (td, dcrit, calc) in zip(materials, per_material):
+                sweeps[mat] = td
                 results.append((mat, dcrit))
-
                 if dcrit:
-                    self.store_detailed_calculation(mat, dcrit,
-                                                    job["Q"], job["L"],
-                                                    job["rho"], job["mu"])
-                    calc_results[mat] = self.calculation_results[mat]
+                    calc_results[mat] = calc
 
-            payload = dict(results=results, calc_results=calc_results)
+            payload = dict(results=results, calc_results=calc_results,
+                           sweeps=sweeps, diameters=diameters)
 
         except Exception as exc:
             payload = dict(error=str(exc))
 
         # ---- generate plot in the worker ----
         matplotlib.use('Agg')          # headless backend
-        import matplotlib.pyplot as plt
-
-        fig, ax = plt.subplots(figsize=(10, 7))
-        for mat, dcrit in results:
-            row = material_df[material_df["Material"] == mat].iloc[0]
-            k = float(str(row["Roughness (mm)"]).replace("Â", "")) * 1e-3
-            total_deltas = []
-
-            for D in np.linspace(0.008, 2.05, 1000):
-                V = (self.flowrate / 3600) / ((np.pi * D ** 2) / 4)
-                if V > self.vmax:
-                    total_deltas.append(np.nan)
-                    continue
-                Re = self.rho * V * D / self.mu
-                lam = 64 / Re if Re < 2300 else self.colebrook(Re, D, k)
-                H = V ** 2 / (2 * 9.81)
-                dP_lin = lam * (self.pipe_length / D) * self.rho * 9.81 * H
-
-                dP_sing = 0
-                for cb, e in self.fitting_widgets:
-                    typ = cb.get().strip()
-                    if not typ:
-                        continue
-                    try:
-                        n = int(e.get() or 0)
-                    except ValueError:
-                        n = 0
-                    if n > 0:
-                        frow = fittings_df[
-                            fittings_df["Fitting Type"].str.strip().str.lower() == typ.strip().lower()]
-                        if frow.empty:
-                            continue
-                        frow = frow.iloc[0]
-                        K1, Kinf, Kd = float(frow["K1"]), float(frow["K∞"]), float(frow["Kd"])
-                        K = Kinf + (K1 - Kinf) * (Re ** (-1 / Kd))
-                        dP_sing += n * K * self.rho * V ** 2 / 2
-                total_deltas.append(dP_lin + dP_sing)
-
-            ax.plot(np.linspace(0.008, 2.05, 1000),
-                    np.array(total_deltas) / 1e5,
-                    label=mat, linewidth=2)
-
-        ax.axhline(float(self.dp_max_entry.get()), color="red",
-                   linestyle="--", linewidth=2, label="ΔP max")
-        ax.set_xlabel("Diameter (m)")
-        ax.set_ylabel("Total ΔP (bar)")
-        ax.set_title("Total Pressure Drop vs Diameter")
-        ax.legend()
-        ax.grid(True, alpha=0.3)
-        img_folder = Path(__file__).parent / "report_imgs"
+        fig = pressure_drop_figure(diameters, sweeps, job["dp_max"])
+        img_folder = Path(resource_path("report_imgs"))
         img_folder.mkdir(exist_ok=True)
-        plt.savefig(img_folder / "pressure_drop_vs_diameter.png",
-                    dpi=150, bbox_inches="tight")
-        plt.close(fig)
+        save_figure(fig, img_folder / "pressure_drop_vs_diameter.png")
 
         self.root.after(0, self._calculation_done, payload)
 
@@ -1262,12 +1026,13 @@ class PipeDesignOptimizerApp:
             self.result_label.config(text=f"Error:\n{payload['error']}")
             return
 
-        results = payload["results"]
         self.calculation_results.update(payload["calc_results"])
+        self.pressure_drop_sweeps = payload["sweeps"]
+        self.diameters = payload["diameters"]
+        self._show_pressure_drop_results(payload["results"])
 
-
-
-        # ---- update GUI ----
+    def _show_pressure_drop_results(self, results):
+        """Store and display (material, dcrit) pairs."""
         self.pressure_drop_results = {}
         for mat, dcrit in results:
             self.pressure_drop_results[mat] = {
@@ -1281,48 +1046,230 @@ class PipeDesignOptimizerApp:
         self.result_label.config(text=text)
         self.show_material_buttons()
 
+    # ----------------------------------------------------------
+    # Monte Carlo uncertainty of dcrit
+    # ----------------------------------------------------------
+    def run_uncertainty(self):
+        """Sample flowrate, viscosity and roughness; show P10/P50/P90 dcrit per material."""
+        if self.two_phase:
+            self.result_label.config(text="⚠️ Uncertainty is not available for two-phase lines.")
+            return
+        try:
+            dp_max = float(self.dp_max_entry.get())
+        except ValueError:
+            self.result_label.config(text="⚠️ Enter valid max pressure drop.")
+            return
+        case = self._case(dp_max)
+        self.result_label.config(text=f"⏳ Sampling {UNCERTAINTY_SAMPLES:,} cases…")
 
+        def work():
+            from engine.uncertainty import monte_carlo
+            try:
+                payload = monte_carlo(case, UNCERTAINTY_SAMPLES, workers=None,
+                                      catalogues=_catalogues, materials=self.compatible_materials)
+            except Exception as exc:
+                payload = dict(error=str(exc))
+            self.root.after(0, self._uncertainty_done, payload)
 
+        threading.Thread(target=work, daemon=True).start()
 
-    
-    def store_detailed_calculation(self, mat, dcrit, Q, L, rho, mu):
-        V = (Q / 3600) / ((np.pi * dcrit ** 2) / 4)
-        Re = rho * V * dcrit / mu
-        row = material_df[material_df["Material"] == mat].iloc[0]
-        k = float(str(row["Roughness (mm)"]).replace("Â", "")) * 1e-3
-        lam = 64 / Re if Re < 2300 else self.colebrook(Re, dcrit, k)
-        H = V ** 2 / (2 * 9.81)
-        dP_lin = lam * (L / dcrit) * rho * 9.81 * H
-        dP_sing = 0
-        details = []
-        for cb, e in self.fitting_widgets:
-            typ = cb.get().strip()
-            if not typ:
-                continue
-            try:
-                n = int(e.get() or 0)
-            except ValueError:
-                n = 0
-            if n > 0:
-                frow = fittings_df[fittings_df["Fitting Type"].str.strip().str.lower() == typ.strip().lower()]
-                if frow.empty:
-                    continue   # skip unknown / mistyped fittings
-                frow = frow.iloc[0]
-                K1, Kinf, Kd = float(frow["K1"]), float(frow["K∞"]), float(frow["Kd"])
-                K = Kinf + (K1 - Kinf) * (Re ** (-1 / Kd))
-                dp_part = n * K * rho * V ** 2 / 2
-                dP_sing += dp_part
-                details.append((typ, n, K))
-        self.calculation_results[mat] = {
-            'diameter': dcrit,
-            'velocity': V,
-            'reynolds': Re,
-            'lambda': lam,
-            'H': H,
-            'dp_linear': dP_lin,
-            'dp_singular': dP_sing,
-            'details': details
+    def _uncertainty_done(self, payload):
+        if payload.get("error"):
+            self.result_label.config(text=f"Error:\n{payload['error']}")
+            return
+        self.result_label.config(text="")
+
+        win = tb.Toplevel(self.root)
+        win.title(f"Critical Diameter Uncertainty — {payload['samples']:,} samples")
+        win.geometry("820x420")
+        cols = ("Material", "P10 (mm)", "P50 (mm)", "P90 (mm)", "Feasible", "Most sensitive to")
+        tree = tb.Treeview(win, columns=cols, show="headings", bootstyle="info")
+        for c in cols:
+            tree.heading(c, text=c)
+            tree.column(c, width=200 if c in ("Material", "Most sensitive to") else 90, anchor="center")
+        mm = lambda v: f"{v * 1000:.1f}" if v is not None else "—"
+        for mat, r in payload["materials"].items():
+            name, corr = r["sensitivity"][0]
+            tree.insert("", "end", values=(mat, mm(r["P10"]), mm(r["P50"]), mm(r["P90"]),
+                                           f"{r['feasible']:.0%}", f"{name} (ρs = {corr:+.2f})"))
+        tree.pack(fill="both", expand=True, padx=10, pady=10)
+        spec = ", ".join(f"{k}: {' '.join(str(a) for a in v)}" for k, v in payload["uncertainty"].items())
+        tb.Label(win, text=f"Input factors — {spec}", font=("Segoe UI", 9),
+                 bootstyle="secondary").pack(pady=(0, 10))
+
+    # ----------------------------------------------------------
+    # Design-space explorer (flowrate × length × ΔP max × material)
+    # ----------------------------------------------------------
+    def open_design_space_explorer(self):
+        """Sweep dcrit over ranges around the current inputs and show it as a heatmap."""
+        if self.two_phase:
+            self.result_label.config(text="⚠️ The design space is not available for two-phase lines.")
+            return
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from engine.plots import design_space_figure
+        from engine.sweep import parametric_sweep
+
+        win = tb.Toplevel(self.root)
+        win.title("Design Space Explorer")
+        win.geometry("980x760")
+
+        form = tb.Frame(win)
+        form.pack(fill="x", padx=10, pady=10)
+        try:
+            dp_nominal = float(self.dp_max_entry.get())
+        except ValueError:
+            dp_nominal = 1.0
+        fields = {
+            "flowrate": ("Flowrate (m³/h)  start:stop:num",
+                         f"{self.flowrate * 0.25:g}:{self.flowrate * 4:g}:50"),
+            "length": ("Length (m)  start:stop:num",
+                       f"{self.pipe_length * 0.25:g}:{self.pipe_length * 4:g}:50"),
+            "dp_max": ("ΔP max (bar)  start:stop:num or list",
+                       f"{dp_nominal * 0.25:g}:{dp_nominal * 4:g}:20"),
         }
+        entries = {}
+        for i, (key, (label, default)) in enumerate(fields.items()):
+            tb.Label(form, text=label, font=("Helvetica", 11)).grid(row=i, column=0, sticky="w", padx=(0, 10))
+            ent = tb.Entry(form, font=("Helvetica", 11), width=30)
+            ent.insert(0, default)
+            ent.grid(row=i, column=1, sticky="w", pady=2)
+            entries[key] = ent
+
+        view = tb.Frame(win)
+        view.pack(fill="x", padx=10)
+        tb.Label(view, text="Material:").pack(side="left")
+        mat_cb = tb.Combobox(view, values=self.compatible_materials, state="readonly", width=32)
+        mat_cb.pack(side="left", padx=(5, 20))
+        tb.Label(view, text="ΔP max (bar):").pack(side="left")
+        dp_cb = tb.Combobox(view, state="readonly", width=10)
+        dp_cb.pack(side="left", padx=5)
+        status = tb.Label(view, text="", bootstyle="info")
+        status.pack(side="right")
+
+        fig = Figure(figsize=(8, 6))
+        canvas = FigureCanvasTkAgg(fig, master=win)
+        canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        state = {}
+
+        def redraw(event=None):
+            space = state.get("space")
+            if space is None or not mat_cb.get() or not dp_cb.get():
+                return
+            design_space_figure(space, mat_cb.get(), float(dp_cb.get()), fig)
+            canvas.draw_idle()
+
+        def done(result):
+            if isinstance(result, Exception):
+                status.config(text=f"⚠ {result}")
+                return
+            space, seconds = result
+            state["space"] = space
+            dp_cb.config(values=[f"{v:g}" for v in space.coords["dp_max"]])
+            dp_cb.set(f"{space.coords['dp_max'][space.index('dp_max', dp_nominal)]:g}")
+            if mat_cb.get() not in self.compatible_materials:
+                mat_cb.set(self.compatible_materials[0])
+            status.config(text=f"{space.dcrit.size:,} designs in {seconds:.2f} s")
+            redraw()
+
+        def compute():
+            axes = {k: e.get() for k, e in entries.items()}
+            case = self._case(dp_nominal)
+            status.config(text="⏳ Sweeping…")
+
+            def work():
+                try:
+                    t0 = time.perf_counter()
+                    space = parametric_sweep(case, axes["flowrate"], axes["length"], axes["dp_max"],
+                                             materials=self.compatible_materials, catalogues=_catalogues)
+                    result = (space, time.perf_counter() - t0)
+                except Exception as exc:
+                    result = exc
+                self.root.after(0, done, result)
+
+            threading.Thread(target=work, daemon=True).start()
+
+        mat_cb.bind("<<ComboboxSelected>>", redraw)
+        dp_cb.bind("<<ComboboxSelected>>", redraw)
+        tb.Button(form, text="Compute", bootstyle="success-outline", width=15,
+                  command=compute).grid(row=0, column=2, rowspan=3, padx=20)
+        compute()
+
+    def open_pareto_explorer(self):
+        """Every (material, OD, wall) candidate on two objectives; click a point for its details."""
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.figure import Figure
+        from engine.pareto import LABELS, OBJECTIVES, pareto_designs
+        from engine.plots import pareto_figure
+
+        win = tb.Toplevel(self.root)
+        win.title("Pareto Explorer")
+        win.geometry("980x760")
+
+        view = tb.Frame(win)
+        view.pack(fill="x", padx=10, pady=10)
+        axes = {}
+        for name, default in (("X:", "cost"), ("Y:", "dp_bar")):
+            tb.Label(view, text=name).pack(side="left")
+            cb = tb.Combobox(view, values=[LABELS[o] for o in OBJECTIVES], state="readonly", width=22)
+            cb.set(LABELS[default])
+            cb.pack(side="left", padx=(5, 20))
+            axes[name] = cb
+        status = tb.Label(view, text="", bootstyle="info")
+        status.pack(side="right")
+        details = tb.Label(win, text="Click a point of the front for its details.", font=("Helvetica", 11))
+        details.pack(fill="x", padx=10)
+
+        fig = Figure(figsize=(8, 6))
+        canvas = FigureCanvasTkAgg(fig, master=win)
+        canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        state = {}
+        objective = {label: o for o, label in LABELS.items()}
+
+        def redraw(event=None):
+            if "pareto" not in state:
+                return
+            pareto_figure(state["pareto"], objective[axes["X:"].get()], objective[axes["Y:"].get()], fig)
+            canvas.draw_idle()
+
+        def pick(event):
+            if "front" not in state or not len(event.ind):
+                return
+            row = state["front"].iloc[int(event.ind[0])]
+            details.config(text=(f"{row['Material']} – NPS {row['NPS']}, OD {row['OD_norm_mm']:g} mm, "
+                                 f"wall {row['t_norm_mm']:g} mm | cost {row['cost']:,.0f} | "
+                                 f"ΔP {row['dp_bar']:.3f} bar | velocity margin {row['velocity_margin']:.0%} | "
+                                 f"{row['mass_kg']:,.0f} kg | thickness margin {row['thickness_margin']:.2f} mm"))
+
+        def done(result):
+            if isinstance(result, Exception):
+                status.config(text=f"⚠ {result}")
+                return
+            pareto, seconds = result
+            state["pareto"], state["front"] = pareto, pareto.table()
+            status.config(text=f"{len(pareto)} of {pareto.feasible.size:,} candidates in {seconds:.2f} s")
+            redraw()
+
+        try:
+            dp_max = float(self.dp_max_entry.get())
+        except ValueError:
+            dp_max = float("inf")
+        case = self._case(dp_max)
+        status.config(text="⏳ Evaluating candidates…")
+
+        def work():
+            try:
+                t0 = time.perf_counter()
+                pareto = pareto_designs(case, _catalogues, materials=self.compatible_materials)
+                result = (pareto, time.perf_counter() - t0)
+            except Exception as exc:
+                result = exc
+            self.root.after(0, done, result)
+
+        for cb in axes.values():
+            cb.bind("<<ComboboxSelected>>", redraw)
+        canvas.mpl_connect("pick_event", pick)
+        threading.Thread(target=work, daemon=True).start()
 
     def show_material_buttons(self):
         for w in self.material_buttons_frame.winfo_children():
@@ -1467,6 +1414,11 @@ class PipeDesignOptimizerApp:
 # ----------------------------------------------------------
     def create_thickness_schedule_page(self):
         """Open a scrollable thickness & schedule window, not full-screen."""
+        from engine import catalogues
+        from engine.thickness import (
+            F_MAP, material_strength, sizing_diameters, thickness_matrix, thickness_schedule,
+        )
+
         # ---- new child window (modal or not, your choice) ----
         top = tk.Toplevel(self.root)
         top.title("Thickness & Schedule Selection")
@@ -1512,10 +1464,7 @@ class PipeDesignOptimizerApp:
 
         # ---- load schedule (unchanged) ----
         try:
-            sched_df = pd.read_excel("schedule.xlsx")
-            sched_df["Outside diameter (mm)"] = pd.to_numeric(sched_df["Outside diameter (mm)"], errors="coerce")
-            sched_df["Wall thickness (mm)"] = pd.to_numeric(sched_df["Wall thickness (mm)"], errors="coerce")
-            sched_df.dropna(subset=["Outside diameter (mm)", "Wall thickness (mm)"], inplace=True)
+            sched_df = catalogues.read_schedule(_catalogues.schedule_path)
             status_msg = "✓ Schedule data loaded"
         except Exception as e:
             status_msg = f"⚠ Failed to load schedule.xlsx: {e}"
@@ -1527,9 +1476,7 @@ class PipeDesignOptimizerApp:
             return
 
         # ---- parameters (unchanged) ----
-        F_map = {"<10 buildings": 0.72, "<46 buildings": 0.60,
-                 ">46 buildings": 0.50, "High-density/traffic": 0.40}
-        F = F_map.get(self.location_var.get(), 0.72)
+        F = F_MAP.get(self.location_var.get(), 0.72)
 
         params_lf = tb.LabelFrame(scroll_frame, text="Parameters", bootstyle="info")
         params_lf.pack(fill="x", pady=(0, 10), padx=5)
@@ -1538,44 +1485,39 @@ class PipeDesignOptimizerApp:
         tb.Label(params_inner, text=f"Factor (F): {F}").grid(row=0, column=0, sticky="w")
         tb.Label(params_inner, text=f"Pressure: {self.design_pressure/1e6:.2f} MPa").grid(row=0, column=1, sticky="w", padx=(20, 0))
 
-        # ---- compute & display results (unchanged) ----
-        results = []
-        for mat in self.compatible_materials:
-            dc_vel = self.dcrit_velocity * 1000
-            dc_pres = self.pressure_drop_results.get(mat, {}).get("Critical Diameter (mm)")
-            dcrit = min(dc_vel, dc_pres) if dc_pres else dc_vel
-            if dcrit is None:
-                continue
-            row = material_df[material_df["Material"] == mat].iloc[0]
-            try:
-                E = float(row["Weld Joint Factor (E)"])
-                Sy = float(row["SMYS (MPa)"]) * 1e6
-            except:
-                continue
-            CA = self.corrosion_allowance / 1000
-            S = F * E * Sy
-            t_req = (self.design_pressure * 10 * (dcrit / 1000)) / (20 * S - 2 * self.design_pressure) + CA
-            OD = dcrit + 2 * t_req * 1000
-
-            cand = sched_df[sched_df["Outside diameter (mm)"] >= OD]
-            if cand.empty:
-                continue
-            min_od = cand["Outside diameter (mm)"].min()
-            cand = cand[cand["Outside diameter (mm)"] == min_od]
-            cand = cand[cand["Wall thickness (mm)"] >= t_req * 1000]
-            if cand.empty:
-                continue
-            best = cand.iloc[0]
-            results.append({
-                "Material": mat,
-                "dcrit (m)": dcrit / 1000,
-                "t_required_mm": t_req * 1000,
-                "OD_computed_mm": OD,
-                "OD_norm_mm": best["Outside diameter (mm)"],
-                "t_norm_mm": best["Wall thickness (mm)"],
-                "NPS": best.get("Nominal size (inches)", "N/A"),
-                "API": best.get("Specif. API", "N/A")
-            })
+        # ---- compute & display results ----
+        results = thickness_schedule(self.compatible_materials, material_df, sched_df,
+                                     self.dcrit_velocity, self.pressure_drop_results,
+                                     F, self.design_pressure, self.corrosion_allowance)
+
+        # ---- all four location classes at once (one broadcast) ----
+        materials = self.compatible_materials
+        if materials:
+            E, Sy = material_strength(material_df, materials)
+            dcrit = sizing_diameters(materials, self.dcrit_velocity, self.pressure_drop_results)
+            sized = thickness_matrix(sched_df, dcrit, E, Sy, self.design_pressure,
+                                     corrosion_allowance=self.corrosion_allowance)
+            compare_lf = tb.LabelFrame(scroll_frame, text="Location Class Comparison (standard pipe)",
+                                       bootstyle="info")
+            compare_lf.pack(fill="x", pady=(0, 10), padx=5)
+            cols = ("Material",) + tuple(F_MAP)
+            tree = tb.Treeview(compare_lf, columns=cols, show="headings",
+                               height=min(len(materials), 8), bootstyle="info")
+            for c in cols:
+                tree.heading(c, text=c if c == "Material" else f"{c} (F={F_MAP[c]})")
+                tree.column(c, width=220 if c == "Material" else 150, anchor="center")
+            nps = sched_df["Nominal size (inches)"] if "Nominal size (inches)" in sched_df else None
+            for i, mat in enumerate(materials):
+                cells = []
+                for j in range(len(F_MAP)):
+                    pos = sized["row"][i, 0, j]
+                    if pos < 0:
+                        cells.append("—")
+                        continue
+                    size = f'NPS {nps.iloc[pos]} · ' if nps is not None else ""
+                    cells.append(f"{size}{sized['t_norm_mm'][i, 0, j]:.2f} mm")
+                tree.insert("", "end", values=(mat, *cells))
+            tree.pack(fill="x", padx=10, pady=5)
 
         if not results:
             tb.Label(scroll_frame, text="⚠ No matching schedule found",
@@ -1611,8 +1553,201 @@ class PipeDesignOptimizerApp:
         btn_box.pack()
         tb.Button(btn_box, text="📄 Generate PDF Report", bootstyle="success", width=20,
                   command=lambda: [top.destroy(), self.generate_report(results)]).pack(side="left", padx=5)
+        tb.Button(btn_box, text="💾 Save Project", bootstyle="info-outline", width=20,
+                  command=lambda: self.save_project(results)).pack(side="left", padx=5)
+        if self.selected_phase == "Liquid" and results:
+            tb.Button(btn_box, text="🌊 Surge Check", bootstyle="warning-outline", width=20,
+                      command=lambda: self.surge_check(top, results, F)).pack(side="left", padx=5)
         tb.Button(btn_box, text="← Back / Close", bootstyle="secondary-outline", width=20,
                   command=top.destroy).pack(side="left", padx=5)
+
+    def surge_check(self, parent, results, F):
+        """Valve-closure water hammer on each selected pipe vs. the pressure its wall allows."""
+        from engine.thickness import material_strength
+        from engine.transient import CLOSURE_TIME, pipe_surge
+
+        closure = simpledialog.askfloat("Surge Check", "Valve closure time (s):", parent=parent,
+                                        initialvalue=CLOSURE_TIME, minvalue=0.0)
+        if closure is None:
+            return
+        materials = [r["Material"] for r in results]
+        E, Sy = material_strength(material_df, materials)
+
+        top = tk.Toplevel(parent)
+        top.title("Surge Check")
+        top.geometry("820x360")
+        top.transient(parent)
+        status = tb.Label(top, text=f"⏳ Simulating {len(results)} pipe(s)…", font=("Segoe UI", 9))
+        status.pack(pady=(10, 5))
+        cols = ("Material", "NPS", "Wave speed (m/s)", "Peak (bar)", "Allowable (bar)", "Status")
+        tree = tb.Treeview(top, columns=cols, show="headings", height=min(len(results), 10),
+                           bootstyle="info")
+        for c in cols:
+            tree.heading(c, text=c)
+            tree.column(c, width=220 if c == "Material" else 110, anchor="center")
+        tree.pack(fill="both", expand=True, padx=10, pady=5)
+
+        def done(rows):
+            if not top.winfo_exists():
+                return
+            if isinstance(rows, Exception):
+                status.config(text=f"⚠ {rows}")
+                return
+            for r, s in zip(results, rows):
+                allowable = f"{s['allowable'] / 1e5:.2f}"
+                if s["governs"] != "wall":
+                    allowable += " (design)"
+                state = "✓ OK" if s["ok"] else "✗ Exceeded"
+                if s["cavitation"]:
+                    state += " · cavitation"
+                tree.insert("", "end", values=(r["Material"], r["NPS"], f"{s['wave_speed']:.0f}",
+                                               f"{s['p_max'] / 1e5:.2f}", allowable, state))
+            status.config(text=f"Closure {closure:g} s · operating {self.operating_pressure:g} bar · "
+                               f"design {self.design_pressure / 1e5:g} bar")
+
+        def work():
+            try:
+                rows = [pipe_surge(self.flowrate, self.pipe_length, self.rho, self.mu,
+                                   material_roughness(r["Material"]), self.operating_pressure * 1e5,
+                                   r["OD_norm_mm"], r["t_norm_mm"], E[i], Sy[i], F,
+                                   self.corrosion_allowance, closure_time=closure,
+                                   design_pressure=self.design_pressure)
+                        for i, r in enumerate(results)]
+            except Exception as exc:
+                rows = exc
+            self.root.after(0, done, rows)
+
+        threading.Thread(target=work, daemon=True).start()
+
+    # ----------------------------------------------------------
+    # Project files (.pdo)
+    # ----------------------------------------------------------
+    def _current_design(self, thickness_results):
+        """The GUI state as a ``run_design``-style result."""
+        prices = self.calculate_pipe_prices(thickness_results)
+        case = self._case(float(self.dp_max_entry.get()))
+        case.update({k: v for k, v in self.velocity_case.items() if k != "velocity"})
+        design = {
+            "case": case,
+            "fluid": {"rho": self.rho, "mu": self.mu},
+            "compatible_materials": self.compatible_materials,
+            "dcrit_velocity": self.dcrit_velocity,
+            "materials": {m: {"dcrit": r["Critical Diameter (m)"],
+                              "calculation": self.calculation_results.get(m)}
+                          for m, r in self.pressure_drop_results.items()},
+            "thickness": thickness_results,
+            "prices": prices,
+            "recommended": min(prices, key=lambda m: prices[m]["total_cost"]) if prices else None,
+        }
+        if self.pressure_drop_sweeps:
+            design["sweeps"] = self.pressure_drop_sweeps
+            design["diameters"] = self.diameters
+        return design
+
+    def save_project(self, thickness_results):
+        from engine.project import EXTENSION as PROJECT_EXTENSION, save_project
+
+        default_name = f"{self.project_name}{PROJECT_EXTENSION}"
+        file_path = filedialog.asksaveasfilename(
+            initialdir=Path.home() / "Documents",
+            initialfile=default_name,
+            defaultextension=PROJECT_EXTENSION,
+            filetypes=[("Pipe Design projects", f"*{PROJECT_EXTENSION}")])
+        if not file_path:
+            return
+        try:
+            save_project(file_path, [self._current_design(thickness_results)], self.project_name)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Save Project", str(e))
+            return
+        messagebox.showinfo("Save Project", f"Project saved to:\n{file_path}")
+
+    def open_project(self):
+        from engine.project import EXTENSION as PROJECT_EXTENSION, load_project
+
+        file_path = filedialog.askopenfilename(
+            filetypes=[("Pipe Design projects", f"*{PROJECT_EXTENSION}"), ("All files", "*.*")])
+        if not file_path:
+            return
+        try:
+            project = load_project(file_path)
+        except (OSError, ValueError, KeyError) as e:
+            messagebox.showerror("Open Project", str(e))
+            return
+        if not len(project):
+            messagebox.showerror("Open Project", "The project has no designs.")
+            return
+        index = 0
+        if len(project) > 1:
+            index = simpledialog.askinteger(
+                "Open Project", f"{project.name} has {len(project)} segments.\nSegment to open (1–{len(project)}):",
+                initialvalue=1, minvalue=1, maxvalue=len(project), parent=self.root)
+            if index is None:
+                return
+            index -= 1
+        self.restore_design(project.design(index))
+
+    def restore_design(self, design):
+        """Rebuild the input form and pressure-drop page from a saved design."""
+        import numpy as np
+        from engine.hydraulics import diameter_grid
+        from engine.plots import pressure_drop_figure, save_figure, velocity_figure
+
+        case = design["case"]
+        self.project_name = case["project_name"]
+        self.create_second_page()
+        self.phase_var.set(case["phase"])
+        self.update_fluid_list()
+        self.fluid_var.set(case["fluid"])
+        self.location_var.set(case["location"])
+        for key, entry in self.entries.items():
+            entry.insert(0, f"{case[key]:g}")
+
+        model = case.get("velocity_limit", "fixed")
+        self.velocity_limit_var.set(next(k for k, v in VELOCITY_LIMITS.items() if v == model))
+        if model != "fixed":
+            self.velocity_parameter_entry.insert(
+                0, f"{case['c_factor']:g}" if model == "api-rp-14e" else case["velocity_expression"])
+        self.velocity_case = {k: case[k] for k in ("velocity", "velocity_limit", "c_factor",
+                                                   "velocity_expression") if k in case}
+        self.selected_phase, self.selected_fluid = case["phase"], case["fluid"]
+        self.flowrate, self.pipe_length, self.vmax = case["flowrate"], case["length"], case["velocity"]
+        self.temperature, self.operating_pressure = case["temperature"], case["pressure"]
+        self.design_pressure = case["design_pressure"] * 1e5
+        self.corrosion_allowance = case["corrosion_allowance"]
+        self.rho, self.mu = design["fluid"]["rho"], design["fluid"]["mu"]
+        self.two_phase = None
+        self.rheology = fluid_rheology(case["fluid"]) if case["phase"] == "Liquid" else None
+        if case["phase"] == "Two-phase":
+            from engine.twophase import TwoPhaseFlow
+            self.gas_var.set(case["gas"])
+            self.gas_fraction_entry.insert(0, f"{case['gas_fraction']:g}")
+            self.correlation_var.set(case["correlation"])
+            self.two_phase = TwoPhaseFlow.from_case(case, _use_catalogues())
+        self.compatible_materials = design["compatible_materials"]
+        self.dcrit_velocity = design["dcrit_velocity"]
+        self.calculation_results = {m: r["calculation"] for m, r in design["materials"].items()
+                                    if r["calculation"]}
+        self.pressure_drop_sweeps = {m: np.array(td, dtype=float)
+                                     for m, td in design.get("sweeps", {}).items()}
+        self.diameters = np.array(design["diameters"]) if "diameters" in design else diameter_grid()
+
+        # report images, as process_input / the worker would have saved them
+        img_folder = Path(resource_path("report_imgs"))
+        img_folder.mkdir(exist_ok=True)
+        save_figure(velocity_figure(self.flowrate, self.vmax, self.dcrit_velocity),
+                    img_folder / "velocity_vs_diameter.png")
+        if self.pressure_drop_sweeps:
+            save_figure(pressure_drop_figure(self.diameters, self.pressure_drop_sweeps,
+                                             case["dp_max"] * 1e5),
+                        img_folder / "pressure_drop_vs_diameter.png")
+
+        self.create_pressure_drop_page()
+        self.dp_max_entry.insert(0, f"{case['dp_max']:g}")
+        self.fittings_editor.set_rows(case["fittings"])
+        self._show_pressure_drop_results([(m, design["materials"][m]["dcrit"])
+                                          for m in self.compatible_materials])
+
     # ----------------------------------------------------------
     # Report generator
     # ----------------------------------------------------------
@@ -1632,19 +1767,7 @@ class PipeDesignOptimizerApp:
         }
 
         # Fittings
-        inputs["fittings"] = []
-        for cb, e in self.fitting_widgets:
-            try:
-                typ = cb.get().strip()
-                if typ:
-                    try:
-                        n = int(e.get() or 0)
-                    except ValueError:
-                        n = 0
-                    if n > 0:
-                        inputs["fittings"].append((typ, n))
-            except tk.TclError:
-                continue
+        inputs["fittings"] = [(typ, n) for typ, n in self._fitting_entries() if n > 0]
 
         # Compatible materials with ranges
         compatible = []
@@ -1713,6 +1836,7 @@ class PipeDesignOptimizerApp:
             return
 
         # Build report
+        from engine.report import build_pipeline_report
         build_pipeline_report(
             inputs=inputs,
             compatible=compatible,
@@ -1730,46 +1854,9 @@ class PipeDesignOptimizerApp:
     # Price calculations
     # ----------------------------------------------------------
     def calculate_pipe_prices(self, thickness_results):
-        prices = {}
-        for r in thickness_results:
-            mat = r["Material"]
-            try:
-                # Get material price
-                mat_row = material_df[material_df["Material"] == mat].iloc[0]
-                price_per_kg = float(mat_row["Price"])
-                density = 7850  # kg/m³ (steel)
-                OD_m = r["OD_norm_mm"] / 1000
-                t_m = r["t_norm_mm"] / 1000
-                volume = np.pi * (OD_m**2 - (OD_m - 2*t_m)**2) / 4 * self.pipe_length
-                mass = volume * density
-                material_cost = mass * price_per_kg
-
-                # Fittings cost – skip widgets that may be destroyed
-                fittings_cost = 0
-                try:
-                    for cb, e in self.fitting_widgets:
-                        if not cb.winfo_exists() or not e.winfo_exists():
-                            continue
-                        typ = cb.get().strip()
-                        if typ:
-                            qty = int(e.get() or 0)
-                            row = fittings_df[fittings_df["Fitting Type"] == typ]
-                            if not row.empty:
-                                unit_price = float(row.iloc[0]["Price"])
-                                fittings_cost += qty * unit_price
-                except tk.TclError:
-                    pass  # ignore destroyed widgets
-
-                total_cost = (material_cost + fittings_cost) * 1.10
-                prices[mat] = {
-                    'material_cost': material_cost,
-                    'fittings_cost': fittings_cost,
-                    'total_cost': total_cost,
-                    'mass': mass
-                }
-            except Exception as e:
-                print(f"Price calc error for {mat}: {e}")
-        return prices
+        from engine import pricing
+        return pricing.calculate_pipe_prices(thickness_results, material_df, fittings_df,
+                                             self._fitting_entries(), self.pipe_length)
 
 
     # ----------------------------------------------------------
@@ -1777,27 +1864,54 @@ class PipeDesignOptimizerApp:
     # ----------------------------------------------------------
     def colebrook(self, Re, D, k):
         """Swamee–Jain explicit approximation to Colebrook-White."""
-        if Re <= 0 or D <= 0:
-            return 0.02  # safe fallback
-        ks = k / D
-        A = (ks / 3.7) ** 1.11 + 5.74 / Re ** 0.9
-        f = 0.25 / (np.log10(A) ** 2)
-        return max(f, 1e-4)  # avoid zero / negatives
+        from engine.hydraulics import colebrook
+        return colebrook(Re, D, k)
 
     def clear_root(self):
         for w in self.root.winfo_children():
             w.destroy()
 
     def set_bg(self, path):
+        """Full-window background; scaled once per window size and shared by all pages."""
         try:
-            img = Image.open(path).resize((self.root.winfo_screenwidth(), self.root.winfo_screenheight()))
-            photo = ImageTk.PhotoImage(img)
+            size = self._window_size()
+            photo = self.images.photo(path, size)
             lbl = tb.Label(self.root, image=photo)
-            lbl.image = photo
+            lbl.image = photo                   # keep it alive if the cache drops it
             lbl.place(x=0, y=0, relwidth=1, relheight=1)
+            self._bg = (lbl, path, size)
         except Exception:
             pass  # background image optional
 
+    def _window_size(self):
+        if self.root.winfo_width() > 1:        # mapped: the real window size
+            return self.root.winfo_width(), self.root.winfo_height()
+        return self.root.winfo_screenwidth(), self.root.winfo_screenheight()
+
+    def _on_root_configure(self, event):
+        if event.widget is not self.root or self._bg is None:
+            return
+        if (event.width, event.height) == self._bg[2]:
+            return
+        if self._resize_job is not None:
+            self.root.after_cancel(self._resize_job)
+        self._resize_job = self.root.after(RESIZE_DEBOUNCE_MS, self._rescale_bg)
+
+    def _rescale_bg(self):
+        """Debounced: refit the background after the window stopped resizing."""
+        self._resize_job = None
+        lbl, path, _ = self._bg
+        if not lbl.winfo_exists():
+            return
+        size = self._window_size()
+        try:
+            photo = self.images.photo(path, size)
+        except Exception:
+            return
+        lbl.configure(image=photo)
+        lbl.image = photo
+        self._bg = (lbl, path, size)
+
     def create_scrollable_frame(self, parent, width=580, height=500):
         container = tb.Frame(parent)
         container.pack(pady=45)
@@ -1852,23 +1966,34 @@ class PipeDesignOptimizerApp:
 
     def update_fluid_list(self, event=None):
         phase = self.phase_var.get()
-        if phase == "Liquid":
+        if phase in ("Liquid", "Two-phase"):
             fluids = liquid_df["Liquid"].dropna().tolist()
         else:
             fluids = gas_df["Gas"].dropna().tolist()
         self.fluid_cb['values'] = fluids
         if fluids:
             self.fluid_cb.current(0)
+        if phase == "Two-phase":
+            gases = gas_df["Gas"].dropna().tolist()
+            self.gas_cb['values'] = gases
+            if gases and self.gas_var.get() not in gases:
+                self.gas_cb.current(0)
+            self.two_phase_frame.grid()
+        else:
+            self.two_phase_frame.grid_remove()
 
 
 
 
 
 # ------------------------------------------------------------------
-# 5.  Run app
+# 6.  Run app
 # ------------------------------------------------------------------
 if __name__ == "__main__":
     from tkinter import filedialog  # avoid import issues
+    import multiprocessing
+    multiprocessing.freeze_support()  # uncertainty workers in the frozen .exe
+    startup.load_catalogues()         # start loading while the window is created
 
     root = tb.Window(themename="cyborg")
     PipeDesignOptimizerApp(root)
@@ -1,19 +1,75 @@
 # -*- mode: python ; coding: utf-8 -*-
+#
+# pyinstaller pipedesignoptimizer.spec
+# python benchmarks/bundle_report.py dist/pipedesignoptimizer      # size + cold start
+#
+# The catalogues are bundled with a prebuilt catalogue.sqlite, so the first
+# start copies them next to the exe instead of parsing the workbooks. Only the
+# Agg and TkAgg matplotlib backends are collected; other GUI toolkits, test
+# suites and matplotlib's sample data are left out. Numba is bundled when it
+# is installed in the build environment, so the exe gets the fused ΔP kernel.
+import importlib.util
+import os
+import sys
+
+ROOT = SPECPATH
+sys.path.insert(0, ROOT)
+from engine.catalogue_db import DB_FILE, TABLES, CatalogueDB  # noqa: E402
+
+WORKBOOKS = [file for file, _ in TABLES.values()]
+ASSETS = ["bg_eppm.png", "Pipe Design Optimizer.ico", "Pipe Design Optimizer.png"]
+
+# Prebuilt catalogue database, rebuilt from the workbooks on every build.
+catalogue_db = os.path.join(workpath, DB_FILE)
+os.makedirs(workpath, exist_ok=True)
+for stale in (catalogue_db, catalogue_db + "-wal", catalogue_db + "-shm"):
+    if os.path.exists(stale):
+        os.remove(stale)
+with CatalogueDB(catalogue_db) as db:
+    db.import_excel(ROOT)
+    db.conn.execute("PRAGMA journal_mode=DELETE")      # one self-contained file
+
+datas = [(os.path.join(ROOT, name), ".") for name in WORKBOOKS + ASSETS
+         if os.path.exists(os.path.join(ROOT, name))]
+datas.append((catalogue_db, "."))
+
+EXCLUDES = [
+    # GUI toolkits matplotlib (or pandas' clipboard support) could pull in
+    "PyQt5", "PyQt6", "PySide2", "PySide6", "qtpy", "wx", "gi", "cairo",
+    # notebooks and test runners
+    "IPython", "jupyter_client", "ipykernel", "notebook", "pytest", "_pytest", "hypothesis",
+    "tkinter.test", "lib2to3", "pydoc_data",
+    # heavy optional dependencies not used by the application
+    "scipy", "pyarrow", "xarray", "sqlalchemy", "tables", "bottleneck",
+]
+if importlib.util.find_spec("numba") is None:
+    EXCLUDES += ["numba", "llvmlite"]                 # the exe then uses the NumPy kernels
+# matplotlib/mpl-data folders not needed to draw PNG figures with Agg/TkAgg
+UNUSED_DATA = ("matplotlib/mpl-data/sample_data/", "matplotlib/mpl-data/plot_directive/",
+               "matplotlib/mpl-data/fonts/afm/", "matplotlib/mpl-data/fonts/pdfcorefonts/",
+               "matplotlib/mpl-data/kpsewhich.lua")
+
+
+def _unused(name):
+    name = name.replace("\\", "/")
+    return "/tests/" in f"/{name}" or name.startswith(UNUSED_DATA)
 
 
 a = Analysis(
     ['pipedesignoptimizer.py'],
-    pathex=[],
+    pathex=[ROOT],
     binaries=[],
-    datas=[],
+    datas=datas,
     hiddenimports=[],
     hookspath=[],
-    hooksconfig={},
+    hooksconfig={"matplotlib": {"backends": ["Agg", "TkAgg"]}},
     runtime_hooks=[],
-    excludes=[],
+    excludes=EXCLUDES,
     noarchive=False,
-    optimize=0,
+    optimize=2,
 )
+a.pure = [entry for entry in a.pure if ".tests." not in f".{entry[0]}."]
+a.datas = [entry for entry in a.datas if not _unused(entry[0])]
 pyz = PYZ(a.pure)
 
 exe = EXE(